@@ -15,7 +15,7 @@ def _patched_torch_load(*args, **kwargs):
 torch.load = _patched_torch_load
 print("[PATCH] torch.load patched for weights_only=False")
 
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, send_file
 from flask_cors import CORS
 import time
 import sys
@@ -65,16 +65,115 @@ except ImportError as e:
     print(f"[WARN] Mesh renderer not available: {e}")
     HAS_MESH_RENDERER = False
 
+from frame_ingest import (
+    FrameDecodeError, read_frame_from_request, read_frames_from_request, get_frame_number, get_bool_param
+)
+from micro_batcher import MicroBatcher
+from mesh_wire import MEDIA_TYPE as MESH_MEDIA_TYPE, encode_result, encode_results, negotiate_mesh_format
+from mesh_topology import attach_topology, get_topology, topology_response, wants_embedded_faces
+from mesh_lod import apply_lod, get_lod, get_lod_level
+from mesh_sequence import get_timeline_codec
+from smpl_params import get_mesh_mode, read_reconstruct_body, reconstruct_meshes, strip_mesh
+from json_response import install_json_provider
+from response_compression import compression_stats, install_compression
+
+# Upper bound on frames per /pose/hybrid/batch request (keeps GPU memory bounded)
+MAX_BATCH_FRAMES = int(os.environ.get('POSE_MAX_BATCH_FRAMES', '32'))
+
+# Upper bound on parameter sets per /mesh/reconstruct request
+MAX_RECONSTRUCT_BODIES = int(os.environ.get('POSE_MAX_RECONSTRUCT_BODIES', '256'))
+
+# Micro-batching: concurrent /pose/hybrid requests arriving within MAX_WAIT_MS
+# share one batched ViTDet + HMR2 pass (POSE_MICROBATCH=0 to disable)
+MICROBATCH_ENABLED = os.environ.get('POSE_MICROBATCH', '1') == '1'
+MICROBATCH_MAX_SIZE = int(os.environ.get('POSE_MICROBATCH_MAX_SIZE', '8'))
+MICROBATCH_MAX_WAIT_MS = float(os.environ.get('POSE_MICROBATCH_MAX_WAIT_MS', '10'))
+
 app = Flask(__name__)
+# NumPy-aware jsonify for every response (see json_response.py)
+install_json_provider(app)
+# gzip/zstd per Accept-Encoding (see response_compression.py)
+install_compression(app)
 
 # Job tracking for async video processing
 import threading
 import uuid
 
+# The detector shares one GPU (and loads its models lazily), so every caller takes
+# turns running it: request threads, the micro-batcher, /process_video's pipeline,
+# /warmup and /reload.
+_detector_lock = threading.Lock()
+
+
+def _run_coalesced_pose_batch(items):
+    """
+    MicroBatcher batch_fn: one detect_pose_batch() call for the queued /pose/hybrid frames.
+    Mesh data stays as NumPy arrays; each request converts it for its own response format.
+    """
+    detector = get_hybrid_detector()
+    with _detector_lock:
+        return detector.detect_pose_batch(
+            [item['image'] for item in items],
+            [item['frame_number'] for item in items],
+            start_time=min(item['start_time'] for item in items),
+            mesh_arrays=True,
+        )
+
+
+def _mesh_lod(detector, level):
+    """MeshLOD for a requested level (None for the full mesh), see mesh_lod.py"""
+    if not level:
+        return None
+    with _detector_lock:
+        detector._load_hmr2()
+        smpl = getattr(detector.hmr2_model, 'smpl', None)
+        if smpl is None:
+            return None
+        return get_lod(level, smpl.faces, detector.smpl_rest_vertices())
+
+
+def _positive_int_param(params, name):
+    """Optional integer >= 1 from a form/JSON mapping (None if absent); ValueError otherwise"""
+    value = params.get(name)
+    if value is None or value == '':
+        return None
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer >= 1, got '{value}'")
+    if number < 1:
+        raise ValueError(f"{name} must be an integer >= 1, got '{value}'")
+    return number
+
+
+def _pose_response(result, mesh_format, include_faces=False, mesh_mode='full', lod=None):
+    """
+    JSON response, or the binary mesh frame when the client negotiated it (see mesh_wire.py).
+    Faces are replaced by a /mesh/topology reference unless include_faces is set;
+    a MeshLOD subsamples the vertices to that level (see mesh_lod.py);
+    mesh_mode 'params' drops the geometry and leaves smpl_params (see smpl_params.py).
+    """
+    attach_topology(result, include_faces)
+    apply_lod(result, lod)
+    if mesh_mode == 'params':
+        strip_mesh(result)
+    if mesh_format:
+        return Response(encode_result(result, mesh_format), mimetype=MESH_MEDIA_TYPE)
+    return jsonify(result)
+
+
+pose_batcher = MicroBatcher(
+    _run_coalesced_pose_batch,
+    max_batch_size=MICROBATCH_MAX_SIZE,
+    max_wait_ms=MICROBATCH_MAX_WAIT_MS,
+    name='pose-hybrid-batcher',
+) if (HAS_HYBRID and MICROBATCH_ENABLED) else None
+
 # Store job status and results
 video_jobs = {}  # {job_id: {status: 'processing'|'complete'|'error', result: {...}, error: str}}
 
-def process_video_async(job_id, input_path, output_path, max_frames='999999'):
+def process_video_async(job_id, input_path, output_path, max_frames='999999', mesh_mode='full',
+                        timeline_codec='none', lod=None):
     """Process video in background thread using track.py"""
     import sys
     
@@ -128,7 +227,18 @@ def process_video_async(job_id, input_path, output_path, max_frames='999999'):
         max_frames_int = int(max_frames)
         log_message(f"[JOB {job_id}] Calling track.py wrapper with max_frames={max_frames_int}...")
         
-        result = process_video_with_track(input_path, track_output_dir, max_frames_int, job_log_file)
+        # LOD maps are decimated on the SMPL template, never on a posed track.py mesh
+        rest_vertices = None
+        if lod and HAS_HYBRID:
+            try:
+                with _detector_lock:
+                    rest_vertices = get_hybrid_detector().smpl_rest_vertices()
+            except Exception as e:
+                log_message(f"[JOB {job_id}] ⚠ SMPL template unavailable for LOD {lod}: {e}")
+        
+        result = process_video_with_track(input_path, track_output_dir, max_frames_int, job_log_file,
+                                          mesh_mode=mesh_mode, timeline_codec=timeline_codec, lod=lod,
+                                          rest_vertices=rest_vertices)
         
         log_message(f"[JOB {job_id}] track.py returned successfully")
         log_message(f"[JOB {job_id}] Result: {result}")
@@ -186,6 +296,8 @@ def health_check():
             'vitdet': 'loaded' if vitdet_loaded else 'not_loaded'
         },
         'ready': hmr2_loaded and vitdet_loaded,
+        'micro_batching': pose_batcher.get_metrics() if pose_batcher else {'enabled': False},
+        'compression': compression_stats(),
         'timestamp': time.time()
     })
 
@@ -211,7 +323,8 @@ def do_warmup():
         print("[WARMUP] Loading HMR2 model...")
         hmr2_start = time.time()
         try:
-            detector._load_hmr2()
+            with _detector_lock:
+                detector._load_hmr2()
             hmr2_time = time.time() - hmr2_start
             results['hmr2'] = {
                 'status': 'loaded' if detector.model_loaded else 'failed',
@@ -228,7 +341,8 @@ def do_warmup():
         print("[WARMUP] Loading ViTDet model...")
         vitdet_start = time.time()
         try:
-            vitdet = detector._load_vitdet()
+            with _detector_lock:
+                vitdet = detector._load_vitdet()
             vitdet_time = time.time() - vitdet_start
             results['vitdet'] = {
                 'status': 'loaded' if vitdet is not None else 'failed',
@@ -291,38 +405,263 @@ def detect_pose_hybrid():
     """
     Detect pose with 3D mesh using HMR2
     
-    Request body:
+    Request body (any of):
+    - Raw JPEG/PNG bytes (Content-Type: image/jpeg, image/png or application/octet-stream),
+      with ?frame_number=0&visualize=true as query parameters
+    - multipart/form-data with the image in a 'frame' (or 'image') file field,
+      plus optional frame_number/frameNumber and visualize form fields
+    - JSON (legacy):
     {
         "image_base64": "base64 encoded PNG/JPG",
         "frame_number": 0 (optional),
         "visualize": true (optional - returns image with mesh overlay)
     }
+    
+    Non-visualize requests that arrive together are coalesced by pose_batcher into
+    one batched HMR2 pass; the response format is the same either way.
+    
+    Send Accept: application/x-smpl-mesh (or ?format=binary / binary16) for a binary
+    response with float32/float16 vertex and joint buffers instead of JSON lists.
+    
+    Faces are not embedded: the result's mesh_topology names the /mesh/topology version
+    to fetch (once) instead. include_faces=true restores mesh_faces_data.
+    
+    mesh=params returns smpl_params (axis-angle pose, betas, camera) without vertices;
+    rebuild meshes with /mesh/reconstruct or client-side skinning (SMPL_LBS_SPEC.md).
     """
     if not HAS_HYBRID:
         return jsonify({'error': 'HMR2 detector not available'}), 501
     
     try:
-        data = request.get_json()
+        start_time = time.time()
+        try:
+            frame = read_frame_from_request(request, base64_field='image_base64', rgb=True)
+        except FrameDecodeError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        params = frame['params']
+        frame_number = get_frame_number(params)
+        visualize = get_bool_param(params, 'visualize')
+        mesh_format = negotiate_mesh_format(request)
+        try:
+            mesh_mode = get_mesh_mode(request, params)
+            lod_level = get_lod_level(request, params)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        detector = get_hybrid_detector()
+        lod = _mesh_lod(detector, lod_level)
+        
+        if visualize:
+            with _detector_lock:
+                result = detector.detect_pose_with_visualization_image(frame['image'], frame_number, start_time=start_time,
+                                                                   mesh_arrays=True)
+        elif pose_batcher is not None:
+            # Coalesced with other in-flight requests; the result is this frame's slice
+            result = pose_batcher.submit({
+                'image': frame['image'],
+                'frame_number': frame_number,
+                'start_time': start_time,
+            })
+            result['processing_time_ms'] = round((time.time() - start_time) * 1000, 2)
+        else:
+            with _detector_lock:
+                result = detector.detect_pose_image(frame['image'], frame_number, start_time=start_time,
+                                                    mesh_arrays=True)
         
-        if not data:
-            return jsonify({'error': 'No JSON data provided'}), 400
+        return _pose_response(result, mesh_format, wants_embedded_faces(request, params), mesh_mode, lod)
         
-        image_base64 = data.get('image_base64')
-        if not image_base64:
-            return jsonify({'error': 'image_base64 is required'}), 400
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({'error': f'Server error: {str(e)}'}), 500
+
+
+@app.route('/pose/hybrid/batch', methods=['POST'])
+def detect_pose_hybrid_batch():
+    """
+    Detect pose on several frames with batched ViTDet and HMR2 passes
+    
+    Request body (any of):
+    - multipart/form-data with one file per frame in repeated 'frames' fields,
+      optional 'frame_numbers' ("0,5,10") or 'start_frame' form fields
+    - JSON:
+    {
+        "frames": [{"image_base64": "...", "frame_number": 0}, ...],
+        "start_frame": 0 (optional - numbering for frames without frame_number)
+    }
+    
+    Returns:
+    {
+        "results": [<same format as /pose/hybrid>, ...],
+        "frame_count": 2,
+        "total_processing_time_ms": 290.5
+    }
+    or, with Accept: application/x-smpl-mesh, a binary batch of the per-frame results
+    (batch totals in X-Frame-Count / X-HMR2-Forward-Passes / X-Processing-Time-Ms headers).
+    Per-frame results reference /mesh/topology instead of embedding faces (include_faces=true to embed).
+    mesh=params returns smpl_params only, as for /pose/hybrid.
+    """
+    if not HAS_HYBRID:
+        return jsonify({'error': 'HMR2 detector not available'}), 501
+    
+    try:
+        start_time = time.time()
+        try:
+            batch = read_frames_from_request(request, base64_field='image_base64', rgb=True)
+        except FrameDecodeError as e:
+            return jsonify({'error': str(e)}), 400
         
-        frame_number = data.get('frame_number', 0)
-        visualize = data.get('visualize', False)
+        frames = batch['frames']
+        if len(frames) > MAX_BATCH_FRAMES:
+            return jsonify({'error': f'Too many frames: {len(frames)} (max {MAX_BATCH_FRAMES})'}), 413
         
+        mesh_format = negotiate_mesh_format(request)
+        try:
+            mesh_mode = get_mesh_mode(request, batch['params'])
+            lod_level = get_lod_level(request, batch['params'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         detector = get_hybrid_detector()
+        lod = _mesh_lod(detector, lod_level)
+        with _detector_lock:
+            results = detector.detect_pose_batch(
+                [frame['image'] for frame in frames],
+                [frame['frame_number'] for frame in frames],
+                start_time=start_time,
+                mesh_arrays=True,
+            )
+            forward_passes = getattr(detector, '_last_batch_forward_passes', None)
+        
+        include_faces = wants_embedded_faces(request, batch['params'])
+        for result in results:
+            attach_topology(result, include_faces)
+            apply_lod(result, lod)
+            if mesh_mode == 'params':
+                strip_mesh(result)
+        
+        if mesh_format:
+            return Response(encode_results(results, mesh_format), mimetype=MESH_MEDIA_TYPE, headers={
+                'X-Frame-Count': str(len(results)),
+                'X-HMR2-Forward-Passes': str(forward_passes),
+                'X-Processing-Time-Ms': str(round((time.time() - start_time) * 1000, 2)),
+            })
         
-        if visualize:
-            result = detector.detect_pose_with_visualization(image_base64, frame_number)
-        else:
-            result = detector.detect_pose(image_base64, frame_number)
+        return jsonify({
+            'results': results,
+            'frame_count': len(results),
+            'hmr2_forward_passes': forward_passes,
+            'total_processing_time_ms': round((time.time() - start_time) * 1000, 2),
+        })
         
-        return jsonify(result)
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({'error': f'Server error: {str(e)}'}), 500
+
+
+@app.route('/mesh/topology', methods=['GET'])
+def get_mesh_topology():
+    """
+    SMPL faces as a packed little-endian uint16 buffer (face_count x 3), served once
+    and cached by clients under the ETag / X-Mesh-Topology-Version (see mesh_topology.py).
+    ?format=json returns {"version", "face_count", "faces": [[a, b, c], ...]}.
+    ?lod=1 / ?lod=2 serve the decimated preview faces (plus "vertex_map" in JSON, see mesh_lod.py).
+    """
+    if not HAS_HYBRID:
+        return jsonify({'error': 'HMR2 detector not available'}), 501
+    
+    try:
+        lod_level = get_lod_level(request)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    detector = get_hybrid_detector()
+    with _detector_lock:
+        detector._load_hmr2()
+    smpl = getattr(detector.hmr2_model, 'smpl', None)
+    lod = _mesh_lod(detector, lod_level) if smpl is not None else None
+    return topology_response(request, smpl.faces if smpl is not None else None, lod)
+
+
+@app.route('/mesh/reconstruct', methods=['POST'])
+def mesh_reconstruct():
+    """
+    Rebuild meshes from compact SMPL params with one batched SMPL forward pass
+    
+    Request body (JSON):
+    {
+        "params": [<smpl_params from a mesh=params result>, ...],
+        "frame_numbers": [0, 1, ...] (optional - echoed back per result)
+    }
+    Each entry is {"global_orient": [3], "body_pose": [69], "betas": [10], "camera": {...}}
+    (axis-angle), or rotation matrices with "rotation_format": "rotmat".
+    
+    Returns {"results": [{"frame_number", "mesh_vertices_data", "joints_3d_raw",
+    "camera_translation", "scaled_focal_length"}, ...], "mesh_topology": {...}},
+    or the binary batch with Accept: application/x-smpl-mesh. ?lod=1 / "lod": 1
+    returns preview-resolution vertices (see mesh_lod.py).
+    """
+    if not HAS_HYBRID:
+        return jsonify({'error': 'HMR2 detector not available'}), 501
+    
+    try:
+        start_time = time.time()
+        data = request.get_json(silent=True)
+        try:
+            payloads, frame_numbers = read_reconstruct_body(data if data is not None else {})
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        if len(payloads) > MAX_RECONSTRUCT_BODIES:
+            return jsonify({'error': f'Too many parameter sets: {len(payloads)} (max {MAX_RECONSTRUCT_BODIES})'}), 413
+        try:
+            lod_level = get_lod_level(request, data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        detector = get_hybrid_detector()
+        try:
+            with _detector_lock:
+                vertices, joints = reconstruct_meshes(payloads, detector.smpl_forward)
+        except ValueError as e:
+            return jsonify({'error': f'Invalid SMPL params: {e}'}), 400
+        lod = _mesh_lod(detector, lod_level)
+        if lod is not None:
+            vertices = vertices[:, lod.vertex_map]
+        
+        results = []
+        for i, payload in enumerate(payloads):
+            camera = payload.get('camera') or {}
+            results.append({
+                'frame_number': frame_numbers[i],
+                'mesh_vertices_data': vertices[i],
+                'joints_3d_raw': joints[i],
+                'camera_translation': camera.get('translation'),
+                'scaled_focal_length': camera.get('focal_length'),
+            })
+        
+        smpl = getattr(detector.hmr2_model, 'smpl', None)
+        topology = get_topology(smpl.faces).reference() if smpl is not None else None
+        if lod is not None:
+            topology = lod.reference()
+        processing_time_ms = round((time.time() - start_time) * 1000, 2)
+        
+        mesh_format = negotiate_mesh_format(request)
+        if mesh_format:
+            for result in results:
+                result['mesh_topology'] = topology
+            return Response(encode_results(results, mesh_format), mimetype=MESH_MEDIA_TYPE, headers={
+                'X-Frame-Count': str(len(results)),
+                'X-Processing-Time-Ms': str(processing_time_ms),
+            })
         
+        return jsonify({
+            'results': results,
+            'mesh_topology': topology,
+            'count': len(results),
+            'processing_time_ms': processing_time_ms,
+        })
+    
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -343,31 +682,33 @@ def reload_modules():
         import importlib
         import sys
         
-        # Get the current detector with loaded models
-        detector = get_hybrid_detector()
-        
-        # Save model references
-        saved_hmr2_model = detector.hmr2_model
-        saved_hmr2_cfg = detector.hmr2_cfg
-        saved_vitdet = detector.vitdet_detector
-        saved_model_loaded = detector.model_loaded
-        saved_vitdet_loaded = detector.vitdet_loaded
-        
-        # Reload the module
-        if 'hybrid_pose_detector' in sys.modules:
-            import hybrid_pose_detector
-            importlib.reload(hybrid_pose_detector)
-        
-        # Get new detector class but restore models
-        from hybrid_pose_detector import HybridPoseDetector, get_hybrid_detector as new_get_detector
-        
-        # The singleton was reset, get it and restore models
-        new_detector = new_get_detector()
-        new_detector.hmr2_model = saved_hmr2_model
-        new_detector.hmr2_cfg = saved_hmr2_cfg
-        new_detector.vitdet_detector = saved_vitdet
-        new_detector.model_loaded = saved_model_loaded
-        new_detector.vitdet_loaded = saved_vitdet_loaded
+        # No request may be inside the detector while its module is swapped out
+        with _detector_lock:
+            # Get the current detector with loaded models
+            detector = get_hybrid_detector()
+            
+            # Save model references
+            saved_hmr2_model = detector.hmr2_model
+            saved_hmr2_cfg = detector.hmr2_cfg
+            saved_vitdet = detector.vitdet_detector
+            saved_model_loaded = detector.model_loaded
+            saved_vitdet_loaded = detector.vitdet_loaded
+            
+            # Reload the module
+            if 'hybrid_pose_detector' in sys.modules:
+                import hybrid_pose_detector
+                importlib.reload(hybrid_pose_detector)
+            
+            # Get new detector class but restore models
+            from hybrid_pose_detector import HybridPoseDetector, get_hybrid_detector as new_get_detector
+            
+            # The singleton was reset, get it and restore models
+            new_detector = new_get_detector()
+            new_detector.hmr2_model = saved_hmr2_model
+            new_detector.hmr2_cfg = saved_hmr2_cfg
+            new_detector.vitdet_detector = saved_vitdet
+            new_detector.model_loaded = saved_model_loaded
+            new_detector.vitdet_loaded = saved_vitdet_loaded
         
         return jsonify({
             'status': 'reloaded',
@@ -391,7 +732,7 @@ def detect_pose_with_visualization():
     """
     Detect pose and return visualization with mesh overlay
     
-    Request body:
+    Accepts raw image bytes or multipart uploads like /pose/hybrid, or JSON:
     {
         "image": "base64 encoded PNG/JPG",
         "frame_number": 0 (optional)
@@ -401,19 +742,18 @@ def detect_pose_with_visualization():
         return jsonify({'error': 'HMR2 detector not available'}), 501
     
     try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({'error': 'No JSON data provided'}), 400
-        
-        image_base64 = data.get('image')
-        if not image_base64:
-            return jsonify({'error': 'image is required'}), 400
+        start_time = time.time()
+        try:
+            frame = read_frame_from_request(request, base64_field='image', rgb=True)
+        except FrameDecodeError as e:
+            return jsonify({'error': str(e)}), 400
         
-        frame_number = data.get('frame_number', 0)
+        frame_number = get_frame_number(frame['params'])
         
         detector = get_hybrid_detector()
-        result = detector.detect_pose_with_visualization(image_base64, frame_number)
+        with _detector_lock:
+            result = detector.detect_pose_with_visualization_image(frame['image'], frame_number, start_time=start_time,
+                                                                   mesh_arrays=True)
         
         return jsonify(result)
         
@@ -432,7 +772,11 @@ def process_video():
     {
         "video": <video file>,
         "max_frames": 10 (default: 10, use 999999 for all frames),
-        "output_format": "base64" or "file_path" (default: "file_path")
+        "output_format": "base64" or "file_path" (default: "file_path"),
+        "detect_every": 5 (optional - run ViTDet every N frames, propagate boxes in between),
+        "sampling": "even" | "motion-diff" | "motion-flow" (optional - how frames are picked),
+        "infer_stride": 3 (optional - run HMR2 every N frames, interpolate SMPL params in between),
+        "mesh": "full" | "params" (optional - params drops per-frame vertices, keeps smplParams)
     }
     
     Returns:
@@ -476,6 +820,15 @@ def process_video():
         if video_file.filename == '':
             return jsonify({'error': 'No video file selected'}), 400
         
+        try:
+            mesh_mode = get_mesh_mode(request, request.form)
+            timeline_codec = get_timeline_codec(request, request.form)
+            lod_level = get_lod_level(request, request.form)
+            detect_every = _positive_int_param(request.form, 'detect_every')
+            infer_stride = _positive_int_param(request.form, 'infer_stride')
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         # Save uploaded video to shared location (accessible from both containers)
         import tempfile
         # Use /shared/videos if running in Docker, otherwise use system temp
@@ -501,11 +854,19 @@ def process_video():
             print("[PROCESS_VIDEO] Loading mesh renderer...")
             mesh_renderer = SMPLMeshRenderer()
             print("[PROCESS_VIDEO] Creating processor...")
-            processor = VideoMeshProcessor(detector, mesh_renderer)
+            processor = VideoMeshProcessor(detector, mesh_renderer, detector_lock=_detector_lock)
             
             # Process video
             print(f"[PROCESS_VIDEO] Starting video processing: {input_path} -> {output_path}")
-            result = processor.process_video(input_path, output_path)
+            result = processor.process_video(
+                input_path, output_path,
+                detect_every=detect_every,
+                sampling=request.form.get('sampling'),
+                infer_stride=infer_stride,
+                mesh_mode=mesh_mode,
+                timeline_codec=timeline_codec,
+                lod=lod_level,
+            )
             print(f"[PROCESS_VIDEO] Video processing complete")
             
             # Add status
@@ -567,6 +928,13 @@ def process_video_async_endpoint():
         print(f"[ASYNC] max_frames from form: {max_frames}")
         sys.stdout.flush()
         
+        try:
+            mesh_mode = get_mesh_mode(request, request.form)
+            timeline_codec = get_timeline_codec(request, request.form)
+            lod_level = get_lod_level(request, request.form)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         import tempfile
         temp_dir = os.path.expanduser('~/videos')
         os.makedirs(temp_dir, exist_ok=True)
@@ -592,7 +960,7 @@ def process_video_async_endpoint():
         
         thread = threading.Thread(
             target=process_video_async,
-            args=(job_id, input_path, output_path, max_frames),
+            args=(job_id, input_path, output_path, max_frames, mesh_mode, timeline_codec, lod_level),
             daemon=True
         )
         print(f"[ASYNC] Thread created: {thread}")
@@ -819,6 +1187,7 @@ if __name__ == '__main__':
     print("  GET  /health                        - Health check (shows ready status)")
     print("  GET  /warmup                        - Pre-load models")
     print("  POST /pose/hybrid                   - HMR2 3D pose detection")
+    print("  POST /pose/hybrid/batch             - HMR2 3D pose detection over N frames")
     print("  POST /detect_pose_with_visualization - Pose with mesh overlay")
     print("  POST /process_video                 - Full video mesh overlay processing")
     print("  POST /process_video_async           - Async video processing with track.py")
@@ -826,6 +1195,10 @@ if __name__ == '__main__':
     print(f"Video processor: {'available' if HAS_VIDEO_PROCESSOR else 'NOT available'}")
     print(f"Track wrapper: {'available' if HAS_TRACK_WRAPPER else 'NOT available'}")
     print(f"Mesh renderer: {'available' if HAS_MESH_RENDERER else 'NOT available'}")
+    if pose_batcher:
+        print(f"Micro-batching: up to {MICROBATCH_MAX_SIZE} frames, {MICROBATCH_MAX_WAIT_MS:.0f}ms window")
+    else:
+        print("Micro-batching: disabled")
     
     if HAS_HYBRID:
         try:
@@ -868,5 +1241,5 @@ if __name__ == '__main__':
     print("[STARTUP] Starting Flask server on 0.0.0.0:5000...")
     print("[STARTUP] Server is ready to accept requests")
     print("=" * 60)
-    app.run(host='0.0.0.0', port=5000, debug=False, use_reloader=False, use_debugger=False, threaded=False)
+    app.run(host='0.0.0.0', port=5000, debug=False, use_reloader=False, use_debugger=False, threaded=pose_batcher is not None)
 
@@ -0,0 +1,226 @@
+"""
+Batched ViTDet + HMR2 inference
+
+Runs the 4D-Humans demo.py pipeline over several frames at once:
+1. ViTDet person detection with all frames in one detector call (chunked)
+2. One ViTDetDataset per frame, concatenated so person crops from every
+   frame are stacked into as few HMR2 forward passes as possible
+3. cam_crop_to_full() per crop, with the focal length scaled by each
+   crop's own image size (identical to demo.py when all frames share a size)
+
+Used by HybridPoseDetector (app.py) and the PHALP Flask wrapper.
+
+Reference: https://github.com/shubham-goel/4D-Humans/blob/main/demo.py
+"""
+
+import logging
+
+import numpy as np
+import torch
+
+logger = logging.getLogger(__name__)
+
+# demo.py: valid_idx = (det_instances.pred_classes==0) & (det_instances.scores > 0.5)
+PERSON_SCORE_THRESHOLD = 0.5
+
+
+def cam_crop_to_full(cam_bbox, box_center, box_size, img_size, focal_length=5000.):
+    """
+    Convert camera parameters from crop space to full image space.
+
+    This is the EXACT function from 4D-Humans/hmr2/utils/renderer.py
+
+    Args:
+        cam_bbox: (B, 3) tensor with [s, tx, ty] in crop space
+        box_center: (B, 2) tensor with crop center in image pixels
+        box_size: (B,) tensor with crop size in pixels
+        img_size: (B, 2) tensor with [width, height] of full image
+        focal_length: focal length for perspective projection (scalar or (B,) tensor)
+
+    Returns:
+        (B, 3) tensor with [tx, ty, tz] camera translation in full image space
+    """
+    img_w, img_h = img_size[:, 0], img_size[:, 1]
+    cx, cy, b = box_center[:, 0], box_center[:, 1], box_size
+    w_2, h_2 = img_w / 2., img_h / 2.
+    bs = b * cam_bbox[:, 0] + 1e-9
+    tz = 2 * focal_length / bs
+    tx = (2 * (cx - w_2) / bs) + cam_bbox[:, 1]
+    ty = (2 * (cy - h_2) / bs) + cam_bbox[:, 2]
+    full_cam = torch.stack([tx, ty, tz], dim=-1)
+    return full_cam
+
+
+def full_image_box(image):
+    """Single box covering the whole image - the fallback when ViTDet finds nobody"""
+    h, w = image.shape[:2]
+    return np.array([[0, 0, w, h]], dtype=np.float32)
+
+
+def detect_people_batch(predictor, images, batch_size=4, score_threshold=PERSON_SCORE_THRESHOLD,
+                        full_image_fallback=True):
+    """
+    Run ViTDet person detection over several images.
+
+    DefaultPredictor_Lazy only takes one image per call, so this reproduces its
+    preprocessing (input format flip + test-time resize) and hands a list of
+    inputs to the underlying detectron2 model. Predictors without those
+    attributes are called once per image.
+
+    Args:
+        predictor: DefaultPredictor_Lazy (or any callable returning {'instances': ...})
+        images: list of (H, W, 3) uint8 images, in the channel order the caller
+                normally feeds the predictor
+        batch_size: Images per detector forward pass
+        score_threshold: Minimum person score
+        full_image_fallback: Use the whole image as the box when nobody is found
+
+    Returns:
+        list (one per image) of {'boxes': (N, 4) float32 xyxy, 'scores': (N,) float32, 'fallback': bool}
+    """
+    instances_list = []
+    model = getattr(predictor, 'model', None)
+    aug = getattr(predictor, 'aug', None)
+
+    if model is None or aug is None:
+        for image in images:
+            instances_list.append(predictor(image)['instances'])
+    else:
+        import detectron2.data.transforms as T
+        input_format = getattr(predictor, 'input_format', 'BGR')
+
+        for start in range(0, len(images), max(1, batch_size)):
+            inputs = []
+            for image in images[start:start + batch_size]:
+                # Same steps as DefaultPredictor_Lazy.__call__
+                original_image = image[:, :, ::-1] if input_format == 'RGB' else image
+                height, width = original_image.shape[:2]
+                transformed = aug(T.AugInput(original_image)).apply_image(original_image)
+                tensor = torch.as_tensor(transformed.astype('float32').transpose(2, 0, 1))
+                inputs.append({'image': tensor, 'height': height, 'width': width})
+
+            with torch.no_grad():
+                predictions = model(inputs)
+            instances_list.extend(p['instances'] for p in predictions)
+
+    detections = []
+    for image, instances in zip(images, instances_list):
+        valid_idx = (instances.pred_classes == 0) & (instances.scores > score_threshold)
+        boxes = instances.pred_boxes.tensor[valid_idx].cpu().numpy().astype(np.float32)
+        scores = instances.scores[valid_idx].cpu().numpy().astype(np.float32)
+
+        fallback = False
+        if len(boxes) == 0 and full_image_fallback:
+            boxes = full_image_box(image)
+            scores = np.zeros(1, dtype=np.float32)
+            fallback = True
+
+        detections.append({'boxes': boxes, 'scores': scores, 'fallback': fallback})
+
+    return detections
+
+
+def run_hmr2_batch(hmr2_model, hmr2_cfg, images, boxes_per_image, device, recursive_to, batch_size=16):
+    """
+    Run HMR2 over every person crop of every image, stacking crops across images.
+
+    Args:
+        hmr2_model: Loaded HMR2 model (eval mode, on device)
+        hmr2_cfg: HMR2 config
+        images: list of (H, W, 3) uint8 images
+        boxes_per_image: list of (N_i, 4) xyxy box arrays, one per image
+        device: torch device string
+        recursive_to: hmr2.utils.recursive_to
+        batch_size: Maximum crops per HMR2 forward pass
+
+    Returns:
+        (persons_per_image, forward_passes) where persons_per_image is a list
+        (one per image) of per-person dicts ordered like the input boxes.
+    """
+    from hmr2.datasets.vitdet_dataset import ViTDetDataset
+
+    datasets = []
+    owners = []  # image index for every crop, in dataset order
+    for image_idx, (image, boxes) in enumerate(zip(images, boxes_per_image)):
+        dataset = ViTDetDataset(hmr2_cfg, image, boxes)
+        datasets.append(dataset)
+        owners.extend([image_idx] * len(dataset))
+
+    persons_per_image = [[] for _ in images]
+    if not owners:
+        return persons_per_image, 0
+
+    dataloader = torch.utils.data.DataLoader(
+        torch.utils.data.ConcatDataset(datasets),
+        batch_size=max(1, batch_size),
+        shuffle=False,
+        num_workers=0,
+    )
+
+    smpl_faces = None
+    if hasattr(hmr2_model, 'smpl'):
+        smpl_faces = hmr2_model.smpl.faces.astype(np.int32)
+
+    focal_length = float(hmr2_cfg.EXTRA.FOCAL_LENGTH)
+    model_image_size = int(hmr2_cfg.MODEL.IMAGE_SIZE)
+
+    cursor = 0
+    forward_passes = 0
+    with torch.no_grad():
+        for batch in dataloader:
+            batch = recursive_to(batch, device)
+            output = hmr2_model(batch)
+            forward_passes += 1
+
+            pred_cam = output['pred_cam']  # (B, 3) - [s, tx, ty] in crop space
+            box_center = batch['box_center'].float()  # (B, 2)
+            box_size = batch['box_size'].float()  # (B,)
+            img_size = batch['img_size'].float()  # (B, 2)
+
+            # demo.py: FOCAL_LENGTH / IMAGE_SIZE * img_size.max(), taken per crop so
+            # frames of different sizes can share a batch
+            scaled_focal_length = focal_length / model_image_size * img_size.max(dim=-1).values
+
+            pred_cam_t_full = cam_crop_to_full(
+                pred_cam, box_center, box_size, img_size, scaled_focal_length
+            ).detach().cpu().numpy()
+
+            vertices = output['pred_vertices'].cpu().numpy()
+            cam_t_crop = output['pred_cam_t'].cpu().numpy()
+            joints_3d = output['pred_keypoints_3d'].cpu().numpy() if 'pred_keypoints_3d' in output else None
+            pred_cam_np = pred_cam.cpu().numpy()
+            box_center_np = box_center.cpu().numpy()
+            box_size_np = box_size.cpu().numpy()
+            img_size_np = img_size.cpu().numpy()
+            scaled_focal_np = scaled_focal_length.cpu().numpy()
+            person_ids = batch['personid'].cpu().numpy() if 'personid' in batch else None
+            # Rotation-matrix SMPL params: global_orient (B, 1, 3, 3), body_pose (B, 23, 3, 3), betas (B, 10)
+            smpl_params = {
+                k: v.detach().cpu().numpy() for k, v in output.get('pred_smpl_params', {}).items()
+            }
+
+            for i in range(len(pred_cam_np)):
+                image_idx = owners[cursor]
+                person_idx = int(person_ids[i]) if person_ids is not None else len(persons_per_image[image_idx])
+                cursor += 1
+
+                persons_per_image[image_idx].append({
+                    'vertices': vertices[i],
+                    'cam_t_full': pred_cam_t_full[i],  # Full image camera translation
+                    'cam_t_crop': cam_t_crop[i],  # Crop space camera translation
+                    'pred_cam': pred_cam_np[i],  # Raw [s, tx, ty]
+                    'joints_3d': joints_3d[i] if joints_3d is not None else None,
+                    'faces': smpl_faces,
+                    'box': np.asarray(boxes_per_image[image_idx][person_idx], dtype=np.float32),
+                    'box_center': box_center_np[i],
+                    'box_size': float(box_size_np[i]),
+                    'img_size': img_size_np[i],
+                    'scaled_focal_length': float(scaled_focal_np[i]),
+                    'focal_length': focal_length,
+                    'model_image_size': model_image_size,
+                    'smpl_params': {k: v[i] for k, v in smpl_params.items()} or None,
+                })
+
+    logger.info("[BATCH] HMR2: %d crops from %d images in %d forward passes",
+                len(owners), len(images), forward_passes)
+    return persons_per_image, forward_passes
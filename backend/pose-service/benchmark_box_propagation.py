@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark detect-every-N box propagation against running ViTDet on every frame.
+
+Runs the HybridPoseDetector over the same frames twice:
+1. Baseline - ViTDet + HMR2 on every frame (reference boxes and keypoints)
+2. Propagation - ViTDet every N frames, HMR2 boxes carried forward in between
+
+and reports speed against box drift:
+- ViTDet runs and wall time per mode
+- IoU of each propagated box against the baseline ViTDet box on the same frame
+- Mean 2D keypoint difference (pixels) between the two runs
+
+Usage:
+    python benchmark_box_propagation.py video.mp4 --detect-every 3 5 10 --max-frames 120
+"""
+
+import argparse
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from box_propagation import BoxPropagator, box_iou
+
+
+def read_frames(video_path, max_frames):
+    """Decode up to max_frames RGB frames"""
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise ValueError(f"Cannot open video: {video_path}")
+
+    frames = []
+    while len(frames) < max_frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    cap.release()
+    return frames
+
+
+def keypoints_2d(result):
+    if not result.get('keypoints'):
+        return None
+    return np.array([[kp['x'], kp['y']] for kp in result['keypoints']], dtype=np.float32)
+
+
+def run_mode(detector, frames, detect_every):
+    """Process frames in order; detect_every=1 is the every-frame baseline"""
+    propagator = BoxPropagator(detect_every=detect_every) if detect_every > 1 else None
+    records = []
+
+    start = time.time()
+    for i, frame in enumerate(frames):
+        boxes = propagator.boxes_for_frame(i) if propagator else None
+        t0 = time.time()
+        result, persons, detections = detector.detect_pose_people(frame, frame_number=i, person_boxes=boxes)
+        frame_ms = (time.time() - t0) * 1000
+
+        detection = detections[0] if boxes is None and detections else None
+        if propagator:
+            propagator.update(i, persons, detection=detection)
+
+        records.append({
+            'box': persons[0]['box'] if persons else None,
+            'propagated': boxes is not None,
+            'keypoints': keypoints_2d(result),
+            'frame_ms': frame_ms,
+        })
+
+    return {
+        'detect_every': detect_every,
+        'wall_seconds': time.time() - start,
+        'detector_runs': propagator.detector_runs if propagator else len(frames),
+        'stats': propagator.get_stats() if propagator else None,
+        'records': records,
+    }
+
+
+def compare(baseline, run):
+    """Box IoU on propagated frames and keypoint drift on all frames vs the baseline"""
+    ious = []
+    kp_errors = []
+    for ref, rec in zip(baseline['records'], run['records']):
+        if rec['propagated'] and ref['box'] is not None and rec['box'] is not None:
+            ious.append(box_iou(ref['box'], rec['box']))
+        if ref['keypoints'] is not None and rec['keypoints'] is not None:
+            kp_errors.append(float(np.linalg.norm(ref['keypoints'] - rec['keypoints'], axis=1).mean()))
+
+    return {
+        'mean_iou': float(np.mean(ious)) if ious else None,
+        'min_iou': float(np.min(ious)) if ious else None,
+        'mean_keypoint_px': float(np.mean(kp_errors)) if kp_errors else None,
+        'p95_keypoint_px': float(np.percentile(kp_errors, 95)) if kp_errors else None,
+    }
+
+
+def fmt(value, spec='.3f'):
+    return format(value, spec) if value is not None else '-'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ViTDet detect-every-N box propagation')
+    parser.add_argument('video', help='Path to video file')
+    parser.add_argument('--detect-every', type=int, nargs='+', default=[3, 5, 10],
+                        help='Detection intervals to compare against every-frame detection')
+    parser.add_argument('--max-frames', type=int, default=120, help='Frames to process')
+    parser.add_argument('--cpu', action='store_true', help='Run on CPU')
+    args = parser.parse_args()
+
+    from hybrid_pose_detector import HybridPoseDetector
+
+    frames = read_frames(args.video, args.max_frames)
+    if not frames:
+        print(f"Error: no frames read from {args.video}")
+        return 1
+    print(f"Loaded {len(frames)} frames from {args.video}")
+
+    detector = HybridPoseDetector(use_gpu=not args.cpu)
+    detector._load_hmr2()
+    detector._load_vitdet()
+
+    # Warm-up so model initialisation is not billed to the baseline
+    detector.detect_pose_image(frames[0], frame_number=0)
+
+    baseline = run_mode(detector, frames, 1)
+    print(f"\nBaseline (ViTDet every frame): {baseline['wall_seconds']:.1f}s, "
+          f"{len(frames) / baseline['wall_seconds']:.2f} fps")
+
+    print(f"\n{'N':>4} {'ViTDet runs':>12} {'time (s)':>9} {'speedup':>8} "
+          f"{'mean IoU':>9} {'min IoU':>8} {'kp px':>7} {'kp p95':>7}  redetect reasons")
+    for n in args.detect_every:
+        run = run_mode(detector, frames, n)
+        drift = compare(baseline, run)
+        print(f"{n:>4} {run['detector_runs']:>12} {run['wall_seconds']:>9.1f} "
+              f"{baseline['wall_seconds'] / run['wall_seconds']:>7.2f}x "
+              f"{fmt(drift['mean_iou']):>9} {fmt(drift['min_iou']):>8} "
+              f"{fmt(drift['mean_keypoint_px'], '.1f'):>7} {fmt(drift['p95_keypoint_px'], '.1f'):>7}  "
+              f"{run['stats']['redetect_reasons']}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
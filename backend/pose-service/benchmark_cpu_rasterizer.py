@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark the NumPy CPU rasterizer against the pooled pyrender renderer.
+
+Renders the same mesh at several output sizes and reports:
+- ms per frame for the CPU rasterizer (smooth and flat shading)
+- ms per frame for pyrender, when it is installed and can create a context
+- mask IoU and mean colour difference of the CPU output against pyrender
+
+By default the mesh is a synthetic SMPL-sized body (ellipsoid with ~6.9k
+vertices / ~13.8k faces) placed like a typical HMR2 result. Pass --mesh with
+an .npz holding 'vertices', 'faces', 'cam_t' and 'focal_length' (e.g. saved
+from a run_hmr2_batch() person) to benchmark a real frame.
+
+Usage:
+    python benchmark_cpu_rasterizer.py --sizes 256x256 1280x720 1920x1080 --iterations 10
+    python benchmark_cpu_rasterizer.py --mesh person.npz --sizes 1920x1080
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from cpu_rasterizer import rasterize_rgba
+from test_cpu_rasterizer import make_sphere
+
+
+def synthetic_body():
+    """Ellipsoid roughly the size of a standing SMPL body, ~1.7m tall"""
+    vertices, faces = make_sphere(radius=1.0, rings=84, segments=82)
+    vertices = vertices * np.array([0.25, 0.85, 0.15]) + np.array([0.0, 0.2, 0.0])
+    return vertices, faces
+
+
+def load_mesh(path):
+    data = np.load(path)
+    return data['vertices'], data['faces'], np.asarray(data['cam_t'], dtype=np.float64), float(data['focal_length'])
+
+
+def time_render(render, iterations):
+    render()  # Warm-up (context creation, allocation)
+    start = time.time()
+    for _ in range(iterations):
+        image = render()
+    return (time.time() - start) / iterations * 1000, image
+
+
+def pixel_diff(reference, image):
+    ref_mask = reference[:, :, 3] > 0
+    mask = image[:, :, 3] > 0
+    union = (ref_mask | mask).sum()
+    both = ref_mask & mask
+    iou = both.sum() / union if union else 1.0
+    mean_diff = np.abs(reference[both][:, :3].astype(np.int16) - image[both][:, :3]).mean() if both.any() else 0.0
+    return float(iou), float(mean_diff)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the CPU rasterizer against pyrender')
+    parser.add_argument('--sizes', nargs='+', default=['256x256', '1280x720', '1920x1080'],
+                        help='Output sizes as WxH')
+    parser.add_argument('--iterations', type=int, default=10, help='Timed renders per configuration')
+    parser.add_argument('--mesh', help='.npz with vertices, faces, cam_t, focal_length')
+    args = parser.parse_args()
+
+    if args.mesh:
+        vertices, faces, cam_t, focal = load_mesh(args.mesh)
+    else:
+        vertices, faces = synthetic_body()
+        cam_t, focal = None, None
+    print(f"Mesh: {len(vertices)} vertices, {len(faces)} faces")
+
+    try:
+        from mesh_renderer import HAS_PYRENDER, render_rgba
+    except ImportError:
+        HAS_PYRENDER = False
+    if not HAS_PYRENDER:
+        print("pyrender not installed - timing the CPU rasterizer only")
+
+    print(f"\n{'size':>10} {'cpu smooth':>11} {'cpu flat':>9} {'pyrender':>9} {'mask IoU':>9} {'colour diff':>12}")
+    for size in args.sizes:
+        w, h = (int(v) for v in size.lower().split('x'))
+        # The synthetic body fills ~60% of the frame height, as a rider usually does
+        frame_focal = focal if focal is not None else 5000.0 * h / 1080
+        frame_cam = cam_t if cam_t is not None else np.array([0.0, 0.0, frame_focal * 1.7 / (0.6 * h)])
+
+        smooth_ms, smooth = time_render(
+            lambda: rasterize_rgba(vertices, faces, frame_cam, w, h, frame_focal), args.iterations)
+        flat_ms, _ = time_render(
+            lambda: rasterize_rgba(vertices, faces, frame_cam, w, h, frame_focal, shading='flat'), args.iterations)
+
+        pyrender_ms, iou, diff = None, None, None
+        if HAS_PYRENDER:
+            try:
+                pyrender_ms, reference = time_render(
+                    lambda: render_rgba(vertices, faces, frame_cam, w, h, frame_focal, backend='pyrender'),
+                    args.iterations)
+                iou, diff = pixel_diff(reference, smooth)
+            except Exception as e:
+                print(f"pyrender failed at {size}: {e}")
+
+        print(f"{size:>10} {smooth_ms:>9.1f}ms {flat_ms:>7.1f}ms "
+              f"{(f'{pyrender_ms:.1f}ms' if pyrender_ms is not None else '-'):>9} "
+              f"{(f'{iou:.4f}' if iou is not None else '-'):>9} "
+              f"{(f'{diff:.1f}/255' if diff is not None else '-'):>12}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
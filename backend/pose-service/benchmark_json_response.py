@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark the NumPy-aware JSON provider against Flask's default jsonify.
+
+Payloads (float32 SMPL meshes, as the detectors return them):
+- hybrid: one /pose/hybrid result (6890 vertices, 45 joints, embedded faces)
+- batch:  /pose/hybrid/batch with --batch results, faces by reference
+- video:  /pose/video with --frames frames of --persons tracked people
+
+Compared per payload:
+- before: .tolist() on every array + Flask's DefaultJSONProvider (stdlib json, sorted keys)
+- stdlib: json_response.dumps with POSE_JSON_BACKEND=stdlib
+- orjson: json_response.dumps writing the arrays directly (if orjson is installed)
+
+Usage:
+    python benchmark_json_response.py --iterations 20 --frames 120
+"""
+
+import argparse
+import sys
+
+import numpy as np
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+import json_response
+from benchmark_mesh_wire import time_it
+from test_mesh_wire import make_result
+
+
+def make_payloads(batch, frames, persons):
+    rng = np.random.default_rng(0)
+    hybrid = make_result()
+    results = []
+    for i in range(batch):
+        result = make_result(seed=i, frame_number=i)
+        result.pop('mesh_faces_data')
+        results.append(result)
+    video = {
+        'status': 'success',
+        'total_frames': frames,
+        'frames': [{
+            'frame_number': f,
+            'persons': [{
+                'person_id': p,
+                'confidence': 0.9,
+                'keypoints_3d': rng.normal(0, 0.5, (45, 3)).astype(np.float32).tolist(),
+                'camera': {'tx': 0.1, 'ty': 0.2, 'tz': 25.0},
+                'mesh_vertices': rng.normal(0, 0.5, (6890, 3)).astype(np.float32),
+            } for p in range(persons)],
+        } for f in range(frames)],
+    }
+    return {'hybrid': hybrid, 'batch': {'results': results, 'count': batch}, 'video': video}
+
+
+def to_lists(value):
+    """What the handlers did before: every array converted with tolist()"""
+    if isinstance(value, dict):
+        return {key: to_lists(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [to_lists(item) for item in value]
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark NumPy-aware JSON responses against default jsonify')
+    parser.add_argument('--iterations', type=int, default=20, help='Timed encodes per payload and backend')
+    parser.add_argument('--batch', type=int, default=8, help='Results in the batch payload')
+    parser.add_argument('--frames', type=int, default=60, help='Frames in the video payload')
+    parser.add_argument('--persons', type=int, default=1, help='People per video frame')
+    args = parser.parse_args()
+
+    default_provider = DefaultJSONProvider(Flask(__name__))
+    backends = ['stdlib'] + (['orjson'] if json_response.HAS_ORJSON else [])
+    if not json_response.HAS_ORJSON:
+        print("orjson not installed - only the stdlib fallback is measured")
+
+    print(f"{'payload':>8} {'backend':>8} {'bytes':>11} {'encode':>11} {'speed':>7}")
+    for name, payload in make_payloads(args.batch, args.frames, args.persons).items():
+        before_ms, before_body = time_it(lambda: default_provider.dumps(to_lists(payload)).encode('utf-8'),
+                                         args.iterations)
+        print(f"{name:>8} {'before':>8} {len(before_body):>11} {before_ms:>9.1f}ms {'1.0x':>7}")
+        for backend in backends:
+            json_response.JSON_BACKEND = backend
+            encode_ms, body = time_it(lambda: json_response.dumps(payload), args.iterations)
+            print(f"{name:>8} {backend:>8} {len(body):>11} {encode_ms:>9.1f}ms {before_ms / encode_ms:>6.1f}x")
+    json_response.JSON_BACKEND = 'auto'
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
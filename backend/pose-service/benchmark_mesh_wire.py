@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark the binary mesh wire format against the JSON /pose/hybrid response.
+
+Builds an SMPL-sized pose result (6890 vertices, 45 joints, 13776 faces) and
+compares, per frame:
+- JSON: vertices.tolist() + json.dumps (what jsonify does)
+- binary float32 and float16: mesh_wire.encode_result
+- decode time for each (json.loads vs mesh_wire.decode_result)
+
+Usage:
+    python benchmark_mesh_wire.py --iterations 50
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from mesh_wire import decode_result, encode_result, mesh_arrays_to_lists
+from test_mesh_wire import make_result
+
+
+def time_it(fn, iterations):
+    fn()
+    start = time.time()
+    for _ in range(iterations):
+        value = fn()
+    return (time.time() - start) / iterations * 1000, value
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark binary mesh responses against JSON')
+    parser.add_argument('--iterations', type=int, default=50, help='Timed encodes per format')
+    parser.add_argument('--no-faces', action='store_true', help='Leave faces out of the payload')
+    args = parser.parse_args()
+
+    result = make_result()
+    if args.no_faces:
+        result.pop('mesh_faces_data')
+
+    json_ms, json_body = time_it(lambda: json.dumps(mesh_arrays_to_lists(dict(result))).encode('utf-8'),
+                                 args.iterations)
+    json_decode_ms, _ = time_it(lambda: json.loads(json_body), args.iterations)
+
+    print(f"{'format':>10} {'bytes':>10} {'encode':>10} {'decode':>10} {'size':>7} {'speed':>7}")
+    print(f"{'json':>10} {len(json_body):>10} {json_ms:>8.2f}ms {json_decode_ms:>8.2f}ms {'1.0x':>7} {'1.0x':>7}")
+    for dtype in ('float32', 'float16'):
+        encode_ms, body = time_it(lambda: encode_result(result, dtype), args.iterations)
+        decode_ms, _ = time_it(lambda: decode_result(body), args.iterations)
+        print(f"{dtype:>10} {len(body):>10} {encode_ms:>8.2f}ms {decode_ms:>8.2f}ms "
+              f"{len(json_body) / len(body):>6.1f}x {json_ms / encode_ms:>6.1f}x")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+Detect-every-N person boxes for video runs
+
+ViTDet-H is the most expensive step of the pipeline. Snowboard clips are
+continuous single-rider footage, so for most frames the rider's box can be
+carried forward from the previous frame's HMR2 result instead: the predicted
+mesh is projected into the image with the full-image camera (exactly as the
+4D-Humans renderer does) and its 2D bounds, padded for motion, become the
+next frame's box.
+
+The detector still runs
+- every `detect_every` frames
+- whenever ViTDet's own confidence was low or it fell back to the full image
+- when the propagated box drifts (low IoU between the box HMR2 was given
+  and the box its mesh projects to) or the mesh leaves the frame
+"""
+
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def project_points(points_3d, cam_t_full, focal_length, img_size):
+    """
+    Perspective-project HMR2 points with the full-image camera.
+
+    Same camera as 4D-Humans demo.py: points are translated by cam_t_full and
+    projected with the scaled focal length around the image centre.
+
+    Args:
+        points_3d: (N, 3) vertices or joints
+        cam_t_full: (3,) camera translation from cam_crop_to_full()
+        focal_length: Scaled focal length in pixels
+        img_size: (width, height)
+
+    Returns:
+        (N, 2) pixel coordinates
+    """
+    points = np.asarray(points_3d, dtype=np.float32) + np.asarray(cam_t_full, dtype=np.float32)
+    z = np.maximum(points[:, 2:3], 1e-3)
+    center = np.array([img_size[0] / 2.0, img_size[1] / 2.0], dtype=np.float32)
+    return points[:, :2] / z * focal_length + center
+
+
+def box_from_points(points_2d, img_w, img_h, padding=1.1, min_size=16):
+    """
+    Padded xyxy box around 2D points, clipped to the image.
+
+    Returns None when the clipped box is smaller than min_size pixels (the
+    person has left the frame), so the caller falls back to the detector.
+    """
+    if points_2d is None or len(points_2d) == 0:
+        return None
+
+    x0, y0 = points_2d.min(axis=0)
+    x1, y1 = points_2d.max(axis=0)
+    cx, cy = (x0 + x1) / 2.0, (y0 + y1) / 2.0
+    half_w, half_h = (x1 - x0) * padding / 2.0, (y1 - y0) * padding / 2.0
+
+    box = np.array([
+        max(0.0, cx - half_w),
+        max(0.0, cy - half_h),
+        min(float(img_w), cx + half_w),
+        min(float(img_h), cy + half_h),
+    ], dtype=np.float32)
+
+    if box[2] - box[0] < min_size or box[3] - box[1] < min_size:
+        return None
+    return box
+
+
+def box_iou(box_a, box_b):
+    """IoU of two xyxy boxes"""
+    ix0, iy0 = max(box_a[0], box_b[0]), max(box_a[1], box_b[1])
+    ix1, iy1 = min(box_a[2], box_b[2]), min(box_a[3], box_b[3])
+    inter = max(0.0, ix1 - ix0) * max(0.0, iy1 - iy0)
+    area_a = max(0.0, box_a[2] - box_a[0]) * max(0.0, box_a[3] - box_a[1])
+    area_b = max(0.0, box_b[2] - box_b[0]) * max(0.0, box_b[3] - box_b[1])
+    union = area_a + area_b - inter
+    return float(inter / union) if union > 0 else 0.0
+
+
+class BoxPropagator:
+    """
+    Decides per frame whether to run ViTDet or reuse boxes propagated from
+    the previous frame's HMR2 meshes.
+
+    Usage (frames must be fed in order):
+        boxes = propagator.boxes_for_frame(frame_idx)   # None -> run the detector
+        ... run HMR2 with `boxes` (or detector boxes) ...
+        propagator.update(frame_idx, persons, detection=detection_or_None)
+
+    Args:
+        detect_every: Run the detector at least every N processed frames (1 = every frame)
+        min_score: Re-detect on the next frame when the weakest ViTDet score is below this
+        min_iou: Re-detect when the box given to HMR2 and its projected mesh box overlap less than this
+        padding: Scale applied to the projected mesh bounds to absorb motion between frames
+    """
+
+    def __init__(self, detect_every=5, min_score=0.8, min_iou=0.5, padding=1.1):
+        self.detect_every = max(1, int(detect_every))
+        self.min_score = min_score
+        self.min_iou = min_iou
+        self.padding = padding
+
+        self._boxes = None  # Propagated boxes for the next frame
+        self._frames_since_detection = 0
+        self._force_reason = 'first_frame'
+
+        self.detector_runs = 0
+        self.propagated_frames = 0
+        self.redetect_reasons = {}
+
+    def boxes_for_frame(self, frame_index):
+        """Propagated (N, 4) boxes for this frame, or None when the detector should run"""
+        reason = self._force_reason
+        if reason is None and self._frames_since_detection >= self.detect_every:
+            reason = 'interval'
+
+        if reason is not None or self._boxes is None:
+            reason = reason or 'no_boxes'
+            self.redetect_reasons[reason] = self.redetect_reasons.get(reason, 0) + 1
+            logger.debug("[BOXPROP] Frame %d: running detector (%s)", frame_index, reason)
+            return None
+
+        self.propagated_frames += 1
+        return self._boxes
+
+    def update(self, frame_index, persons, detection=None):
+        """
+        Record this frame's HMR2 results and prepare boxes for the next frame.
+
+        Args:
+            frame_index: Frame that was just processed
+            persons: HMR2 person dicts from run_hmr2_batch() (vertices, cam_t_full,
+                     scaled_focal_length, img_size, box)
+            detection: The detect_people_batch() entry when ViTDet ran on this frame
+                       ({'boxes', 'scores', 'fallback'}), None when boxes were propagated
+        """
+        self._force_reason = None
+
+        if detection is not None:
+            self.detector_runs += 1
+            self._frames_since_detection = 1
+            if detection.get('fallback'):
+                self._force_reason = 'no_detection'
+            elif len(detection['scores']) and float(np.min(detection['scores'])) < self.min_score:
+                self._force_reason = 'low_score'
+        else:
+            self._frames_since_detection += 1
+
+        if not persons:
+            self._boxes = None
+            self._force_reason = self._force_reason or 'lost'
+            return
+
+        boxes = []
+        for person in persons:
+            img_w, img_h = float(person['img_size'][0]), float(person['img_size'][1])
+            points_2d = project_points(person['vertices'], person['cam_t_full'],
+                                       person['scaled_focal_length'], (img_w, img_h))
+            box = box_from_points(points_2d, img_w, img_h, padding=self.padding)
+            if box is None:
+                self._force_reason = self._force_reason or 'left_frame'
+                break
+
+            # Drift check: the mesh HMR2 fitted should sit in the box it was given
+            if detection is None and person.get('box') is not None:
+                iou = box_iou(person['box'], box)
+                if iou < self.min_iou:
+                    logger.debug("[BOXPROP] Frame %d: drift, IoU %.2f < %.2f", frame_index, iou, self.min_iou)
+                    self._force_reason = self._force_reason or 'drift'
+
+            boxes.append(box)
+
+        self._boxes = np.stack(boxes).astype(np.float32) if len(boxes) == len(persons) else None
+
+    def get_stats(self):
+        """Detector usage summary for logs and results"""
+        total = self.detector_runs + self.propagated_frames
+        return {
+            'detect_every': self.detect_every,
+            'frames': total,
+            'detector_runs': self.detector_runs,
+            'propagated_frames': self.propagated_frames,
+            'detector_fraction': round(self.detector_runs / total, 3) if total else 0.0,
+            'redetect_reasons': dict(self.redetect_reasons),
+        }
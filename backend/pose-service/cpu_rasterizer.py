@@ -0,0 +1,215 @@
+"""
+Pure NumPy mesh rasterizer - CPU fallback for the pyrender overlay
+
+Renders SMPL meshes with no OpenGL context (no EGL / OSMesa), for headless
+CPU nodes and WSL setups where pyrender is unavailable. Output matches the
+pyrender path in mesh_renderer.py:
+- same camera: mesh rotated 180 degrees about X, camera X translation flipped,
+  intrinsics camera with the principal point at the image centre
+  (equivalent to u = f * (x + tx) / (z + tz) + cx, v = f * (y + ty) / (z + tz) + cy)
+- same Raymond lights and ambient term, Lambert-shaded base colour, gamma 2.2
+- RGBA uint8 output with a binary alpha mask
+
+Rasterization is vectorised over triangles: every (triangle, pixel) pair in
+each front-facing triangle's bounding box is tested with barycentric
+coordinates at pixel centres, and a z-buffer pass keeps the nearest
+fragment per pixel (one sort over packed pixel/depth keys).
+"""
+
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+LIGHT_BLUE = (0.65098039, 0.74117647, 0.85882353)
+
+# Matches the pyrender scene in mesh_renderer.py
+AMBIENT_LIGHT = 0.3
+LIGHT_INTENSITY = 1.0
+# Lambert diffuse for a dielectric PBR material (F0 = 0.04): (1 - 0.04) / pi
+DIFFUSE_SCALE = 0.96 / np.pi
+# pyrender's fragment shader writes pow(color, 1 / 2.2)
+GAMMA = 2.2
+
+# Candidate (triangle, pixel) pairs processed per chunk - bounds peak memory
+CHUNK_FRAGMENTS = 2_000_000
+
+
+def raymond_light_directions():
+    """Unit vectors towards the three Raymond lights (world frame, as create_raymond_lights)"""
+    thetas = np.pi * np.array([1.0 / 6.0, 1.0 / 6.0, 1.0 / 6.0])
+    phis = np.pi * np.array([0.0, 2.0 / 3.0, 4.0 / 3.0])
+    dirs = np.stack([np.sin(thetas) * np.cos(phis), np.sin(thetas) * np.sin(phis), np.cos(thetas)], axis=1)
+    return dirs / np.linalg.norm(dirs, axis=1, keepdims=True)
+
+
+def vertex_normals(vertices, faces):
+    """Area-weighted vertex normals (float64, unit length)"""
+    tris = vertices[faces]
+    face_normals = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    normals = np.zeros_like(vertices)
+    for corner in range(3):
+        np.add.at(normals, faces[:, corner], face_normals)
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    return normals / np.maximum(lengths, 1e-12)
+
+
+def rasterize_rgba(vertices, faces, camera_translation, width, height, focal_length,
+                   mesh_color=LIGHT_BLUE, shading='smooth', cull_backfaces=True, roi=None):
+    """
+    Render one mesh to an RGBA uint8 image.
+
+    Args:
+        vertices: (V, 3) SMPL vertices (HMR2 convention, before the 180 degree X rotation)
+        faces: (F, 3) triangle indices
+        camera_translation: (3,) cam_t_full [tx, ty, tz]
+        width, height: Image size in pixels (sets the principal point)
+        focal_length: Focal length in pixels
+        mesh_color: RGB base colour in [0, 1], or (F, 3) per-face colours (e.g. one per person
+                    when several meshes are concatenated into one raster pass)
+        shading: 'smooth' (per-vertex Lambert, interpolated) or 'flat' (per-face)
+        cull_backfaces: Skip triangles facing away from the camera (pyrender's single-sided default)
+        roi: Optional (x0, y0, x1, y1) window of the image to rasterize; the
+             returned image is the window's size
+
+    Returns:
+        (H, W, 4) uint8 RGBA image (or the ROI's size), alpha 255 where the mesh covers the pixel
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    faces = np.asarray(faces, dtype=np.int64)
+    tx, ty, tz = [float(c) for c in camera_translation]
+
+    x0, y0, x1, y1 = (0, 0, int(width), int(height)) if roi is None else [int(c) for c in roi]
+    out_w, out_h = x1 - x0, y1 - y0
+    output = np.zeros((out_h, out_w, 4), dtype=np.uint8)
+    if out_w <= 0 or out_h <= 0 or len(faces) == 0:
+        return output
+
+    # Camera space (OpenCV axes: x right, y down, z forward) - identical to the
+    # pyrender setup after its X rotation and camera X flip
+    cam_points = vertices + np.array([tx, ty, tz])
+    depth = cam_points[:, 2]
+    safe_depth = np.maximum(depth, 1e-6)
+    u = focal_length * cam_points[:, 0] / safe_depth + width / 2.0 - x0
+    v = focal_length * cam_points[:, 1] / safe_depth + height / 2.0 - y0
+
+    # Shading in pyrender's world frame (mesh rotated 180 degrees about X)
+    world = vertices * np.array([1.0, -1.0, -1.0])
+    light_dirs = raymond_light_directions()
+    base = np.asarray(mesh_color, dtype=np.float64)
+    face_colors = base.reshape(-1, 3) if base.ndim == 2 else np.broadcast_to(base, (len(faces), 3))
+
+    tris_world = world[faces]
+    face_normals = np.cross(tris_world[:, 1] - tris_world[:, 0], tris_world[:, 2] - tris_world[:, 0])
+
+    if shading != 'flat':
+        # Normals over the whole mesh so silhouette vertices match pyrender's smooth normals
+        vertex_light = np.clip(vertex_normals(world, faces) @ light_dirs.T, 0.0, None).sum(axis=1)
+
+    keep = np.all(depth[faces] > 1e-3, axis=1)
+    if cull_backfaces:
+        camera_position = np.array([-tx, ty, tz])  # Flipped X, as in the pyrender camera pose
+        keep &= np.einsum('ij,ij->i', face_normals, tris_world[:, 0] - camera_position) < 0
+    faces = faces[keep]
+    face_normals = face_normals[keep]
+    face_colors = face_colors[keep]
+    if len(faces) == 0:
+        return output
+
+    if shading == 'flat':
+        normals = face_normals / np.maximum(np.linalg.norm(face_normals, axis=1, keepdims=True), 1e-12)
+        face_light = np.clip(normals @ light_dirs.T, 0.0, None).sum(axis=1)
+
+    # Triangle bounding boxes in pixel-centre space, clipped to the output
+    tri_u, tri_v, tri_z = u[faces], v[faces], depth[faces]
+    bx0 = np.clip(np.ceil(tri_u.min(axis=1) - 0.5), 0, out_w).astype(np.int64)
+    bx1 = np.clip(np.floor(tri_u.max(axis=1) - 0.5) + 1, 0, out_w).astype(np.int64)
+    by0 = np.clip(np.ceil(tri_v.min(axis=1) - 0.5), 0, out_h).astype(np.int64)
+    by1 = np.clip(np.floor(tri_v.max(axis=1) - 0.5) + 1, 0, out_h).astype(np.int64)
+    box_w = np.maximum(bx1 - bx0, 0)
+    box_h = np.maximum(by1 - by0, 0)
+    counts = box_w * box_h
+
+    nonempty = np.nonzero(counts)[0]
+    if len(nonempty) == 0:
+        return output
+
+    z_near = float(tri_z.min())
+    z_range = max(float(tri_z.max()) - z_near, 1e-9)
+
+    best_key = None  # Packed (pixel << 32 | depth) of the nearest fragment so far
+    best_fragments = None
+    best_faces = None
+
+    # Chunk triangles so the candidate arrays stay bounded
+    cumulative = np.cumsum(counts[nonempty])
+    start = 0
+    while start < len(nonempty):
+        end = int(np.searchsorted(cumulative, (cumulative[start - 1] if start else 0) + CHUNK_FRAGMENTS, side='right'))
+        end = max(end, start + 1)
+        chunk = nonempty[start:end]
+        start = end
+
+        n = counts[chunk]
+        tri_index = np.repeat(chunk, n)
+        offsets = np.arange(int(n.sum())) - np.repeat(np.cumsum(n) - n, n)
+        px = bx0[tri_index] + offsets % box_w[tri_index]
+        py = by0[tri_index] + offsets // box_w[tri_index]
+
+        # Barycentric coordinates at pixel centres
+        cx = px + 0.5
+        cy = py + 0.5
+        ax, ay = tri_u[tri_index, 0], tri_v[tri_index, 0]
+        bx, by = tri_u[tri_index, 1], tri_v[tri_index, 1]
+        qx, qy = tri_u[tri_index, 2], tri_v[tri_index, 2]
+        area = (bx - ax) * (qy - ay) - (qx - ax) * (by - ay)
+        safe_area = np.where(np.abs(area) < 1e-12, 1.0, area)
+        w1 = ((cx - ax) * (qy - ay) - (qx - ax) * (cy - ay)) / safe_area
+        w2 = ((bx - ax) * (cy - ay) - (cx - ax) * (by - ay)) / safe_area
+        w0 = 1.0 - w1 - w2
+
+        inside = (w0 >= 0) & (w1 >= 0) & (w2 >= 0) & (np.abs(area) >= 1e-12)
+        if not inside.any():
+            continue
+        tri_index, px, py = tri_index[inside], px[inside], py[inside]
+        w0, w1, w2 = w0[inside], w1[inside], w2[inside]
+
+        # Perspective-correct depth: interpolate 1/z in screen space
+        inv_z = (w0 / tri_z[tri_index, 0] + w1 / tri_z[tri_index, 1] + w2 / tri_z[tri_index, 2])
+        frag_z = 1.0 / inv_z
+
+        pixel = py * out_w + px
+        depth_q = np.clip((frag_z - z_near) / z_range * (2 ** 31 - 1), 0, 2 ** 31 - 1).astype(np.int64)
+        keys = (pixel << 32) | depth_q
+
+        if shading == 'flat':
+            light = face_light[tri_index]
+        else:
+            tri_faces = faces[tri_index]
+            light = (w0 * vertex_light[tri_faces[:, 0]] + w1 * vertex_light[tri_faces[:, 1]]
+                     + w2 * vertex_light[tri_faces[:, 2]])
+
+        if best_key is not None:
+            keys = np.concatenate([best_key, keys])
+            light = np.concatenate([best_fragments, light])
+            tri_index = np.concatenate([best_faces, tri_index])
+
+        # Z-buffer: after sorting, the first key of each pixel run is the nearest
+        order = np.argsort(keys, kind='stable')
+        keys, light, tri_index = keys[order], light[order], tri_index[order]
+        first = np.ones(len(keys), dtype=bool)
+        first[1:] = (keys[1:] >> 32) != (keys[:-1] >> 32)
+        best_key, best_fragments, best_faces = keys[first], light[first], tri_index[first]
+
+    if best_key is None:
+        return output
+
+    pixel = best_key >> 32
+    shade = AMBIENT_LIGHT + DIFFUSE_SCALE * LIGHT_INTENSITY * best_fragments
+    colors = np.clip(face_colors[best_faces] * shade[:, None], 0.0, 1.0) ** (1.0 / GAMMA)
+
+    flat = output.reshape(-1, 4)
+    flat[pixel, :3] = np.round(colors * 255.0).astype(np.uint8)
+    flat[pixel, 3] = 255
+    return output
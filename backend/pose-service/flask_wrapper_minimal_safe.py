@@ -13,8 +13,6 @@ print("=" * 60)
 
 import sys
 import json
-import base64
-import io
 import time
 import traceback
 import os
@@ -76,10 +74,23 @@ phalp_path = os.path.join(current_dir, 'PHALP')
 if phalp_path not in sys.path:
     sys.path.insert(0, phalp_path)
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
+from frame_ingest import FrameDecodeError, read_frame_from_request, read_frames_from_request, get_frame_number
+from mesh_wire import MEDIA_TYPE as MESH_MEDIA_TYPE, encode_result, encode_results, negotiate_mesh_format
+from mesh_lod import apply_lod, get_lod, get_lod_level
+from ndjson_stream import ndjson_response, wants_ndjson
+from json_response import install_json_provider
+from response_compression import compression_stats, install_compression
+from mesh_topology import attach_topology, get_topology, topology_response, wants_embedded_faces
+from smpl_params import encode_smpl_params, get_mesh_mode, read_reconstruct_body, reconstruct_meshes, strip_mesh
+from batch_inference import detect_people_batch, run_hmr2_batch, full_image_box
 
 # Initialize Flask app
 app = Flask(__name__)
+# NumPy-aware jsonify for every response (see json_response.py)
+install_json_provider(app)
+# gzip/zstd per Accept-Encoding (see response_compression.py)
+install_compression(app)
 app.config['JSON_SORT_KEYS'] = False
 
 # Global state
@@ -104,6 +115,12 @@ POSE_TIMEOUT_MS = int(os.environ.get('POSE_TIMEOUT_MS', '180000'))
 # Use /app for Docker container, fall back to /home/ben/pose-service for WSL
 POSE_SERVICE_PATH = os.environ.get('POSE_SERVICE_PATH', '/app' if os.path.exists('/app') else '/home/ben/pose-service')
 DEBUG_MODE = os.environ.get('DEBUG_MODE', 'false').lower() == 'true'
+# Multi-frame /pose/hybrid/batch limits
+MAX_BATCH_FRAMES = int(os.environ.get('POSE_MAX_BATCH_FRAMES', '32'))
+# Upper bound on parameter sets per /mesh/reconstruct request
+MAX_RECONSTRUCT_BODIES = int(os.environ.get('POSE_MAX_RECONSTRUCT_BODIES', '256'))
+DETECTOR_BATCH_SIZE = int(os.environ.get('POSE_DETECTOR_BATCH_SIZE', '4'))
+HMR2_BATCH_SIZE = int(os.environ.get('POSE_HMR2_BATCH_SIZE', '16'))
 
 print(f"[CONFIG] POSE_POOL_SIZE: {POSE_POOL_SIZE}")
 print(f"[CONFIG] POSE_TIMEOUT_MS: {POSE_TIMEOUT_MS}")
@@ -385,71 +402,86 @@ def initialize_models():
         return False
 
 
-def parse_pkl_to_json(pkl_path):
+def load_phalp_frames(pkl_path):
+    """Load PHALP's .pkl output and return its per-frame entries (list)."""
+    import pickle
+    
+    print(f"[PARSER] 📂 Loading pickle file: {pkl_path}")
+    
+    with open(pkl_path, 'rb') as f:
+        phalp_output = pickle.load(f)
+    
+    print(f"[PARSER] ✅ Pickle loaded successfully")
+    print(f"[PARSER] 📊 Type: {type(phalp_output)}")
+    
+    # PHALP output structure varies, but typically contains:
+    # - 'results': list of frame results
+    # - 'frame_data': dict with frame numbers as keys
+    # - Direct list of frame data
+    
+    frames_data = []
+    
+    if isinstance(phalp_output, dict):
+        print(f"[PARSER] 📋 Dict keys: {list(phalp_output.keys())[:10]}")
+        
+        # Try common keys
+        if 'results' in phalp_output:
+            frames_data = phalp_output['results']
+            print(f"[PARSER] ✅ Found 'results' key with {len(frames_data)} frames")
+        elif 'frame_data' in phalp_output:
+            frames_data = phalp_output['frame_data']
+            print(f"[PARSER] ✅ Found 'frame_data' key")
+        else:
+            # Try to find frame data by looking for numeric keys
+            numeric_keys = [k for k in phalp_output.keys() if isinstance(k, int)]
+            if numeric_keys:
+                frames_data = [phalp_output[k] for k in sorted(numeric_keys)]
+                print(f"[PARSER] ✅ Found {len(frames_data)} frames with numeric keys")
+            else:
+                print(f"[PARSER] ⚠️  Could not find frame data in dict")
+                frames_data = []
+    
+    elif isinstance(phalp_output, list):
+        frames_data = phalp_output
+        print(f"[PARSER] ✅ Direct list with {len(frames_data)} frames")
+    
+    else:
+        print(f"[PARSER] ⚠️  Unexpected output type: {type(phalp_output)}")
+        frames_data = []
+    
+    print(f"[PARSER] 📊 Total frames: {len(frames_data)}")
+    return frames_data
+
+
+def iter_json_frames(frames_data, mesh_mode='full', lod=None):
+    """Convert PHALP frame entries to JSON-serializable frames one at a time (see convert_frame_to_json).
+    
+    Frames that fail to convert are logged and skipped.
+    """
+    for frame_idx, frame_data in enumerate(frames_data):
+        try:
+            json_frame = convert_frame_to_json(frame_idx, frame_data, mesh_mode, lod)
+        except Exception as e:
+            print(f"[PARSER] ⚠️  Error converting frame {frame_idx}: {e}")
+            # Continue with next frame
+            continue
+        yield json_frame
+
+
+def parse_pkl_to_json(pkl_path, mesh_mode='full', lod=None):
     """Parse PHALP's .pkl output to JSON format.
     
     Extracts frame-by-frame pose data from PHALP's pickle output.
     Returns a dictionary with all frames and their pose data.
+    mesh_mode 'params' leaves out per-person mesh vertices (smpl_params only);
+    a MeshLOD subsamples them to that preview level (mesh_lod.py).
+    For streaming responses use load_phalp_frames() + iter_json_frames() instead.
     """
-    import pickle
-    
-    print(f"[PARSER] 📂 Loading pickle file: {pkl_path}")
-    
     try:
-        with open(pkl_path, 'rb') as f:
-            phalp_output = pickle.load(f)
-        
-        print(f"[PARSER] ✅ Pickle loaded successfully")
-        print(f"[PARSER] 📊 Type: {type(phalp_output)}")
-        
-        # PHALP output structure varies, but typically contains:
-        # - 'results': list of frame results
-        # - 'frame_data': dict with frame numbers as keys
-        # - Direct list of frame data
-        
-        frames_data = []
-        
-        if isinstance(phalp_output, dict):
-            print(f"[PARSER] 📋 Dict keys: {list(phalp_output.keys())[:10]}")
-            
-            # Try common keys
-            if 'results' in phalp_output:
-                frames_data = phalp_output['results']
-                print(f"[PARSER] ✅ Found 'results' key with {len(frames_data)} frames")
-            elif 'frame_data' in phalp_output:
-                frames_data = phalp_output['frame_data']
-                print(f"[PARSER] ✅ Found 'frame_data' key")
-            else:
-                # Try to find frame data by looking for numeric keys
-                numeric_keys = [k for k in phalp_output.keys() if isinstance(k, int)]
-                if numeric_keys:
-                    frames_data = [phalp_output[k] for k in sorted(numeric_keys)]
-                    print(f"[PARSER] ✅ Found {len(frames_data)} frames with numeric keys")
-                else:
-                    print(f"[PARSER] ⚠️  Could not find frame data in dict")
-                    frames_data = []
-        
-        elif isinstance(phalp_output, list):
-            frames_data = phalp_output
-            print(f"[PARSER] ✅ Direct list with {len(frames_data)} frames")
-        
-        else:
-            print(f"[PARSER] ⚠️  Unexpected output type: {type(phalp_output)}")
-            frames_data = []
-        
-        print(f"[PARSER] 📊 Total frames: {len(frames_data)}")
+        frames_data = load_phalp_frames(pkl_path)
         
         # Convert frames to JSON-serializable format
-        json_frames = []
-        
-        for frame_idx, frame_data in enumerate(frames_data):
-            try:
-                json_frame = convert_frame_to_json(frame_idx, frame_data)
-                json_frames.append(json_frame)
-            except Exception as e:
-                print(f"[PARSER] ⚠️  Error converting frame {frame_idx}: {e}")
-                # Continue with next frame
-                continue
+        json_frames = list(iter_json_frames(frames_data, mesh_mode, lod))
         
         print(f"[PARSER] ✅ Converted {len(json_frames)} frames to JSON")
         
@@ -467,7 +499,7 @@ def parse_pkl_to_json(pkl_path):
         raise
 
 
-def convert_frame_to_json(frame_idx, frame_data):
+def convert_frame_to_json(frame_idx, frame_data, mesh_mode='full', lod=None):
     """Convert a single frame from PHALP output to JSON format.
     
     Handles various PHALP output formats and extracts:
@@ -510,7 +542,7 @@ def convert_frame_to_json(frame_idx, frame_data):
             if isinstance(persons_list, list):
                 for person_data in persons_list:
                     try:
-                        json_person = convert_person_to_json(person_data)
+                        json_person = convert_person_to_json(person_data, mesh_mode, lod)
                         json_frame['persons'].append(json_person)
                     except Exception as e:
                         print(f"[PARSER] ⚠️  Error converting person: {e}")
@@ -520,7 +552,7 @@ def convert_frame_to_json(frame_idx, frame_data):
         # Frame data is a list of persons
         for person_data in frame_data:
             try:
-                json_person = convert_person_to_json(person_data)
+                json_person = convert_person_to_json(person_data, mesh_mode, lod)
                 json_frame['persons'].append(json_person)
             except Exception as e:
                 print(f"[PARSER] ⚠️  Error converting person: {e}")
@@ -529,8 +561,12 @@ def convert_frame_to_json(frame_idx, frame_data):
     return json_frame
 
 
-def convert_person_to_json(person_data):
-    """Convert a single person's pose data to JSON format."""
+def convert_person_to_json(person_data, mesh_mode='full', lod=None):
+    """Convert a single person's pose data to JSON format.
+    
+    Adds compact axis-angle 'smpl_params' when PHALP gives rotation-matrix SMPL params;
+    mesh_mode 'params' skips the mesh vertices, a MeshLOD subsamples them.
+    """
     import numpy as np
     
     json_person = {
@@ -634,11 +670,31 @@ def convert_person_to_json(person_data):
                 json_person['bbox'] = to_list(person_data[key])
                 break
         
+        # Compact params (~85 floats) from the rotation-matrix SMPL dict
+        smpl_data = person_data.get('smpl')
+        if isinstance(smpl_data, dict):
+            try:
+                camera = json_person['camera']
+                json_person['smpl_params'] = encode_smpl_params(
+                    smpl_data, [camera['tx'], camera['ty'], camera['tz']]
+                )
+            except (KeyError, ValueError):
+                pass
+        
         # Extract mesh vertices
-        for key in ['mesh_vertices', 'vertices', 'verts']:
-            if key in person_data:
-                json_person['mesh_vertices'] = to_list(person_data[key])
-                break
+        if mesh_mode == 'params':
+            del json_person['mesh_vertices']
+        else:
+            for key in ['mesh_vertices', 'vertices', 'verts']:
+                if key in person_data:
+                    vertices = person_data[key]
+                    if lod is not None and len(vertices) == lod.source_vertex_count:
+                        vertices = lod.subsample(vertices)
+                    # Arrays go straight to the JSON provider (json_response.py)
+                    json_person['mesh_vertices'] = vertices if isinstance(vertices, np.ndarray) else to_list(vertices)
+                    break
+    elif mesh_mode == 'params':
+        del json_person['mesh_vertices']
     
     return json_person
 
@@ -676,6 +732,7 @@ def health():
         'device': device,
         'ready': models_loaded,
         'vitdet_available': vitdet_detector is not None,
+        'compression': compression_stats(),
         'error': model_load_error
     })
 
@@ -828,10 +885,127 @@ def debug_faces():
         }), 500
 
 
+@app.route('/mesh/topology', methods=['GET'])
+def mesh_topology():
+    """SMPL faces as a packed uint16 buffer with an ETag (see mesh_topology.py); ?format=json for lists.
+    ?lod=1 / ?lod=2 serve the decimated preview faces (plus "vertex_map" in JSON, see mesh_lod.py)."""
+    try:
+        lod_level = get_lod_level(request)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    if smpl_faces is None:
+        if not models_loaded and not initialize_models():
+            return jsonify({'error': 'Failed to initialize models', 'details': model_load_error}), 500
+        ensure_smpl_faces()
+    try:
+        lod = get_mesh_lod(lod_level)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 503
+    return topology_response(request, smpl_faces, lod)
+
+
+def get_mesh_lod(level):
+    """MeshLOD for a requested level (None for the full mesh); decimated on the SMPL template
+    the first time a topology is seen (see mesh_lod.py). ValueError if that is not possible yet."""
+    if not level or ensure_smpl_faces() is None:
+        return None
+    template = None
+    if hmr2_model is not None and hasattr(hmr2_model, 'smpl'):
+        template = hmr2_model.smpl.v_template.detach().cpu().numpy()
+    return get_lod(level, smpl_faces, template)
+
+
+def smpl_forward(global_orient, body_pose, betas):
+    """Batched SMPL forward with HMR2's SMPL layer: rotation matrices in, (vertices, joints) numpy out."""
+    with torch.no_grad():
+        smpl_output = hmr2_model.smpl(
+            global_orient=torch.as_tensor(global_orient, dtype=torch.float32, device=device),
+            body_pose=torch.as_tensor(body_pose, dtype=torch.float32, device=device),
+            betas=torch.as_tensor(betas, dtype=torch.float32, device=device),
+            pose2rot=False,
+        )
+    return smpl_output.vertices.cpu().numpy(), smpl_output.joints.cpu().numpy()
+
+
+@app.route('/mesh/reconstruct', methods=['POST'])
+def mesh_reconstruct():
+    """Rebuild meshes from compact SMPL params in one batched SMPL forward pass.
+    
+    JSON body: {"params": [<smpl_params from a mesh=params result>, ...], "frame_numbers": [...] (optional)}.
+    Returns {"results": [{"frame_number", "mesh_vertices_data", "joints_3d_raw", "camera_translation",
+    "scaled_focal_length"}, ...], "mesh_topology": {...}}, or a binary batch (mesh_wire.py) when negotiated.
+    """
+    try:
+        if not models_loaded and not initialize_models():
+            return jsonify({'error': 'Failed to initialize models', 'details': model_load_error}), 500
+        if hmr2_model is None:
+            return jsonify({'error': 'HMR2 model not loaded'}), 503
+        ensure_smpl_faces()
+        
+        start_time = time.time()
+        data = request.get_json(silent=True)
+        try:
+            payloads, frame_numbers = read_reconstruct_body(data if data is not None else {})
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        if len(payloads) > MAX_RECONSTRUCT_BODIES:
+            return jsonify({'error': f'Too many parameter sets: {len(payloads)} (max {MAX_RECONSTRUCT_BODIES})'}), 413
+        try:
+            lod = get_mesh_lod(get_lod_level(request, data))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        try:
+            vertices, joints = reconstruct_meshes(payloads, smpl_forward)
+        except ValueError as e:
+            return jsonify({'error': f'Invalid SMPL params: {e}'}), 400
+        
+        topology = get_topology(smpl_faces).reference() if smpl_faces is not None else None
+        if lod is not None:
+            vertices = vertices[:, lod.vertex_map]
+            topology = lod.reference()
+        results = []
+        for i, payload in enumerate(payloads):
+            camera = payload.get('camera') or {}
+            results.append({
+                'frame_number': frame_numbers[i],
+                'mesh_vertices_data': vertices[i],
+                'joints_3d_raw': joints[i],
+                'camera_translation': camera.get('translation'),
+                'scaled_focal_length': camera.get('focal_length'),
+            })
+        processing_time_ms = round((time.time() - start_time) * 1000, 2)
+        print(f"[🔴 POSE] 🧍 Reconstructed {len(results)} meshes in {processing_time_ms:.1f}ms")
+        
+        mesh_format = negotiate_mesh_format(request)
+        if mesh_format:
+            for result in results:
+                result['mesh_topology'] = topology
+            return Response(encode_results(results, mesh_format), mimetype=MESH_MEDIA_TYPE, headers={
+                'X-Frame-Count': str(len(results)),
+                'X-Processing-Time-Ms': str(processing_time_ms),
+            })
+        return jsonify({
+            'results': results,
+            'mesh_topology': topology,
+            'count': len(results),
+            'processing_time_ms': processing_time_ms,
+        })
+    
+    except Exception as e:
+        print(f"[ERROR] Mesh reconstruction failed: {e}")
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/pose/video', methods=['POST'])
 def pose_video():
     """Process an entire video with PHALP video-level tracking.
     
+    Send Accept: application/x-ndjson (or "stream": true) to get one frame per line as
+    the pickle is converted, followed by a summary line (see ndjson_stream.py).
+    
     Requirement 1: Process spawning and lifecycle management
     Requirement 2: Process pool and task queue
     Requirement 3: HTTP endpoints for pose detection
@@ -853,6 +1027,13 @@ def pose_video():
         video_path = data['video_path']
         logger.info(f"[VIDEO] Received request for video: {video_path}")
         
+        try:
+            mesh_mode = get_mesh_mode(request, data)
+            lod_level = get_lod_level(request, data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        stream = wants_ndjson(request, data)
+        
         # Validate video file exists
         if not os.path.exists(video_path):
             logger.error(f"[VIDEO] Video file not found: {video_path}")
@@ -869,7 +1050,10 @@ def pose_video():
                 
                 request_queue.append({
                     'job_id': job_id,
-                    'video_path': video_path
+                    'video_path': video_path,
+                    'mesh_mode': mesh_mode,
+                    'lod': lod_level,
+                    'stream': stream
                 })
                 
                 active_jobs[job_id] = {
@@ -892,7 +1076,7 @@ def pose_video():
         
         # Process the video
         try:
-            result = process_video_subprocess(video_path)
+            result = process_video_subprocess(video_path, mesh_mode=mesh_mode, lod_level=lod_level, stream=stream)
             return result
         finally:
             # Mark GPU as free and process next queued request if any
@@ -921,9 +1105,15 @@ def pose_video():
         return jsonify({'error': str(e)}), 500
 
 
-def process_video_subprocess(video_path, job_id=None, video_hash=None):
+def process_video_subprocess(video_path, job_id=None, video_hash=None, mesh_mode='full', lod_level=0,
+                             stream=False):
     """Process a single video with track.py subprocess.
     
+    mesh_mode 'params' returns per-person smpl_params without mesh vertices;
+    lod_level 1 / 2 returns decimated preview vertices (mesh_lod.py).
+    stream=True returns NDJSON - one frame per line as it is converted, then a
+    summary line (ndjson_stream.py) - instead of one JSON document.
+    
     Requirement 1: Process spawning and lifecycle management
     Requirement 8: Comprehensive logging of process spawning, task queuing, and errors
     """
@@ -1103,7 +1293,34 @@ def process_video_subprocess(video_path, job_id=None, video_hash=None):
             parse_start = time.time()
             
             try:
-                parsed_data = parse_pkl_to_json(pkl_path)
+                try:
+                    lod = get_mesh_lod(lod_level)
+                except ValueError as e:
+                    logger.warning(f"[PROCESS] LOD {lod_level} unavailable, returning full meshes: {e} - job_id: {job_id}")
+                    lod = None
+                
+                if stream:
+                    frames_data = load_phalp_frames(pkl_path)
+                    logger.info(f"[PROCESS] Streaming {len(frames_data)} frames as NDJSON - job_id: {job_id}")
+                    
+                    def summary(frame_count):
+                        parse_elapsed = time.time() - parse_start
+                        logger.info(f"[PROCESS] Streamed {frame_count} frames in {parse_elapsed:.1f}s - job_id: {job_id}")
+                        return {
+                            'status': 'success',
+                            'video_path': video_path,
+                            'pkl_path': pkl_path,
+                            'total_frames': frame_count,
+                            'mesh_topology': lod.reference() if lod is not None else None,
+                            'processing_time_seconds': elapsed,
+                            'parsing_time_seconds': parse_elapsed,
+                            'job_id': job_id
+                        }
+                    
+                    return ndjson_response(iter_json_frames(frames_data, mesh_mode, lod), summary,
+                                           headers={'X-Job-Id': job_id}), 200
+                
+                parsed_data = parse_pkl_to_json(pkl_path, mesh_mode, lod)
                 parse_elapsed = time.time() - parse_start
                 logger.info(f"[PROCESS] Parsing completed in {parse_elapsed:.1f}s - job_id: {job_id}")
                 logger.info(f"[PROCESS] Total frames: {parsed_data['total_frames']} - job_id: {job_id}")
@@ -1118,6 +1335,7 @@ def process_video_subprocess(video_path, job_id=None, video_hash=None):
                     'pkl_path': pkl_path,
                     'total_frames': parsed_data['total_frames'],
                     'frames': parsed_data['frames'],
+                    'mesh_topology': lod.reference() if lod is not None else None,
                     'processing_time_seconds': elapsed,
                     'parsing_time_seconds': parse_elapsed,
                     'job_id': job_id
@@ -1209,10 +1427,196 @@ def pose_video_status(job_id):
     }), 200
 
 
+def ensure_smpl_faces():
+    """Load SMPL face indices on first pose request (HMR2 model first, then the SMPL pickle)."""
+    global smpl_faces
+    
+    if smpl_faces is not None:
+        return smpl_faces
+    
+    print("[🔴 POSE] Loading SMPL faces from HMR2 model...")
+    try:
+        if hmr2_model is not None and hasattr(hmr2_model, 'smpl'):
+            smpl_faces = hmr2_model.smpl.faces
+            print(f"[🔴 POSE] ✓ SMPL faces loaded from HMR2: shape {smpl_faces.shape}, type {type(smpl_faces)}")
+        else:
+            print("[🔴 POSE] ⚠ Could not extract faces from HMR2, trying pickle file...")
+            import pickle
+            # Try multiple possible filenames (male model with neutral fallback)
+            possible_paths = [
+                '/app/data/basicmodel_m_lbs_10_207_0_v1.1.0.pkl',  # Docker container path
+                '/app/data/basicmodel_m_lbs_10_207_0_v1.1.0_p3.pkl',  # Docker container path (alternate)
+                '/app/data/basicModel_neutral_lbs_10_207_0_v1.0.0.pkl',  # Neutral model fallback
+                '/home/ben/pose-service/basicmodel_m_lbs_10_207_0_v1.1.0.pkl',  # WSL path
+                '/home/ben/pose-service/basicmodel_m_lbs_10_207_0_v1.1.0_p3.pkl',  # WSL path (alternate)
+            ]
+            
+            for pkl_path in possible_paths:
+                if os.path.exists(pkl_path):
+                    print(f"[🔴 POSE] Found pickle at {pkl_path}")
+                    try:
+                        with open(pkl_path, 'rb') as f:
+                            smpl_data = pickle.load(f, encoding='latin1')
+                        if 'f' in smpl_data:
+                            smpl_faces = smpl_data['f']
+                            print(f"[🔴 POSE] ✓ SMPL faces loaded from pickle: shape {smpl_faces.shape}, type {type(smpl_faces)}")
+                            break
+                    except Exception as e:
+                        print(f"[🔴 POSE] ✗ Failed to load from {pkl_path}: {e}")
+                        continue
+    except Exception as e:
+        print(f"[🔴 POSE] ⚠ Failed to load SMPL faces: {e}")
+        traceback.print_exc()
+        smpl_faces = None
+    
+    return smpl_faces
+
+
+def detect_person_boxes(images_bgr, frame_numbers):
+    """Run ViTDet over the frames - EXACTLY as demo.py, full image fallback per frame."""
+    if vitdet_detector is None:
+        print(f"[🔴 POSE] ⚠️ Frames {frame_numbers}: ViTDet not available, using full image")
+        return [full_image_box(image) for image in images_bgr]
+    
+    print(f"[🔴 POSE] 🔍 Frames {frame_numbers}: Running ViTDet detection (exactly as demo.py)...")
+    try:
+        # CRITICAL: Clear GPU memory before ViTDet detection
+        torch.cuda.empty_cache()
+        
+        # Pass BGR images exactly as demo.py does with cv2.imread
+        detections = detect_people_batch(vitdet_detector, images_bgr, batch_size=DETECTOR_BATCH_SIZE)
+        
+        for frame_number, det in zip(frame_numbers, detections):
+            if det['fallback']:
+                print(f"[🔴 POSE] ⚠️ Frame {frame_number}: No persons detected, using full image")
+            else:
+                print(f"[🔴 POSE] ✅ Frame {frame_number}: ViTDet found {len(det['boxes'])} persons, first box: {det['boxes'][0]}")
+        
+        return [det['boxes'] for det in detections]
+    except Exception as e:
+        print(f"[🔴 POSE] ⚠️ Frames {frame_numbers}: ViTDet failed: {e}")
+        traceback.print_exc()
+        return [full_image_box(image) for image in images_bgr]
+
+
+def build_hybrid_response(frame_number, person, num_persons, processing_time_ms, mesh_arrays=False,
+                          include_faces=False, mesh_mode='full', lod=None):
+    """Build the /pose/hybrid response for one person result from run_hmr2_batch().
+    
+    Vertices/faces stay NumPy arrays (jsonify writes them directly, see json_response.py);
+    mesh_arrays adds joints_3d_raw for the binary wire format (mesh_wire.py).
+    Faces are sent as a mesh_topology reference to /mesh/topology unless include_faces is set;
+    a MeshLOD subsamples the vertices to that preview level (mesh_lod.py);
+    mesh_mode 'params' drops the vertices and keeps the compact smpl_params (smpl_params.py).
+    """
+    vertices = person['vertices']
+    cam_t = person['cam_t_full']  # Full image camera translation
+    pred_cam = person['pred_cam']
+    img_size = person['img_size']
+    
+    # Get 3D keypoints if available
+    keypoints_3d = person['joints_3d'] if person['joints_3d'] is not None else np.zeros((24, 3), dtype=np.float32)
+    
+    # Format keypoints
+    keypoints = []
+    for i, kp in enumerate(keypoints_3d):
+        keypoints.append({
+            'name': f'joint_{i}',
+            'x': float(kp[0]),
+            'y': float(kp[1]),
+            'z': float(kp[2]),
+            'confidence': 1.0
+        })
+    
+    # Build response with full camera info for proper 3D rendering
+    response = {
+        'frame_number': frame_number,
+        'keypoints': keypoints,
+        'has_3d': True,
+        'mesh_vertices_data': vertices,
+        'mesh_faces_data': np.asarray(smpl_faces) if smpl_faces is not None else [],
+        # Full image camera translation [tx, ty, tz] - exactly as demo.py uses
+        'camera_translation': cam_t.tolist(),
+        # Camera params for weak perspective (crop space)
+        'camera_params': {
+            'scale': float(pred_cam[0]),
+            'tx': float(pred_cam[1]),
+            'ty': float(pred_cam[2]),
+            'type': 'weak_perspective'
+        },
+        # Full camera info for proper rendering
+        'camera_full': {
+            'tx': float(cam_t[0]),
+            'ty': float(cam_t[1]),
+            'tz': float(cam_t[2]),
+            'focal_length': person['scaled_focal_length'],
+            'img_width': int(img_size[0]),
+            'img_height': int(img_size[1]),
+            'type': 'perspective'
+        },
+        # Detection info
+        'detection': {
+            'box_center': person['box_center'].tolist(),
+            'box_size': float(person['box_size']),
+            'vitdet_used': vitdet_detector is not None,
+            'num_persons_detected': num_persons
+        },
+        'phalp_available': phalp_tracker is not None,
+        'processing_time_ms': processing_time_ms,
+        'error': None,
+        'smpl_params': encode_smpl_params(person.get('smpl_params'), cam_t, person['scaled_focal_length'], img_size),
+    }
+    attach_topology(response, include_faces)
+    apply_lod(response, lod)
+    if mesh_mode == 'params':
+        strip_mesh(response)
+    if mesh_arrays:
+        response['joints_3d_raw'] = keypoints_3d
+    return response
+
+
+def run_hybrid_frames(images_bgr, frame_numbers):
+    """
+    Run ViTDet + HMR2 over one or more BGR frames - EXACTLY as 4D-Humans demo.py,
+    with all person crops stacked into as few HMR2 forward passes as possible.
+    
+    Returns:
+        (persons_per_frame, num_boxes_per_frame, forward_passes)
+    """
+    # Step 1: Detect humans in images - EXACTLY as demo.py
+    boxes_per_frame = detect_person_boxes(images_bgr, frame_numbers)
+    
+    # Step 2: Run HMR2.0 on all detected humans - EXACTLY as demo.py
+    # demo.py: dataset = ViTDetDataset(model_cfg, img_cv2, boxes)
+    print(f"[🔴 POSE] 🔄 Frames {frame_numbers}: Running HMR2 inference on {sum(len(b) for b in boxes_per_frame)} crops...")
+    
+    # CRITICAL: Clear GPU memory BEFORE moving new batch to device
+    torch.cuda.empty_cache()
+    persons_per_frame, forward_passes = run_hmr2_batch(
+        hmr2_model, hmr2_cfg, images_bgr, boxes_per_frame, device,
+        HMR2_MODULES['recursive_to'], batch_size=HMR2_BATCH_SIZE
+    )
+    
+    # CRITICAL: Clear GPU memory after extracting all outputs to CPU
+    # This prevents CUDA out of memory errors on subsequent frames
+    torch.cuda.empty_cache()
+    
+    return persons_per_frame, [len(b) for b in boxes_per_frame], forward_passes
+
+
 @app.route('/pose/hybrid', methods=['POST'])
 def pose_hybrid():
-    """Process a single frame with 4D-Humans + PHALP tracking."""
-    global models_loaded, smpl_faces
+    """Process a single frame with 4D-Humans + PHALP tracking.
+    
+    Accepts raw JPEG/PNG bytes (image/jpeg, image/png, application/octet-stream),
+    multipart/form-data with a 'frame' file, or legacy JSON with image_base64.
+    
+    Responds with JSON, or the binary mesh format (mesh_wire.py) when the client sends
+    Accept: application/x-smpl-mesh or ?format=binary / binary16. Faces are referenced
+    via mesh_topology (fetch /mesh/topology once) unless include_faces=true.
+    mesh=params returns smpl_params without vertices (see /mesh/reconstruct).
+    """
+    global models_loaded
     
     try:
         # Initialize models on first request if not already done
@@ -1223,273 +1627,154 @@ def pose_hybrid():
                 return jsonify({'error': 'Failed to initialize models', 'details': model_load_error}), 500
         
         # Load SMPL faces on first pose request if not already loaded
-        if smpl_faces is None:
-            print("[🔴 POSE] Loading SMPL faces from HMR2 model...")
-            try:
-                if hmr2_model is not None and hasattr(hmr2_model, 'smpl'):
-                    smpl_faces = hmr2_model.smpl.faces
-                    print(f"[🔴 POSE] ✓ SMPL faces loaded from HMR2: shape {smpl_faces.shape}, type {type(smpl_faces)}")
-                else:
-                    print("[🔴 POSE] ⚠ Could not extract faces from HMR2, trying pickle file...")
-                    import pickle
-                    # Try multiple possible filenames (male model with neutral fallback)
-                    possible_paths = [
-                        '/app/data/basicmodel_m_lbs_10_207_0_v1.1.0.pkl',  # Docker container path
-                        '/app/data/basicmodel_m_lbs_10_207_0_v1.1.0_p3.pkl',  # Docker container path (alternate)
-                        '/app/data/basicModel_neutral_lbs_10_207_0_v1.0.0.pkl',  # Neutral model fallback
-                        '/home/ben/pose-service/basicmodel_m_lbs_10_207_0_v1.1.0.pkl',  # WSL path
-                        '/home/ben/pose-service/basicmodel_m_lbs_10_207_0_v1.1.0_p3.pkl',  # WSL path (alternate)
-                    ]
-                    
-                    for pkl_path in possible_paths:
-                        if os.path.exists(pkl_path):
-                            print(f"[🔴 POSE] Found pickle at {pkl_path}")
-                            try:
-                                with open(pkl_path, 'rb') as f:
-                                    smpl_data = pickle.load(f, encoding='latin1')
-                                if 'f' in smpl_data:
-                                    smpl_faces = smpl_data['f']
-                                    print(f"[🔴 POSE] ✓ SMPL faces loaded from pickle: shape {smpl_faces.shape}, type {type(smpl_faces)}")
-                                    break
-                            except Exception as e:
-                                print(f"[🔴 POSE] ✗ Failed to load from {pkl_path}: {e}")
-                                continue
-            except Exception as e:
-                print(f"[🔴 POSE] ⚠ Failed to load SMPL faces: {e}")
-                traceback.print_exc()
-                smpl_faces = None
-        
-        # Parse request
-        data = request.get_json()
-        if not data:
-            print("[🔴 POSE] ❌ No JSON data provided")
-            return jsonify({'error': 'No JSON data provided'}), 400
+        ensure_smpl_faces()
         
-        if 'image_base64' not in data:
-            print("[🔴 POSE] ❌ Missing image_base64 in request")
-            return jsonify({'error': 'Missing image_base64'}), 400
-        
-        frame_number = data.get('frame_number', 0)
-        image_base64 = data['image_base64']
-        print(f"[🔴 POSE] 📥 Frame {frame_number}: Received {len(image_base64)} bytes of base64 image data")
-        
-        # Decode image
+        # Parse request - raw image bytes, multipart 'frame' file, or JSON image_base64
+        # Decoded straight to BGR for ViTDet (exactly as demo.py uses cv2.imread which returns BGR)
         try:
-            import numpy as np
-            from PIL import Image
-            import cv2
-            
-            image_data = base64.b64decode(image_base64)
-            print(f"[🔴 POSE] 📥 Frame {frame_number}: Decoded to {len(image_data)} bytes")
-            image = Image.open(io.BytesIO(image_data)).convert('RGB')
-            image_rgb = np.array(image)
-            # Convert to BGR for ViTDet (exactly as demo.py uses cv2.imread which returns BGR)
-            image_bgr = cv2.cvtColor(image_rgb, cv2.COLOR_RGB2BGR)
-            print(f"[🔴 POSE] 📥 Frame {frame_number}: Image shape {image_bgr.shape} (BGR)")
-        except Exception as e:
-            print(f"[🔴 POSE] ❌ Frame {frame_number}: Failed to decode image: {str(e)}")
+            frame = read_frame_from_request(request, base64_field='image_base64')
+        except FrameDecodeError as e:
+            print(f"[🔴 POSE] ❌ Failed to read frame: {str(e)}")
             return jsonify({'error': f'Failed to decode image: {str(e)}'}), 400
         
+        frame_number = get_frame_number(frame['params'])
+        image_bgr = frame['image']
+        try:
+            mesh_mode = get_mesh_mode(request, frame['params'])
+            lod_level = get_lod_level(request, frame['params'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        print(f"[🔴 POSE] 📥 Frame {frame_number}: Received {frame['encoded_bytes']} bytes ({frame['source']}), image shape {image_bgr.shape} (BGR)")
+        
         # Run HMR2 detection - EXACTLY as 4D-Humans demo.py
         if hmr2_model is None:
             print(f"[🔴 POSE] ❌ Frame {frame_number}: HMR2 model not loaded")
             return jsonify({'error': 'HMR2 model not loaded'}), 503
         
         try:
-            import torch
-            import numpy as np
-            
-            # Import exactly as demo.py
-            from hmr2.datasets.vitdet_dataset import ViTDetDataset
-            from hmr2.utils.renderer import cam_crop_to_full
-            recursive_to = HMR2_MODULES['recursive_to']
-            
             print(f"[🔴 POSE] 🔄 Frame {frame_number}: Starting HMR2 processing (demo.py style)...")
             start_time = time.time()
             
-            h, w = image_bgr.shape[:2]
-            print(f"[🔴 POSE] 📐 Frame {frame_number}: Image size {w}x{h}")
+            persons_per_frame, num_boxes, _ = run_hybrid_frames([image_bgr], [frame_number])
+            persons = persons_per_frame[0]
+            if not persons:
+                return jsonify({'error': 'HMR2 processing failed: no person crops produced'}), 500
             
-            # Step 1: Detect humans in image - EXACTLY as demo.py
-            # demo.py: det_out = detector(img_cv2)
-            boxes = None
-            if vitdet_detector is not None:
-                print(f"[🔴 POSE] 🔍 Frame {frame_number}: Running ViTDet detection (exactly as demo.py)...")
-                try:
-                    # CRITICAL: Clear GPU memory before ViTDet detection
-                    print(f"[🔴 POSE] 🧹 Frame {frame_number}: Pre-clearing GPU memory before ViTDet...")
-                    torch.cuda.empty_cache()
-                    
-                    # Pass BGR image exactly as demo.py does with cv2.imread
-                    det_out = vitdet_detector(image_bgr)
-                    det_instances = det_out['instances']
-                    
-                    # Filter exactly as demo.py:
-                    # valid_idx = (det_instances.pred_classes==0) & (det_instances.scores > 0.5)
-                    valid_idx = (det_instances.pred_classes == 0) & (det_instances.scores > 0.5)
-                    boxes = det_instances.pred_boxes.tensor[valid_idx].cpu().numpy()
-                    
-                    print(f"[🔴 POSE] ✅ Frame {frame_number}: ViTDet found {len(boxes)} persons")
-                    if len(boxes) > 0:
-                        print(f"[🔴 POSE] 📦 Frame {frame_number}: First box: {boxes[0]}")
-                    else:
-                        print(f"[🔴 POSE] ⚠️ Frame {frame_number}: No persons detected, using full image")
-                        boxes = np.array([[0, 0, w, h]], dtype=np.float32)
-                except Exception as e:
-                    print(f"[🔴 POSE] ⚠️ Frame {frame_number}: ViTDet failed: {e}")
-                    traceback.print_exc()
-                    boxes = np.array([[0, 0, w, h]], dtype=np.float32)
-            else:
-                print(f"[🔴 POSE] ⚠️ Frame {frame_number}: ViTDet not available, using full image")
-                boxes = np.array([[0, 0, w, h]], dtype=np.float32)
+            person = persons[0]
+            print(f"[🔴 POSE] ===== CAMERA CONVERSION (exactly as demo.py) =====")
+            print(f"[🔴 POSE]   pred_cam (crop space): {person['pred_cam']}")
+            print(f"[🔴 POSE]   box_center: {person['box_center']}")
+            print(f"[🔴 POSE]   box_size: {person['box_size']:.1f}")
+            print(f"[🔴 POSE]   img_size: {person['img_size']}")
+            print(f"[🔴 POSE]   scaled_focal_length: {person['scaled_focal_length']:.1f}")
+            print(f"[🔴 POSE]   pred_cam_t_full: {person['cam_t_full']}")
             
-            # Step 2: Run HMR2.0 on all detected humans - EXACTLY as demo.py
-            # demo.py: dataset = ViTDetDataset(model_cfg, img_cv2, boxes)
-            print(f"[🔴 POSE] 🔄 Frame {frame_number}: Creating ViTDetDataset with {len(boxes)} boxes...")
-            dataset = ViTDetDataset(hmr2_cfg, image_bgr, boxes)
-            dataloader = torch.utils.data.DataLoader(dataset, batch_size=1, shuffle=False, num_workers=0)
+            processing_time_ms = (time.time() - start_time) * 1000
+            mesh_format = negotiate_mesh_format(request)
+            response_data = build_hybrid_response(frame_number, person, num_boxes[0], processing_time_ms,
+                                                  mesh_arrays=mesh_format is not None,
+                                                  include_faces=wants_embedded_faces(request, frame['params']),
+                                                  mesh_mode=mesh_mode, lod=get_mesh_lod(lod_level))
             
-            # Step 3: Run model - EXACTLY as demo.py
-            print(f"[🔴 POSE] 🔄 Frame {frame_number}: Running HMR2 inference...")
+            print(f"[🔴 POSE] ✅ Frame {frame_number}: Response ready - {len(response_data['keypoints'])} keypoints, {len(person['vertices'])} vertices ({mesh_mode} mesh)")
+            print(f"[🔴 POSE] 📤 Frame {frame_number}: Sending {'binary ' + mesh_format if mesh_format else 'JSON'} response (took {processing_time_ms:.1f}ms)")
             
-            try:
-                for batch in dataloader:
-                    # CRITICAL: Clear GPU memory BEFORE moving new batch to device
-                    # This prevents CUDA OOM when loading the next frame
-                    print(f"[🔴 POSE] 🧹 Frame {frame_number}: Pre-clearing GPU memory before batch transfer...")
-                    torch.cuda.empty_cache()
-                    
-                    batch = recursive_to(batch, device)
-                    with torch.no_grad():
-                        out = hmr2_model(batch)
-                    
-                    # Step 4: Extract camera params - EXACTLY as demo.py
-                    pred_cam = out['pred_cam']
-                    box_center = batch["box_center"].float()
-                    box_size = batch["box_size"].float()
-                    img_size = batch["img_size"].float()
-                    
-                    # Compute scaled focal length - EXACTLY as demo.py
-                    scaled_focal_length = hmr2_cfg.EXTRA.FOCAL_LENGTH / hmr2_cfg.MODEL.IMAGE_SIZE * img_size.max()
-                    
-                    # Convert camera to full image space - EXACTLY as demo.py
-                    pred_cam_t_full = cam_crop_to_full(
-                        pred_cam, box_center, box_size, img_size, scaled_focal_length
-                    ).detach().cpu().numpy()
-                    
-                    print(f"[🔴 POSE] ===== CAMERA CONVERSION (exactly as demo.py) =====")
-                    print(f"[🔴 POSE]   pred_cam (crop space): {pred_cam[0].cpu().numpy()}")
-                    print(f"[🔴 POSE]   box_center: {box_center[0].cpu().numpy()}")
-                    print(f"[🔴 POSE]   box_size: {box_size[0].cpu().numpy():.1f}")
-                    print(f"[🔴 POSE]   img_size: {img_size[0].cpu().numpy()}")
-                    print(f"[🔴 POSE]   scaled_focal_length: {scaled_focal_length.cpu().numpy():.1f}")
-                    print(f"[🔴 POSE]   pred_cam_t_full: {pred_cam_t_full[0]}")
-                    
-                    # Extract outputs - exactly as demo.py
-                    vertices = out['pred_vertices'][0].cpu().numpy()
-                    cam_t = pred_cam_t_full[0]  # Full image camera translation
-                    
-                    # Get 3D keypoints if available
-                    keypoints_3d = out.get('pred_keypoints_3d', torch.zeros(1, 24, 3))[0].cpu().numpy()
-                    
-                    # Extract camera params to CPU before clearing GPU memory
-                    pred_cam_cpu = pred_cam[0].cpu().numpy()
-                    box_center_cpu = box_center[0].cpu().numpy()
-                    box_size_cpu = box_size[0].cpu().numpy()
-                    img_size_cpu = img_size[0].cpu().numpy()
-                    scaled_focal_length_cpu = float(scaled_focal_length.cpu().numpy())
-                    
-                    # CRITICAL: Clear GPU memory after extracting all outputs to CPU
-                    # This prevents CUDA out of memory errors on subsequent frames
-                    print(f"[🔴 POSE] 🧹 Frame {frame_number}: Clearing GPU memory...")
-                    del batch, out, pred_cam, box_center, box_size, img_size, scaled_focal_length, pred_cam_t_full
-                    torch.cuda.empty_cache()
-                    print(f"[🔴 POSE] ✅ Frame {frame_number}: GPU memory cleared")
-                    
-                    print(f"[🔴 POSE] ✅ Frame {frame_number}: Extracted vertices shape {vertices.shape}")
-                    print(f"[🔴 POSE] ✅ Frame {frame_number}: Extracted keypoints shape {keypoints_3d.shape}")
-                    print(f"[🔴 POSE] ✅ Frame {frame_number}: Camera translation (full): {cam_t}")
-                    
-                    # Format keypoints
-                    keypoints = []
-                    for i, kp in enumerate(keypoints_3d):
-                        keypoints.append({
-                            'name': f'joint_{i}',
-                            'x': float(kp[0]),
-                            'y': float(kp[1]),
-                            'z': float(kp[2]),
-                            'confidence': 1.0
-                        })
-                    
-                    # Format faces
-                    faces_list = []
-                    if smpl_faces is not None:
-                        if hasattr(smpl_faces, 'tolist'):
-                            faces_list = smpl_faces.tolist()
-                        else:
-                            faces_list = list(smpl_faces)
-                        print(f"[🔴 POSE] ✅ Frame {frame_number}: Formatted {len(faces_list)} faces")
-                    
-                    processing_time_ms = (time.time() - start_time) * 1000
-                    
-                    # Build response with full camera info for proper 3D rendering
-                    response_data = {
-                        'frame_number': frame_number,
-                        'keypoints': keypoints,
-                        'has_3d': True,
-                        'mesh_vertices_data': vertices.tolist(),
-                        'mesh_faces_data': faces_list,
-                        # Full image camera translation [tx, ty, tz] - exactly as demo.py uses
-                        'camera_translation': cam_t.tolist(),
-                        # Camera params for weak perspective (crop space)
-                        'camera_params': {
-                            'scale': float(pred_cam_cpu[0]),
-                            'tx': float(pred_cam_cpu[1]),
-                            'ty': float(pred_cam_cpu[2]),
-                            'type': 'weak_perspective'
-                        },
-                        # Full camera info for proper rendering
-                        'camera_full': {
-                            'tx': float(cam_t[0]),
-                            'ty': float(cam_t[1]),
-                            'tz': float(cam_t[2]),
-                            'focal_length': scaled_focal_length_cpu,
-                            'img_width': int(img_size_cpu[0]),
-                            'img_height': int(img_size_cpu[1]),
-                            'type': 'perspective'
-                        },
-                        # Detection info
-                        'detection': {
-                            'box_center': box_center_cpu.tolist(),
-                            'box_size': float(box_size_cpu),
-                            'vitdet_used': vitdet_detector is not None,
-                            'num_persons_detected': len(boxes)
-                        },
-                        'phalp_available': phalp_tracker is not None,
-                        'processing_time_ms': processing_time_ms,
-                        'error': None
-                    }
-                    
-                    print(f"[🔴 POSE] ✅ Frame {frame_number}: Response ready - {len(keypoints)} keypoints, {len(vertices)} vertices")
-                    print(f"[🔴 POSE] 📤 Frame {frame_number}: Sending response (took {processing_time_ms:.1f}ms)")
-                    
-                    # Final GPU memory cleanup before returning
-                    torch.cuda.empty_cache()
-                    
-                    return jsonify(response_data)
+            if mesh_format:
+                return Response(encode_result(response_data, mesh_format), mimetype=MESH_MEDIA_TYPE)
+            return jsonify(response_data)
+        
+        except Exception as e:
+            print(f"[🔴 POSE] ❌ Frame {frame_number}: HMR2 processing failed: {e}")
+            traceback.print_exc()
+            # Clear GPU memory even on error
+            torch.cuda.empty_cache()
+            return jsonify({'error': f'HMR2 processing failed: {str(e)}'}), 500
+    
+    except Exception as e:
+        print(f"[ERROR] Unexpected error: {e}")
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/pose/hybrid/batch', methods=['POST'])
+def pose_hybrid_batch():
+    """Process several frames with one batched ViTDet pass and as few HMR2 passes as possible.
+    
+    Accepts multipart/form-data with repeated 'frames' files (optional 'frame_numbers'
+    or 'start_frame' fields), or JSON {"frames": [{"image_base64": ..., "frame_number": 0}, ...]}.
+    
+    Returns {"results": [<per-frame /pose/hybrid response>, ...], "frame_count": N, ...}.
+    Frames where no person crop could be processed get {"frame_number": n, "has_3d": false, "error": ...}.
+    """
+    global models_loaded
+    
+    try:
+        if not models_loaded:
+            print("[🔴 POSE] First request - initializing models...")
+            if not initialize_models():
+                return jsonify({'error': 'Failed to initialize models', 'details': model_load_error}), 500
+        
+        ensure_smpl_faces()
+        
+        try:
+            batch = read_frames_from_request(request, base64_field='image_base64')
+        except FrameDecodeError as e:
+            return jsonify({'error': f'Failed to decode image: {str(e)}'}), 400
+        
+        frames = batch['frames']
+        if len(frames) > MAX_BATCH_FRAMES:
+            return jsonify({'error': f'Too many frames: {len(frames)} (max {MAX_BATCH_FRAMES})'}), 413
+        try:
+            mesh_mode = get_mesh_mode(request, batch['params'])
+            lod_level = get_lod_level(request, batch['params'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        if hmr2_model is None:
+            return jsonify({'error': 'HMR2 model not loaded'}), 503
+        
+        frame_numbers = [frame['frame_number'] for frame in frames]
+        print(f"[🔴 POSE] 📥 Batch of {len(frames)} frames ({batch['source']}): {frame_numbers}")
+        
+        try:
+            start_time = time.time()
+            persons_per_frame, num_boxes, forward_passes = run_hybrid_frames(
+                [frame['image'] for frame in frames], frame_numbers
+            )
+            processing_time_ms = (time.time() - start_time) * 1000
             
-            except Exception as e:
-                print(f"[🔴 POSE] ❌ Frame {frame_number}: HMR2 processing failed: {e}")
-                traceback.print_exc()
-                # Clear GPU memory even on error
-                torch.cuda.empty_cache()
-                return jsonify({'error': f'HMR2 processing failed: {str(e)}'}), 500
+            mesh_format = negotiate_mesh_format(request)
+            include_faces = wants_embedded_faces(request, batch['params'])
+            lod = get_mesh_lod(lod_level)
+            results = []
+            for frame_number, persons, boxes_count in zip(frame_numbers, persons_per_frame, num_boxes):
+                if persons:
+                    results.append(build_hybrid_response(frame_number, persons[0], boxes_count, processing_time_ms,
+                                                         mesh_arrays=mesh_format is not None,
+                                                         include_faces=include_faces, mesh_mode=mesh_mode, lod=lod))
+                else:
+                    results.append({'frame_number': frame_number, 'has_3d': False, 'error': 'No person crops produced'})
+            
+            print(f"[🔴 POSE] 📤 Batch of {len(frames)} frames done in {processing_time_ms:.1f}ms ({forward_passes} HMR2 passes)")
+            
+            if mesh_format:
+                return Response(encode_results(results, mesh_format), mimetype=MESH_MEDIA_TYPE, headers={
+                    'X-Frame-Count': str(len(results)),
+                    'X-HMR2-Forward-Passes': str(forward_passes),
+                    'X-Processing-Time-Ms': str(round(processing_time_ms, 2)),
+                })
+            return jsonify({
+                'results': results,
+                'frame_count': len(results),
+                'hmr2_forward_passes': forward_passes,
+                'total_processing_time_ms': processing_time_ms,
+            })
         
         except Exception as e:
-            print(f"[🔴 POSE] ❌ Frame {frame_number}: Image decoding or HMR2 setup failed: {e}")
+            print(f"[🔴 POSE] ❌ Batch {frame_numbers}: HMR2 processing failed: {e}")
             traceback.print_exc()
             torch.cuda.empty_cache()
-            return jsonify({'error': f'Processing failed: {str(e)}'}), 500
+            return jsonify({'error': f'HMR2 processing failed: {str(e)}'}), 500
     
     except Exception as e:
         print(f"[ERROR] Unexpected error: {e}")
@@ -0,0 +1,243 @@
+"""
+Frame ingest for the pose endpoints
+
+Decodes request frames straight into numpy arrays, skipping the
+base64 -> PIL -> RGB -> BGR round trip. Three request shapes are accepted:
+
+1. Raw image bytes (Content-Type: image/jpeg, image/png or application/octet-stream)
+   with frame_number / visualize passed as query parameters
+2. multipart/form-data with the image in a 'frame' or 'image' file field
+   (this is what the Node /api/pose/hybrid proxy sends)
+3. JSON body with a base64 encoded image (legacy clients)
+"""
+
+import base64
+import json
+import logging
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+RAW_IMAGE_CONTENT_TYPES = (
+    'application/octet-stream',
+    'image/jpeg',
+    'image/jpg',
+    'image/png',
+)
+MULTIPART_FILE_FIELDS = ('frame', 'image')
+
+
+class FrameDecodeError(ValueError):
+    """Raised when a request does not carry a decodable frame"""
+
+
+def decode_image_bytes(image_bytes, rgb=False):
+    """
+    Decode JPEG/PNG bytes into a uint8 image.
+
+    Args:
+        image_bytes: Encoded image (bytes, bytearray or memoryview)
+        rgb: Return RGB instead of OpenCV's native BGR
+
+    Returns:
+        (H, W, 3) uint8 array, BGR unless rgb=True
+    """
+    if not image_bytes:
+        raise FrameDecodeError('Empty image data')
+
+    buffer = np.frombuffer(image_bytes, dtype=np.uint8)
+    image = cv2.imdecode(buffer, cv2.IMREAD_COLOR)
+    if image is None:
+        raise FrameDecodeError('Could not decode image data (expected JPEG or PNG)')
+
+    if rgb:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    return image
+
+
+def read_frame_from_request(req, base64_field='image_base64', rgb=False):
+    """
+    Pull a single frame out of a Flask request.
+
+    Args:
+        req: flask.request
+        base64_field: JSON field holding the base64 image for legacy clients
+        rgb: Return RGB instead of BGR
+
+    Returns:
+        {
+            'image': (H, W, 3) uint8 array,
+            'params': dict of the remaining request parameters,
+            'source': 'binary' | 'multipart' | 'base64',
+            'encoded_bytes': size of the encoded image
+        }
+
+    Raises:
+        FrameDecodeError: No frame in the request or the frame cannot be decoded
+    """
+    content_type = (req.mimetype or '').lower()
+
+    if content_type in RAW_IMAGE_CONTENT_TYPES:
+        image_bytes = req.get_data(cache=False)
+        params = req.args.to_dict()
+        source = 'binary'
+
+    elif content_type == 'multipart/form-data':
+        file_storage = None
+        for field in MULTIPART_FILE_FIELDS:
+            if field in req.files:
+                file_storage = req.files[field]
+                break
+        if file_storage is None:
+            raise FrameDecodeError(
+                f"multipart request needs an image in one of: {', '.join(MULTIPART_FILE_FIELDS)}"
+            )
+        image_bytes = file_storage.read()
+        params = req.args.to_dict()
+        params.update(req.form.to_dict())
+        source = 'multipart'
+
+    else:
+        data = req.get_json(silent=True)
+        if not data:
+            raise FrameDecodeError(
+                f"No frame provided: send raw image bytes, a multipart 'frame' file, "
+                f"or JSON with '{base64_field}'"
+            )
+        if not isinstance(data, dict):
+            raise FrameDecodeError(f'JSON body must be an object with {base64_field}')
+        image_base64 = data.get(base64_field)
+        if not image_base64:
+            raise FrameDecodeError(f'{base64_field} is required')
+        try:
+            image_bytes = base64.b64decode(image_base64)
+        except Exception as e:
+            raise FrameDecodeError(f'Invalid base64 image data: {e}')
+        params = {k: v for k, v in data.items() if k != base64_field}
+        source = 'base64'
+
+    image = decode_image_bytes(image_bytes, rgb=rgb)
+    logger.debug("[INGEST] %s frame: %d encoded bytes -> %s", source, len(image_bytes), image.shape)
+
+    return {
+        'image': image,
+        'params': params,
+        'source': source,
+        'encoded_bytes': len(image_bytes),
+    }
+
+
+def read_frames_from_request(req, base64_field='image_base64', rgb=False):
+    """
+    Pull a list of frames out of a Flask request (for the batch endpoints).
+
+    Accepted shapes:
+    - multipart/form-data with one file per frame in the 'frames' field
+      (repeated), optional 'frame_numbers' form field ("0,5,10" or a JSON list)
+    - JSON: {"frames": [{"image_base64": "...", "frame_number": 0}, ...]}
+      (list entries may also be bare base64 strings)
+
+    Args:
+        req: flask.request
+        base64_field: Per-frame JSON field holding the base64 image
+        rgb: Return RGB instead of BGR
+
+    Returns:
+        {
+            'frames': [{'image': ndarray, 'frame_number': int, 'encoded_bytes': int}, ...],
+            'params': dict of the remaining request parameters,
+            'source': 'multipart' | 'base64'
+        }
+
+    Raises:
+        FrameDecodeError: No frames in the request or a frame cannot be decoded
+    """
+    content_type = (req.mimetype or '').lower()
+    encoded_frames = []  # (image_bytes, frame_number or None)
+
+    if content_type == 'multipart/form-data':
+        files = req.files.getlist('frames')
+        if not files:
+            raise FrameDecodeError("multipart batch request needs one or more 'frames' files")
+        params = req.args.to_dict()
+        params.update(req.form.to_dict())
+        frame_numbers = _parse_frame_numbers(params.pop('frame_numbers', None))
+        for i, file_storage in enumerate(files):
+            frame_number = frame_numbers[i] if frame_numbers and i < len(frame_numbers) else None
+            encoded_frames.append((file_storage.read(), frame_number))
+        source = 'multipart'
+
+    else:
+        data = req.get_json(silent=True)
+        if not isinstance(data, dict) or not isinstance(data.get('frames'), list) or not data['frames']:
+            raise FrameDecodeError(
+                f"No frames provided: send multipart 'frames' files or JSON "
+                f"{{\"frames\": [{{\"{base64_field}\": ...}}]}}"
+            )
+        for i, entry in enumerate(data['frames']):
+            if isinstance(entry, str):
+                image_base64, frame_number = entry, None
+            elif isinstance(entry, dict):
+                image_base64 = entry.get(base64_field)
+                frame_number = entry.get('frame_number', entry.get('frameNumber'))
+            else:
+                raise FrameDecodeError(f'Frame {i}: expected an object or base64 string')
+            if not image_base64:
+                raise FrameDecodeError(f'Frame {i}: {base64_field} is required')
+            if frame_number is not None:
+                try:
+                    frame_number = int(frame_number)
+                except (TypeError, ValueError):
+                    raise FrameDecodeError(f'Frame {i}: invalid frame_number {frame_number!r}')
+            try:
+                encoded_frames.append((base64.b64decode(image_base64), frame_number))
+            except Exception as e:
+                raise FrameDecodeError(f'Frame {i}: invalid base64 image data: {e}')
+        params = {k: v for k, v in data.items() if k != 'frames'}
+        source = 'base64'
+
+    start_frame = get_frame_number({'frame_number': params.get('start_frame', 0)})
+    frames = []
+    for i, (image_bytes, frame_number) in enumerate(encoded_frames):
+        try:
+            image = decode_image_bytes(image_bytes, rgb=rgb)
+        except FrameDecodeError as e:
+            raise FrameDecodeError(f'Frame {i}: {e}')
+        frames.append({
+            'image': image,
+            'frame_number': int(frame_number) if frame_number is not None else start_frame + i,
+            'encoded_bytes': len(image_bytes),
+        })
+
+    return {'frames': frames, 'params': params, 'source': source}
+
+
+def _parse_frame_numbers(value):
+    """Parse '0,5,10' or '[0, 5, 10]' into a list of ints (None when absent)"""
+    if not value:
+        return None
+    try:
+        if value.strip().startswith('['):
+            return [int(v) for v in json.loads(value)]
+        return [int(v) for v in value.split(',') if v.strip()]
+    except (TypeError, ValueError) as e:
+        raise FrameDecodeError(f'Invalid frame_numbers: {e}')
+
+
+def get_frame_number(params, default=0):
+    """Read the frame number from either snake_case or the Node proxy's camelCase field"""
+    value = params.get('frame_number', params.get('frameNumber', default))
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def get_bool_param(params, name, default=False):
+    """Read a boolean that may arrive as a JSON bool or as a query/form string"""
+    value = params.get(name, default)
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes', 'on')
+    return bool(value)
@@ -64,6 +64,14 @@ if HAS_TORCH and USE_HMR2:
     except Exception as e:
         print(f"[POSE] HMR2 not available: {e}")
 
+# Batched ViTDet/HMR2 helpers (cam_crop_to_full is re-exported for existing importers)
+from batch_inference import cam_crop_to_full, detect_people_batch, run_hmr2_batch, full_image_box
+from smpl_params import encode_smpl_params
+
+# Batch sizes for multi-frame inference
+DETECTOR_BATCH_SIZE = int(os.environ.get('POSE_DETECTOR_BATCH_SIZE', '4'))
+HMR2_BATCH_SIZE = int(os.environ.get('POSE_HMR2_BATCH_SIZE', '16'))
+
 # SMPL joint names (24 joints from 4D-Humans)
 SMPL_JOINT_NAMES = [
     'pelvis', 'left_hip', 'right_hip', 'spine1',
@@ -75,31 +83,12 @@ SMPL_JOINT_NAMES = [
 ]
 
 
-def cam_crop_to_full(cam_bbox, box_center, box_size, img_size, focal_length=5000.):
-    """
-    Convert camera parameters from crop space to full image space.
-    
-    This is the EXACT function from 4D-Humans/hmr2/utils/renderer.py
-    
-    Args:
-        cam_bbox: (B, 3) tensor with [s, tx, ty] in crop space
-        box_center: (B, 2) tensor with crop center in image pixels
-        box_size: (B,) tensor with crop size in pixels
-        img_size: (B, 2) tensor with [width, height] of full image
-        focal_length: focal length for perspective projection
-    
-    Returns:
-        (B, 3) tensor with [tx, ty, tz] camera translation in full image space
-    """
-    img_w, img_h = img_size[:, 0], img_size[:, 1]
-    cx, cy, b = box_center[:, 0], box_center[:, 1], box_size
-    w_2, h_2 = img_w / 2., img_h / 2.
-    bs = b * cam_bbox[:, 0] + 1e-9
-    tz = 2 * focal_length / bs
-    tx = (2 * (cx - w_2) / bs) + cam_bbox[:, 1]
-    ty = (2 * (cy - h_2) / bs) + cam_bbox[:, 2]
-    full_cam = torch.stack([tx, ty, tz], dim=-1)
-    return full_cam
+def _fallback_detections(images):
+    """Full-image 'detections' for when ViTDet is unavailable or fails"""
+    return [
+        {'boxes': full_image_box(image), 'scores': np.zeros(1, dtype=np.float32), 'fallback': True}
+        for image in images
+    ]
 
 
 class HybridPoseDetector:
@@ -121,6 +110,13 @@ class HybridPoseDetector:
         self.vitdet_detector = None  # Cache ViTDet detector
         self.vitdet_loaded = False
         
+        # Results of the most recent call, for single-threaded callers. Anything that can
+        # run next to other requests uses the return values of detect_pose_people() instead.
+        self._last_hmr2_result = None
+        self._last_hmr2_persons = []
+        self._last_detections = None  # detect_people_batch() output, None when boxes were given
+        self._last_batch_forward_passes = 0
+        
         self.use_3d = HAS_TORCH and HAS_HMR2  # Works on CPU or CUDA
         self.model_version = "4d-humans-hmr2-demo" if self.use_3d else "disabled"
         
@@ -232,160 +228,173 @@ class HybridPoseDetector:
             pil_image = pil_image.convert('RGB')
         return pil_image, np.array(pil_image)
     
-    def _run_hmr2_demo_style(self, image_np):
+    def _detect_person_boxes(self, images):
         """
-        Run HMR2 exactly as in demo.py
+        ViTDet person detections for each image (EXACT filtering as demo.py),
+        falling back to the full image when ViTDet is unavailable or finds nobody.
         
-        Key steps from demo.py:
-        1. Detect humans with ViTDet
-        2. Create ViTDetDataset with detected boxes
-        3. Run HMR2 model
-        4. Use cam_crop_to_full() for camera conversion
+        Returns:
+            list of detect_people_batch() dicts ('boxes', 'scores', 'fallback'), one per image
+        """
+        try:
+            # Use cached ViTDet detector
+            detector = self._load_vitdet()
+            
+            if detector is None:
+                logger.info("[HMR2] ViTDet not available, using full image as bounding box")
+                return _fallback_detections(images)
+            
+            logger.info("[HMR2] Running ViTDet inference on %d image(s)...", len(images))
+            detections = detect_people_batch(detector, images, batch_size=DETECTOR_BATCH_SIZE)
+            logger.info("[HMR2] ✓ ViTDet inference complete")
+            
+            for i, det in enumerate(detections):
+                if det['fallback']:
+                    logger.info("[HMR2] Image %d: ViTDet found no persons, using full image", i)
+                else:
+                    logger.info("[HMR2] Image %d: ✓ ViTDet found %d persons", i, len(det['boxes']))
+                    logger.info("[HMR2] Box bounds: %s", det['boxes'])
+            
+            return detections
+        
+        except ImportError as e:
+            logger.error("[HMR2] ImportError: %s", str(e), exc_info=True)
+            logger.info("[HMR2] ViTDet not available, using full image as bounding box")
+        except Exception as e:
+            logger.error("[HMR2] Exception during ViTDet detection: %s", str(e), exc_info=True)
+            logger.warning("[HMR2] ViTDet detection failed, using full image")
+        
+        return _fallback_detections(images)
+    
+    def _run_hmr2_batch(self, images, boxes_per_image=None):
         """
-        logger.info("[HMR2] _run_hmr2_demo_style called: use_3d=%s, HAS_TORCH=%s, HAS_HMR2=%s, device=%s", 
-                   self.use_3d, HAS_TORCH, HAS_HMR2, self.device)
+        Run ViTDet + HMR2 over several images at once.
+        
+        Detection runs over all images in chunked detector calls, then every person
+        crop from every image is stacked into as few HMR2 forward passes as possible.
+        
+        Args:
+            images: list of (H, W, 3) uint8 images
+            boxes_per_image: Optional precomputed person boxes (skips ViTDet)
+        
+        Returns:
+            (persons_per_image, detections, forward_passes) - persons_per_image is a list (one per
+            image) of per-person result dicts, or None if HMR2 is unavailable; detections is the
+            _detect_person_boxes() output, None when boxes were given
+        """
+        logger.info("[HMR2] _run_hmr2_batch called: %d image(s), use_3d=%s, HAS_TORCH=%s, HAS_HMR2=%s, device=%s",
+                   len(images), self.use_3d, HAS_TORCH, HAS_HMR2, self.device)
         
         if not self.use_3d or not HMR2_MODULES:
             logger.warning("[HMR2] Skipped: use_3d=%s, HMR2_MODULES=%s", self.use_3d, HMR2_MODULES is not None)
-            return None
+            return None, None, 0
         
-        logger.info("[HMR2] Starting HMR2 detection (demo-style)")
         self._load_hmr2()
         if not self.model_loaded:
             logger.error("[HMR2] Model failed to load")
-            return None
+            return None, None, 0
         
+        detections = None
         try:
-            import cv2
-            import sys
             hmr2_path = os.path.join(os.path.dirname(__file__), '4D-Humans')
             if hmr2_path not in sys.path:
                 sys.path.insert(0, hmr2_path)
-            from hmr2.datasets.vitdet_dataset import ViTDetDataset
-            recursive_to = HMR2_MODULES['recursive_to']
-            
-            h, w = image_np.shape[:2]
-            logger.info("[HMR2] Image shape: %dx%d", w, h)
-            
-            # Step 1: Try ViTDet detection (EXACT as demo.py), fallback to full image
-            boxes = None
-            try:
-                # Use cached ViTDet detector
-                detector = self._load_vitdet()
-                
-                if detector is not None:
-                    logger.info("[HMR2] Running ViTDet inference on image...")
-                    det_out = detector(image_np)
-                    det_instances = det_out['instances']
-                    
-                    # Filter for persons (class 0) with score > 0.5 - EXACT as demo.py
-                    valid_idx = (det_instances.pred_classes == 0) & (det_instances.scores > 0.5)
-                    boxes_detected = det_instances.pred_boxes.tensor[valid_idx].cpu().numpy()
-                    
-                    logger.info("[HMR2] ✓ ViTDet inference complete")
-                    logger.info("[HMR2] Total instances: %d, Valid persons: %d", 
-                               len(det_instances), len(boxes_detected))
-                    
-                    if len(boxes_detected) > 0:
-                        logger.info("[HMR2] ✓ ViTDet found %d persons", len(boxes_detected))
-                        logger.info("[HMR2] Box bounds: %s", boxes_detected)
-                        boxes = boxes_detected.astype(np.float32)
-                    else:
-                        logger.info("[HMR2] ViTDet found no persons, using full image")
-                        boxes = np.array([[0, 0, w, h]], dtype=np.float32)
-                else:
-                    logger.info("[HMR2] ViTDet not available, using full image as bounding box")
-                    boxes = np.array([[0, 0, w, h]], dtype=np.float32)
-                    
-            except ImportError as e:
-                logger.error("[HMR2] ImportError: %s", str(e), exc_info=True)
-                logger.info("[HMR2] ViTDet not available, using full image as bounding box")
-                boxes = np.array([[0, 0, w, h]], dtype=np.float32)
-            except Exception as e:
-                logger.error("[HMR2] Exception during ViTDet detection: %s", str(e), exc_info=True)
-                logger.warning("[HMR2] ViTDet detection failed, using full image")
-                boxes = np.array([[0, 0, w, h]], dtype=np.float32)
-            
-            # Step 2: Create ViTDetDataset - exactly as in demo.py
-            logger.info("[HMR2] Creating ViTDetDataset with %d boxes", len(boxes))
-            dataset = ViTDetDataset(self.hmr2_cfg, image_np, boxes)
-            dataloader = torch.utils.data.DataLoader(dataset, batch_size=1, shuffle=False, num_workers=0)
             
-            # Step 3: Run HMR2 model - exactly as in demo.py
-            logger.info("[HMR2] Running HMR2 model inference...")
-            
-            with torch.no_grad():
-                for batch in dataloader:
-                    batch = recursive_to(batch, self.device)
-                    output = self.hmr2_model(batch)
-                    
-                    # Step 4: Extract predictions - exactly as in demo.py
-                    pred_cam = output['pred_cam']  # (B, 3) - [s, tx, ty] in crop space
-                    box_center = batch["box_center"].float()  # (B, 2)
-                    box_size = batch["box_size"].float()  # (B,)
-                    img_size = batch["img_size"].float()  # (B, 2)
-                    
-                    # Step 5: Compute scaled focal length - exactly as in demo.py
-                    # CRITICAL: This must match the focal length used in projection
-                    scaled_focal_length = self.hmr2_cfg.EXTRA.FOCAL_LENGTH / self.hmr2_cfg.MODEL.IMAGE_SIZE * img_size.max()
-                    
-                    # Step 6: Convert camera to full image space - THE KEY FUNCTION
-                    # This ensures mesh and keypoints use identical camera parameters
-                    pred_cam_t_full = cam_crop_to_full(
-                        pred_cam, 
-                        box_center, 
-                        box_size, 
-                        img_size, 
-                        scaled_focal_length
-                    ).detach().cpu().numpy()
-                    
-                    logger.info("[HMR2] ===== CAMERA CONVERSION (demo-style) =====")
-                    logger.info("[HMR2] pred_cam (crop space): %s", pred_cam[0].cpu().numpy())
-                    logger.info("[HMR2] box_center: %s", box_center[0].cpu().numpy())
-                    logger.info("[HMR2] box_size: %.1f", box_size[0].cpu().numpy())
-                    logger.info("[HMR2] img_size: %s", img_size[0].cpu().numpy())
-                    logger.info("[HMR2] scaled_focal_length: %.1f", scaled_focal_length.cpu().numpy())
-                    logger.info("[HMR2] pred_cam_t_full: %s", pred_cam_t_full[0])
-                    
-                    # Extract all outputs
-                    pred_vertices = output['pred_vertices'][0].cpu().numpy()
-                    pred_cam_t = output['pred_cam_t'][0].cpu().numpy()  # Original crop-space cam_t
-                    
-                    # Get 3D joints
-                    joints_3d = None
-                    if 'pred_keypoints_3d' in output:
-                        joints_3d = output['pred_keypoints_3d'][0].cpu().numpy()
-                    
-                    # Get SMPL faces
-                    smpl_faces = None
-                    if hasattr(self.hmr2_model, 'smpl'):
-                        smpl_faces = self.hmr2_model.smpl.faces.astype(np.int32)
-                    
-                    logger.info("[HMR2] ✓ Detection complete")
-                    logger.info("[HMR2] Vertices: %s", pred_vertices.shape)
-                    logger.info("[HMR2] Joints 3D: %s", joints_3d.shape if joints_3d is not None else None)
-                    
-                    return {
-                        'vertices': pred_vertices,
-                        'cam_t_full': pred_cam_t_full[0],  # Full image camera translation
-                        'cam_t_crop': pred_cam_t,  # Crop space camera translation
-                        'pred_cam': pred_cam[0].cpu().numpy(),  # Raw [s, tx, ty]
-                        'joints_3d': joints_3d,
-                        'faces': smpl_faces,
-                        'box_center': box_center[0].cpu().numpy(),
-                        'box_size': float(box_size[0].cpu().numpy()),
-                        'img_size': img_size[0].cpu().numpy(),
-                        'scaled_focal_length': float(scaled_focal_length.cpu().numpy()),
-                        'focal_length': float(self.hmr2_cfg.EXTRA.FOCAL_LENGTH),
-                        'model_image_size': int(self.hmr2_cfg.MODEL.IMAGE_SIZE),
-                    }
-            
-            return None
+            if boxes_per_image is None:
+                detections = self._detect_person_boxes(images)
+                boxes_per_image = [det['boxes'] for det in detections]
             
+            logger.info("[HMR2] Running HMR2 model inference on %d crops...",
+                       sum(len(boxes) for boxes in boxes_per_image))
+            persons_per_image, forward_passes = run_hmr2_batch(
+                self.hmr2_model,
+                self.hmr2_cfg,
+                images,
+                boxes_per_image,
+                self.device,
+                HMR2_MODULES['recursive_to'],
+                batch_size=HMR2_BATCH_SIZE,
+            )
+            return persons_per_image, detections, forward_passes
+        
         except Exception as e:
             logger.error("[HMR2] Error: %s", str(e), exc_info=True)
-            return None
+            return None, detections, 0
+    
+    def _run_hmr2_demo_style(self, image_np, person_boxes=None):
+        """
+        Run HMR2 exactly as in demo.py
+        
+        Key steps from demo.py:
+        1. Detect humans with ViTDet
+        2. Create ViTDetDataset with detected boxes
+        3. Run HMR2 model
+        4. Use cam_crop_to_full() for camera conversion
+        
+        Args:
+            image_np: (H, W, 3) uint8 RGB image
+            person_boxes: Optional (N, 4) xyxy boxes to use instead of running ViTDet
+                          (e.g. propagated from the previous video frame)
+        
+        Returns:
+            (first detected person or None, all persons, detections - see _run_hmr2_batch())
+        """
+        h, w = image_np.shape[:2]
+        logger.info("[HMR2] Starting HMR2 detection (demo-style), image shape: %dx%d", w, h)
+        
+        boxes_per_image = [np.asarray(person_boxes, dtype=np.float32)] if person_boxes is not None else None
+        persons_per_image, detections, _ = self._run_hmr2_batch([image_np], boxes_per_image)
+        persons = persons_per_image[0] if persons_per_image else []
+        if not persons:
+            return None, persons, detections
+        
+        result = persons[0]
+        
+        logger.info("[HMR2] ===== CAMERA CONVERSION (demo-style) =====")
+        logger.info("[HMR2] pred_cam (crop space): %s", result['pred_cam'])
+        logger.info("[HMR2] box_center: %s", result['box_center'])
+        logger.info("[HMR2] box_size: %.1f", result['box_size'])
+        logger.info("[HMR2] img_size: %s", result['img_size'])
+        logger.info("[HMR2] scaled_focal_length: %.1f", result['scaled_focal_length'])
+        logger.info("[HMR2] pred_cam_t_full: %s", result['cam_t_full'])
+        logger.info("[HMR2] ✓ Detection complete")
+        logger.info("[HMR2] Vertices: %s", result['vertices'].shape)
+        logger.info("[HMR2] Joints 3D: %s", result['joints_3d'].shape if result['joints_3d'] is not None else None)
+        
+        return result, persons, detections
 
+    def smpl_forward(self, global_orient, body_pose, betas):
+        """
+        Batched SMPL forward pass with HMR2's SMPL layer (same joints as pred_keypoints_3d).
+        
+        Args:
+            global_orient: (T, 1, 3, 3) rotation matrices
+            body_pose: (T, 23, 3, 3) rotation matrices
+            betas: (T, 10) shape coefficients
+        
+        Returns:
+            (vertices (T, 6890, 3), joints (T, J, 3)) numpy float32 arrays
+        """
+        self._load_hmr2()
+        if not self.model_loaded:
+            raise RuntimeError("HMR2 model not loaded - SMPL forward unavailable")
+        
+        with torch.no_grad():
+            smpl_output = self.hmr2_model.smpl(
+                global_orient=torch.as_tensor(global_orient, dtype=torch.float32, device=self.device),
+                body_pose=torch.as_tensor(body_pose, dtype=torch.float32, device=self.device),
+                betas=torch.as_tensor(betas, dtype=torch.float32, device=self.device),
+                pose2rot=False,
+            )
+        return smpl_output.vertices.cpu().numpy(), smpl_output.joints.cpu().numpy()
+    
+    def smpl_rest_vertices(self):
+        """SMPL template (rest-pose) vertices as a (6890, 3) numpy array, e.g. for mesh_lod"""
+        self._load_hmr2()
+        if not self.model_loaded:
+            raise RuntimeError("HMR2 model not loaded - SMPL template unavailable")
+        return self.hmr2_model.smpl.v_template.detach().cpu().numpy()
+    
     def _project_vertices_to_2d(self, vertices, cam_t_full, focal_length, img_size):
         """
         Project 3D vertices to 2D using perspective projection.
@@ -466,25 +475,107 @@ class HybridPoseDetector:
     
     def detect_pose(self, image_base64: str, frame_number: int = 0) -> dict:
         """Detect pose using 4D-Humans (demo-style implementation)"""
-        logger.info("=" * 80)
-        logger.info("=== DETECT_POSE START (frame %d) ===", frame_number)
-        logger.info("=" * 80)
         start_time = time.time()
         
         try:
             pil_image, image_np = self._decode_image(image_base64)
-            h, w = image_np.shape[:2]
-            logger.info("✓ Image decoded: %dx%d", w, h)
         except Exception as e:
             logger.error("✗ Failed to decode image: %s", str(e))
             return {'error': f'Failed to decode image: {str(e)}', 'frame_number': frame_number}
         
+        return self.detect_pose_image(image_np, frame_number, start_time=start_time)
+    
+    def detect_pose_image(self, image_np: np.ndarray, frame_number: int = 0, start_time: float = None,
+                          person_boxes: np.ndarray = None, mesh_arrays: bool = False) -> dict:
+        """Detect pose on an already decoded image (arguments as detect_pose_people(), result dict only)"""
+        result, _, _ = self.detect_pose_people(image_np, frame_number, start_time=start_time,
+                                               person_boxes=person_boxes, mesh_arrays=mesh_arrays)
+        return result
+    
+    def detect_pose_people(self, image_np: np.ndarray, frame_number: int = 0, start_time: float = None,
+                           person_boxes: np.ndarray = None, mesh_arrays: bool = False):
+        """
+        Detect pose on an already decoded image, returning every person found.
+        
+        Args:
+            image_np: (H, W, 3) uint8 RGB image
+            frame_number: Frame index echoed back in the result
+            start_time: Request start time, so decode time is included in processing_time_ms
+            person_boxes: Optional (N, 4) xyxy person boxes - skips ViTDet (see box_propagation.py)
+            mesh_arrays: Keep vertices, joints and faces as NumPy arrays instead of lists
+                         (for the binary wire format in mesh_wire.py, or jsonify via json_response.py)
+        
+        Returns:
+            (result, persons, detections) - the pose result dict for the first person, every
+            per-person HMR2 dict (first = result's person) and the ViTDet detections
+            (None when person_boxes were given)
+        """
+        logger.info("=" * 80)
+        logger.info("=== DETECT_POSE START (frame %d) ===", frame_number)
+        logger.info("=" * 80)
+        if start_time is None:
+            start_time = time.time()
+        
+        h, w = image_np.shape[:2]
+        logger.info("✓ Image: %dx%d", w, h)
+        
         # Run HMR2 (demo-style)
-        hmr2_result = self._run_hmr2_demo_style(image_np)
+        hmr2_result, persons, detections = self._run_hmr2_demo_style(image_np, person_boxes=person_boxes)
         self._last_hmr2_result = hmr2_result
+        self._last_hmr2_persons = persons
+        self._last_detections = detections
         
         processing_time_ms = (time.time() - start_time) * 1000
+        result = self._build_pose_result(hmr2_result, frame_number, w, h, processing_time_ms,
+                                         mesh_arrays=mesh_arrays)
+        
+        logger.info("=== DETECT_POSE END (frame %d) ===", frame_number)
+        logger.info("Keypoints: %d, Has 3D: %s, Time: %.0fms", 
+                   result.get('keypoint_count', 0), result.get('has_3d'), processing_time_ms)
         
+        return result, persons, detections
+    
+    def detect_pose_batch(self, images, frame_numbers=None, start_time=None, mesh_arrays=False) -> list:
+        """
+        Detect pose on several decoded images with batched ViTDet and HMR2 passes.
+        
+        Args:
+            images: list of (H, W, 3) uint8 RGB images
+            frame_numbers: Frame index for each image (defaults to 0..N-1)
+            start_time: Request start time
+            mesh_arrays: As detect_pose_image()
+        
+        Returns:
+            list of per-frame results in the same format as detect_pose_image().
+            processing_time_ms is the time for the whole batch.
+        """
+        if start_time is None:
+            start_time = time.time()
+        if frame_numbers is None:
+            frame_numbers = list(range(len(images)))
+        
+        logger.info("=== DETECT_POSE_BATCH START (%d frames) ===", len(images))
+        
+        persons_per_image, self._last_detections, self._last_batch_forward_passes = (
+            self._run_hmr2_batch(images) if images else ([], None, 0)
+        )
+        processing_time_ms = (time.time() - start_time) * 1000
+        
+        results = []
+        for i, image_np in enumerate(images):
+            h, w = image_np.shape[:2]
+            persons = persons_per_image[i] if persons_per_image else []
+            hmr2_result = persons[0] if persons else None
+            result = self._build_pose_result(hmr2_result, frame_numbers[i], w, h, processing_time_ms,
+                                             mesh_arrays=mesh_arrays)
+            result['num_persons_detected'] = len(persons)
+            results.append(result)
+        
+        logger.info("=== DETECT_POSE_BATCH END (%d frames, %.0fms) ===", len(images), processing_time_ms)
+        return results
+    
+    def _build_pose_result(self, hmr2_result, frame_number, w, h, processing_time_ms, mesh_arrays=False) -> dict:
+        """Build the JSON-ready pose result for one frame from an HMR2 person result (mesh arrays kept as NumPy if mesh_arrays)"""
         result = {
             'frame_number': frame_number,
             'frame_width': w,
@@ -530,7 +621,10 @@ class HybridPoseDetector:
             
             result['keypoints'] = keypoints
             result['keypoint_count'] = len(keypoints)
-            result['joints_3d_raw'] = joints_3d.tolist() if joints_3d is not None else None
+            if joints_3d is None:
+                result['joints_3d_raw'] = None
+            else:
+                result['joints_3d_raw'] = joints_3d if mesh_arrays else joints_3d.tolist()
             result['joint_angles_3d'] = self._compute_angles_from_3d(joints_3d)
             result['camera_translation'] = cam_t_full.tolist() if cam_t_full is not None else None
             result['scaled_focal_length'] = scaled_focal
@@ -540,18 +634,17 @@ class HybridPoseDetector:
             faces = hmr2_result.get('faces')
             if vertices is not None:
                 result['mesh_vertices'] = vertices.shape[0]
-                result['mesh_vertices_data'] = vertices.tolist()
+                result['mesh_vertices_data'] = vertices if mesh_arrays else vertices.tolist()
             if faces is not None:
-                result['mesh_faces_data'] = faces.tolist()
+                result['mesh_faces_data'] = faces if mesh_arrays else faces.tolist()
+            # Compact axis-angle SMPL params (~85 floats) - enough to rebuild the mesh client side
+            result['smpl_params'] = encode_smpl_params(hmr2_result.get('smpl_params'), cam_t_full,
+                                                       scaled_focal, img_size)
         else:
             result['keypoints'] = []
             result['keypoint_count'] = 0
             result['error'] = 'HMR2 detection failed'
         
-        logger.info("=== DETECT_POSE END (frame %d) ===", frame_number)
-        logger.info("Keypoints: %d, Has 3D: %s, Time: %.0fms", 
-                   result.get('keypoint_count', 0), result.get('has_3d'), processing_time_ms)
-        
         return result
     
     def detect_pose_with_visualization(self, image_base64: str, frame_number: int = 0) -> dict:
@@ -563,85 +656,143 @@ class HybridPoseDetector:
         - cam_crop_to_full() for camera conversion
         - Perspective projection with scaled focal length
         """
-        import cv2
+        start_time = time.time()
+        
         try:
-            from mesh_renderer import SMPLMeshRenderer
-        except ImportError as e:
-            logger.error("[VIZ] Failed to import SMPLMeshRenderer: %s", str(e))
-            SMPLMeshRenderer = None
+            pil_image, image_np = self._decode_image(image_base64)
+        except Exception as e:
+            logger.error("✗ Failed to decode image: %s", str(e))
+            return {'error': f'Failed to decode image: {str(e)}', 'frame_number': frame_number}
+        
+        return self.detect_pose_with_visualization_image(image_np, frame_number, start_time=start_time)
+    
+    def detect_pose_with_visualization_image(self, image_np: np.ndarray, frame_number: int = 0,
+                                             start_time: float = None, mesh_arrays: bool = False) -> dict:
+        """
+        Detect pose and render the mesh overlay on an already decoded image.
+        
+        Args:
+            image_np: (H, W, 3) uint8 RGB image
+            frame_number: Frame index echoed back in the result
+            start_time: Request start time, so decode time is included in processing_time_ms
+            mesh_arrays: As detect_pose_image()
+        """
+        import cv2
+        
+        result, image_bgr, _ = self.detect_pose_with_visualization_frame(image_np, frame_number, start_time=start_time,
+                                                                         mesh_arrays=mesh_arrays)
+        
+        # Encode result
+        image_rgb = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB)
+        pil_result = Image.fromarray(image_rgb)
+        buffer = io.BytesIO()
+        pil_result.save(buffer, format='PNG')
+        viz_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
+        
+        result['visualization'] = f"data:image/png;base64,{viz_base64}"
+        result['visualization_base64'] = viz_base64  # For video processor carousel frames
+        
+        return result
+    
+    def detect_pose_with_visualization_frame(self, image_np: np.ndarray, frame_number: int = 0,
+                                             start_time: float = None, image_bgr: np.ndarray = None,
+                                             mesh_arrays: bool = False):
+        """
+        Detect pose and render the mesh overlay without any image encoding.
+        
+        Used by VideoMeshProcessor so a video frame is decoded once by OpenCV and
+        only encoded again by the video writer.
+        
+        Args:
+            image_np: (H, W, 3) uint8 RGB image fed to the detector
+            frame_number: Frame index echoed back in the result
+            start_time: Request start time
+            image_bgr: The same frame in BGR to draw on (e.g. straight from cv2.VideoCapture).
+                       Converted from image_np when not given. Drawn on in place.
+            mesh_arrays: As detect_pose_image()
+        
+        Returns:
+            (result, visualization_bgr, hmr2_result) - result is the detect_pose_image() dict
+            plus 'mesh_rendered'; hmr2_result is the raw person dict (or None)
+        """
+        import cv2
         
         logger.info("[VIZ] ===== VISUALIZATION (demo-style) frame %d =====", frame_number)
         
         # Get pose detection
-        result = self.detect_pose(image_base64, frame_number)
+        result, persons, _ = self.detect_pose_people(image_np, frame_number, start_time=start_time,
+                                                     mesh_arrays=mesh_arrays)
+        hmr2_result = persons[0] if persons else None
         
-        # Decode image for visualization
-        try:
-            image_data = base64.b64decode(image_base64)
-            pil_image = Image.open(io.BytesIO(image_data))
-            if pil_image.mode != 'RGB':
-                pil_image = pil_image.convert('RGB')
-            image_np = np.array(pil_image)
+        if image_bgr is None:
             image_bgr = cv2.cvtColor(image_np, cv2.COLOR_RGB2BGR)
-        except Exception as e:
-            result['visualization_error'] = str(e)
-            return result
+        
+        image_bgr = self.render_visualization(image_bgr, result, hmr2_result, frame_number, persons=persons)
+        return result, image_bgr, hmr2_result
+    
+    def render_visualization(self, image_bgr: np.ndarray, result: dict, hmr2_result: dict,
+                             frame_number: int = 0, persons: list = None) -> np.ndarray:
+        """
+        Draw the mesh overlay, skeleton and info panels onto a BGR frame.
+        
+        Args:
+            persons: Every HMR2 person in the frame (run_hmr2_batch() dicts); all
+                     are rendered in one pass with a colour each. Defaults to [hmr2_result].
+        
+        Sets result['mesh_rendered'] and result['mesh_persons_rendered'].
+        Returns the rendered BGR frame.
+        """
+        import cv2
+        try:
+            from mesh_renderer import SMPLMeshRenderer
+        except ImportError as e:
+            logger.error("[VIZ] Failed to import SMPLMeshRenderer: %s", str(e))
+            SMPLMeshRenderer = None
         
         h, w = image_bgr.shape[:2]
         mesh_rendered = False
         
         # Render mesh using exact 4D-Humans pyrender approach
-        logger.info("[VIZ] Mesh rendering check: SMPLMeshRenderer=%s, has_3d=%s, _last_hmr2_result=%s", 
-                   SMPLMeshRenderer is not None, result.get('has_3d'), 
-                   hasattr(self, '_last_hmr2_result') and self._last_hmr2_result is not None)
+        logger.info("[VIZ] Mesh rendering check: SMPLMeshRenderer=%s, has_3d=%s, hmr2_result=%s", 
+                   SMPLMeshRenderer is not None, result.get('has_3d'), hmr2_result is not None)
         
-        if SMPLMeshRenderer and result.get('has_3d') and hasattr(self, '_last_hmr2_result') and self._last_hmr2_result:
-            hmr2_result = self._last_hmr2_result
-            
+        if SMPLMeshRenderer and result.get('has_3d') and hmr2_result:
             try:
-                vertices = hmr2_result.get('vertices')
-                faces = hmr2_result.get('faces')
-                cam_t_full = hmr2_result.get('cam_t_full')
+                if not persons:
+                    persons = [hmr2_result]
+                meshes = []
+                for person in persons:
+                    faces = person.get('faces') if person.get('faces') is not None else hmr2_result.get('faces')
+                    if person.get('vertices') is not None and faces is not None and person.get('cam_t_full') is not None:
+                        meshes.append((person['vertices'], faces, person['cam_t_full']))
                 scaled_focal = hmr2_result.get('scaled_focal_length')
                 
-                logger.info("[VIZ] Mesh data check: vertices=%s, faces=%s, cam_t_full=%s, scaled_focal=%s",
-                           vertices is not None, faces is not None, cam_t_full is not None, scaled_focal is not None)
+                logger.info("[VIZ] Mesh data check: %d/%d persons with vertices, faces and cam_t_full, scaled_focal=%s",
+                           len(meshes), len(persons), scaled_focal is not None)
                 
-                if vertices is not None and faces is not None and cam_t_full is not None:
-                    logger.info("[VIZ] Rendering %d vertices with pyrender (exact 4D-Humans)", len(vertices))
-                    logger.info("[VIZ] cam_t_full: %s", cam_t_full)
+                if meshes:
+                    logger.info("[VIZ] Rendering %d person(s) in one pass (exact 4D-Humans camera)", len(meshes))
+                    logger.info("[VIZ] cam_t_full: %s", [mesh[2] for mesh in meshes])
                     logger.info("[VIZ] scaled_focal: %.1f", scaled_focal)
                     
-                    # Extract 2D keypoints for body bounds alignment
-                    keypoints_2d = None
-                    if result.get('keypoints') and len(result['keypoints']) > 0:
-                        keypoints_2d = np.array([[kp['x'], kp['y']] for kp in result['keypoints']], dtype=np.float32)
-                        logger.info("[VIZ] Using %d keypoints for body bounds alignment", len(keypoints_2d))
-                    
-                    # Use exact 4D-Humans renderer
+                    # Use exact 4D-Humans renderer, every person in the same scene
                     renderer = SMPLMeshRenderer(focal_length=scaled_focal, img_size=256)
-                    image_bgr = renderer.render_mesh_overlay(
-                        image_bgr,
-                        vertices,
-                        faces,
-                        cam_t_full,
-                        focal_length=scaled_focal,
-                        keypoints_2d=keypoints_2d,
-                    )
+                    image_bgr = renderer.render_meshes_overlay(image_bgr, meshes, focal_length=scaled_focal)
+                    result['mesh_render_stats'] = renderer.last_render_stats
+                    result['mesh_persons_rendered'] = len(meshes)
                     
                     mesh_rendered = True
-                    logger.info("[VIZ] ✓ Mesh rendered with pyrender")
+                    logger.info("[VIZ] ✓ Mesh rendered for %d person(s)", len(meshes))
                 else:
-                    logger.warning("[VIZ] Missing mesh data: vertices=%s, faces=%s, cam_t_full=%s",
-                                  vertices is not None, faces is not None, cam_t_full is not None)
+                    logger.warning("[VIZ] Missing mesh data for every person (vertices, faces or cam_t_full)")
                     
             except Exception as e:
                 logger.error("[VIZ] Mesh rendering failed: %s", str(e), exc_info=True)
         elif not SMPLMeshRenderer:
             logger.warning("[VIZ] SMPLMeshRenderer not available, skipping mesh rendering")
         else:
-            logger.warning("[VIZ] Mesh rendering skipped: has_3d=%s, _last_hmr2_result=%s",
-                          result.get('has_3d'), hasattr(self, '_last_hmr2_result') and self._last_hmr2_result is not None)
+            logger.warning("[VIZ] Mesh rendering skipped: has_3d=%s, hmr2_result=%s",
+                          result.get('has_3d'), hmr2_result is not None)
         
         result['mesh_rendered'] = mesh_rendered
         
@@ -698,17 +849,7 @@ class HybridPoseDetector:
                                 (w - 160, y_pos), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1)
                     y_pos += 20
         
-        # Encode result
-        image_rgb = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB)
-        pil_result = Image.fromarray(image_rgb)
-        buffer = io.BytesIO()
-        pil_result.save(buffer, format='PNG')
-        viz_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
-        
-        result['visualization'] = f"data:image/png;base64,{viz_base64}"
-        result['visualization_base64'] = viz_base64  # For video processor carousel frames
-        
-        return result
+        return image_bgr
 
 
 # Singleton
@@ -0,0 +1,96 @@
+"""
+NumPy-aware JSON serialization for every pose-service response
+
+Pose results are mostly NumPy data (6890 x 3 vertices, joints, faces), and
+converting them with .tolist() before Flask's stdlib jsonify builds millions
+of Python floats just to print them again. install_json_provider(app)
+replaces Flask's JSON provider, so every jsonify() call in the app goes
+through dumps() below:
+
+- orjson (when installed) writes ndarrays and NumPy scalars directly, with
+  no intermediate lists. float32 values are written at float32 precision,
+  so bodies get shorter as well
+- the stdlib fallback converts NumPy values in json.dumps' default hook,
+  so handlers can hand arrays to jsonify either way
+
+Keys are not sorted (Flask's default sorts them), and with orjson NaN and
+Infinity become null instead of the non-standard NaN token.
+
+POSE_JSON_BACKEND=stdlib forces the fallback; see benchmark_json_response.py
+for the difference on typical payloads.
+"""
+
+import json
+import os
+
+import numpy as np
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+JSON_BACKENDS = ('auto', 'orjson', 'stdlib')
+JSON_BACKEND = os.environ.get('POSE_JSON_BACKEND', 'auto')
+
+if HAS_ORJSON:
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def use_orjson():
+    """True when responses are written by orjson"""
+    return HAS_ORJSON and JSON_BACKEND != 'stdlib'
+
+
+def to_builtin(value):
+    """json default hook: NumPy arrays and scalars (and anything orjson skips) to Python values"""
+    if isinstance(value, np.ndarray):
+        # orjson only takes C-contiguous arrays of its supported dtypes (not float16)
+        if use_orjson() and value.dtype != np.float16:
+            return np.ascontiguousarray(value)
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(obj):
+    """Serialize to compact UTF-8 JSON bytes"""
+    if use_orjson():
+        return orjson.dumps(obj, default=to_builtin, option=_ORJSON_OPTIONS)
+    return json.dumps(obj, default=to_builtin, separators=(',', ':')).encode('utf-8')
+
+
+def loads(data):
+    """Parse JSON from bytes or str"""
+    if use_orjson():
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class NumpyJSONProvider(JSONProvider):
+    """Flask JSON provider backed by dumps() / loads()"""
+
+    mimetype = 'application/json'
+
+    def dumps(self, obj, **kwargs):
+        return dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        # Bytes straight into the response body - no str round trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype=self.mimetype)
+
+
+def install_json_provider(app):
+    """Make jsonify() (and request.get_json()) use NumpyJSONProvider for this app"""
+    app.json = NumpyJSONProvider(app)
+    print(f"[JSON] Responses serialized with {'orjson' if use_orjson() else 'stdlib json'}")
+    return app
@@ -0,0 +1,169 @@
+"""
+Motion-adaptive keyframe selection for video runs
+
+Instead of spending the inference budget on evenly spaced frames, a cheap
+pre-pass measures how much each frame changes from the one before it
+(mean absolute difference or Farneback optical-flow magnitude on small
+grayscale frames). Frames are then picked by inverse-CDF sampling over the
+motion energy, so takeoff, rotation and landing get dense coverage while
+static stretches are thinned out. A uniform share of the budget keeps slow
+sections from disappearing entirely.
+"""
+
+import logging
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MOTION_METHODS = ('diff', 'flow')
+
+
+def compute_motion_scores(video_path, method='diff', downscale_width=160, analysis_stride=1):
+    """
+    Per-frame motion energy for a video.
+
+    Args:
+        video_path: Path to the video
+        method: 'diff' (mean absolute grayscale difference) or 'flow'
+                (mean Farneback optical-flow magnitude, slower but ignores lighting flicker)
+        downscale_width: Width frames are resized to before scoring
+        analysis_stride: Score every Nth frame only (others are interpolated);
+                         skipped frames are grabbed without being decoded
+
+    Returns:
+        (total_frames,) float32 array; score[i] is the motion between frame i and
+        the previous analysed frame (score[0] is 0)
+    """
+    if method not in MOTION_METHODS:
+        raise ValueError(f"Unknown motion method '{method}', expected one of {MOTION_METHODS}")
+
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise ValueError(f"Cannot open video: {video_path}")
+
+    analysis_stride = max(1, int(analysis_stride))
+    indices = []
+    scores = []
+    previous = None
+    frame_index = 0
+
+    try:
+        while True:
+            if frame_index % analysis_stride:
+                if not cap.grab():
+                    break
+                frame_index += 1
+                continue
+
+            ret, frame = cap.read()
+            if not ret:
+                break
+
+            h, w = frame.shape[:2]
+            scale = downscale_width / float(w) if w > downscale_width else 1.0
+            small = cv2.resize(frame, (max(1, int(w * scale)), max(1, int(h * scale))),
+                               interpolation=cv2.INTER_AREA)
+            gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+            if previous is None:
+                score = 0.0
+            elif method == 'diff':
+                score = float(cv2.absdiff(gray, previous).mean())
+            else:
+                flow = cv2.calcOpticalFlowFarneback(previous, gray, None, 0.5, 2, 9, 2, 5, 1.1, 0)
+                score = float(np.linalg.norm(flow, axis=2).mean())
+
+            indices.append(frame_index)
+            scores.append(score)
+            previous = gray
+            frame_index += 1
+    finally:
+        cap.release()
+
+    total_frames = frame_index
+    if total_frames == 0:
+        return np.zeros(0, dtype=np.float32)
+    if analysis_stride == 1:
+        return np.asarray(scores, dtype=np.float32)
+
+    # Motion between analysed frames is spread over the frames in between
+    per_frame = np.asarray(scores, dtype=np.float32) / analysis_stride
+    return np.interp(np.arange(total_frames), indices, per_frame).astype(np.float32)
+
+
+def select_keyframes(motion_scores, budget, uniform_fraction=0.25):
+    """
+    Pick `budget` frame indices with density proportional to motion.
+
+    Args:
+        motion_scores: (N,) per-frame motion energy
+        budget: Number of frames to select
+        uniform_fraction: Share of the sampling weight spread evenly over all
+                          frames (0 = pure motion, 1 = even sampling)
+
+    Returns:
+        Sorted list of unique frame indices (len == min(budget, N))
+    """
+    scores = np.asarray(motion_scores, dtype=np.float64)
+    total = len(scores)
+    if budget >= total:
+        return list(range(total))
+    if budget <= 0:
+        return []
+
+    uniform_fraction = float(np.clip(uniform_fraction, 0.0, 1.0))
+    motion_sum = scores.sum()
+    if motion_sum <= 0:
+        uniform_fraction = 1.0
+        motion_sum = 1.0
+
+    weights = (1.0 - uniform_fraction) * scores / motion_sum + uniform_fraction / total
+    cdf = np.cumsum(weights)
+    cdf /= cdf[-1]
+
+    # Inverse-CDF sampling at evenly spaced quantiles
+    targets = (np.arange(budget) + 0.5) / budget
+    selected = set(np.searchsorted(cdf, targets).clip(0, total - 1).tolist())
+
+    # High-motion bursts map several quantiles onto the same frame; spend the
+    # leftover budget on the highest-weight frames not yet chosen
+    if len(selected) < budget:
+        for index in np.argsort(-weights, kind='stable'):
+            if len(selected) >= budget:
+                break
+            selected.add(int(index))
+
+    return sorted(selected)
+
+
+def select_motion_keyframes(video_path, budget, method='diff', uniform_fraction=0.25,
+                            downscale_width=160, analysis_stride=1):
+    """
+    Pre-pass + selection in one call.
+
+    Returns:
+        {
+            'method': 'motion-diff' | 'motion-flow',
+            'selected_frames': [frame indices],
+            'motion_scores': [per-frame score, rounded],
+            'uniform_fraction': float,
+            'analysis_stride': int
+        }
+    """
+    scores = compute_motion_scores(video_path, method=method, downscale_width=downscale_width,
+                                   analysis_stride=analysis_stride)
+    selected = select_keyframes(scores, budget, uniform_fraction=uniform_fraction)
+
+    logger.info("[KEYFRAMES] %s: %d/%d frames selected (motion %s, mean %.2f, max %.2f)",
+                video_path, len(selected), len(scores), method,
+                float(scores.mean()) if len(scores) else 0.0, float(scores.max()) if len(scores) else 0.0)
+
+    return {
+        'method': f'motion-{method}',
+        'selected_frames': selected,
+        'motion_scores': [round(float(s), 3) for s in scores],
+        'uniform_fraction': uniform_fraction,
+        'analysis_stride': analysis_stride,
+    }
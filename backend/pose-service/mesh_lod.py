@@ -0,0 +1,309 @@
+"""
+Decimated SMPL level-of-detail meshes for previews
+
+Thumbnails, scrubbing and the comparison views do not need all 6890 SMPL
+vertices. Each LOD level is a subset of the original vertices plus its own
+triangle list:
+
+    level 0   6890 vertices (full mesh)
+    level 1   ~3445 vertices
+    level 2   ~1722 vertices
+
+The subsets come from greedy half-edge collapses on the rest-pose template:
+the shortest edge (u, v) is collapsed by dropping u and reconnecting its
+faces to v, skipping collapses that would break the manifold or flip a
+face. A collapse never moves a vertex, so a level is fully described by a
+fixed vertex index map into the full mesh and the server serves an LOD mesh
+as plain indexing:
+
+    lod_vertices = vertices[vertex_map]
+
+All levels come from one collapse sequence, so level 2 is a subset of
+level 1. The maps are computed once per topology version and kept in
+POSE_LOD_CACHE_DIR, so they stay fixed across restarts.
+
+Send ?lod=1 (or "lod": 1 in a JSON/form body) to the pose and video
+endpoints; results then reference /mesh/topology?lod=1 for the matching
+faces (?format=json also returns the vertex_map for client-side skinning).
+"""
+
+import hashlib
+import heapq
+import os
+import tempfile
+import threading
+
+import numpy as np
+
+from mesh_topology import TOPOLOGY_URL, MeshTopology, get_topology
+
+# Fraction of the full vertex count kept at each level (level 0 is the full mesh)
+LOD_RATIOS = (1.0, 0.5, 0.25)
+DEFAULT_LOD = int(os.environ.get('POSE_LOD', '0'))
+
+# Where computed vertex maps are stored ('' keeps them in memory only)
+LOD_CACHE_DIR = os.environ.get('POSE_LOD_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'pose-service-lod'))
+
+# Reject collapses that turn a face normal by more than ~45 degrees (looser settings let
+# normals drift across successive collapses until faces flip at the quarter level)
+_MIN_NORMAL_COS = 0.7
+
+
+class MeshLOD:
+    """One decimated level: vertex index map into the full mesh plus its faces"""
+
+    def __init__(self, level, vertex_map, faces, source_vertex_count):
+        self.level = level
+        self.vertex_map = np.ascontiguousarray(vertex_map, dtype=np.int32)
+        self.topology = MeshTopology(faces)
+        self.faces = self.topology.faces
+        self.vertex_count = len(self.vertex_map)
+        self.source_vertex_count = source_vertex_count
+
+    def reference(self):
+        """mesh_topology reference for results at this level"""
+        reference = self.topology.reference()
+        reference.update({
+            'url': f'{TOPOLOGY_URL}?lod={self.level}&v={self.topology.version}',
+            'lod': self.level,
+            'vertex_count': self.vertex_count,
+        })
+        return reference
+
+    def subsample(self, vertices):
+        """(source_vertex_count, 3) vertices -> (vertex_count, 3) for this level"""
+        vertices = np.asarray(vertices)
+        if len(vertices) != self.source_vertex_count:
+            raise ValueError(f"LOD {self.level} expects {self.source_vertex_count} vertices, got {len(vertices)}")
+        return vertices[self.vertex_map]
+
+
+def get_lod_level(request, params=None):
+    """
+    LOD level from ?lod= or the request's own parameters (JSON/form).
+
+    Raises:
+        ValueError: Not an integer level in range
+    """
+    value = request.args.get('lod')
+    if value is None:
+        value = (params or {}).get('lod')
+    if value is None or value == '':
+        value = DEFAULT_LOD
+    try:
+        level = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"lod must be an integer 0-{len(LOD_RATIOS) - 1}, got '{value}'")
+    if not 0 <= level < len(LOD_RATIOS):
+        raise ValueError(f"lod must be 0-{len(LOD_RATIOS) - 1}, got {level}")
+    return level
+
+
+def _face_normal(vertices, face):
+    a, b, c = vertices[face[0]], vertices[face[1]], vertices[face[2]]
+    return np.cross(b - a, c - a)
+
+
+def decimate(faces, vertices, targets):
+    """
+    Greedy half-edge collapse down to each target vertex count.
+
+    Args:
+        faces: (F, 3) triangle indices
+        vertices: (V, 3) rest-pose positions (only used to order and check collapses)
+        targets: Vertex counts to snapshot, e.g. [3445, 1722]
+
+    Returns:
+        {target: (vertex_map (K,), faces (F', 3) indexing into vertex_map order)}
+    """
+    vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+    face_list = np.asarray(faces, dtype=np.int64).reshape(-1, 3).copy()
+    vertex_count = len(vertices)
+    alive = np.ones(len(face_list), dtype=bool)
+    removed = np.zeros(vertex_count, dtype=bool)
+
+    vertex_faces = [set() for _ in range(vertex_count)]
+    for f, face in enumerate(face_list):
+        for vertex in face:
+            vertex_faces[vertex].add(f)
+
+    def neighbors(vertex):
+        return {int(w) for f in vertex_faces[vertex] for w in face_list[f]} - {vertex}
+
+    def edge_length(u, v):
+        return float(np.linalg.norm(vertices[u] - vertices[v]))
+
+    heap = []
+    for u in range(vertex_count):
+        for v in neighbors(u):
+            heapq.heappush(heap, (edge_length(u, v), u, v))
+
+    def can_collapse(u, v):
+        shared = [f for f in vertex_faces[u] if v in face_list[f]]
+        if len(shared) not in (1, 2):
+            return False
+        # Link condition: u and v share exactly the neighbours of their shared faces
+        if len(neighbors(u) & neighbors(v)) != len(shared):
+            return False
+        for f in vertex_faces[u]:
+            if f in shared:
+                continue
+            face = face_list[f]
+            before = _face_normal(vertices, face)
+            after = _face_normal(vertices, np.where(face == u, v, face))
+            norms = np.linalg.norm(before) * np.linalg.norm(after)
+            if norms < 1e-20 or np.dot(before, after) < _MIN_NORMAL_COS * norms:
+                return False
+        return True
+
+    snapshots = {}
+    pending = sorted(set(int(t) for t in targets), reverse=True)
+    remaining = vertex_count
+
+    def snapshot(target):
+        vertex_map = np.flatnonzero(~removed)
+        remap = np.full(vertex_count, -1, dtype=np.int64)
+        remap[vertex_map] = np.arange(len(vertex_map))
+        snapshots[target] = (vertex_map, remap[face_list[alive]])
+
+    while pending and heap:
+        while pending and remaining <= pending[0]:
+            snapshot(pending.pop(0))
+        if not pending:
+            break
+        _, u, v = heapq.heappop(heap)
+        if removed[u] or removed[v] or not any(v in face_list[f] for f in vertex_faces[u]):
+            continue
+        if not can_collapse(u, v):
+            continue
+
+        old_neighbors = neighbors(v)
+        for f in list(vertex_faces[u]):
+            face = face_list[f]
+            if v in face:
+                alive[f] = False
+                for vertex in face:
+                    vertex_faces[vertex].discard(f)
+            else:
+                face[face == u] = v
+                vertex_faces[v].add(f)
+        vertex_faces[u].clear()
+        removed[u] = True
+        remaining -= 1
+        for w in neighbors(v) - old_neighbors:
+            length = edge_length(v, w)
+            heapq.heappush(heap, (length, v, w))
+            heapq.heappush(heap, (length, w, v))
+
+    # Targets the mesh could not be collapsed to get the smallest valid mesh
+    for target in pending:
+        snapshot(target)
+    return snapshots
+
+
+class LODSet:
+    """Every level for one topology"""
+
+    def __init__(self, faces, vertex_maps, lod_faces, source_vertex_count):
+        self.levels = [MeshLOD(0, np.arange(source_vertex_count), faces, source_vertex_count)]
+        for level, (vertex_map, level_faces) in enumerate(zip(vertex_maps, lod_faces), start=1):
+            self.levels.append(MeshLOD(level, vertex_map, level_faces, source_vertex_count))
+
+    def __getitem__(self, level):
+        return self.levels[level]
+
+
+_cache_lock = threading.Lock()
+_lod_sets = {}  # topology version -> LODSet
+
+
+def _cache_path(version):
+    ratios = ','.join(str(ratio) for ratio in LOD_RATIOS)
+    key = hashlib.sha256(f'{version}:{ratios}'.encode()).hexdigest()[:16]
+    return os.path.join(LOD_CACHE_DIR, f'smpl_lod_{key}.npz')
+
+
+def _load_cached(path, count):
+    try:
+        with np.load(path) as data:
+            return ([data[f'vertex_map_{level}'] for level in range(1, count)],
+                    [data[f'faces_{level}'] for level in range(1, count)])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def get_lod_set(faces, rest_vertices=None):
+    """
+    All LOD levels for a face array, computed once per topology version.
+
+    Args:
+        faces: Full-resolution SMPL faces
+        rest_vertices: Rest-pose (template) vertices to decimate on; only needed the first
+                       time a topology is seen and its maps are not in POSE_LOD_CACHE_DIR
+
+    Raises:
+        ValueError: The maps have to be computed but no vertices were given
+    """
+    topology = get_topology(faces)
+    with _cache_lock:
+        lod_set = _lod_sets.get(topology.version)
+        if lod_set is not None:
+            return lod_set
+
+        source_vertex_count = int(topology.faces.max()) + 1
+        path = _cache_path(topology.version) if LOD_CACHE_DIR else None
+        cached = _load_cached(path, len(LOD_RATIOS)) if path and os.path.exists(path) else None
+        if cached is None:
+            if rest_vertices is None:
+                raise ValueError("LOD vertex maps are not computed yet and no rest-pose vertices were given")
+            rest_vertices = np.asarray(rest_vertices, dtype=np.float64).reshape(-1, 3)
+            source_vertex_count = len(rest_vertices)
+            targets = [max(4, int(round(source_vertex_count * ratio))) for ratio in LOD_RATIOS[1:]]
+            snapshots = decimate(topology.faces, rest_vertices, targets)
+            cached = ([snapshots[t][0] for t in targets], [snapshots[t][1] for t in targets])
+            print(f"[MESH_LOD] Decimated {source_vertex_count} vertices -> "
+                  f"{', '.join(str(len(vertex_map)) for vertex_map in cached[0])}")
+            if path:
+                try:
+                    os.makedirs(LOD_CACHE_DIR, exist_ok=True)
+                    arrays = {}
+                    for level, (vertex_map, level_faces) in enumerate(zip(*cached), start=1):
+                        arrays[f'vertex_map_{level}'] = vertex_map
+                        arrays[f'faces_{level}'] = level_faces
+                    np.savez(path, **arrays)
+                except OSError as e:
+                    print(f"[MESH_LOD] Could not store LOD maps in {LOD_CACHE_DIR}: {e}")
+
+        lod_set = LODSet(topology.faces, cached[0], cached[1], source_vertex_count)
+        _lod_sets[topology.version] = lod_set
+        return lod_set
+
+
+def get_lod(level, faces, rest_vertices=None):
+    """MeshLOD for one level (see get_lod_set)"""
+    return get_lod_set(faces, rest_vertices)[level]
+
+
+def apply_lod(result, lod, vertices_key='mesh_vertices_data', faces_key='mesh_faces_data'):
+    """
+    Swap a result's mesh for the LOD level (in place): subsample the vertices, replace
+    embedded faces and point mesh_topology at the LOD faces. Level 0 leaves it unchanged.
+
+    Args:
+        result: Pose result or timeline frame dict (call after attach_topology)
+        lod: MeshLOD
+        vertices_key, faces_key: Keys holding the mesh ('vertices' / 'faces' in video timelines)
+    """
+    if lod is None or lod.level == 0:
+        return result
+    vertices = result.get(vertices_key)
+    if vertices is not None and len(vertices) > 0:
+        subsampled = lod.subsample(vertices)
+        result[vertices_key] = subsampled if isinstance(vertices, np.ndarray) else subsampled.tolist()
+    faces = result.get(faces_key)
+    if faces is not None and len(faces) > 0:
+        result[faces_key] = lod.faces if isinstance(faces, np.ndarray) else lod.faces.tolist()
+    if vertices is not None or 'mesh_topology' in result:
+        result['mesh_topology'] = lod.reference()
+    result['mesh_lod'] = lod.level
+    return result
@@ -9,23 +9,88 @@ It handles:
 4. Rendering with alpha blending
 5. Overlay on original image
 
+OffscreenRenderers (one EGL context each) are pooled by viewport size and
+each keeps a persistent scene with the lights and camera already in place,
+so a frame only swaps the mesh node and updates the camera pose/intrinsics.
+A GL context stays current on the thread that last used it, so every
+pyrender call runs on one dedicated render thread that owns all pooled
+contexts; request threads submit work to it and wait for the result.
+Call release_renderers() to free the contexts (also done at exit) - the
+release runs on the render thread too, whichever thread calls it.
+
+Without pyrender (or without a working EGL/OSMesa context) rendering falls
+back to the pure NumPy rasterizer in cpu_rasterizer.py, which uses the same
+camera and lighting conventions. RENDER_BACKEND=auto|pyrender|cpu picks the
+backend (auto: pyrender when it can create a context, else cpu). Only a
+failure to create a context switches auto mode to cpu for good; any other
+pyrender error falls back to cpu for that frame alone.
+
+Overlays render only the mesh's projected bounding box plus a margin (ROI
+mode, RENDER_ROI=1) and blend that region in fixed-point uint8, so render
+and blend cost scale with the rider's size rather than the frame's. pyrender
+ROI viewports are rounded up to RENDER_ROI_QUANTUM pixels so pooled contexts
+are reused across frames.
+
+Several people are drawn in one pass (render_rgba_multiple): each mesh is
+placed at its own camera translation inside a single scene, or concatenated
+into one CPU raster pass, with a colour per person.
+
 Reference: https://github.com/shubham-goel/4D-Humans/blob/main/hmr2/utils/renderer.py
 """
 
+import atexit
 import os
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
 if 'PYOPENGL_PLATFORM' not in os.environ:
     os.environ['PYOPENGL_PLATFORM'] = 'egl'
 
 import numpy as np
-import pyrender
-import trimesh
 import cv2
 import logging
 
+from cpu_rasterizer import rasterize_rgba
+
 logger = logging.getLogger(__name__)
 
+try:
+    import pyrender
+    import trimesh
+    HAS_PYRENDER = True
+except ImportError:
+    HAS_PYRENDER = False
+    logger.warning("[RENDER] pyrender/trimesh not available - using the CPU rasterizer")
+
 LIGHT_BLUE = (0.65098039, 0.74117647, 0.85882353)
 
+# Per-person mesh colours (RGB in [0, 1]); person 0 keeps the 4D-Humans light blue
+PERSON_COLORS = [
+    LIGHT_BLUE,
+    (0.93, 0.60, 0.45),
+    (0.56, 0.82, 0.56),
+    (0.90, 0.80, 0.40),
+    (0.78, 0.60, 0.88),
+    (0.45, 0.82, 0.85),
+]
+
+# Distinct viewport sizes kept alive at once (least recently used is released)
+MAX_POOLED_VIEWPORTS = int(os.environ.get('RENDERER_POOL_SIZE', '4'))
+
+# auto | pyrender | cpu
+RENDER_BACKEND = os.environ.get('RENDER_BACKEND', 'auto').lower()
+RENDER_BACKENDS = ('auto', 'pyrender', 'cpu')
+
+# Render only the projected mesh bounding box (plus margin) for overlays
+RENDER_ROI = os.environ.get('RENDER_ROI', '1') == '1'
+ROI_MARGIN = int(os.environ.get('RENDER_ROI_MARGIN', '16'))
+# pyrender ROI viewports are rounded up to this many pixels for context reuse
+ROI_QUANTUM = int(os.environ.get('RENDER_ROI_QUANTUM', '64'))
+# Seconds release_renderers() waits for the render thread before giving up
+RELEASE_TIMEOUT = float(os.environ.get('RENDERER_RELEASE_TIMEOUT', '10'))
+
 
 def create_raymond_lights():
     """Create Raymond lighting setup - EXACT from 4D-Humans"""
@@ -58,25 +123,411 @@ def create_raymond_lights():
     return nodes
 
 
+class RenderContextError(RuntimeError):
+    """pyrender could not create an OffscreenRenderer (no usable EGL/OSMesa context)"""
+
+
+class _RenderContext:
+    """One OffscreenRenderer plus a persistent scene for a viewport size"""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.renderer = pyrender.OffscreenRenderer(viewport_width=width, viewport_height=height, point_size=1.0)
+
+        self.scene = pyrender.Scene(bg_color=[0, 0, 0, 0], ambient_light=(0.3, 0.3, 0.3))
+        self.camera = pyrender.IntrinsicsCamera(
+            fx=5000.0, fy=5000.0, cx=width / 2.0, cy=height / 2.0, zfar=1e12
+        )
+        self.camera_node = self.scene.add(self.camera, pose=np.eye(4))
+        for node in create_raymond_lights():
+            self.scene.add_node(node)
+
+        self.mesh_nodes = []
+        self.renders = 0
+
+    def render(self, meshes, camera_pose, focal_length, cx=None, cy=None):
+        """
+        Swap in this frame's mesh (or list of meshes) and camera, render RGBA uint8.
+        cx/cy default to the viewport centre.
+        """
+        for node in self.mesh_nodes:
+            self.scene.remove_node(node)
+        if not isinstance(meshes, (list, tuple)):
+            meshes = [meshes]
+        self.mesh_nodes = [self.scene.add(mesh, f"mesh_{i}") for i, mesh in enumerate(meshes)]
+
+        self.camera.fx = focal_length
+        self.camera.fy = focal_length
+        self.camera.cx = self.width / 2.0 if cx is None else cx
+        self.camera.cy = self.height / 2.0 if cy is None else cy
+        self.scene.set_pose(self.camera_node, pose=camera_pose)
+
+        color, _ = self.renderer.render(self.scene, flags=pyrender.RenderFlags.RGBA)
+        self.renders += 1
+        return color
+
+    def delete(self):
+        self.renderer.delete()
+
+
+_render_lock = threading.Lock()  # Guards the pool and stats against readers on other threads
+_render_contexts = OrderedDict()  # (width, height) -> _RenderContext, LRU order; render thread only
+_render_jobs = queue.Queue()  # (future, fn, args) for the render thread
+_render_thread = None
+_render_thread_lock = threading.Lock()
+_materials = {}  # mesh_color -> material
+_pool_stats = {'contexts_created': 0, 'contexts_released': 0, 'cpu_renders': 0}
+_pyrender_failed = False  # Set when auto mode could not create a GL context
+_roi_stats = {'frames': 0, 'frame_pixels': 0, 'rendered_pixels': 0}
+
+
+def _render_worker():
+    """Run submitted pyrender jobs; every GL context is created, used and deleted here"""
+    while True:
+        future, fn, args = _render_jobs.get()
+        if not future.set_running_or_notify_cancel():
+            continue
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+
+def _on_render_thread(fn, *args, timeout=None, start=True):
+    """
+    Run fn(*args) on the render thread and return its result (exceptions re-raise here).
+
+    Returns None without running fn when start is False and the thread was never started.
+    """
+    global _render_thread
+
+    if threading.current_thread() is _render_thread:
+        return fn(*args)
+    with _render_thread_lock:
+        if _render_thread is None:
+            if not start:
+                return None
+            _render_thread = threading.Thread(target=_render_worker, name='mesh-render', daemon=True)
+            _render_thread.start()
+    future = Future()
+    _render_jobs.put((future, fn, args))
+    return future.result(timeout=timeout)
+
+
+def _get_render_context(width, height):
+    """Pooled context for this viewport; runs on the render thread with _render_lock held"""
+    key = (int(width), int(height))
+    context = _render_contexts.get(key)
+    if context is not None:
+        _render_contexts.move_to_end(key)
+        return context
+
+    while len(_render_contexts) >= max(1, MAX_POOLED_VIEWPORTS):
+        _, evicted = _render_contexts.popitem(last=False)
+        evicted.delete()
+        _pool_stats['contexts_released'] += 1
+
+    logger.info(f"[RENDER] Creating OffscreenRenderer for {key[0]}x{key[1]}")
+    try:
+        context = _RenderContext(*key)
+    except Exception as e:
+        raise RenderContextError(f"Could not create a {key[0]}x{key[1]} OffscreenRenderer: {e}") from e
+    _render_contexts[key] = context
+    _pool_stats['contexts_created'] += 1
+    return context
+
+
+def _get_material(mesh_color):
+    """Cached material - EXACT as 4D-Humans"""
+    key = tuple(float(c) for c in mesh_color)
+    material = _materials.get(key)
+    if material is None:
+        material = pyrender.MetallicRoughnessMaterial(
+            metallicFactor=0.0,
+            alphaMode="OPAQUE",
+            baseColorFactor=(*key, 1.0),
+        )
+        _materials[key] = material
+    return material
+
+
+def _release_contexts():
+    with _render_lock:
+        while _render_contexts:
+            _, context = _render_contexts.popitem()
+            try:
+                context.delete()
+            except Exception as e:
+                logger.warning(f"[RENDER] Failed to release renderer: {e}")
+            _pool_stats['contexts_released'] += 1
+
+
+def release_renderers():
+    """
+    Delete every pooled OffscreenRenderer (frees the EGL/OSMesa contexts).
+
+    Safe from any thread (including the atexit hook on the main thread): the
+    contexts are unbound and deleted on the render thread that holds them.
+    """
+    try:
+        _on_render_thread(_release_contexts, timeout=RELEASE_TIMEOUT, start=False)
+    except Exception as e:
+        logger.warning(f"[RENDER] Failed to release renderers: {e}")
+
+
+def get_renderer_pool_stats():
+    """Pooled viewports and how often contexts were created vs reused"""
+    with _render_lock:
+        renders = sum(context.renders for context in _render_contexts.values())
+        saved = _roi_stats['frame_pixels'] - _roi_stats['rendered_pixels']
+        return {
+            'backend': resolve_backend(),
+            'viewports': [f"{w}x{h}" for w, h in _render_contexts],
+            'renders': renders,
+            **_pool_stats,
+            'roi': {
+                **_roi_stats,
+                'saved_pixels': saved,
+                'saved_fraction': round(saved / _roi_stats['frame_pixels'], 3) if _roi_stats['frame_pixels'] else 0.0,
+            },
+        }
+
+
+atexit.register(release_renderers)
+
+
+def resolve_backend(backend=None):
+    """
+    Backend that will actually render: 'pyrender' or 'cpu'.
+
+    Raises:
+        ValueError: Unknown backend name
+        ImportError: 'pyrender' requested but not installed
+    """
+    backend = (backend or RENDER_BACKEND).lower()
+    if backend not in RENDER_BACKENDS:
+        raise ValueError(f"Unknown render backend '{backend}' (expected one of {', '.join(RENDER_BACKENDS)})")
+    if backend == 'pyrender' and not HAS_PYRENDER:
+        raise ImportError("RENDER_BACKEND=pyrender but pyrender/trimesh are not installed")
+    if backend == 'auto':
+        return 'pyrender' if HAS_PYRENDER and not _pyrender_failed else 'cpu'
+    return backend
+
+
+def mesh_roi(vertices, camera_translation, width, height, focal_length, margin=ROI_MARGIN):
+    """
+    Pixel window covering the projected mesh plus a margin, clipped to the image.
+
+    Returns:
+        (x0, y0, x1, y1), an empty window (x1 <= x0 or y1 <= y0) when the mesh
+        is off-screen, or None when a vertex is behind the camera (render the
+        full frame instead)
+    """
+    cam_points = np.asarray(vertices, dtype=np.float64) + np.asarray(camera_translation, dtype=np.float64)
+    depth = cam_points[:, 2]
+    if len(depth) == 0 or depth.min() <= 1e-3:
+        return None
+    u = focal_length * cam_points[:, 0] / depth + width / 2.0
+    v = focal_length * cam_points[:, 1] / depth + height / 2.0
+
+    x0 = int(np.clip(np.floor(u.min()) - margin, 0, width))
+    y0 = int(np.clip(np.floor(v.min()) - margin, 0, height))
+    x1 = int(np.clip(np.ceil(u.max()) + margin, 0, width))
+    y1 = int(np.clip(np.ceil(v.max()) + margin, 0, height))
+    return (x0, y0, x1, y1)
+
+
+def blend_rgba_uint8(image, rgba, channels_bgr=False):
+    """
+    Alpha-blend a uint8 RGBA render onto a uint8 image region in place.
+
+    Fixed point: out = (mesh * a + image * (255 - a) + 127) // 255
+
+    Args:
+        image: (H, W, 3) uint8 view to write into (e.g. frame[y0:y1, x0:x1])
+        rgba: (H, W, 4) uint8 render of the same size
+        channels_bgr: image is BGR (OpenCV) - the render's RGB is swapped to match
+    """
+    alpha = rgba[:, :, 3:4].astype(np.uint16)
+    color = rgba[:, :, 2::-1] if channels_bgr else rgba[:, :, :3]
+    blended = (color.astype(np.uint16) * alpha + image.astype(np.uint16) * (255 - alpha) + 127) // 255
+    image[...] = blended.astype(np.uint8)
+    return image
+
+
+def render_rgba(vertices, faces, camera_translation, width, height, focal_length, mesh_color=LIGHT_BLUE,
+                backend=None, roi=None):
+    """
+    Render one SMPL mesh to an RGBA uint8 image.
+
+    Same camera and mesh conventions as 4D-Humans renderer.py: the mesh is
+    rotated 180 degrees about X and the camera X translation is flipped.
+    pyrender uses a pooled renderer; the cpu backend rasterizes in NumPy.
+    In auto mode a failure to create a GL context switches to cpu for good;
+    other pyrender errors fall back to cpu for this frame only.
+
+    roi: Optional (x0, y0, x1, y1) window of the width x height image; only
+    that window is rendered and the result has the window's size.
+    """
+    if resolve_backend(backend) == 'cpu':
+        _pool_stats['cpu_renders'] += 1
+        return rasterize_rgba(vertices, faces, camera_translation, width, height, focal_length, mesh_color, roi=roi)
+
+    try:
+        return _render_rgba_pyrender(vertices, faces, camera_translation, width, height, focal_length, mesh_color,
+                                     roi=roi)
+    except Exception as e:
+        if (backend or RENDER_BACKEND).lower() != 'auto':
+            raise
+        _handle_pyrender_error(e)
+        _pool_stats['cpu_renders'] += 1
+        return rasterize_rgba(vertices, faces, camera_translation, width, height, focal_length, mesh_color, roi=roi)
+
+
+def _handle_pyrender_error(error):
+    """Auto mode: latch the CPU fallback when no context can be created, else skip just this frame"""
+    global _pyrender_failed
+
+    if isinstance(error, RenderContextError):
+        logger.warning(f"[RENDER] {error} - switching to the CPU rasterizer")
+        _pyrender_failed = True
+    else:
+        logger.warning(f"[RENDER] pyrender failed ({error}) - using the CPU rasterizer for this frame")
+
+
+def _render_rgba_pyrender(vertices, faces, camera_translation, width, height, focal_length, mesh_color, roi=None):
+    """pyrender path of render_rgba()"""
+    # Create mesh
+    mesh = trimesh.Trimesh(vertices.copy(), faces.copy())
+
+    # Apply 180-degree rotation around X-axis - EXACT as 4D-Humans
+    # This flips Y and Z to match OpenGL conventions
+    rot = trimesh.transformations.rotation_matrix(np.radians(180), [1, 0, 0])
+    mesh.apply_transform(rot)
+
+    # CRITICAL: Flip X component of camera translation - this is in the original renderer.py
+    camera_translation_adjusted = np.array(camera_translation, dtype=np.float64)
+    camera_translation_adjusted[0] *= -1.0
+
+    camera_pose = np.eye(4)
+    camera_pose[:3, 3] = camera_translation_adjusted
+
+    if roi is None:
+        return _on_render_thread(_render_pooled, [(mesh, mesh_color)], camera_pose, focal_length, width, height)
+
+    # ROI: a viewport the size of the window (rounded up so contexts are reused)
+    # with the principal point shifted by the window origin, cropped afterwards
+    x0, y0, x1, y1 = roi
+    quantum = max(1, ROI_QUANTUM)
+    viewport_w = -(-(x1 - x0) // quantum) * quantum
+    viewport_h = -(-(y1 - y0) // quantum) * quantum
+    color = _on_render_thread(_render_pooled, [(mesh, mesh_color)], camera_pose, focal_length,
+                              viewport_w, viewport_h, width / 2.0 - x0, height / 2.0 - y0)
+    return color[:y1 - y0, :x1 - x0]
+
+
+def _render_pooled(meshes, camera_pose, focal_length, viewport_w, viewport_h, cx=None, cy=None):
+    """Render (trimesh, colour) pairs with the pooled context for this viewport; render thread only"""
+    with _render_lock:
+        nodes = [pyrender.Mesh.from_trimesh(mesh, material=_get_material(color)) for mesh, color in meshes]
+        context = _get_render_context(viewport_w, viewport_h)
+        return context.render(nodes, camera_pose, focal_length, cx=cx, cy=cy)
+
+
+def render_rgba_multiple(meshes, width, height, focal_length, mesh_colors=None, backend=None, roi=None):
+    """
+    Render several SMPL meshes into one RGBA uint8 image with a single render.
+
+    Each mesh is moved to its own camera translation (vertices + cam_t) and
+    the camera sits at the origin, as in 4D-Humans render_rgba_multiple.
+
+    Args:
+        meshes: list of (vertices, faces, camera_translation)
+        mesh_colors: One RGB colour per mesh (defaults to PERSON_COLORS)
+        backend, roi: As render_rgba()
+    """
+    if mesh_colors is None:
+        mesh_colors = [PERSON_COLORS[i % len(PERSON_COLORS)] for i in range(len(meshes))]
+    placed = [np.asarray(vertices, dtype=np.float64) + np.asarray(cam_t, dtype=np.float64)
+              for vertices, _, cam_t in meshes]
+
+    def rasterize():
+        # One raster pass over the concatenated meshes, coloured per face
+        offsets = np.cumsum([0] + [len(v) for v in placed[:-1]])
+        faces = np.concatenate([np.asarray(f) + offset for (_, f, _), offset in zip(meshes, offsets)])
+        face_colors = np.concatenate([np.tile(np.asarray(color, dtype=np.float64), (len(f), 1))
+                                      for (_, f, _), color in zip(meshes, mesh_colors)])
+        _pool_stats['cpu_renders'] += 1
+        return rasterize_rgba(np.concatenate(placed), faces, np.zeros(3), width, height, focal_length,
+                              face_colors, roi=roi)
+
+    if resolve_backend(backend) == 'cpu':
+        return rasterize()
+
+    try:
+        rot = trimesh.transformations.rotation_matrix(np.radians(180), [1, 0, 0])
+        scene_meshes = []
+        for vertices, (_, faces, _), color in zip(placed, meshes, mesh_colors):
+            mesh = trimesh.Trimesh(vertices, np.asarray(faces).copy())
+            mesh.apply_transform(rot)
+            scene_meshes.append((mesh, color))
+
+        x0, y0, x1, y1 = (0, 0, width, height) if roi is None else roi
+        quantum = 1 if roi is None else max(1, ROI_QUANTUM)
+        viewport_w = -(-(x1 - x0) // quantum) * quantum
+        viewport_h = -(-(y1 - y0) // quantum) * quantum
+        color = _on_render_thread(_render_pooled, scene_meshes, np.eye(4), focal_length, viewport_w, viewport_h,
+                                  width / 2.0 - x0, height / 2.0 - y0)
+        return color[:y1 - y0, :x1 - x0]
+    except Exception as e:
+        if (backend or RENDER_BACKEND).lower() != 'auto':
+            raise
+        _handle_pyrender_error(e)
+        return rasterize()
+
+
 class SMPLMeshRenderer:
     """
     Render SMPL mesh overlaid on image - EXACT 4D-Humans implementation
     
-    Uses pyrender for proper 3D rendering with:
+    Uses pyrender (or the NumPy CPU rasterizer) for proper 3D rendering with:
     - Perspective projection
     - Lighting
     - Alpha blending
     """
 
-    def __init__(self, focal_length=5000.0, img_size=256):
+    def __init__(self, focal_length=5000.0, img_size=256, backend=None, roi=None):
         """
         Args:
             focal_length: Focal length for camera intrinsics
             img_size: Model image size (used for camera center)
+            backend: 'auto', 'pyrender' or 'cpu' (defaults to RENDER_BACKEND)
+            roi: Render overlays in the mesh bounding box only (defaults to RENDER_ROI)
         """
+        resolve_backend(backend)  # Fail fast on a bad name or missing pyrender
+        self.backend = backend
+        self.roi = RENDER_ROI if roi is None else roi
         self.focal_length = focal_length
         self.img_size = img_size
         self.camera_center = [img_size / 2.0, img_size / 2.0]
+        self.last_render_stats = None  # Pixels rendered vs saved by the last overlay
+
+    def _record_render(self, width, height, roi):
+        """Per-frame and cumulative pixels rendered vs the full frame"""
+        frame_pixels = width * height
+        rendered = frame_pixels if roi is None else max(roi[2] - roi[0], 0) * max(roi[3] - roi[1], 0)
+        self.last_render_stats = {
+            'roi': list(roi) if roi is not None else None,
+            'frame_pixels': frame_pixels,
+            'rendered_pixels': rendered,
+            'saved_pixels': frame_pixels - rendered,
+        }
+        with _render_lock:
+            _roi_stats['frames'] += 1
+            _roi_stats['frame_pixels'] += frame_pixels
+            _roi_stats['rendered_pixels'] += rendered
+        logger.debug(f"[RENDER] Rendered {rendered}/{frame_pixels} px (saved {frame_pixels - rendered})")
 
     def render_mesh_on_image(
         self,
@@ -107,6 +558,22 @@ class SMPLMeshRenderer:
             focal_length = self.focal_length
 
         h, w = image.shape[:2]
+
+        if self.roi and not return_rgba:
+            roi = mesh_roi(vertices, camera_translation, w, h, focal_length)
+            if roi is not None:
+                # Blend only the mesh window; the rest of the frame is copied as is
+                output = np.array(image, dtype=np.float32, copy=True)
+                x0, y0, x1, y1 = roi
+                if x1 > x0 and y1 > y0:
+                    color = render_rgba(vertices, faces, camera_translation, w, h, focal_length, mesh_color,
+                                        backend=self.backend, roi=roi).astype(np.float32) / 255.0
+                    alpha = color[:, :, 3:4]
+                    region = output[y0:y1, x0:x1]
+                    region[...] = color[:, :, :3] * alpha + (1 - alpha) * region
+                self._record_render(w, h, roi)
+                return output
+
         logger.debug(f"[RENDER] Image: {w}x{h}, Vertices: {len(vertices)}, Faces: {len(faces)}")
         logger.debug(f"[RENDER] Camera: {camera_translation}, Focal: {focal_length}")
         
@@ -118,66 +585,16 @@ class SMPLMeshRenderer:
         logger.info(f"[RENDER] Camera position (before flip): {camera_translation}")
         logger.info(f"[RENDER] Camera depth (tz): {camera_translation[2]}")
 
-        # Create pyrender renderer
-        renderer = pyrender.OffscreenRenderer(
-            viewport_width=w, viewport_height=h, point_size=1.0
-        )
-
-        # Create material - EXACT as 4D-Humans
-        material = pyrender.MetallicRoughnessMaterial(
-            metallicFactor=0.0,
-            alphaMode="OPAQUE",
-            baseColorFactor=(*mesh_color, 1.0),
-        )
-
-        # Create mesh
-        mesh = trimesh.Trimesh(vertices.copy(), faces.copy())
-
-        # Apply 180-degree rotation around X-axis - EXACT as 4D-Humans
-        # This flips Y and Z to match OpenGL conventions
-        rot = trimesh.transformations.rotation_matrix(np.radians(180), [1, 0, 0])
-        mesh.apply_transform(rot)
+        logger.info(f"[RENDER] Camera position (after flip): {[-camera_translation[0], camera_translation[1], camera_translation[2]]}")
 
-        mesh = pyrender.Mesh.from_trimesh(mesh, material=material)
-
-        # Create scene
-        scene = pyrender.Scene(bg_color=[0, 0, 0, 0], ambient_light=(0.3, 0.3, 0.3))
-        scene.add(mesh, "mesh")
-
-        # Setup camera - EXACT as 4D-Humans
-        # CRITICAL: Flip X component of camera translation - this is in the original renderer.py
-        camera_translation_adjusted = camera_translation.copy()
-        camera_translation_adjusted[0] *= -1.0
-        logger.info(f"[RENDER] Camera position (after flip): {camera_translation_adjusted}")
-        
-        camera_pose = np.eye(4)
-        camera_pose[:3, 3] = camera_translation_adjusted
-
-        # Camera center in image coordinates
-        camera_center = [w / 2.0, h / 2.0]
-
-        # Intrinsics camera - EXACT as 4D-Humans
-        camera = pyrender.IntrinsicsCamera(
-            fx=focal_length,
-            fy=focal_length,
-            cx=camera_center[0],
-            cy=camera_center[1],
-            zfar=1e12,
-        )
-        scene.add(camera, pose=camera_pose)
-
-        # Add lighting - EXACT as 4D-Humans
-        light_nodes = create_raymond_lights()
-        for node in light_nodes:
-            scene.add_node(node)
-
-        # Render with alpha
-        color, depth = renderer.render(scene, flags=pyrender.RenderFlags.RGBA)
+        # Render with alpha (pooled renderer, persistent scene)
+        color = render_rgba(vertices, faces, camera_translation, w, h, focal_length, mesh_color,
+                            backend=self.backend)
         color = color.astype(np.float32) / 255.0
-        renderer.delete()
 
         if return_rgba:
             return color
+        self._record_render(w, h, None)
 
         # Blend with original image
         valid_mask = color[:, :, 3:4]  # Alpha channel
@@ -213,6 +630,23 @@ class SMPLMeshRenderer:
         Returns:
             (H, W, 3) BGR image with mesh overlay
         """
+        if focal_length is None:
+            focal_length = self.focal_length
+
+        if self.roi:
+            h, w = image_bgr.shape[:2]
+            roi = mesh_roi(vertices, camera_translation, w, h, focal_length)
+            if roi is not None:
+                # Render the mesh window only and blend it in uint8 - no full-frame float conversion
+                output = image_bgr.copy()
+                x0, y0, x1, y1 = roi
+                if x1 > x0 and y1 > y0:
+                    rgba = render_rgba(vertices, faces, camera_translation, w, h, focal_length, mesh_color,
+                                       backend=self.backend, roi=roi)
+                    blend_rgba_uint8(output[y0:y1, x0:x1], rgba, channels_bgr=True)
+                self._record_render(w, h, roi)
+                return output
+
         # Convert BGR to RGB and normalize
         image_rgb = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB).astype(np.float32) / 255.0
 
@@ -232,6 +666,44 @@ class SMPLMeshRenderer:
 
         return rendered_bgr
 
+    def render_meshes_overlay(
+        self,
+        image_bgr: np.ndarray,
+        meshes: list,
+        focal_length: float = None,
+        mesh_colors=None,
+    ) -> np.ndarray:
+        """
+        Render every person's mesh onto a BGR image in one pass.
+
+        Args:
+            image_bgr: (H, W, 3) BGR image in [0, 255] range
+            meshes: list of (vertices, faces, camera_translation), one per person
+            focal_length: Focal length (shared by all people in the frame)
+            mesh_colors: One RGB colour per person (defaults to PERSON_COLORS)
+
+        Returns:
+            (H, W, 3) BGR image with the mesh overlays
+        """
+        if focal_length is None:
+            focal_length = self.focal_length
+        h, w = image_bgr.shape[:2]
+        output = image_bgr.copy()
+        if not meshes:
+            return output
+
+        roi = None
+        if self.roi:
+            all_vertices = np.concatenate([np.asarray(v, dtype=np.float64) + np.asarray(t, dtype=np.float64)
+                                           for v, _, t in meshes])
+            roi = mesh_roi(all_vertices, np.zeros(3), w, h, focal_length)
+        x0, y0, x1, y1 = (0, 0, w, h) if roi is None else roi
+        if x1 > x0 and y1 > y0:
+            rgba = render_rgba_multiple(meshes, w, h, focal_length, mesh_colors, backend=self.backend, roi=roi)
+            blend_rgba_uint8(output[y0:y1, x0:x1], rgba, channels_bgr=True)
+        self._record_render(w, h, roi)
+        return output
+
     def render_mesh_rgba(
         self,
         vertices: np.ndarray,
@@ -256,41 +728,12 @@ class SMPLMeshRenderer:
             (H, W, 4) RGBA image
         """
         w, h = render_size
-        renderer = pyrender.OffscreenRenderer(viewport_width=w, viewport_height=h, point_size=1.0)
-
-        material = pyrender.MetallicRoughnessMaterial(
-            metallicFactor=0.0, alphaMode="OPAQUE", baseColorFactor=(*mesh_color, 1.0)
-        )
-
-        mesh = trimesh.Trimesh(vertices.copy(), faces.copy())
-        rot = trimesh.transformations.rotation_matrix(np.radians(180), [1, 0, 0])
-        mesh.apply_transform(rot)
-        mesh = pyrender.Mesh.from_trimesh(mesh, material=material)
-
-        scene = pyrender.Scene(bg_color=[0, 0, 0, 0], ambient_light=(0.3, 0.3, 0.3))
-        scene.add(mesh, "mesh")
-
-        # CRITICAL: Flip X component of camera translation - EXACT as 4D-Humans renderer.py
-        camera_translation_adjusted = camera_translation.copy()
-        camera_translation_adjusted[0] *= -1.0
-        
-        camera_pose = np.eye(4)
-        camera_pose[:3, 3] = camera_translation_adjusted
 
         if focal_length is None:
             focal_length = self.focal_length
 
-        camera = pyrender.IntrinsicsCamera(
-            fx=focal_length, fy=focal_length, cx=w / 2.0, cy=h / 2.0, zfar=1e12
-        )
-        scene.add(camera, pose=camera_pose)
-
-        light_nodes = create_raymond_lights()
-        for node in light_nodes:
-            scene.add_node(node)
-
-        color, depth = renderer.render(scene, flags=pyrender.RenderFlags.RGBA)
+        color = render_rgba(vertices, faces, camera_translation, w, h, focal_length, mesh_color,
+                            backend=self.backend)
         color = color.astype(np.float32) / 255.0
-        renderer.delete()
 
         return color
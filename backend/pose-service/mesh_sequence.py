@@ -0,0 +1,355 @@
+"""
+Temporal delta + quantization codec for mesh vertex sequences
+
+Stored timelines (VideoMeshProcessor's pose_timeline, TrackWrapper frames)
+keep 6890 x 3 vertices per frame, and consecutive frames differ by a few
+millimetres. A sequence is encoded as:
+
+1. Quantization: every coordinate becomes a uint16 step count inside the
+   sequence's bounding box (origin + step per axis). The step is the box
+   size / 65535 or `precision` (default 0.5 mm), whichever is larger, so the
+   error is at most step / 2 per axis - reported as max_error.
+2. Prediction: frames are grouped into GOPs of keyframe_interval present
+   frames. The first frame of a GOP (keyframe) is stored as the difference
+   between consecutive vertices (SMPL vertex order is spatially coherent);
+   the others as the difference to the previous frame. Differences are
+   int16 mod 2^16 (reconstruction is exact) and zigzag-coded.
+3. Byte shuffle + compression: each GOP's uint16 values are split into a
+   low-byte plane and a high-byte plane (deltas make the high plane mostly
+   zeros) and compressed with zlib by default (every Node.js can inflate it),
+   or zstd when MESH_SEQUENCE_COMPRESSION=zstd and zstandard is installed.
+
+Each GOP is compressed on its own, so decode_frame() touches one GOP only.
+
+Layout (little-endian):
+
+    offset  size  field
+    0       4     magic b'SMSQ'
+    4       1     version (1)
+    5       1     compression: 0 = none, 1 = zlib, 2 = zstd
+    6       2     flags (0)
+    8       4     frame_count (including missing frames)
+    12      4     vertex_count
+    16      4     keyframe_interval
+    20      12    origin: float32 x, y, z
+    32      12    step: float32 x, y, z
+    44      ...   presence: frame_count bytes (1 = frame has vertices), padded to 4
+    ...     4     gop_count
+    ...     4*n   compressed length of each GOP
+    ...           GOP blobs back to back
+
+A GOP blob decompresses to 2 * (k * vertex_count * 3) bytes for its k
+frames: all low bytes, then all high bytes, of the frame-major uint16 values
+(frame, vertex, axis). Decoding one GOP, all arithmetic mod 2^16 and
+unzigzag(z) = (z >> 1) ^ -(z & 1):
+
+    q[0][0]   = values[0][0]
+    q[0][i]   = q[0][i-1] + unzigzag(values[0][i])    (keyframe, per vertex i)
+    q[t]      = q[t-1] + unzigzag(values[t])          (t >= 1)
+    vertex    = origin + q * step
+
+backend/src/services/meshSequenceCodec.ts implements the same decoder.
+"""
+
+import base64
+import os
+import struct
+import zlib
+
+import numpy as np
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+MAGIC = b'SMSQ'
+FORMAT_VERSION = 1
+CODEC_NAME = 'smsq-delta'
+
+COMPRESSIONS = {'none': 0, 'zlib': 1, 'zstd': 2}
+
+# Frames per GOP: larger compresses slightly better, smaller makes random access cheaper
+KEYFRAME_INTERVAL = int(os.environ.get('MESH_SEQUENCE_KEYFRAME_INTERVAL', '30'))
+# Quantization step floor in metres; coarser steps mean smaller deltas and better compression
+PRECISION = float(os.environ.get('MESH_SEQUENCE_PRECISION', '0.0005'))
+# 'zlib', 'zstd' (needs zstandard here and zlib.zstdDecompressSync in Node) or 'none'
+DEFAULT_COMPRESSION = os.environ.get('MESH_SEQUENCE_COMPRESSION', 'zlib')
+ZLIB_LEVEL = int(os.environ.get('MESH_SEQUENCE_ZLIB_LEVEL', '6'))
+ZSTD_LEVEL = int(os.environ.get('MESH_SEQUENCE_ZSTD_LEVEL', '10'))
+
+# Timeline codecs accepted by the video endpoints ('none' keeps per-frame vertex lists)
+TIMELINE_CODECS = ('none', 'delta')
+DEFAULT_TIMELINE_CODEC = os.environ.get('VIDEO_TIMELINE_CODEC', 'none')
+
+_HEADER = struct.Struct('<4sBBHIII3f3f')
+_LEVELS = 65535
+
+
+class MeshSequenceError(ValueError):
+    """Malformed or inconsistent mesh sequence"""
+
+
+def get_timeline_codec(request, params=None):
+    """
+    'none' or 'delta' from ?timeline_codec= or the request's own parameters (JSON/form).
+
+    Raises:
+        ValueError: Unknown codec
+    """
+    codec = request.args.get('timeline_codec') or (params or {}).get('timeline_codec') or DEFAULT_TIMELINE_CODEC
+    codec = str(codec).strip().lower()
+    if codec not in TIMELINE_CODECS:
+        raise ValueError(f"Unknown timeline codec '{codec}' (expected one of {', '.join(TIMELINE_CODECS)})")
+    return codec
+
+
+def _compress(data, code):
+    if code == 1:
+        return zlib.compress(data, ZLIB_LEVEL)
+    if code == 2:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return data
+
+
+def _decompress(data, code):
+    if code == 1:
+        return zlib.decompress(data)
+    if code == 2:
+        if not HAS_ZSTD:
+            raise MeshSequenceError("Sequence is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if code == 0:
+        return bytes(data)
+    raise MeshSequenceError(f"Unknown compression code {code}")
+
+
+def _zigzag(deltas):
+    """int16 -> uint16 with small magnitudes (either sign) mapped to small values"""
+    return ((deltas << 1) ^ (deltas >> 15)).view(np.uint16)
+
+
+def _unzigzag(values):
+    values = values.astype(np.int32)
+    return ((values >> 1) ^ -(values & 1)).astype(np.uint16)
+
+
+def _shuffle(values):
+    return np.ascontiguousarray(values.view(np.uint8).reshape(-1, 2).T).tobytes()
+
+
+def _unshuffle(data, count):
+    planes = np.frombuffer(data, dtype=np.uint8)
+    if planes.size != count * 2:
+        raise MeshSequenceError(f"GOP holds {planes.size} bytes, expected {count * 2}")
+    return np.ascontiguousarray(planes.reshape(2, count).T).view('<u2').reshape(-1)
+
+
+def encode_sequence(frames, keyframe_interval=None, compression=None, precision=None):
+    """
+    Encode a vertex sequence.
+
+    Args:
+        frames: list of (V, 3) arrays or nested lists; None for frames without a mesh
+        keyframe_interval: Present frames per GOP (default MESH_SEQUENCE_KEYFRAME_INTERVAL)
+        compression: 'zlib', 'zstd' or 'none' (default MESH_SEQUENCE_COMPRESSION)
+        precision: Quantization step floor in metres (default MESH_SEQUENCE_PRECISION;
+                   0 uses the full 16-bit resolution of the bounding box)
+
+    Returns:
+        (data bytes, stats dict with max_error, raw_bytes, encoded_bytes, ratio, ...)
+
+    Raises:
+        MeshSequenceError: Frames with different vertex counts
+    """
+    keyframe_interval = max(1, int(keyframe_interval or KEYFRAME_INTERVAL))
+    compression = compression or DEFAULT_COMPRESSION
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression '{compression}' (expected one of {', '.join(COMPRESSIONS)})")
+    if compression == 'zstd' and not HAS_ZSTD:
+        raise ImportError("zstd compression needs the zstandard package")
+    code = COMPRESSIONS[compression]
+
+    presence = np.array([frame is not None and len(frame) > 0 for frame in frames], dtype=np.uint8)
+    present = [np.asarray(frame, dtype=np.float32).reshape(-1, 3) for frame, here in zip(frames, presence) if here]
+    vertex_count = len(present[0]) if present else 0
+    if any(len(vertices) != vertex_count for vertices in present):
+        raise MeshSequenceError("Every frame in a sequence needs the same vertex count")
+
+    stacked = np.stack(present) if present else np.zeros((0, 0, 3), dtype=np.float32)
+    if present:
+        low = stacked.min(axis=(0, 1))
+        high = stacked.max(axis=(0, 1))
+    else:
+        low = high = np.zeros(3, dtype=np.float32)
+    origin = low.astype(np.float32)
+    precision = PRECISION if precision is None else float(precision)
+    step = np.maximum((high.astype(np.float64) - origin) / _LEVELS, max(precision, 1e-9)).astype(np.float32)
+
+    quantized = np.clip(np.rint((stacked - origin) / step), 0, _LEVELS).astype(np.uint16)
+    max_error = float(np.abs(origin + quantized.astype(np.float32) * step - stacked).max()) if present else 0.0
+
+    gops = []
+    for start in range(0, len(quantized), keyframe_interval):
+        gop = quantized[start:start + keyframe_interval]
+        values = gop.copy()
+        values[0, 1:] = _zigzag((gop[0, 1:] - gop[0, :-1]).view(np.int16))
+        values[1:] = _zigzag((gop[1:] - gop[:-1]).view(np.int16))
+        gops.append(_compress(_shuffle(values), code))
+
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, code, 0, len(frames), vertex_count, keyframe_interval,
+                          *origin.tolist(), *step.tolist())
+    presence_bytes = presence.tobytes() + b'\0' * (-len(frames) % 4)
+    table = struct.pack(f'<I{len(gops)}I', len(gops), *[len(gop) for gop in gops])
+    data = b''.join([header, presence_bytes, table] + gops)
+
+    raw_bytes = stacked.size * 4
+    stats = {
+        'codec': CODEC_NAME,
+        'compression': compression,
+        'frame_count': len(frames),
+        'present_frames': len(present),
+        'vertex_count': vertex_count,
+        'keyframe_interval': keyframe_interval,
+        'max_error': max_error,
+        # Half a step, plus float32 rounding of origin + q * step
+        'error_bound': float(step.max() / 2 + np.abs(np.concatenate([low, high])).max() * 2.0 ** -22),
+        'raw_bytes': raw_bytes,
+        'encoded_bytes': len(data),
+        'ratio': round(raw_bytes / len(data), 2) if data and raw_bytes else None,
+    }
+    return data, stats
+
+
+def _parse(data):
+    """Header fields, presence flags and (offset, length) of every GOP"""
+    view = memoryview(data)
+    if len(view) < _HEADER.size:
+        raise MeshSequenceError("Truncated mesh sequence header")
+    fields = _HEADER.unpack_from(view, 0)
+    magic, version, code, _flags, frame_count, vertex_count, keyframe_interval = fields[:7]
+    if magic != MAGIC:
+        raise MeshSequenceError(f"Bad mesh sequence magic {magic!r}")
+    if version != FORMAT_VERSION:
+        raise MeshSequenceError(f"Unsupported mesh sequence version {version}")
+
+    pos = _HEADER.size
+    presence = np.frombuffer(view, dtype=np.uint8, count=frame_count, offset=pos).astype(bool)
+    pos += frame_count + (-frame_count % 4)
+    (gop_count,) = struct.unpack_from('<I', view, pos)
+    lengths = struct.unpack_from(f'<{gop_count}I', view, pos + 4)
+    pos += 4 + 4 * gop_count
+
+    spans = []
+    for length in lengths:
+        spans.append((pos, length))
+        pos += length
+    if pos > len(view):
+        raise MeshSequenceError("Truncated mesh sequence GOP data")
+
+    return {
+        'view': view,
+        'compression': code,
+        'frame_count': frame_count,
+        'vertex_count': vertex_count,
+        'keyframe_interval': keyframe_interval,
+        'origin': np.array(fields[7:10], dtype=np.float32),
+        'step': np.array(fields[10:13], dtype=np.float32),
+        'presence': presence,
+        'gops': spans,
+    }
+
+
+def _decode_gop(parsed, gop_index):
+    """(k, V, 3) float32 vertices for one GOP"""
+    offset, length = parsed['gops'][gop_index]
+    present_total = int(parsed['presence'].sum())
+    frames_in_gop = min(parsed['keyframe_interval'], present_total - gop_index * parsed['keyframe_interval'])
+    count = frames_in_gop * parsed['vertex_count'] * 3
+
+    raw = _decompress(parsed['view'][offset:offset + length], parsed['compression'])
+    values = _unshuffle(raw, count).reshape(frames_in_gop, parsed['vertex_count'], 3)
+    values[0, 1:] = _unzigzag(values[0, 1:])
+    values[0] = np.cumsum(values[0], axis=0, dtype=np.uint16)
+    values[1:] = _unzigzag(values[1:])
+    quantized = np.cumsum(values, axis=0, dtype=np.uint16)
+    return parsed['origin'] + quantized.astype(np.float32) * parsed['step']
+
+
+def decode_sequence(data):
+    """Decode a whole sequence to a list of (V, 3) float32 arrays (None for missing frames)"""
+    parsed = _parse(data)
+    present = [vertices for gop in range(len(parsed['gops'])) for vertices in _decode_gop(parsed, gop)]
+    frames = []
+    cursor = 0
+    for here in parsed['presence']:
+        if here:
+            frames.append(present[cursor])
+            cursor += 1
+        else:
+            frames.append(None)
+    return frames
+
+
+def decode_frame(data, index):
+    """Decode one frame (decompresses only its GOP); None if that frame has no mesh"""
+    parsed = _parse(data)
+    if not 0 <= index < parsed['frame_count']:
+        raise IndexError(f"Frame {index} out of range (sequence has {parsed['frame_count']})")
+    if not parsed['presence'][index]:
+        return None
+    position = int(parsed['presence'][:index].sum())
+    gop, offset = divmod(position, parsed['keyframe_interval'])
+    return _decode_gop(parsed, gop)[offset]
+
+
+def encode_timeline(frames, vertices_key='vertices', track_key=None, keyframe_interval=None, compression=None):
+    """
+    Move the vertices out of timeline frame dicts into encoded sequences (in place).
+
+    Args:
+        frames: Timeline frame dicts (pose_timeline entries, TrackWrapper frames)
+        vertices_key: Key holding each frame's vertex list
+        track_key: Frame key identifying the person (e.g. 'personId'); one sequence per
+                   track so deltas stay between frames of the same body
+        keyframe_interval, compression: As encode_sequence()
+
+    Returns:
+        {'codec', 'tracks': [{'track', 'frames' (timeline indices), 'data' (base64), ...stats}],
+         'raw_bytes', 'encoded_bytes', 'ratio', 'max_error'}
+    """
+    by_track = {}
+    for index, frame in enumerate(frames):
+        track = frame.get(track_key, 0) if track_key else 0
+        by_track.setdefault(track, []).append(index)
+
+    tracks = []
+    for track, indices in by_track.items():
+        data, stats = encode_sequence([frames[i].get(vertices_key) for i in indices],
+                                      keyframe_interval=keyframe_interval, compression=compression)
+        tracks.append({'track': track, 'frames': indices, 'data': base64.b64encode(data).decode('ascii'), **stats})
+        for i in indices:
+            frames[i].pop(vertices_key, None)
+
+    raw_bytes = sum(track['raw_bytes'] for track in tracks)
+    encoded_bytes = sum(track['encoded_bytes'] for track in tracks)
+    return {
+        'codec': CODEC_NAME,
+        'vertices_key': vertices_key,
+        'tracks': tracks,
+        'raw_bytes': raw_bytes,
+        'encoded_bytes': encoded_bytes,
+        'ratio': round(raw_bytes / encoded_bytes, 2) if encoded_bytes and raw_bytes else None,
+        'max_error': max((track['max_error'] for track in tracks), default=0.0),
+    }
+
+
+def decode_timeline(frames, encoded):
+    """Put the vertices from encode_timeline() back into the frame dicts as lists (in place)"""
+    key = encoded.get('vertices_key', 'vertices')
+    for track in encoded['tracks']:
+        decoded = decode_sequence(base64.b64decode(track['data']))
+        for index, vertices in zip(track['frames'], decoded):
+            frames[index][key] = vertices.tolist() if vertices is not None else None
+    return frames
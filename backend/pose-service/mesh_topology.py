@@ -0,0 +1,145 @@
+"""
+SMPL mesh topology served once as a cacheable asset
+
+The SMPL triangle list (13776 x 3 vertex indices) is the same for every frame
+of a given model, yet it used to be embedded in every /pose/hybrid response
+and copied into every frame of a stored timeline. Instead, GET /mesh/topology
+returns the faces once as a packed little-endian uint16 buffer (uint32 if the
+mesh ever has more than 65536 vertices) with an ETag, and per-frame results
+carry a small reference:
+
+    'mesh_topology': {'version': '3f9a...', 'url': '/mesh/topology?v=3f9a...',
+                      'face_count': 13776, 'dtype': 'uint16'}
+
+The version is a hash of the packed buffer, so clients can cache the faces
+by version and only refetch when the model changes. Send include_faces=true
+(or set POSE_EMBED_FACES=1) to keep the legacy embedded mesh_faces_data.
+"""
+
+import hashlib
+import os
+import threading
+
+import numpy as np
+from flask import Response, jsonify
+
+TOPOLOGY_URL = '/mesh/topology'
+
+# Legacy behaviour: embed mesh_faces_data in every frame as well as the reference
+EMBED_FACES = os.environ.get('POSE_EMBED_FACES', '0') == '1'
+
+# The topology is immutable per version; clients revalidate with the ETag after this
+TOPOLOGY_MAX_AGE = int(os.environ.get('POSE_TOPOLOGY_MAX_AGE', '86400'))
+
+
+class MeshTopology:
+    """Packed face buffer plus its content hash"""
+
+    def __init__(self, faces):
+        faces = np.asarray(faces).reshape(-1, 3)
+        index_dtype = np.dtype('<u2') if faces.size == 0 or faces.max() < 65536 else np.dtype('<u4')
+        self.faces = np.ascontiguousarray(faces, dtype=index_dtype)
+        self.data = self.faces.tobytes()
+        self.version = hashlib.sha256(self.data).hexdigest()[:16]
+        self.face_count = len(self.faces)
+        self.dtype = 'uint16' if index_dtype.itemsize == 2 else 'uint32'
+
+    def reference(self):
+        """Per-frame stand-in for the embedded face list"""
+        return {
+            'version': self.version,
+            'url': f'{TOPOLOGY_URL}?v={self.version}',
+            'face_count': self.face_count,
+            'dtype': self.dtype,
+        }
+
+
+# Faces come from the model (often as a fresh astype() copy per batch), so the
+# last topology is reused when the array is the same object or compares equal
+_cache_lock = threading.Lock()
+_cached_faces = None
+_cached_topology = None
+
+
+def get_topology(faces):
+    """MeshTopology for a face array, packed and hashed once per model"""
+    global _cached_faces, _cached_topology
+    with _cache_lock:
+        if faces is _cached_faces:
+            return _cached_topology
+        faces_array = np.asarray(faces)
+        if _cached_topology is None or not np.array_equal(faces_array.reshape(-1, 3), _cached_topology.faces):
+            _cached_topology = MeshTopology(faces_array)
+        _cached_faces = faces
+        return _cached_topology
+
+
+def wants_embedded_faces(request, params=None):
+    """include_faces=true in the query string or the request's own parameters (JSON/form)"""
+    for source in (request.args, params or {}):
+        value = source.get('include_faces')
+        if isinstance(value, str) and value.strip().lower() in ('1', 'true', 'yes', 'on'):
+            return True
+        if value is True:
+            return True
+    return EMBED_FACES
+
+
+def attach_topology(result, include_faces=False, faces_key='mesh_faces_data'):
+    """
+    Replace a result's face list with a mesh_topology reference (in place).
+
+    Args:
+        result: Pose result or timeline frame dict
+        include_faces: Keep the embedded faces too (legacy clients)
+        faces_key: Key holding the faces ('faces' in video timelines)
+    """
+    faces = result.get(faces_key)
+    if faces is None or len(faces) == 0:
+        return result
+    result['mesh_topology'] = get_topology(faces).reference()
+    if not (include_faces or EMBED_FACES):
+        del result[faces_key]
+    return result
+
+
+def topology_response(request, faces, lod=None):
+    """
+    Flask response for GET /mesh/topology.
+
+    Binary by default (application/octet-stream, face_count * 3 indices);
+    ?format=json returns the faces as lists. Both carry the version as a strong
+    ETag (weak once gzip/zstd-encoded, see response_compression.py) and answer
+    If-None-Match with 304 Not Modified.
+
+    With a MeshLOD (?lod=1, see mesh_lod.py) the LOD faces are served instead,
+    and the JSON form adds the vertex_map into the full mesh.
+    """
+    if faces is None:
+        return jsonify({'error': 'SMPL faces not loaded yet'}), 503
+
+    topology = lod.topology if lod is not None else get_topology(faces)
+    reference = lod.reference() if lod is not None else topology.reference()
+    headers = {
+        'X-Mesh-Topology-Version': topology.version,
+        'X-Mesh-Face-Count': str(topology.face_count),
+        'X-Mesh-Index-Dtype': topology.dtype,
+    }
+    if lod is not None:
+        headers['X-Mesh-LOD'] = str(lod.level)
+        headers['X-Mesh-Vertex-Count'] = str(lod.vertex_count)
+
+    if request.if_none_match.contains_weak(topology.version):
+        response = Response(status=304, headers=headers)
+    elif (request.args.get('format') or '').lower() == 'json':
+        payload = {**reference, 'faces': topology.faces.tolist()}
+        if lod is not None:
+            payload['vertex_map'] = lod.vertex_map.tolist()
+        response = jsonify(payload)
+        response.headers.update(headers)
+    else:
+        response = Response(topology.data, mimetype='application/octet-stream', headers=headers)
+
+    response.set_etag(topology.version)
+    response.headers['Cache-Control'] = f'public, max-age={TOPOLOGY_MAX_AGE}'
+    return response
@@ -0,0 +1,242 @@
+"""
+Binary wire format for pose results with mesh data
+
+JSON responses carry the 6890x3 SMPL vertices as nested lists of Python
+floats (hundreds of KB of text per frame). Clients that send
+    Accept: application/x-smpl-mesh            (float32)
+    Accept: application/x-smpl-mesh; precision=16   (float16)
+or ?format=binary / ?format=binary16 get the same result as one binary frame
+instead: a small header, the non-mesh fields as compact JSON, then raw
+little-endian buffers that map directly onto typed arrays.
+
+Frame layout (all little-endian, every buffer 8-byte aligned):
+
+    offset  size  field
+    0       4     magic b'SMSH'
+    4       1     version (1)
+    5       1     dtype: 1 = float32, 2 = float16 (vertices and joints)
+    6       2     flags: bit 0 = faces buffer present
+    8       4     metadata_length (bytes of UTF-8 JSON, padded to 8 with spaces)
+    12      4     vertex_count
+    16      4     joint_count
+    20      4     face_count
+    24      16    camera: float32 tx, ty, tz, focal_length (NaN when unknown)
+    40      ...   metadata JSON
+    ...           vertices  vertex_count * 3 * dtype
+    ...           joints    joint_count * 3 * dtype
+    ...           faces     face_count * 3 uint16 (uint32 when vertex_count > 65535)
+
+Batches are wrapped in a container: b'SMBT', uint32 frame_count, uint32
+length per frame, then the frames back to back (each padded to 8 bytes).
+"""
+
+import json
+import struct
+
+import numpy as np
+
+MEDIA_TYPE = 'application/x-smpl-mesh'
+FORMAT_VERSION = 1
+
+FRAME_MAGIC = b'SMSH'
+BATCH_MAGIC = b'SMBT'
+
+DTYPES = {'float32': 1, 'float16': 2}
+_NUMPY_DTYPES = {1: np.dtype('<f4'), 2: np.dtype('<f2')}
+
+FLAG_FACES = 1
+
+_HEADER = struct.Struct('<4sBBHIIII')
+_CAMERA = struct.Struct('<4f')
+
+# Result keys carried as buffers rather than JSON
+_VERTICES_KEY = 'mesh_vertices_data'
+_JOINTS_KEY = 'joints_3d_raw'
+_FACES_KEY = 'mesh_faces_data'
+_ARRAY_KEYS = (_VERTICES_KEY, _JOINTS_KEY, _FACES_KEY)
+
+
+class MeshWireError(ValueError):
+    """Malformed binary mesh payload"""
+
+
+def negotiate_mesh_format(request):
+    """
+    Pick the response encoding for a Flask request.
+
+    Returns:
+        None for JSON, or 'float32' / 'float16' for the binary format
+    """
+    fmt = (request.args.get('format') or '').lower()
+    if fmt in ('binary', 'binary32'):
+        return 'float32'
+    if fmt == 'binary16':
+        return 'float16'
+
+    for entry in request.headers.get('Accept', '').split(','):
+        parts = [part.strip() for part in entry.split(';')]
+        if parts[0].lower() != MEDIA_TYPE:
+            continue
+        params = dict(part.split('=', 1) for part in parts[1:] if '=' in part)
+        try:
+            if float(params.get('q', '1')) <= 0:
+                continue
+        except ValueError:
+            continue
+        return 'float16' if params.get('precision') == '16' else 'float32'
+    return None
+
+
+def _jsonable(value):
+    """json.dumps default= for NumPy values left in the metadata"""
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _pad8(data, fill=b'\0'):
+    return data + fill * (-len(data) % 8)
+
+
+def mesh_arrays_to_lists(result):
+    """Convert any NumPy arrays in a pose result to lists for a JSON response (in place)"""
+    for key, value in result.items():
+        if isinstance(value, (np.ndarray, np.generic)):
+            result[key] = value.tolist()
+    return result
+
+
+def encode_result(result, dtype='float32'):
+    """
+    Encode one pose result dict as a binary frame.
+
+    mesh_vertices_data, joints_3d_raw and mesh_faces_data (lists or arrays)
+    become buffers; camera_translation plus scaled_focal_length (or
+    camera_full.focal_length) fill the camera block; every other key goes
+    into the metadata JSON.
+    """
+    if dtype not in DTYPES:
+        raise ValueError(f"Unsupported dtype '{dtype}' (expected one of {', '.join(DTYPES)})")
+    dtype_code = DTYPES[dtype]
+    np_dtype = _NUMPY_DTYPES[dtype_code]
+
+    def as_array(key, array_dtype):
+        value = result.get(key)
+        if value is None or len(value) == 0:
+            return np.zeros((0, 3), dtype=array_dtype)
+        return np.ascontiguousarray(np.asarray(value).reshape(-1, 3), dtype=array_dtype)
+
+    vertices = as_array(_VERTICES_KEY, np_dtype)
+    joints = as_array(_JOINTS_KEY, np_dtype)
+    face_dtype = np.dtype('<u2') if len(vertices) <= 65536 else np.dtype('<u4')
+    faces = as_array(_FACES_KEY, face_dtype)
+
+    camera = [float('nan')] * 4
+    if result.get('camera_translation') is not None:
+        camera[:3] = [float(c) for c in result['camera_translation']]
+    focal = result.get('scaled_focal_length')
+    if focal is None and isinstance(result.get('camera_full'), dict):
+        focal = result['camera_full'].get('focal_length')
+    if focal is not None:
+        camera[3] = float(focal)
+
+    metadata = {key: value for key, value in result.items() if key not in _ARRAY_KEYS}
+    metadata_bytes = _pad8(json.dumps(metadata, default=_jsonable, separators=(',', ':')).encode('utf-8'), b' ')
+
+    flags = FLAG_FACES if len(faces) else 0
+    header = _HEADER.pack(FRAME_MAGIC, FORMAT_VERSION, dtype_code, flags, len(metadata_bytes),
+                          len(vertices), len(joints), len(faces))
+    return b''.join([
+        header,
+        _CAMERA.pack(*camera),
+        metadata_bytes,
+        _pad8(vertices.tobytes()),
+        _pad8(joints.tobytes()),
+        _pad8(faces.tobytes()),
+    ])
+
+
+def encode_results(results, dtype='float32'):
+    """Encode several pose results as one batch container"""
+    frames = [encode_result(result, dtype) for result in results]
+    header = BATCH_MAGIC + struct.pack(f'<I{len(frames)}I', len(frames), *[len(frame) for frame in frames])
+    return _pad8(header) + b''.join(frames)
+
+
+def decode_result(data):
+    """
+    Decode one binary frame back to a pose result dict.
+
+    Vertices, joints and faces come back as NumPy arrays (views into data),
+    camera_translation and scaled_focal_length from the camera block when
+    the metadata does not already have them.
+    """
+    return _decode_frame(memoryview(data), 0)[0]
+
+
+def _decode_frame(view, offset):
+    """Decode the frame at offset; returns (result, offset just past the frame)"""
+    if len(view) - offset < _HEADER.size + _CAMERA.size:
+        raise MeshWireError("Truncated mesh frame header")
+    magic, version, dtype_code, flags, metadata_length, vertex_count, joint_count, face_count = \
+        _HEADER.unpack_from(view, offset)
+    if magic != FRAME_MAGIC:
+        raise MeshWireError(f"Bad mesh frame magic {magic!r}")
+    if version != FORMAT_VERSION:
+        raise MeshWireError(f"Unsupported mesh format version {version}")
+    if dtype_code not in _NUMPY_DTYPES:
+        raise MeshWireError(f"Unknown mesh dtype code {dtype_code}")
+
+    np_dtype = _NUMPY_DTYPES[dtype_code]
+    face_dtype = np.dtype('<u2') if vertex_count <= 65536 else np.dtype('<u4')
+
+    pos = offset + _HEADER.size
+    camera = _CAMERA.unpack_from(view, pos)
+    pos += _CAMERA.size
+    result = json.loads(bytes(view[pos:pos + metadata_length]))
+    pos += metadata_length
+
+    def take(count, dtype):
+        nonlocal pos
+        nbytes = count * 3 * dtype.itemsize
+        if pos + nbytes > len(view):
+            raise MeshWireError("Truncated mesh buffer")
+        array = np.frombuffer(view, dtype=dtype, count=count * 3, offset=pos).reshape(count, 3)
+        pos += nbytes + (-nbytes % 8)
+        return array
+
+    vertices = take(vertex_count, np_dtype)
+    joints = take(joint_count, np_dtype)
+    faces = take(face_count, face_dtype)
+
+    if vertex_count:
+        result[_VERTICES_KEY] = vertices
+    if joint_count:
+        result[_JOINTS_KEY] = joints
+    if flags & FLAG_FACES:
+        result[_FACES_KEY] = faces
+    if not np.isnan(camera[0]):
+        result.setdefault('camera_translation', list(camera[:3]))
+    if not np.isnan(camera[3]):
+        result.setdefault('scaled_focal_length', camera[3])
+    return result, pos
+
+
+def decode_results(data):
+    """Decode a batch container (or a single frame) to a list of result dicts"""
+    view = memoryview(data)
+    if bytes(view[:4]) == FRAME_MAGIC:
+        return [_decode_frame(view, 0)[0]]
+    if bytes(view[:4]) != BATCH_MAGIC:
+        raise MeshWireError(f"Bad mesh batch magic {bytes(view[:4])!r}")
+
+    (count,) = struct.unpack_from('<I', view, 4)
+    lengths = struct.unpack_from(f'<{count}I', view, 8)
+    pos = 8 + 4 * count
+    pos += -pos % 8
+
+    results = []
+    for length in lengths:
+        results.append(_decode_frame(view, pos)[0])
+        pos += length
+    return results
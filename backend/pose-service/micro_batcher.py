@@ -0,0 +1,188 @@
+"""
+Dynamic micro-batching for concurrent single-frame requests
+
+Requests that arrive within a short window are coalesced into one call of a
+batch function (e.g. one batched ViTDet + HMR2 pass) and every caller gets
+its own slice of the result back. Callers block in submit() exactly as if
+they had run the model themselves, so the single-frame API does not change.
+
+    batcher = MicroBatcher(run_batch, max_batch_size=8, max_wait_ms=10)
+    result = batcher.submit(item)   # from any request thread
+
+A batch is dispatched as soon as it is full or the oldest queued request
+has waited max_wait_ms, so a lone request pays at most max_wait_ms extra.
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# Number of recent batches kept for the queue-wait percentiles
+METRICS_WINDOW = 1000
+
+
+class _PendingRequest:
+    """One submitted item waiting for its batch to run"""
+
+    __slots__ = ('item', 'enqueued_at', 'done', 'result', 'error')
+
+    def __init__(self, item):
+        self.item = item
+        self.enqueued_at = time.monotonic()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent submit() calls into batched calls of batch_fn.
+
+    Args:
+        batch_fn: Callable taking a list of items and returning a list of
+                  results in the same order (one result per item)
+        max_batch_size: Maximum items per batch_fn call
+        max_wait_ms: Longest time the oldest queued item waits for company
+        name: Name used for the worker thread and log lines
+    """
+
+    def __init__(self, batch_fn, max_batch_size=8, max_wait_ms=10.0, name='micro-batcher'):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_ms = max(0.0, float(max_wait_ms))
+        self.name = name
+
+        self._queue = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
+        self._metrics_lock = threading.Lock()
+        self._batches = 0
+        self._requests = 0
+        self._errors = 0
+        self._max_batch_seen = 0
+        self._batch_size_histogram = {}
+        self._total_batch_time_ms = 0.0
+        self._recent_waits_ms = deque(maxlen=METRICS_WINDOW)
+
+    def submit(self, item, timeout=None):
+        """
+        Queue an item and block until its batch has run.
+
+        Args:
+            item: Anything batch_fn understands
+            timeout: Seconds to wait for the result (None = forever)
+
+        Returns:
+            The result batch_fn produced for this item
+
+        Raises:
+            TimeoutError: The result did not arrive within timeout
+            Exception: Whatever batch_fn raised for this item's batch
+        """
+        pending = _PendingRequest(item)
+        self._ensure_worker()
+        self._queue.put(pending)
+
+        if not pending.done.wait(timeout):
+            raise TimeoutError(f'{self.name}: no result within {timeout}s')
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def get_metrics(self):
+        """Batch-size and queue-wait statistics since startup"""
+        with self._metrics_lock:
+            waits = sorted(self._recent_waits_ms)
+            return {
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait_ms,
+                'queue_depth': self._queue.qsize(),
+                'batches': self._batches,
+                'requests': self._requests,
+                'errors': self._errors,
+                'avg_batch_size': round(self._requests / self._batches, 2) if self._batches else 0.0,
+                'largest_batch': self._max_batch_seen,
+                'batch_size_histogram': dict(sorted(self._batch_size_histogram.items())),
+                'avg_batch_time_ms': round(self._total_batch_time_ms / self._batches, 2) if self._batches else 0.0,
+                'queue_wait_ms': {
+                    'avg': round(sum(waits) / len(waits), 2) if waits else 0.0,
+                    'p50': round(_percentile(waits, 50), 2),
+                    'p95': round(_percentile(waits, 95), 2),
+                    'max': round(waits[-1], 2) if waits else 0.0,
+                },
+            }
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = batch[0].enqueued_at + self.max_wait_ms / 1000.0
+
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        batch.append(self._queue.get(timeout=remaining))
+                    else:
+                        # Window closed - still take anything already queued
+                        batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            self._run_batch(batch)
+
+    def _run_batch(self, batch):
+        started = time.monotonic()
+        waits_ms = [(started - pending.enqueued_at) * 1000 for pending in batch]
+
+        failed = False
+        try:
+            results = self.batch_fn([pending.item for pending in batch])
+            if results is None or len(results) != len(batch):
+                raise RuntimeError(
+                    f'{self.name}: batch_fn returned {0 if results is None else len(results)} '
+                    f'results for {len(batch)} items'
+                )
+            for pending, result in zip(batch, results):
+                pending.result = result
+        except Exception as e:
+            logger.error("[MICROBATCH] %s: batch of %d failed: %s", self.name, len(batch), e, exc_info=True)
+            failed = True
+            for pending in batch:
+                pending.error = e
+
+        batch_time_ms = (time.monotonic() - started) * 1000
+        with self._metrics_lock:
+            self._batches += 1
+            self._requests += len(batch)
+            self._errors += 1 if failed else 0
+            self._max_batch_seen = max(self._max_batch_seen, len(batch))
+            self._batch_size_histogram[len(batch)] = self._batch_size_histogram.get(len(batch), 0) + 1
+            self._total_batch_time_ms += batch_time_ms
+            self._recent_waits_ms.extend(waits_ms)
+
+        logger.debug("[MICROBATCH] %s: %d items, max wait %.1fms, ran in %.1fms",
+                     self.name, len(batch), max(waits_ms), batch_time_ms)
+
+        for pending in batch:
+            pending.done.set()
+
+
+def _percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list (0.0 when empty)"""
+    if not sorted_values:
+        return 0.0
+    rank = int(round(pct / 100.0 * (len(sorted_values) - 1)))
+    return sorted_values[rank]
@@ -0,0 +1,69 @@
+"""
+Streaming NDJSON responses for long video results
+
+/pose/video used to convert every frame of the PHALP pickle into one big
+dict and jsonify it in a single call, so memory and time-to-first-byte grew
+with the video length. In streaming mode each frame is serialized and sent
+as soon as it is converted, one JSON object per line:
+
+    {"type": "frame", "frame_number": 0, "persons": [...]}
+    {"type": "frame", "frame_number": 1, "persons": [...]}
+    ...
+    {"type": "summary", "status": "success", "total_frames": 2, ...}
+
+If conversion fails part-way, the last line is {"type": "error", "error": ...}
+instead of the summary, so clients can tell a truncated stream from a
+complete one.
+
+Request it with Accept: application/x-ndjson, or "stream": true in the JSON
+body (?stream=1 in the query string).
+"""
+
+import logging
+
+from flask import Response, stream_with_context
+
+from frame_ingest import get_bool_param
+from json_response import dumps
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+
+
+def wants_ndjson(request, params=None):
+    """Accept: application/x-ndjson, or stream=true in the query string / request parameters"""
+    if NDJSON_MEDIA_TYPE in (request.headers.get('Accept') or ''):
+        return True
+    return get_bool_param(request.args, 'stream') or get_bool_param(params or {}, 'stream')
+
+
+def ndjson_line(record):
+    """One compact JSON line (bytes, newline-terminated)"""
+    return dumps(record) + b'\n'
+
+
+def iter_ndjson(frames, summary):
+    """
+    Yield NDJSON lines: one 'frame' record per item, then the 'summary' record.
+
+    Args:
+        frames: Iterable of frame dicts, converted lazily by the caller
+        summary: Callable(frame_count) -> dict, evaluated after the last frame
+    """
+    count = 0
+    try:
+        for frame in frames:
+            yield ndjson_line({'type': 'frame', **frame})
+            count += 1
+    except Exception as e:
+        logger.error(f"[NDJSON] Stream failed after {count} frames: {e}")
+        yield ndjson_line({'type': 'error', 'error': str(e), 'frames_sent': count})
+        return
+    yield ndjson_line({'type': 'summary', **summary(count)})
+
+
+def ndjson_response(frames, summary, headers=None):
+    """Streaming Flask response for iter_ndjson() (request context kept alive while streaming)"""
+    return Response(stream_with_context(iter_ndjson(frames, summary)), mimetype=NDJSON_MEDIA_TYPE,
+                    headers=headers)
@@ -0,0 +1,243 @@
+"""
+Accept-Encoding response compression (gzip / zstd) for mesh-heavy JSON
+
+/pose/hybrid, /process_video and /pose/video answer with multi-MB JSON that
+gzip shrinks 2x or more even at level 1 (~20 ms of CPU per MB), which pays
+off on the Node <-> pose-service hop when the two run on different hosts.
+install_compression(app) adds an after_request hook that:
+
+- picks zstd or gzip from the request's Accept-Encoding (q-values honoured,
+  zstd preferred when both are acceptable and zstandard is installed)
+- compresses JSON / NDJSON / text bodies of at least POSE_COMPRESSION_MIN_BYTES
+- compresses streamed responses (NDJSON from /pose/video) chunk by chunk,
+  flushing after every chunk so each line still reaches the client as soon
+  as it is produced
+- records per-endpoint stats (ratio, CPU time) - see compression_stats()
+
+Binary mesh frames (mesh_wire.py) and files from send_file are left as they
+are. axios in Node asks for gzip and inflates it transparently, so existing
+clients need no changes.
+
+Config:
+    POSE_COMPRESSION=0               disable
+    POSE_COMPRESSION_MIN_BYTES=8192  smaller bodies are sent as-is
+    POSE_GZIP_LEVEL=1                1 (fast) - 9 (small); 5+ costs 4x the CPU for ~10% smaller
+    POSE_ZSTD_LEVEL=3                1 (fast) - 19 (small)
+"""
+
+import os
+import threading
+import time
+import zlib
+
+from flask import request
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+COMPRESSION_ENABLED = os.environ.get('POSE_COMPRESSION', '1') == '1'
+MIN_BYTES = int(os.environ.get('POSE_COMPRESSION_MIN_BYTES', '8192'))
+GZIP_LEVEL = int(os.environ.get('POSE_GZIP_LEVEL', '1'))
+ZSTD_LEVEL = int(os.environ.get('POSE_ZSTD_LEVEL', '3'))
+
+# Server preference when the client accepts several with the same q-value
+ENCODINGS = ('zstd', 'gzip') if HAS_ZSTD else ('gzip',)
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson')
+
+
+def negotiate_encoding(accept_encoding):
+    """
+    Best supported content coding for an Accept-Encoding header, or None for identity.
+
+    'gzip;q=0.5, zstd' -> 'zstd'; 'gzip;q=0' -> None; '*' matches any supported coding.
+    """
+    if not accept_encoding:
+        return None
+    weights = {}
+    for item in accept_encoding.split(','):
+        name, _, params = item.strip().partition(';')
+        name = name.strip().lower()
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key.strip() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name:
+            weights[name] = q
+    best, best_q = None, 0.0
+    for encoding in ENCODINGS:
+        q = weights.get(encoding, weights.get('*', 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class Compressor:
+    """Incremental compressor for one response body"""
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        if encoding == 'zstd':
+            self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+        else:
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data, flush=False):
+        """Compress a chunk; flush=True makes everything so far decodable by the client"""
+        out = self._compressor.compress(data)
+        if flush:
+            if self.encoding == 'zstd':
+                out += self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+            else:
+                out += self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        return out
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+def compress_bytes(data, encoding):
+    """One-shot compression of a whole body"""
+    compressor = Compressor(encoding)
+    return compressor.compress(data) + compressor.finish()
+
+
+class EndpointStats:
+    """Compression accounting for one endpoint"""
+
+    def __init__(self):
+        self.compressed = 0
+        self.streamed = 0
+        self.skipped = 0  # Below MIN_BYTES or identity requested
+        self.raw_bytes = 0
+        self.encoded_bytes = 0
+        self.cpu_seconds = 0.0
+        self.encodings = {}
+
+    def to_dict(self):
+        raw_mb = self.raw_bytes / 1e6
+        return {
+            'compressed': self.compressed,
+            'streamed': self.streamed,
+            'skipped': self.skipped,
+            'raw_bytes': self.raw_bytes,
+            'encoded_bytes': self.encoded_bytes,
+            'ratio': round(self.raw_bytes / self.encoded_bytes, 2) if self.encoded_bytes else None,
+            'cpu_ms': round(self.cpu_seconds * 1000, 1),
+            'cpu_ms_per_mb': round(self.cpu_seconds * 1000 / raw_mb, 2) if raw_mb else None,
+            'encodings': dict(self.encodings),
+        }
+
+
+_stats_lock = threading.Lock()
+_stats = {}  # endpoint -> EndpointStats
+
+
+def _record(endpoint, encoding=None, raw_bytes=0, encoded_bytes=0, cpu_seconds=0.0, streamed=False):
+    with _stats_lock:
+        stats = _stats.setdefault(endpoint, EndpointStats())
+        if encoding is None:
+            stats.skipped += 1
+            return
+        if streamed:
+            stats.streamed += 1
+        else:
+            stats.compressed += 1
+        stats.raw_bytes += raw_bytes
+        stats.encoded_bytes += encoded_bytes
+        stats.cpu_seconds += cpu_seconds
+        stats.encodings[encoding] = stats.encodings.get(encoding, 0) + 1
+
+
+def compression_stats():
+    """Per-endpoint compression stats since startup (for /health)"""
+    with _stats_lock:
+        return {
+            'enabled': COMPRESSION_ENABLED,
+            'encodings': list(ENCODINGS),
+            'min_bytes': MIN_BYTES,
+            'gzip_level': GZIP_LEVEL,
+            'zstd_level': ZSTD_LEVEL if HAS_ZSTD else None,
+            'endpoints': {endpoint: stats.to_dict() for endpoint, stats in sorted(_stats.items())},
+        }
+
+
+def _compress_stream(chunks, encoding, endpoint):
+    """Compress a streamed body chunk by chunk (flushing after each one); stats recorded at the end"""
+    compressor = Compressor(encoding)
+    raw_bytes = encoded_bytes = 0
+    cpu_seconds = 0.0
+    try:
+        for chunk in chunks:
+            if not chunk:
+                continue
+            t0 = time.thread_time()
+            out = compressor.compress(chunk, flush=True)
+            cpu_seconds += time.thread_time() - t0
+            raw_bytes += len(chunk)
+            encoded_bytes += len(out)
+            yield out
+        t0 = time.thread_time()
+        out = compressor.finish()
+        cpu_seconds += time.thread_time() - t0
+        encoded_bytes += len(out)
+        yield out
+    finally:
+        _record(endpoint, encoding, raw_bytes, encoded_bytes, cpu_seconds, streamed=True)
+
+
+def _compressible(response):
+    if response.direct_passthrough or 'Content-Encoding' in response.headers:
+        return False
+    if response.status_code < 200 or response.status_code in (204, 206, 304) or request.method == 'HEAD':
+        return False
+    return response.mimetype in COMPRESSIBLE_TYPES or response.mimetype.startswith('text/')
+
+
+def compress_response(response):
+    """after_request hook: compress the body if the client accepts it and it is worth it"""
+    if not COMPRESSION_ENABLED or not _compressible(response):
+        return response
+    response.vary.add('Accept-Encoding')
+    endpoint = request.endpoint or request.path
+    encoding = negotiate_encoding(request.headers.get('Accept-Encoding'))
+
+    if encoding is None:
+        _record(endpoint)
+        return response
+
+    if response.is_streamed:
+        response.response = _compress_stream(response.iter_encoded(), encoding, endpoint)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < MIN_BYTES:
+            _record(endpoint)
+            return response
+        t0 = time.thread_time()
+        body = compress_bytes(data, encoding)
+        _record(endpoint, encoding, len(data), len(body), time.thread_time() - t0)
+        response.set_data(body)
+
+    response.headers['Content-Encoding'] = encoding
+    # A compressed body is a different representation: the ETag may only match weakly
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def install_compression(app):
+    """Compress this app's responses according to Accept-Encoding"""
+    app.after_request(compress_response)
+    if COMPRESSION_ENABLED:
+        print(f"[COMPRESSION] {'/'.join(ENCODINGS)} for bodies >= {MIN_BYTES} bytes "
+              f"(gzip level {GZIP_LEVEL}{f', zstd level {ZSTD_LEVEL}' if HAS_ZSTD else ''})")
+    return app
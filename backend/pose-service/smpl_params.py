@@ -0,0 +1,263 @@
+"""
+Compact SMPL parameter payloads
+
+A posed SMPL mesh is 6890 x 3 floats, but it is fully determined by
+    global_orient  3 floats  (axis-angle)
+    body_pose      69 floats (23 joints, axis-angle)
+    betas          10 floats
+    camera         3 floats  (full-image translation) + focal length
+so results can carry these ~85 numbers instead of ~20k vertex coordinates.
+Clients rebuild the mesh either by skinning it themselves (see
+SMPL_LBS_SPEC.md and linear_blend_skinning() below, the executable form of
+that spec) or by posting the parameters to /mesh/reconstruct.
+
+Send ?mesh=params (or "mesh": "params" in a JSON body) to /pose/hybrid,
+/pose/hybrid/batch and the video endpoints to drop vertices and faces from
+the response; POSE_MESH_MODE=params makes that the default.
+"""
+
+import os
+
+import numpy as np
+
+from temporal_upsampling import rotmat_to_quat
+
+MESH_MODES = ('full', 'params')
+DEFAULT_MESH_MODE = os.environ.get('POSE_MESH_MODE', 'full')
+
+NUM_BODY_JOINTS = 23
+NUM_BETAS = 10
+
+# Fields that params-only results leave out (rebuilt from smpl_params + /mesh/topology)
+MESH_KEYS = ('mesh_vertices_data', 'mesh_faces_data', 'vertices', 'faces')
+
+# Enough precision for rotations in radians and metres; keeps the JSON short
+DECIMALS = 6
+
+
+def get_mesh_mode(request, params=None):
+    """
+    'full' or 'params' from ?mesh= or the request's own parameters (JSON/form).
+
+    Raises:
+        ValueError: Unknown mode
+    """
+    mode = request.args.get('mesh') or (params or {}).get('mesh') or DEFAULT_MESH_MODE
+    mode = str(mode).strip().lower()
+    if mode not in MESH_MODES:
+        raise ValueError(f"Unknown mesh mode '{mode}' (expected one of {', '.join(MESH_MODES)})")
+    return mode
+
+
+def rotmat_to_axis_angle(rotmats):
+    """(..., 3, 3) rotation matrices to (..., 3) axis-angle vectors"""
+    quats = rotmat_to_quat(rotmats)
+    xyz = quats[..., 1:]
+    sin_half = np.linalg.norm(xyz, axis=-1, keepdims=True)
+    angle = 2.0 * np.arctan2(sin_half, quats[..., :1])
+    # Small angles: axis * angle -> 2 * xyz
+    scale = np.where(sin_half < 1e-8, 2.0, angle / np.maximum(sin_half, 1e-8))
+    return xyz * scale
+
+
+def axis_angle_to_rotmat(axis_angle):
+    """(..., 3) axis-angle vectors to (..., 3, 3) rotation matrices (Rodrigues)"""
+    aa = np.asarray(axis_angle, dtype=np.float64)
+    theta = np.linalg.norm(aa, axis=-1, keepdims=True)
+    axis = aa / np.maximum(theta, 1e-8)
+    x, y, z = axis[..., 0], axis[..., 1], axis[..., 2]
+    zeros = np.zeros_like(x)
+    K = np.stack([zeros, -z, y, z, zeros, -x, -y, x, zeros], axis=-1).reshape(aa.shape[:-1] + (3, 3))
+
+    theta = theta[..., None]
+    eye = np.broadcast_to(np.eye(3), K.shape)
+    return eye + np.sin(theta) * K + (1.0 - np.cos(theta)) * (K @ K)
+
+
+def _round(values):
+    return np.round(np.asarray(values, dtype=np.float64).reshape(-1), DECIMALS).tolist()
+
+
+def encode_smpl_params(smpl_params, cam_t=None, focal_length=None, img_size=None):
+    """
+    HMR2 rotation-matrix SMPL params to the compact axis-angle payload.
+
+    Args:
+        smpl_params: {'global_orient': (1, 3, 3), 'body_pose': (23, 3, 3), 'betas': (10,)}
+        cam_t: Full-image camera translation [tx, ty, tz]
+        focal_length: Scaled focal length in pixels
+        img_size: [width, height]
+
+    Returns:
+        {'rotation_format': 'axis_angle', 'global_orient': [3], 'body_pose': [69],
+         'betas': [10], 'camera': {'translation', 'focal_length', 'img_size'}} or None
+    """
+    if not smpl_params or smpl_params.get('body_pose') is None:
+        return None
+    payload = {
+        'rotation_format': 'axis_angle',
+        'global_orient': _round(rotmat_to_axis_angle(np.asarray(smpl_params['global_orient']).reshape(-1, 3, 3))),
+        'body_pose': _round(rotmat_to_axis_angle(np.asarray(smpl_params['body_pose']).reshape(-1, 3, 3))),
+        'betas': _round(smpl_params['betas']),
+    }
+    camera = {}
+    if cam_t is not None:
+        camera['translation'] = _round(cam_t)
+    if focal_length is not None:
+        camera['focal_length'] = round(float(focal_length), 3)
+    if img_size is not None:
+        camera['img_size'] = [int(v) for v in np.asarray(img_size).reshape(-1)[:2]]
+    if camera:
+        payload['camera'] = camera
+    return payload
+
+
+def decode_smpl_params(payload):
+    """
+    Compact payload (axis-angle, or rotation_format 'rotmat' with 9 floats per joint)
+    back to rotation-matrix params for the SMPL layer.
+
+    Returns:
+        {'global_orient': (1, 3, 3), 'body_pose': (23, 3, 3), 'betas': (10,)} float32
+
+    Raises:
+        ValueError: Not an object, missing fields, wrong sizes or a non-object camera
+    """
+    if not isinstance(payload, dict):
+        raise ValueError(f"SMPL params must be an object, got {type(payload).__name__}")
+    if payload.get('camera') is not None and not isinstance(payload['camera'], dict):
+        raise ValueError("camera must be an object with translation / focal_length")
+    try:
+        global_orient = np.asarray(payload['global_orient'], dtype=np.float64).reshape(-1)
+        body_pose = np.asarray(payload['body_pose'], dtype=np.float64).reshape(-1)
+        betas = np.asarray(payload.get('betas', np.zeros(NUM_BETAS)), dtype=np.float64).reshape(-1)
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"SMPL params need global_orient, body_pose and betas: {e}")
+
+    rotation_format = payload.get('rotation_format', 'axis_angle')
+    per_joint = {'axis_angle': 3, 'rotmat': 9}.get(rotation_format)
+    if per_joint is None:
+        raise ValueError(f"Unknown rotation_format '{rotation_format}'")
+    if global_orient.size != per_joint or body_pose.size != NUM_BODY_JOINTS * per_joint:
+        raise ValueError(f"Expected {per_joint} + {NUM_BODY_JOINTS * per_joint} rotation values for "
+                         f"{rotation_format}, got {global_orient.size} + {body_pose.size}")
+    if betas.size > NUM_BETAS:
+        raise ValueError(f"Expected at most {NUM_BETAS} betas, got {betas.size}")
+
+    if per_joint == 3:
+        global_orient = axis_angle_to_rotmat(global_orient.reshape(1, 3))
+        body_pose = axis_angle_to_rotmat(body_pose.reshape(NUM_BODY_JOINTS, 3))
+    return {
+        'global_orient': global_orient.reshape(1, 3, 3).astype(np.float32),
+        'body_pose': body_pose.reshape(NUM_BODY_JOINTS, 3, 3).astype(np.float32),
+        'betas': np.pad(betas, (0, NUM_BETAS - betas.size)).astype(np.float32),
+    }
+
+
+def strip_mesh(result):
+    """Drop vertex and face data from a result or timeline frame (in place) for params-only responses"""
+    for key in MESH_KEYS:
+        result.pop(key, None)
+    return result
+
+
+def read_reconstruct_body(data):
+    """
+    Validate a /mesh/reconstruct JSON body.
+
+    Returns:
+        (payloads, frame_numbers) - frame_numbers defaults to 0..len(payloads) - 1
+
+    Raises:
+        ValueError: Not an object, params not a non-empty list, or frame_numbers not a
+                    list with one entry per parameter set (the payloads themselves are
+                    checked by decode_smpl_params)
+    """
+    if not isinstance(data, dict):
+        raise ValueError('JSON body must be an object with params')
+    payloads = data.get('params')
+    if not isinstance(payloads, list) or not payloads:
+        raise ValueError('params must be a non-empty list of SMPL parameter sets')
+    frame_numbers = data.get('frame_numbers')
+    if frame_numbers is None:
+        return payloads, list(range(len(payloads)))
+    if not isinstance(frame_numbers, list) or len(frame_numbers) != len(payloads):
+        raise ValueError(f'frame_numbers must be a list with one entry per parameter set ({len(payloads)})')
+    return payloads, frame_numbers
+
+
+def reconstruct_meshes(payloads, smpl_forward):
+    """
+    Rebuild meshes for many compact payloads with one batched SMPL forward pass.
+
+    Args:
+        payloads: list of encode_smpl_params() dicts
+        smpl_forward: Callable(global_orient (T, 1, 3, 3), body_pose (T, 23, 3, 3), betas (T, 10))
+                      -> (vertices (T, V, 3), joints (T, J, 3)), e.g. HybridPoseDetector.smpl_forward
+
+    Returns:
+        (vertices (T, V, 3), joints (T, J, 3))
+    """
+    decoded = [decode_smpl_params(payload) for payload in payloads]
+    return smpl_forward(
+        np.stack([params['global_orient'] for params in decoded]),
+        np.stack([params['body_pose'] for params in decoded]),
+        np.stack([params['betas'] for params in decoded]),
+    )
+
+
+def linear_blend_skinning(model, global_orient, body_pose, betas):
+    """
+    Reference SMPL skinning for one body, exactly as SMPL_LBS_SPEC.md describes it.
+
+    Args:
+        model: {'v_template': (V, 3), 'shapedirs': (V, 3, B), 'posedirs': (V, 3, 9 * K),
+                'J_regressor': (J, V), 'weights': (V, J), 'parents': (J,) with parents[0] = -1}
+                where K = J - 1
+        global_orient, body_pose: axis-angle (3,) and (K * 3,), or rotation matrices
+        betas: (B',) shape coefficients, B' <= B
+
+    Returns:
+        (vertices (V, 3), joints (J, 3)) in SMPL space (camera translation not applied)
+    """
+    v_template = np.asarray(model['v_template'], dtype=np.float64)
+    shapedirs = np.asarray(model['shapedirs'], dtype=np.float64)
+    posedirs = np.asarray(model['posedirs'], dtype=np.float64)
+    J_regressor = np.asarray(model['J_regressor'], dtype=np.float64)
+    weights = np.asarray(model['weights'], dtype=np.float64)
+    parents = np.asarray(model['parents'], dtype=np.int64)
+    num_joints = len(parents)
+
+    def as_rotmats(values, count):
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == count * 9:
+            return values.reshape(count, 3, 3)
+        return axis_angle_to_rotmat(values.reshape(count, 3))
+
+    rotations = np.concatenate([as_rotmats(global_orient, 1), as_rotmats(body_pose, num_joints - 1)])
+
+    # 1. Shape blend shapes, 2. rest-pose joints
+    betas = np.asarray(betas, dtype=np.float64).reshape(-1)
+    v_shaped = v_template + shapedirs[:, :, :betas.size] @ betas
+    joints = J_regressor @ v_shaped
+
+    # 3. Pose blend shapes from the non-root rotations
+    pose_feature = (rotations[1:] - np.eye(3)).reshape(-1)
+    v_posed = v_shaped + posedirs @ pose_feature
+
+    # 4. Kinematic chain: world transform of every joint
+    transforms = np.zeros((num_joints, 4, 4))
+    for k in range(num_joints):
+        local = np.eye(4)
+        local[:3, :3] = rotations[k]
+        local[:3, 3] = joints[k] - (joints[parents[k]] if k > 0 else 0.0)
+        transforms[k] = local if k == 0 else transforms[parents[k]] @ local
+    posed_joints = transforms[:, :3, 3].copy()
+
+    # 5. Remove the rest pose so transforms act on rest-pose vertices
+    transforms[:, :3, 3] -= np.einsum('kij,kj->ki', transforms[:, :3, :3], joints)
+
+    # 6. Blend the joint transforms per vertex
+    blended = np.einsum('vk,kij->vij', weights, transforms)
+    vertices = np.einsum('vij,vj->vi', blended[:, :3, :3], v_posed) + blended[:, :3, 3]
+    return vertices, posed_joints
@@ -0,0 +1,253 @@
+"""
+Temporal upsampling of HMR2 results
+
+Runs HMR2 on every `stride`-th frame and reconstructs the frames in between:
+- global_orient and body_pose rotations are interpolated with quaternion slerp
+- betas are held fixed at the earlier keyframe (body shape does not change mid-clip)
+- the full-image camera translation is interpolated linearly
+- vertices and joints are regenerated with one batched SMPL forward pass
+- with several riders, people are matched between keyframes by box IoU and
+  every matched pair is interpolated in that same forward pass
+
+SMPL parameters are the rotation-matrix form HMR2 predicts
+(pred_smpl_params: global_orient (1, 3, 3), body_pose (23, 3, 3), betas (10,)).
+"""
+
+import logging
+
+import numpy as np
+
+from box_propagation import box_iou
+
+logger = logging.getLogger(__name__)
+
+
+def rotmat_to_quat(rotmats):
+    """
+    Rotation matrices to unit quaternions (w, x, y, z).
+
+    Args:
+        rotmats: (..., 3, 3) array
+
+    Returns:
+        (..., 4) array with w >= 0
+    """
+    R = np.asarray(rotmats, dtype=np.float64)
+    m00, m01, m02 = R[..., 0, 0], R[..., 0, 1], R[..., 0, 2]
+    m10, m11, m12 = R[..., 1, 0], R[..., 1, 1], R[..., 1, 2]
+    m20, m21, m22 = R[..., 2, 0], R[..., 2, 1], R[..., 2, 2]
+
+    # Shepperd's method: use the largest of 4w^2, 4x^2, 4y^2, 4z^2 for stability
+    candidates = np.stack([
+        1.0 + m00 + m11 + m22,
+        1.0 + m00 - m11 - m22,
+        1.0 - m00 + m11 - m22,
+        1.0 - m00 - m11 + m22,
+    ], axis=-1)
+    best = np.argmax(candidates, axis=-1)
+    s = np.sqrt(np.maximum(np.take_along_axis(candidates, best[..., None], axis=-1)[..., 0], 1e-12)) * 2.0
+
+    quats = np.empty(R.shape[:-2] + (4,), dtype=np.float64)
+    options = [
+        np.stack([s / 4.0, (m21 - m12) / s, (m02 - m20) / s, (m10 - m01) / s], axis=-1),
+        np.stack([(m21 - m12) / s, s / 4.0, (m01 + m10) / s, (m02 + m20) / s], axis=-1),
+        np.stack([(m02 - m20) / s, (m01 + m10) / s, s / 4.0, (m12 + m21) / s], axis=-1),
+        np.stack([(m10 - m01) / s, (m02 + m20) / s, (m12 + m21) / s, s / 4.0], axis=-1),
+    ]
+    for i, option in enumerate(options):
+        mask = best == i
+        quats[mask] = option[mask]
+
+    quats /= np.linalg.norm(quats, axis=-1, keepdims=True)
+    quats *= np.where(quats[..., :1] < 0, -1.0, 1.0)
+    return quats
+
+
+def quat_to_rotmat(quats):
+    """Unit quaternions (w, x, y, z) of shape (..., 4) to (..., 3, 3) rotation matrices"""
+    q = np.asarray(quats, dtype=np.float64)
+    q = q / np.linalg.norm(q, axis=-1, keepdims=True)
+    w, x, y, z = q[..., 0], q[..., 1], q[..., 2], q[..., 3]
+
+    R = np.empty(q.shape[:-1] + (3, 3), dtype=np.float64)
+    R[..., 0, 0] = 1 - 2 * (y * y + z * z)
+    R[..., 0, 1] = 2 * (x * y - w * z)
+    R[..., 0, 2] = 2 * (x * z + w * y)
+    R[..., 1, 0] = 2 * (x * y + w * z)
+    R[..., 1, 1] = 1 - 2 * (x * x + z * z)
+    R[..., 1, 2] = 2 * (y * z - w * x)
+    R[..., 2, 0] = 2 * (x * z - w * y)
+    R[..., 2, 1] = 2 * (y * z + w * x)
+    R[..., 2, 2] = 1 - 2 * (x * x + y * y)
+    return R
+
+
+def slerp(q0, q1, t):
+    """
+    Spherical linear interpolation between quaternion arrays.
+
+    Args:
+        q0, q1: (..., 4) unit quaternions
+        t: scalar or (T,) weights in [0, 1]; with (T,) the result gains a leading T axis
+
+    Returns:
+        (..., 4) or (T, ..., 4) unit quaternions
+    """
+    q0 = np.asarray(q0, dtype=np.float64)
+    q1 = np.asarray(q1, dtype=np.float64)
+    t = np.asarray(t, dtype=np.float64)
+    if t.ndim:
+        t = t.reshape((-1,) + (1,) * q0.ndim)
+
+    # Take the short way round
+    dot = np.sum(q0 * q1, axis=-1, keepdims=True)
+    q1 = np.where(dot < 0, -q1, q1)
+    dot = np.abs(dot)
+
+    theta = np.arccos(np.clip(dot, -1.0, 1.0))
+    sin_theta = np.sin(theta)
+    near = sin_theta < 1e-6
+
+    # Nearly identical rotations fall back to normalised lerp
+    safe_sin = np.where(near, 1.0, sin_theta)
+    w0 = np.where(near, 1.0 - t, np.sin((1.0 - t) * theta) / safe_sin)
+    w1 = np.where(near, t, np.sin(t * theta) / safe_sin)
+
+    out = w0 * q0 + w1 * q1
+    return out / np.linalg.norm(out, axis=-1, keepdims=True)
+
+
+def interpolate_smpl_params(params0, params1, ts):
+    """
+    Interpolate HMR2 SMPL parameters between two keyframes.
+
+    Args:
+        params0, params1: {'global_orient': (1, 3, 3), 'body_pose': (23, 3, 3), 'betas': (10,)}
+        ts: (T,) interpolation weights in (0, 1)
+
+    Returns:
+        {'global_orient': (T, 1, 3, 3), 'body_pose': (T, 23, 3, 3), 'betas': (T, 10)} float32
+    """
+    ts = np.asarray(ts, dtype=np.float64)
+    out = {}
+    for key in ('global_orient', 'body_pose'):
+        q = slerp(rotmat_to_quat(params0[key]), rotmat_to_quat(params1[key]), ts)
+        out[key] = quat_to_rotmat(q).astype(np.float32)
+    # Body shape is held at the earlier keyframe
+    out['betas'] = np.repeat(np.asarray(params0['betas'], dtype=np.float32)[None], len(ts), axis=0)
+    return out
+
+
+def interpolate_persons(person0, person1, ts, smpl_forward):
+    """
+    Reconstruct HMR2 person results for frames between two inferred keyframes.
+
+    Args:
+        person0, person1: run_hmr2_batch() person dicts with 'smpl_params'
+        ts: (T,) interpolation weights in (0, 1), one per in-between frame
+        smpl_forward: Callable(global_orient, body_pose, betas) -> (vertices (T, V, 3),
+                      joints (T, J, 3)) numpy arrays - e.g. HybridPoseDetector.smpl_forward
+
+    Returns:
+        list of T person dicts shaped like run_hmr2_batch() output, with 'interpolated': True
+    """
+    return [persons[0] for persons in _interpolate_pairs([(person0, person1)], ts, smpl_forward)]
+
+
+def match_persons(persons0, persons1, min_iou=0.3):
+    """
+    Pair up the people of two keyframes by box IoU.
+
+    The primary riders (index 0 on both sides) are always paired; the others are
+    matched greedily, best overlap first. People without a match are left out.
+
+    Returns:
+        list of (index0, index1) pairs, primary first
+    """
+    if not persons0 or not persons1:
+        return []
+    pairs = [(0, 0)]
+    candidates = []
+    for i, person0 in enumerate(persons0[1:], start=1):
+        for j, person1 in enumerate(persons1[1:], start=1):
+            if person0.get('box') is not None and person1.get('box') is not None:
+                iou = box_iou(person0['box'], person1['box'])
+                if iou >= min_iou:
+                    candidates.append((iou, i, j))
+    used0, used1 = {0}, {0}
+    for _, i, j in sorted(candidates, reverse=True):
+        if i not in used0 and j not in used1:
+            pairs.append((i, j))
+            used0.add(i)
+            used1.add(j)
+    return pairs
+
+
+def interpolate_tracks(persons0, persons1, ts, smpl_forward, min_iou=0.3):
+    """
+    Interpolate every rider seen at both keyframes (see match_persons) in one SMPL forward pass.
+
+    Args:
+        persons0, persons1: All person dicts of the two keyframes, primary first
+        ts, smpl_forward: As interpolate_persons()
+        min_iou: Minimum box overlap for two secondary riders to count as the same person
+
+    Returns:
+        list (one per t) of person lists, primary rider first
+    """
+    pairs = [
+        (persons0[i], persons1[j]) for i, j in match_persons(persons0, persons1, min_iou)
+        if persons0[i].get('smpl_params') and persons1[j].get('smpl_params')
+    ]
+    return _interpolate_pairs(pairs, ts, smpl_forward)
+
+
+def _interpolate_pairs(pairs, ts, smpl_forward):
+    """Interpolated person dicts for each (person0, person1) pair: list (one per t) of lists (one per pair)"""
+    ts = np.asarray(ts, dtype=np.float64)
+    if len(ts) == 0 or not pairs:
+        return [[] for _ in ts]
+
+    params = [interpolate_smpl_params(person0['smpl_params'], person1['smpl_params'], ts)
+              for person0, person1 in pairs]
+    vertices, joints = smpl_forward(*(np.concatenate([p[key] for p in params])
+                                      for key in ('global_orient', 'body_pose', 'betas')))
+
+    frames = [[] for _ in ts]
+    for pair_idx, (person0, person1) in enumerate(pairs):
+        cam0 = np.asarray(person0['cam_t_full'], dtype=np.float64)
+        cam1 = np.asarray(person1['cam_t_full'], dtype=np.float64)
+        cams = (cam0[None] * (1.0 - ts[:, None]) + cam1[None] * ts[:, None]).astype(np.float32)
+        boxes = None
+        if person0.get('box') is not None and person1.get('box') is not None:
+            box0 = np.asarray(person0['box'], dtype=np.float64)
+            box1 = np.asarray(person1['box'], dtype=np.float64)
+            boxes = (box0[None] * (1.0 - ts[:, None]) + box1[None] * ts[:, None]).astype(np.float32)
+
+        for i, t in enumerate(ts):
+            row = pair_idx * len(ts) + i
+            person = {
+                'vertices': vertices[row],
+                'joints_3d': joints[row],
+                'cam_t_full': cams[i],
+                'faces': person0.get('faces'),
+                'img_size': person0['img_size'],
+                'scaled_focal_length': person0['scaled_focal_length'] * (1.0 - t) + person1['scaled_focal_length'] * t,
+                'focal_length': person0.get('focal_length'),
+                'smpl_params': {
+                    'global_orient': params[pair_idx]['global_orient'][i],
+                    'body_pose': params[pair_idx]['body_pose'][i],
+                    'betas': params[pair_idx]['betas'][i],
+                },
+                'interpolated': True,
+                'interpolation_t': float(t),
+            }
+            if boxes is not None:
+                person['box'] = boxes[i]
+            frames[i].append(person)
+    return frames
+
+
+def is_keyframe(position, total, stride):
+    """Keyframes are every stride-th processed frame plus the last one"""
+    return stride <= 1 or position % stride == 0 or position == total - 1
@@ -0,0 +1,103 @@
+"""
+Test script for detect-every-N box propagation - scheduling and drift
+checks with synthetic HMR2 person results (no models needed)
+"""
+
+import numpy as np
+
+from box_propagation import BoxPropagator, box_from_points, box_iou, project_points
+
+IMG_SIZE = (640, 480)
+FOCAL = 1000.0
+
+
+def make_person(offset_x=0.0, box=None):
+    """A 2m-tall column of points 10m from the camera, shifted sideways by offset_x metres"""
+    ys = np.linspace(-1.0, 1.0, 20)
+    vertices = np.stack([np.full_like(ys, offset_x), ys, np.zeros_like(ys)], axis=1)
+    vertices = np.concatenate([vertices, vertices + [0.4, 0, 0]])
+    return {
+        'vertices': vertices.astype(np.float32),
+        'cam_t_full': np.array([0.0, 0.0, 10.0], dtype=np.float32),
+        'scaled_focal_length': FOCAL,
+        'img_size': np.array(IMG_SIZE, dtype=np.float32),
+        'box': box,
+    }
+
+
+def detection(score=0.99, fallback=False):
+    return {'boxes': np.zeros((1, 4), np.float32), 'scores': np.array([score], np.float32), 'fallback': fallback}
+
+
+def test_projection_and_box():
+    """Projected column lands in the image centre and gets a padded box"""
+    points = project_points(make_person()['vertices'], [0, 0, 10], FOCAL, IMG_SIZE)
+    assert np.allclose(points[:20, 0], 320.0)
+    assert np.isclose(points[:, 1].min(), 140.0) and np.isclose(points[:, 1].max(), 340.0)
+
+    box = box_from_points(points, *IMG_SIZE, padding=1.0)
+    assert np.allclose(box, [320, 140, 360, 340]), box
+    assert box_iou(box, box) == 1.0
+    assert box_from_points(points - 2000, *IMG_SIZE) is None
+    print("✓ Projection and box bounds")
+
+
+def test_detects_every_n_frames():
+    """With a steady rider the detector runs once every N frames"""
+    propagator = BoxPropagator(detect_every=4, min_iou=0.3)
+    detected = []
+    for i in range(12):
+        boxes = propagator.boxes_for_frame(i)
+        detected.append(boxes is None)
+        person = make_person(box=boxes[0] if boxes is not None else None)
+        propagator.update(i, [person], detection=detection() if boxes is None else None)
+
+    assert detected == [True, False, False, False] * 3, detected
+    stats = propagator.get_stats()
+    assert stats['detector_runs'] == 3 and stats['propagated_frames'] == 9
+    print(f"✓ Detector ran on frames {[i for i, d in enumerate(detected) if d]}")
+
+
+def test_low_score_and_fallback_force_detection():
+    """Weak or missing ViTDet detections are re-checked on the next frame"""
+    for det, reason in ((detection(score=0.6), 'low_score'), (detection(fallback=True), 'no_detection')):
+        propagator = BoxPropagator(detect_every=10)
+        propagator.boxes_for_frame(0)
+        propagator.update(0, [make_person()], detection=det)
+        assert propagator.boxes_for_frame(1) is None
+        assert propagator.get_stats()['redetect_reasons'][reason] == 1
+    print("✓ Low score / fallback force re-detection")
+
+
+def test_drift_forces_detection():
+    """A mesh that no longer sits in its propagated box triggers the detector"""
+    propagator = BoxPropagator(detect_every=10, min_iou=0.5)
+    propagator.boxes_for_frame(0)
+    propagator.update(0, [make_person()], detection=detection())
+
+    boxes = propagator.boxes_for_frame(1)
+    assert boxes is not None
+    # Rider jumped 1.5m sideways: HMR2 fit inside the stale box is far from it
+    propagator.update(1, [make_person(offset_x=1.5, box=boxes[0])])
+
+    assert propagator.boxes_for_frame(2) is None
+    assert propagator.get_stats()['redetect_reasons']['drift'] == 1
+    print("✓ Drift forces re-detection")
+
+
+def test_lost_person_forces_detection():
+    """No HMR2 persons means no boxes to propagate"""
+    propagator = BoxPropagator(detect_every=10)
+    propagator.boxes_for_frame(0)
+    propagator.update(0, [], detection=detection())
+    assert propagator.boxes_for_frame(1) is None
+    print("✓ Lost person forces re-detection")
+
+
+if __name__ == '__main__':
+    test_projection_and_box()
+    test_detects_every_n_frames()
+    test_low_score_and_fallback_force_detection()
+    test_drift_forces_detection()
+    test_lost_person_forces_detection()
+    print("All box propagation tests passed")
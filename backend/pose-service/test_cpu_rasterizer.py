@@ -0,0 +1,221 @@
+"""
+Test script for the NumPy CPU rasterizer - projection, z-buffer and
+silhouette checks on synthetic meshes, plus a pixel diff against pyrender
+when pyrender is installed
+"""
+
+import numpy as np
+
+from cpu_rasterizer import LIGHT_BLUE, rasterize_rgba
+
+
+def make_sphere(radius=0.5, rings=24, segments=48):
+    """UV sphere with outward-facing (counter-clockwise) triangles"""
+    vertices = [[0.0, radius, 0.0]]
+    for i in range(1, rings):
+        theta = np.pi * i / rings
+        for j in range(segments):
+            phi = 2 * np.pi * j / segments
+            vertices.append([radius * np.sin(theta) * np.cos(phi), radius * np.cos(theta),
+                             radius * np.sin(theta) * np.sin(phi)])
+    vertices.append([0.0, -radius, 0.0])
+    vertices = np.array(vertices)
+
+    def ring(i, j):
+        return 1 + (i - 1) * segments + j % segments
+
+    faces = []
+    bottom = len(vertices) - 1
+    for j in range(segments):
+        faces.append([0, ring(1, j + 1), ring(1, j)])
+        faces.append([bottom, ring(rings - 1, j), ring(rings - 1, j + 1)])
+    for i in range(1, rings - 1):
+        for j in range(segments):
+            a, b = ring(i, j), ring(i, j + 1)
+            c, d = ring(i + 1, j), ring(i + 1, j + 1)
+            faces.append([a, b, c])
+            faces.append([b, d, c])
+    return vertices, np.array(faces)
+
+
+def make_quad(x0, y0, x1, y1, z):
+    """Axis-aligned quad in the z plane, facing the camera in both windings"""
+    vertices = np.array([[x0, y0, z], [x1, y0, z], [x1, y1, z], [x0, y1, z]], dtype=np.float64)
+    faces = np.array([[0, 1, 2], [0, 2, 3], [0, 2, 1], [0, 3, 2]])
+    return vertices, faces
+
+
+def test_projection_matches_pinhole():
+    """A quad lands on the pixels given by u = f * (x + tx) / (z + tz) + w / 2"""
+    w, h, f = 200, 100, 100.0
+    vertices, faces = make_quad(-0.5, -0.25, 0.5, 0.25, 0.0)
+    rgba = rasterize_rgba(vertices, faces, [0.2, 0.1, 2.0], w, h, f, cull_backfaces=False)
+
+    ys, xs = np.nonzero(rgba[:, :, 3])
+    # x in [-0.3, 0.7] * 50 + 100 -> [85, 135); y in [-0.15, 0.35] * 50 + 50 -> [42.5, 67.5]
+    # (pixel centres on an edge are covered)
+    assert (xs.min(), xs.max()) == (85, 134), (xs.min(), xs.max())
+    assert (ys.min(), ys.max()) == (42, 67), (ys.min(), ys.max())
+    assert rgba.dtype == np.uint8 and set(np.unique(rgba[:, :, 3])) == {0, 255}
+    print("✓ Projection matches the pinhole model")
+
+
+def test_zbuffer_keeps_nearest():
+    """Overlapping quads: the nearer one wins regardless of face order"""
+    near_v, near_f = make_quad(-0.5, -0.5, 0.5, 0.5, 0.0)
+    far_v, far_f = make_quad(-3.0, -3.0, 3.0, 3.0, 1.0)
+    vertices = np.concatenate([far_v, near_v])
+    faces = np.concatenate([far_f, near_f + 4])
+
+    red = rasterize_rgba(vertices[4:], near_f, [0, 0, 5.0], 64, 64, 50.0, mesh_color=(1, 0, 0),
+                         cull_backfaces=False)
+    both = rasterize_rgba(vertices, faces, [0, 0, 5.0], 64, 64, 50.0, mesh_color=(1, 0, 0),
+                          cull_backfaces=False)
+    flipped = rasterize_rgba(vertices, faces[::-1], [0, 0, 5.0], 64, 64, 50.0, mesh_color=(1, 0, 0),
+                             cull_backfaces=False)
+
+    assert np.array_equal(both, flipped)
+    centre = both[32, 32]
+    assert centre[3] == 255 and np.array_equal(centre, red[32, 32]), (centre, red[32, 32])
+    # The far quad still fills the border the near one does not cover
+    assert both[32, 2, 3] == 0 and both[32, 12, 3] == 255
+    print("✓ Z-buffer keeps the nearest fragment")
+
+
+def test_sphere_silhouette_and_culling():
+    """A sphere covers ~pi * r^2 projected pixels; culling back faces does not change the image"""
+    vertices, faces = make_sphere(radius=0.5)
+    w, h, f, tz = 256, 256, 500.0, 10.0
+    culled = rasterize_rgba(vertices, faces, [0, 0, tz], w, h, f)
+    full = rasterize_rgba(vertices, faces, [0, 0, tz], w, h, f, cull_backfaces=False)
+
+    covered = int((culled[:, :, 3] > 0).sum())
+    expected = np.pi * (f * 0.5 / tz) ** 2
+    assert abs(covered - expected) / expected < 0.05, (covered, expected)
+    assert np.array_equal(culled[:, :, 3], full[:, :, 3])
+    # The lights sit on the camera side: the centre is lit, the rim falls back towards ambient
+    ambient_only = round((0.3 * LIGHT_BLUE[2]) ** (1 / 2.2) * 255)
+    rim = culled[128, np.nonzero(culled[128, :, 3])[0][0], 2]
+    assert culled[128, 128, 2] > rim >= ambient_only, (culled[128, 128], rim, ambient_only)
+    print(f"✓ Sphere silhouette {covered} px (expected {expected:.0f})")
+
+
+def test_flat_vs_smooth_shading():
+    """Both shading modes cover the same pixels; smooth has more distinct shades"""
+    vertices, faces = make_sphere(radius=0.5, rings=8, segments=12)
+    smooth = rasterize_rgba(vertices, faces, [0, 0, 4.0], 128, 128, 200.0, shading='smooth')
+    flat = rasterize_rgba(vertices, faces, [0, 0, 4.0], 128, 128, 200.0, shading='flat')
+
+    assert np.array_equal(smooth[:, :, 3], flat[:, :, 3])
+    mask = smooth[:, :, 3] > 0
+    assert len(np.unique(smooth[mask][:, 2])) > len(np.unique(flat[mask][:, 2]))
+    print("✓ Flat and smooth shading")
+
+
+def test_roi_matches_full_render():
+    """Rasterizing a window gives exactly the same pixels as cropping the full render"""
+    vertices, faces = make_sphere(radius=0.5)
+    args = (vertices, faces, [0.3, -0.1, 6.0], 320, 240, 300.0)
+    full = rasterize_rgba(*args)
+    roi = (130, 70, 250, 170)
+    window = rasterize_rgba(*args, roi=roi)
+    assert window.shape == (100, 120, 4)
+    assert np.array_equal(window, full[70:170, 130:250])
+    print("✓ ROI render matches the full-frame crop")
+
+
+def test_overlay_roi_matches_full_frame():
+    """ROI uint8 overlay matches the full-frame float overlay and reports saved pixels"""
+    from mesh_renderer import SMPLMeshRenderer, mesh_roi
+
+    vertices, faces = make_sphere(radius=0.5)
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, (480, 640, 3), dtype=np.uint8)
+    cam_t, focal = np.array([0.4, 0.2, 10.0]), 800.0
+
+    roi_renderer = SMPLMeshRenderer(backend='cpu', roi=True)
+    full_renderer = SMPLMeshRenderer(backend='cpu', roi=False)
+    roi_out = roi_renderer.render_mesh_overlay(frame, vertices, faces, cam_t, focal_length=focal)
+    full_out = full_renderer.render_mesh_overlay(frame, vertices, faces, cam_t, focal_length=focal)
+
+    assert np.abs(roi_out.astype(np.int16) - full_out).max() <= 1
+    stats = roi_renderer.last_render_stats
+    x0, y0, x1, y1 = mesh_roi(vertices, cam_t, 640, 480, focal)
+    assert stats['roi'] == [x0, y0, x1, y1]
+    assert stats['rendered_pixels'] == (x1 - x0) * (y1 - y0)
+    assert stats['saved_pixels'] == 640 * 480 - stats['rendered_pixels'] > 0
+    assert full_renderer.last_render_stats['saved_pixels'] == 0
+
+    # Off-screen mesh: nothing rendered, frame unchanged
+    away = roi_renderer.render_mesh_overlay(frame, vertices, faces, np.array([50.0, 0, 10.0]), focal_length=focal)
+    assert np.array_equal(away, frame) and roi_renderer.last_render_stats['rendered_pixels'] == 0
+    print(f"✓ ROI overlay: rendered {stats['rendered_pixels']} of {stats['frame_pixels']} px")
+
+
+def test_multiple_people_one_pass():
+    """Two people render in one pass, each in its own colour, matching separate renders"""
+    from mesh_renderer import PERSON_COLORS, SMPLMeshRenderer, render_rgba, render_rgba_multiple
+
+    vertices, faces = make_sphere(radius=0.5)
+    left, right = np.array([-1.0, 0.0, 10.0]), np.array([1.0, 0.0, 12.0])
+    meshes = [(vertices, faces, left), (vertices, faces, right)]
+
+    combined = render_rgba_multiple(meshes, 320, 240, 500.0, backend='cpu')
+    first = render_rgba(vertices, faces, left, 320, 240, 500.0, PERSON_COLORS[0], backend='cpu')
+    second = render_rgba(vertices, faces, right, 320, 240, 500.0, PERSON_COLORS[1], backend='cpu')
+
+    assert np.array_equal(combined[:, :160], first[:, :160])
+    assert np.array_equal(combined[:, 160:], second[:, 160:])
+    assert not np.array_equal(first[120, 110, :3], second[120, 201, :3])
+
+    frame = np.zeros((240, 320, 3), dtype=np.uint8)
+    renderer = SMPLMeshRenderer(backend='cpu')
+    overlay = renderer.render_meshes_overlay(frame, meshes, focal_length=500.0)
+    assert np.array_equal(overlay[120, 110], first[120, 110, 2::-1])
+    assert np.array_equal(overlay[120, 201], second[120, 201, 2::-1])
+    roi = renderer.last_render_stats['roi']
+    assert roi[0] <= 110 and roi[2] > 201
+    print("✓ Two people rendered in one pass")
+
+
+def test_matches_pyrender():
+    """Pixel diff against the pooled pyrender renderer (skipped without pyrender / EGL)"""
+    try:
+        from mesh_renderer import HAS_PYRENDER, render_rgba
+    except ImportError:
+        HAS_PYRENDER = False
+    if not HAS_PYRENDER:
+        print("⚠ pyrender not installed - skipping pixel diff")
+        return
+
+    vertices, faces = make_sphere(radius=0.4)
+    vertices = vertices * np.array([0.6, 1.8, 0.5]) + np.array([0.1, -0.2, 0.0])
+    args = (vertices, faces, np.array([0.05, 0.3, 12.0]), 640, 480, 1000.0)
+    try:
+        reference = render_rgba(*args, backend='pyrender')
+    except Exception as e:
+        print(f"⚠ pyrender could not render ({e}) - skipping pixel diff")
+        return
+    ours = rasterize_rgba(*args)
+
+    ref_mask = reference[:, :, 3] > 0
+    our_mask = ours[:, :, 3] > 0
+    iou = (ref_mask & our_mask).sum() / max((ref_mask | our_mask).sum(), 1)
+    both = ref_mask & our_mask
+    mean_diff = np.abs(reference[both][:, :3].astype(np.int16) - ours[both][:, :3]).mean()
+
+    assert iou > 0.98, iou
+    assert mean_diff < 20, mean_diff
+    print(f"✓ Matches pyrender: mask IoU {iou:.4f}, mean colour diff {mean_diff:.1f}/255")
+
+
+if __name__ == '__main__':
+    test_projection_matches_pinhole()
+    test_zbuffer_keeps_nearest()
+    test_sphere_silhouette_and_culling()
+    test_flat_vs_smooth_shading()
+    test_roi_matches_full_render()
+    test_overlay_roi_matches_full_frame()
+    test_multiple_people_one_pass()
+    test_matches_pyrender()
+    print("All CPU rasterizer tests passed")
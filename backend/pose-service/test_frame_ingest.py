@@ -0,0 +1,76 @@
+"""
+Test script for request frame ingest - raw bytes, multipart and base64 JSON
+frames decode to arrays, and malformed bodies raise FrameDecodeError (400)
+instead of escaping as 500s
+"""
+
+import base64
+import io
+
+import cv2
+import numpy as np
+from flask import Flask, request
+
+from frame_ingest import FrameDecodeError, read_frame_from_request, read_frames_from_request
+
+app = Flask(__name__)
+
+
+def make_jpeg():
+    image = np.zeros((48, 64, 3), dtype=np.uint8)
+    image[:, :32] = (255, 0, 0)
+    ok, encoded = cv2.imencode('.jpg', image)
+    assert ok
+    return encoded.tobytes()
+
+
+def expect_decode_error(**request_kwargs):
+    with app.test_request_context('/pose/hybrid', method='POST', **request_kwargs):
+        try:
+            read_frame_from_request(request)
+        except FrameDecodeError as e:
+            return str(e)
+    raise AssertionError(f'No FrameDecodeError for {request_kwargs}')
+
+
+def test_request_shapes():
+    """Raw bytes, a multipart 'frame' file and legacy base64 JSON decode to the same image"""
+    jpeg = make_jpeg()
+    shapes = {
+        'binary': {'data': jpeg, 'content_type': 'image/jpeg', 'query_string': {'frame_number': '5'}},
+        'multipart': {'data': {'frame': (io.BytesIO(jpeg), 'f.jpg'), 'frame_number': '5'},
+                      'content_type': 'multipart/form-data'},
+        'base64': {'json': {'image_base64': base64.b64encode(jpeg).decode('ascii'), 'frame_number': 5}},
+    }
+    for source, kwargs in shapes.items():
+        with app.test_request_context('/pose/hybrid', method='POST', **kwargs):
+            frame = read_frame_from_request(request)
+        assert frame['source'] == source and frame['image'].shape == (48, 64, 3)
+        assert int(frame['params']['frame_number']) == 5 and frame['encoded_bytes'] == len(jpeg)
+    print(f"✓ Decoded {', '.join(shapes)} frames")
+
+
+def test_malformed_bodies():
+    """Non-object JSON, missing fields and undecodable bytes are FrameDecodeErrors"""
+    assert 'must be an object' in expect_decode_error(json=[1, 2])
+    assert 'must be an object' in expect_decode_error(json='image')
+    assert 'required' in expect_decode_error(json={'frame_number': 1})
+    assert 'No frame provided' in expect_decode_error(data=b'', content_type='application/json')
+    assert 'Could not decode' in expect_decode_error(data=b'not a jpeg', content_type='image/jpeg')
+
+    frame = base64.b64encode(make_jpeg()).decode('ascii')
+    bad_frame_numbers = [{'frames': [{'image_base64': frame, 'frame_number': value}]} for value in ('abc', [1], {})]
+    for body in [[1, 2], {'frames': []}, {'frames': 'abc'}] + bad_frame_numbers:
+        with app.test_request_context('/pose/hybrid/batch', method='POST', json=body):
+            try:
+                read_frames_from_request(request)
+            except FrameDecodeError:
+                continue
+        raise AssertionError(f'No FrameDecodeError for batch body {body!r}')
+    print("✓ Malformed bodies rejected")
+
+
+if __name__ == '__main__':
+    test_request_shapes()
+    test_malformed_bodies()
+    print("All frame ingest tests passed")
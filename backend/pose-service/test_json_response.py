@@ -0,0 +1,88 @@
+"""
+Test script for the NumPy-aware JSON provider - arrays and NumPy scalars
+serialize without tolist(), both backends agree, and jsonify() / NDJSON lines
+go through it
+"""
+
+import json
+
+import numpy as np
+from flask import Flask, jsonify
+
+import json_response
+from json_response import dumps, install_json_provider
+from ndjson_stream import ndjson_line
+from test_mesh_wire import make_result
+
+
+def backends():
+    return ['stdlib'] + (['orjson'] if json_response.HAS_ORJSON else [])
+
+
+def test_numpy_values():
+    """Arrays (any layout / dtype) and NumPy scalars come back as the equivalent lists and numbers"""
+    payload = {
+        'vertices': np.arange(12, dtype=np.float32).reshape(4, 3) / 4,
+        'transposed': np.arange(6, dtype=np.int64).reshape(2, 3).T,
+        'half': np.array([0.5, 1.5], dtype=np.float16),
+        'flags': np.array([True, False]),
+        'focal': np.float32(1234.5),
+        'count': np.int64(3),
+        'nested': [{'joints': np.zeros((2, 3), dtype=np.float64)}],
+        7: 'int key',
+    }
+    expected = {
+        'vertices': (np.arange(12).reshape(4, 3) / 4).tolist(),
+        'transposed': [[0, 3], [1, 4], [2, 5]],
+        'half': [0.5, 1.5],
+        'flags': [True, False],
+        'focal': 1234.5,
+        'count': 3,
+        'nested': [{'joints': [[0.0] * 3] * 2}],
+        '7': 'int key',
+    }
+    try:
+        for backend in backends():
+            json_response.JSON_BACKEND = backend
+            body = dumps(payload)
+            assert isinstance(body, bytes) and b' ' not in body.replace(b'int key', b'')
+            assert json.loads(body) == expected, backend
+    finally:
+        json_response.JSON_BACKEND = 'auto'
+    print(f"✓ NumPy values serialized by {', '.join(backends())}")
+
+
+def test_float32_precision():
+    """float32 vertices decode to the same float32 values as tolist() would give"""
+    result = make_result()
+    for backend in backends():
+        json_response.JSON_BACKEND = backend
+        decoded = np.asarray(json.loads(dumps(result))['mesh_vertices_data'], dtype=np.float32)
+        assert np.array_equal(decoded, result['mesh_vertices_data']), backend
+    json_response.JSON_BACKEND = 'auto'
+    print("✓ float32 vertices round-trip exactly")
+
+
+def test_jsonify_and_ndjson():
+    """jsonify() in an app with the provider installed, and NDJSON lines, accept raw arrays"""
+    app = install_json_provider(Flask(__name__))
+    result = make_result()
+    with app.test_request_context('/pose/hybrid'):
+        response = jsonify(result)
+        payload = response.get_json()
+    assert response.mimetype == 'application/json'
+    assert len(payload['mesh_vertices_data']) == 6890 and payload['scaled_focal_length'] == 1234.5
+    assert payload['mesh_faces_data'] == result['mesh_faces_data'].tolist()
+
+    line = ndjson_line({'type': 'frame', 'mesh_vertices': result['mesh_vertices_data'][:2]})
+    assert line.endswith(b'\n') and line.count(b'\n') == 1
+    decoded = np.asarray(json.loads(line)['mesh_vertices'], dtype=np.float32)
+    assert np.array_equal(decoded, result['mesh_vertices_data'][:2])
+    print(f"✓ jsonify response: {len(response.get_data())} bytes")
+
+
+if __name__ == '__main__':
+    test_numpy_values()
+    test_float32_precision()
+    test_jsonify_and_ndjson()
+    print("All JSON response tests passed")
@@ -0,0 +1,79 @@
+"""
+Test script for motion-adaptive keyframe selection - synthetic motion
+scores and a generated clip with a static and a moving section
+"""
+
+import os
+import tempfile
+
+import cv2
+import numpy as np
+
+from keyframe_selection import compute_motion_scores, select_keyframes, select_motion_keyframes
+
+
+def write_clip(path, static_frames=40, moving_frames=20, size=(96, 64)):
+    """Static grey frames followed by a square sweeping across the frame"""
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), 30, size)
+    for _ in range(static_frames):
+        writer.write(np.full((size[1], size[0], 3), 90, np.uint8))
+    for i in range(moving_frames):
+        frame = np.full((size[1], size[0], 3), 90, np.uint8)
+        x = 4 * i
+        cv2.rectangle(frame, (x, 16), (x + 16, 48), (255, 255, 255), -1)
+        writer.write(frame)
+    writer.release()
+
+
+def test_budget_follows_motion():
+    """High-motion frames get denser sampling than static ones"""
+    scores = np.zeros(100)
+    scores[60:80] = 10.0
+    selected = select_keyframes(scores, 20, uniform_fraction=0.25)
+
+    assert len(selected) == 20 and selected == sorted(set(selected))
+    in_burst = sum(60 <= i < 80 for i in selected)
+    assert in_burst >= 12, selected
+    assert any(i < 60 for i in selected), "static section should keep some coverage"
+    print(f"✓ {in_burst}/20 keyframes in the high-motion 20% of the clip")
+
+
+def test_degenerate_inputs():
+    """No motion falls back to even sampling; small clips keep every frame"""
+    even = select_keyframes(np.zeros(10), 5)
+    assert len(even) == 5 and set(np.diff(even)) == {2}, even
+    assert select_keyframes(np.ones(4), 10) == [0, 1, 2, 3]
+    assert select_keyframes(np.ones(4), 0) == []
+    # All motion in one frame still yields a full budget
+    spike = np.zeros(50)
+    spike[10] = 100.0
+    assert len(select_keyframes(spike, 8, uniform_fraction=0.0)) == 8
+    print("✓ Degenerate inputs")
+
+
+def test_scores_from_video():
+    """The diff pre-pass sees the moving section and selection concentrates there"""
+    path = os.path.join(tempfile.gettempdir(), 'keyframe_selection_test.mp4')
+    write_clip(path)
+    try:
+        scores = compute_motion_scores(path, method='diff')
+        assert len(scores) == 60
+        assert scores[41:60].mean() > 5 * (scores[1:40].mean() + 1e-3), scores
+
+        strided = compute_motion_scores(path, method='diff', analysis_stride=3)
+        assert len(strided) == 60
+
+        selection = select_motion_keyframes(path, 15, method='flow')
+        assert selection['method'] == 'motion-flow'
+        assert len(selection['motion_scores']) == 60
+        assert sum(i >= 40 for i in selection['selected_frames']) > 15 * 20 / 60
+        print(f"✓ Selected from clip: {selection['selected_frames']}")
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    test_budget_follows_motion()
+    test_degenerate_inputs()
+    test_scores_from_video()
+    print("All keyframe selection tests passed")
@@ -0,0 +1,125 @@
+"""
+Test script for the decimated SMPL level-of-detail meshes - vertex counts,
+nested index maps, manifold and orientation checks, result subsampling,
+/mesh/topology?lod= and the on-disk map cache (a 6890-vertex torus stands in
+for the SMPL template)
+"""
+
+import tempfile
+
+import numpy as np
+from flask import Flask, request
+
+import mesh_lod
+from mesh_lod import apply_lod, decimate, get_lod, get_lod_level
+from mesh_topology import attach_topology, topology_response
+
+
+def make_torus(rings=130, segments=53, radius=0.5, tube=0.15):
+    """Closed, consistently oriented 130 x 53 = 6890-vertex mesh"""
+    u = np.arange(rings)[:, None] / rings * 2 * np.pi
+    v = np.arange(segments)[None, :] / segments * 2 * np.pi
+    vertices = np.stack([(radius + tube * np.cos(v)) * np.cos(u),
+                         (radius + tube * np.cos(v)) * np.sin(u),
+                         np.broadcast_to(tube * np.sin(v), (rings, segments))], axis=-1).reshape(-1, 3)
+    i, j = np.meshgrid(np.arange(rings), np.arange(segments), indexing='ij')
+    a = i * segments + j
+    b = (i + 1) % rings * segments + j
+    c = (i + 1) % rings * segments + (j + 1) % segments
+    d = i * segments + (j + 1) % segments
+    faces = np.concatenate([np.stack([a, b, c], -1).reshape(-1, 3), np.stack([a, c, d], -1).reshape(-1, 3)])
+    return vertices, faces
+
+
+def outward(vertices, faces, radius=0.5):
+    """Dot of each face normal with the direction away from the tube centre"""
+    a, b, c = vertices[faces[:, 0]], vertices[faces[:, 1]], vertices[faces[:, 2]]
+    normals = np.cross(b - a, c - a)
+    centroid = (a + b + c) / 3
+    ring = centroid.copy()
+    ring[:, 2] = 0
+    ring *= radius / np.linalg.norm(ring, axis=1, keepdims=True)
+    return np.einsum('ij,ij->i', normals, centroid - ring)
+
+
+def test_decimate_counts_and_manifold():
+    """Half and quarter levels hit their vertex counts, nest, stay closed and keep orientation"""
+    vertices, faces = make_torus()
+    assert (outward(vertices, faces) > 0).all()
+    snapshots = decimate(faces, vertices, [3445, 1722])
+
+    for target, (vertex_map, lod_faces) in snapshots.items():
+        assert len(vertex_map) == target, (target, len(vertex_map))
+        assert lod_faces.min() >= 0 and lod_faces.max() < target
+        edges = {tuple(sorted(edge)) for face in lod_faces for edge in ((face[0], face[1]), (face[1], face[2]),
+                                                                         (face[2], face[0]))}
+        assert target - len(edges) + len(lod_faces) == 0  # Euler characteristic of a torus
+        assert len(lod_faces) == 2 * target
+        assert (outward(vertices[vertex_map], lod_faces) > 0).all()
+    assert set(snapshots[1722][0]) <= set(snapshots[3445][0])
+    print(f"✓ Decimated 6890 -> {len(snapshots[3445][0])} / {len(snapshots[1722][0])} vertices, "
+          f"{len(snapshots[3445][1])} / {len(snapshots[1722][1])} faces")
+
+
+def test_apply_lod_and_topology_response():
+    """Results are subsampled by index; /mesh/topology?lod=1 serves the matching faces and map"""
+    vertices, faces = make_torus()
+    mesh_lod.LOD_CACHE_DIR = ''
+    lod = get_lod(1, faces, vertices)
+    assert get_lod(1, faces) is lod and get_lod(0, faces).vertex_count == 6890
+
+    posed = vertices * 1.1
+    result = attach_topology({'mesh_vertices_data': posed, 'mesh_faces_data': faces})
+    apply_lod(result, lod)
+    assert np.array_equal(result['mesh_vertices_data'], posed[lod.vertex_map])
+    assert result['mesh_lod'] == 1 and result['mesh_topology']['vertex_count'] == lod.vertex_count
+    assert result['mesh_topology']['url'] == f'/mesh/topology?lod=1&v={lod.topology.version}'
+
+    timeline_frame = apply_lod({'vertices': posed.tolist(), 'faces': faces.tolist()}, lod,
+                               vertices_key='vertices', faces_key='faces')
+    assert len(timeline_frame['vertices']) == lod.vertex_count and timeline_frame['faces'] == lod.faces.tolist()
+
+    app = Flask(__name__)
+    with app.test_request_context('/mesh/topology?lod=1&format=json'):
+        assert get_lod_level(request) == 1
+        response = topology_response(request, faces, lod)
+        payload = response.get_json()
+        assert response.headers['X-Mesh-LOD'] == '1' and response.headers.get('ETag') == f'"{lod.topology.version}"'
+        assert payload['vertex_map'] == lod.vertex_map.tolist() and payload['face_count'] == len(lod.faces)
+    for bad in ('3', 'half'):
+        with app.test_request_context(f'/pose/hybrid?lod={bad}'):
+            try:
+                get_lod_level(request)
+                raise AssertionError('expected ValueError')
+            except ValueError:
+                pass
+    print(f"✓ LOD 1 result: {lod.vertex_count} vertices, {len(lod.faces)} faces")
+
+
+def test_disk_cache():
+    """Maps computed once are reloaded from POSE_LOD_CACHE_DIR without any vertices"""
+    vertices, faces = make_torus(rings=40, segments=20)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        mesh_lod.LOD_CACHE_DIR = cache_dir
+        first = mesh_lod.get_lod_set(faces, vertices)
+        mesh_lod._lod_sets.clear()
+        reloaded = mesh_lod.get_lod_set(faces)
+        for level in (1, 2):
+            assert np.array_equal(reloaded[level].vertex_map, first[level].vertex_map)
+            assert reloaded[level].topology.version == first[level].topology.version
+
+        mesh_lod._lod_sets.clear()
+        mesh_lod.LOD_CACHE_DIR = ''
+        try:
+            mesh_lod.get_lod_set(faces)
+            raise AssertionError('expected ValueError')
+        except ValueError:
+            pass
+    print("✓ LOD maps cached on disk")
+
+
+if __name__ == '__main__':
+    test_decimate_counts_and_manifold()
+    test_apply_lod_and_topology_response()
+    test_disk_cache()
+    print("All mesh LOD tests passed")
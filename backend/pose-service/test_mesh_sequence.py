@@ -0,0 +1,119 @@
+"""
+Test script for the temporal delta + quantization vertex sequence codec -
+error bound, exact GOP reconstruction, missing frames, random access and
+compression ratio on a smoothly moving SMPL-sized point cloud
+"""
+
+import json
+
+import numpy as np
+
+from mesh_sequence import (
+    MeshSequenceError, decode_frame, decode_sequence, decode_timeline, encode_sequence, encode_timeline,
+)
+
+
+def make_motion(frames=60, vertex_count=6890):
+    """A body-sized surface (rings of vertices, spatially ordered like SMPL) that sways,
+    bends and drifts like a rider over ~2 seconds"""
+    per_ring = 53
+    i = np.arange(vertex_count)
+    y = (i // per_ring) / (vertex_count / per_ring) * 1.7 - 0.85
+    angle = (i % per_ring) / per_ring * 2 * np.pi
+    radius = 0.12 + 0.05 * np.sin(y * 4)
+    rest = np.stack([radius * np.cos(angle), y, 0.7 * radius * np.sin(angle)], axis=1).astype(np.float32)
+
+    sequence = []
+    for t in range(frames):
+        sway = 0.4 * np.sin(t / 9.0)
+        rotation = np.array([[np.cos(sway), 0, np.sin(sway)], [0, 1, 0], [-np.sin(sway), 0, np.cos(sway)]])
+        bend = 0.05 * np.sin(t / 5.0) * rest[:, 1:2] ** 2
+        sequence.append((rest @ rotation.T + bend + [0.01 * t, 0, 0]).astype(np.float32))
+    return sequence
+
+
+def test_round_trip_error_bound():
+    """Decoded vertices stay within half a quantization step of the input"""
+    frames = make_motion()
+    data, stats = encode_sequence(frames, compression='zlib')
+    decoded = decode_sequence(data)
+
+    error = max(float(np.abs(a - b).max()) for a, b in zip(decoded, frames))
+    assert error <= stats['error_bound'], (error, stats['error_bound'])
+    assert abs(error - stats['max_error']) < 1e-6
+    assert stats['max_error'] <= 0.00025 + 1e-6  # half of the default 0.5 mm step
+
+    fine, fine_stats = encode_sequence(frames, compression='zlib', precision=0)
+    assert fine_stats['max_error'] < 3e-5 and len(fine) > len(data)  # ~2 m box / 65535 levels
+    print(f"✓ Round trip max error {error * 1000:.3f} mm (bound {stats['error_bound'] * 1000:.3f} mm)")
+
+
+def test_compression_ratio():
+    """Correlated frames compress at least 10x against float32 (and far more against JSON)"""
+    frames = make_motion(frames=90)
+    data, stats = encode_sequence(frames, compression='zlib')
+    json_bytes = len(json.dumps([frame.tolist() for frame in frames]))
+
+    assert stats['ratio'] >= 10, stats
+    print(f"✓ {stats['raw_bytes'] // 1024} KB float32 ({json_bytes // 1024} KB JSON) -> "
+          f"{len(data) // 1024} KB ({stats['ratio']}x)")
+
+
+def test_missing_frames_and_random_access():
+    """None frames survive; decode_frame matches the full decode across GOP boundaries"""
+    frames = make_motion(frames=25, vertex_count=500)
+    frames[0] = None
+    frames[7] = None
+    frames[24] = []
+    data, _ = encode_sequence(frames, keyframe_interval=4, compression='none')
+    decoded = decode_sequence(data)
+
+    assert [d is None for d in decoded] == [f is None or len(f) == 0 for f in frames]
+    for index in (1, 6, 8, 12, 23):
+        assert np.array_equal(decode_frame(data, index), decoded[index]), index
+    assert decode_frame(data, 7) is None
+
+    empty, stats = encode_sequence([None, None])
+    assert decode_sequence(empty) == [None, None] and stats['present_frames'] == 0
+    print("✓ Missing frames and random access")
+
+
+def test_bad_input():
+    """Mixed vertex counts and corrupt payloads raise MeshSequenceError"""
+    for bad in (lambda: encode_sequence([np.zeros((10, 3)), np.zeros((11, 3))]),
+                lambda: decode_sequence(b'JUNK' + bytes(60))):
+        try:
+            bad()
+            raise AssertionError('expected MeshSequenceError')
+        except MeshSequenceError:
+            pass
+    print("✓ Bad input rejected")
+
+
+def test_timeline_round_trip():
+    """encode_timeline moves vertices out per track; decode_timeline restores them"""
+    motion_a = make_motion(frames=6, vertex_count=200)
+    motion_b = [frame + [0.5, 0.0, 0.0] for frame in make_motion(frames=6, vertex_count=200)]
+    timeline = []
+    for a, b in zip(motion_a, motion_b):
+        timeline.append({'frameNumber': len(timeline), 'personId': 0, 'vertices': a.tolist()})
+        timeline.append({'frameNumber': len(timeline), 'personId': 1, 'vertices': b.tolist()})
+
+    encoded = encode_timeline(timeline, track_key='personId', compression='zlib')
+    assert all('vertices' not in frame for frame in timeline)
+    assert [track['track'] for track in encoded['tracks']] == [0, 1]
+    json.dumps(encoded)
+
+    decode_timeline(timeline, json.loads(json.dumps(encoded)))
+    for frame, expected in zip(timeline[1::2], motion_b):
+        assert np.abs(np.asarray(frame['vertices']) - expected).max() <= encoded['max_error'] + 1e-6
+    print(f"✓ Timeline round trip ({encoded['ratio']}x)")
+
+
+if __name__ == '__main__':
+    test_round_trip_error_bound()
+    test_compression_ratio()
+    test_missing_frames_and_random_access()
+    test_bad_input()
+    test_timeline_round_trip()
+    print("All mesh sequence tests passed")
@@ -0,0 +1,93 @@
+"""
+Test script for the /mesh/topology asset - packing, version hashing, per-frame
+references and ETag revalidation (synthetic SMPL-sized faces)
+"""
+
+import numpy as np
+from flask import Flask, request
+
+from mesh_topology import MeshTopology, attach_topology, get_topology, topology_response, wants_embedded_faces
+
+
+def make_faces(seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 6890, (13776, 3)).astype(np.int64)
+
+
+def test_packing_and_version():
+    """Faces pack to uint16; the version depends only on the index values"""
+    faces = make_faces()
+    topology = MeshTopology(faces)
+
+    assert topology.dtype == 'uint16' and len(topology.data) == 13776 * 3 * 2
+    assert np.array_equal(np.frombuffer(topology.data, dtype='<u2').reshape(-1, 3), faces)
+    assert MeshTopology(faces.astype(np.int32)).version == topology.version
+    assert MeshTopology(faces.tolist()).version == topology.version
+    assert MeshTopology(make_faces(1)).version != topology.version
+    assert MeshTopology(np.array([[0, 1, 70000]])).dtype == 'uint32'
+    print(f"✓ Packed {len(topology.data)} bytes, version {topology.version}")
+
+
+def test_cache_reuses_equal_faces():
+    """A fresh copy of the same faces (astype per batch) reuses the cached topology"""
+    faces = make_faces()
+    first = get_topology(faces)
+    assert get_topology(faces.astype(np.int32)) is first
+    assert get_topology(make_faces(2)) is not first
+    print("✓ Topology cache")
+
+
+def test_attach_topology():
+    """Per-frame results carry a reference instead of the face list"""
+    faces = make_faces()
+    result = attach_topology({'frame_number': 3, 'mesh_faces_data': faces})
+    assert 'mesh_faces_data' not in result
+    assert result['mesh_topology']['version'] == MeshTopology(faces).version
+    assert result['mesh_topology']['face_count'] == 13776
+    assert result['mesh_topology']['url'].startswith('/mesh/topology?v=')
+
+    legacy = attach_topology({'mesh_faces_data': faces}, include_faces=True)
+    assert legacy['mesh_faces_data'] is faces and 'mesh_topology' in legacy
+
+    frame = attach_topology({'faces': faces.tolist()}, faces_key='faces')
+    assert 'faces' not in frame and frame['mesh_topology']['version'] == result['mesh_topology']['version']
+    assert attach_topology({'frame_number': 4}) == {'frame_number': 4}
+    print("✓ Per-frame topology references")
+
+
+def test_endpoint_etag():
+    """The binary asset carries an ETag and answers If-None-Match with 304"""
+    faces = make_faces()
+    app = Flask(__name__)
+
+    @app.route('/mesh/topology')
+    def mesh_topology():
+        return topology_response(request, faces)
+
+    client = app.test_client()
+    response = client.get('/mesh/topology')
+    assert response.status_code == 200 and response.mimetype == 'application/octet-stream'
+    assert np.array_equal(np.frombuffer(response.data, dtype='<u2').reshape(-1, 3), faces)
+    etag = response.headers['ETag']
+    assert etag.strip('"') == response.headers['X-Mesh-Topology-Version']
+    assert 'max-age' in response.headers['Cache-Control']
+
+    revalidated = client.get('/mesh/topology', headers={'If-None-Match': etag})
+    assert revalidated.status_code == 304 and revalidated.data == b''
+
+    as_json = client.get('/mesh/topology?format=json').get_json()
+    assert as_json['faces'] == faces.tolist() and as_json['face_count'] == 13776
+
+    with app.test_request_context('/pose/hybrid?include_faces=true'):
+        assert wants_embedded_faces(request)
+    with app.test_request_context('/pose/hybrid'):
+        assert not wants_embedded_faces(request) and wants_embedded_faces(request, {'include_faces': True})
+    print("✓ /mesh/topology ETag and 304")
+
+
+if __name__ == '__main__':
+    test_packing_and_version()
+    test_cache_reuses_equal_faces()
+    test_attach_topology()
+    test_endpoint_etag()
+    print("All mesh topology tests passed")
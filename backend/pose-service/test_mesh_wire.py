@@ -0,0 +1,117 @@
+"""
+Test script for the binary mesh wire format - round trips, batches, content
+negotiation and payload size against JSON (synthetic SMPL-sized data)
+"""
+
+import json
+
+import numpy as np
+from flask import Flask, request
+
+from mesh_wire import (
+    MEDIA_TYPE, MeshWireError, decode_result, decode_results, encode_result, encode_results,
+    mesh_arrays_to_lists, negotiate_mesh_format,
+)
+
+
+def make_result(seed=0, frame_number=7):
+    rng = np.random.default_rng(seed)
+    return {
+        'frame_number': frame_number,
+        'has_3d': True,
+        'keypoints': [{'name': 'pelvis', 'x': 320.5, 'y': 240.25, 'confidence': 1.0}],
+        'camera_translation': [0.1, 0.2, 25.0],
+        'scaled_focal_length': np.float32(1234.5),
+        'mesh_vertices_data': rng.normal(0, 0.5, (6890, 3)).astype(np.float32),
+        'joints_3d_raw': rng.normal(0, 0.5, (45, 3)).astype(np.float32),
+        'mesh_faces_data': rng.integers(0, 6890, (13776, 3)).astype(np.int64),
+    }
+
+
+def test_round_trip_float32():
+    """Buffers come back bit-exact and the metadata is preserved"""
+    result = make_result()
+    decoded = decode_result(encode_result(result))
+
+    assert np.array_equal(decoded['mesh_vertices_data'], result['mesh_vertices_data'])
+    assert np.array_equal(decoded['joints_3d_raw'], result['joints_3d_raw'])
+    assert np.array_equal(decoded['mesh_faces_data'], result['mesh_faces_data'])
+    assert decoded['mesh_faces_data'].dtype == np.uint16
+    assert decoded['frame_number'] == 7 and decoded['keypoints'] == result['keypoints']
+    assert decoded['camera_translation'] == [0.1, 0.2, 25.0]
+    assert abs(decoded['scaled_focal_length'] - 1234.5) < 1e-3
+    print("✓ float32 round trip")
+
+
+def test_round_trip_float16_and_lists():
+    """float16 halves the buffers within half-precision error; list inputs work too"""
+    result = make_result()
+    result['mesh_vertices_data'] = result['mesh_vertices_data'].tolist()
+    full = encode_result(result)
+    half = encode_result(result, 'float16')
+    decoded = decode_result(half)
+
+    assert decoded['mesh_vertices_data'].dtype == np.float16
+    error = np.abs(decoded['mesh_vertices_data'].astype(np.float32) - np.asarray(result['mesh_vertices_data']))
+    assert error.max() < 2e-3, error.max()
+    assert len(half) < len(full) - 6890 * 3 * 2 + 64
+    print(f"✓ float16 round trip ({len(half)} vs {len(full)} bytes)")
+
+
+def test_batch_and_missing_mesh():
+    """Batches keep order; frames without a mesh encode empty buffers"""
+    results = [make_result(0, 1), {'frame_number': 2, 'has_3d': False, 'error': 'No person crops produced'},
+               make_result(1, 3)]
+    decoded = decode_results(encode_results(results))
+
+    assert [r['frame_number'] for r in decoded] == [1, 2, 3]
+    assert 'mesh_vertices_data' not in decoded[1] and decoded[1]['error'] == 'No person crops produced'
+    assert np.array_equal(decoded[2]['mesh_vertices_data'], results[2]['mesh_vertices_data'])
+    assert decode_results(encode_result(results[0]))[0]['frame_number'] == 1
+
+    try:
+        decode_result(b'JUNK' + bytes(60))
+        raise AssertionError('expected MeshWireError')
+    except MeshWireError:
+        pass
+    print("✓ Batch container and bad payloads")
+
+
+def test_negotiation():
+    """Accept header and ?format= choose the encoding; browsers still get JSON"""
+    app = Flask(__name__)
+    cases = [
+        ({}, '', None),
+        ({'Accept': '*/*'}, '', None),
+        ({'Accept': 'application/json'}, '', None),
+        ({'Accept': MEDIA_TYPE}, '', 'float32'),
+        ({'Accept': f'application/json;q=0.5, {MEDIA_TYPE}; precision=16'}, '', 'float16'),
+        ({'Accept': f'{MEDIA_TYPE};q=0'}, '', None),
+        ({}, '?format=binary', 'float32'),
+        ({}, '?format=binary16', 'float16'),
+    ]
+    for headers, query, expected in cases:
+        with app.test_request_context('/pose/hybrid' + query, headers=headers):
+            assert negotiate_mesh_format(request) == expected, (headers, query)
+    print("✓ Content negotiation")
+
+
+def test_smaller_than_json():
+    """The binary frame is a fraction of the JSON text for the same result"""
+    result = make_result()
+    json_bytes = len(json.dumps(mesh_arrays_to_lists(dict(result))))
+    binary = len(encode_result(result))
+    binary16 = len(encode_result(result, 'float16'))
+
+    assert binary * 4 < json_bytes, (binary, json_bytes)
+    assert binary16 * 5 < json_bytes, (binary16, json_bytes)
+    print(f"✓ JSON {json_bytes // 1024} KB vs binary {binary // 1024} KB (float16 {binary16 // 1024} KB)")
+
+
+if __name__ == '__main__':
+    test_round_trip_float32()
+    test_round_trip_float16_and_lists()
+    test_batch_and_missing_mesh()
+    test_negotiation()
+    test_smaller_than_json()
+    print("All mesh wire format tests passed")
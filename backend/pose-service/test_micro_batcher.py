@@ -0,0 +1,114 @@
+"""
+Test script for the micro-batcher - concurrent submits are coalesced and
+every caller gets its own result back (no models needed)
+"""
+
+import threading
+import time
+
+from micro_batcher import MicroBatcher
+
+
+def test_concurrent_requests_are_coalesced():
+    """Requests submitted together share one batch_fn call"""
+    calls = []
+
+    def batch_fn(items):
+        calls.append(list(items))
+        time.sleep(0.01)
+        return [item * 10 for item in items]
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=8, max_wait_ms=50)
+    results = {}
+
+    def worker(value):
+        results[value] = batcher.submit(value, timeout=5)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == {i: i * 10 for i in range(6)}, results
+    assert len(calls) < 6, f"expected coalescing, got {len(calls)} calls"
+
+    metrics = batcher.get_metrics()
+    assert metrics['requests'] == 6
+    assert metrics['batches'] == len(calls)
+    assert metrics['largest_batch'] == max(len(c) for c in calls)
+    print(f"✓ 6 requests ran in {len(calls)} batches, avg size {metrics['avg_batch_size']}")
+
+
+def test_max_batch_size_is_respected():
+    """No batch_fn call receives more than max_batch_size items"""
+    sizes = []
+
+    def batch_fn(items):
+        sizes.append(len(items))
+        return list(items)
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=3, max_wait_ms=50)
+    threads = [threading.Thread(target=batcher.submit, args=(i, 5)) for i in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sum(sizes) == 10
+    assert max(sizes) <= 3, sizes
+    print(f"✓ Batch sizes {sizes} all <= 3")
+
+
+def test_single_request_waits_at_most_max_wait():
+    """A lone request is dispatched once the wait window closes"""
+    batcher = MicroBatcher(lambda items: list(items), max_batch_size=8, max_wait_ms=20)
+
+    start = time.monotonic()
+    assert batcher.submit('frame', timeout=5) == 'frame'
+    elapsed_ms = (time.monotonic() - start) * 1000
+
+    assert elapsed_ms < 500, elapsed_ms
+    assert batcher.get_metrics()['queue_wait_ms']['max'] >= 15
+    print(f"✓ Lone request returned after {elapsed_ms:.1f}ms")
+
+
+def test_errors_reach_every_caller():
+    """An exception in batch_fn is raised in each waiting caller, and the worker keeps going"""
+    def batch_fn(items):
+        if 'bad' in items:
+            raise ValueError('boom')
+        return list(items)
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=4, max_wait_ms=0)
+
+    try:
+        batcher.submit('bad', timeout=5)
+        raise AssertionError('expected ValueError')
+    except ValueError:
+        pass
+
+    assert batcher.submit('good', timeout=5) == 'good'
+    assert batcher.get_metrics()['errors'] == 1
+    print("✓ batch_fn errors propagate and the worker survives")
+
+
+def test_result_count_mismatch_is_an_error():
+    """batch_fn must return one result per item"""
+    batcher = MicroBatcher(lambda items: [], max_batch_size=4, max_wait_ms=0)
+
+    try:
+        batcher.submit(1, timeout=5)
+        raise AssertionError('expected RuntimeError')
+    except RuntimeError:
+        pass
+    print("✓ Result count mismatch raises RuntimeError")
+
+
+if __name__ == '__main__':
+    test_concurrent_requests_are_coalesced()
+    test_max_batch_size_is_respected()
+    test_single_request_waits_at_most_max_wait()
+    test_errors_reach_every_caller()
+    test_result_count_mismatch_is_an_error()
+    print("All micro-batcher tests passed")
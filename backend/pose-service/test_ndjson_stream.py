@@ -0,0 +1,76 @@
+"""
+Test script for the NDJSON streaming responses - line format, trailing
+summary, mid-stream errors, negotiation and lazy frame conversion
+"""
+
+import json
+
+from flask import Flask, request
+
+from ndjson_stream import NDJSON_MEDIA_TYPE, iter_ndjson, ndjson_response, wants_ndjson
+
+
+def test_lines_and_summary():
+    """One compact frame record per line, then a summary that sees the frame count"""
+    frames = [{'frame_number': i, 'persons': [{'track_id': 1}]} for i in range(3)]
+    lines = list(iter_ndjson(iter(frames), lambda count: {'status': 'success', 'total_frames': count}))
+
+    records = [json.loads(line) for line in lines]
+    assert all(line.endswith(b'\n') and line.count(b'\n') == 1 for line in lines)
+    assert b' ' not in lines[0]
+    assert [r['type'] for r in records] == ['frame', 'frame', 'frame', 'summary']
+    assert records[1]['frame_number'] == 1 and records[1]['persons'] == [{'track_id': 1}]
+    assert records[-1] == {'type': 'summary', 'status': 'success', 'total_frames': 3}
+    print(f"✓ {len(lines)} NDJSON lines")
+
+
+def test_error_ends_stream():
+    """A conversion failure ends the stream with an error record instead of a summary"""
+    def frames():
+        yield {'frame_number': 0}
+        raise RuntimeError('corrupt frame')
+
+    records = [json.loads(line) for line in iter_ndjson(frames(), lambda count: {})]
+    assert [r['type'] for r in records] == ['frame', 'error']
+    assert records[-1]['frames_sent'] == 1 and 'corrupt frame' in records[-1]['error']
+    print("✓ Mid-stream error record")
+
+
+def test_streaming_response_is_lazy():
+    """The first line is sent before later frames are converted"""
+    app = Flask(__name__)
+    converted = []
+
+    def frames():
+        for i in range(100):
+            converted.append(i)
+            yield {'frame_number': i}
+
+    @app.route('/video', methods=['POST'])
+    def video():
+        assert wants_ndjson(request, request.get_json(silent=True))
+        return ndjson_response(frames(), lambda count: {'total_frames': count})
+
+    client = app.test_client()
+    response = client.post('/video', headers={'Accept': NDJSON_MEDIA_TYPE}, buffered=False)
+    assert response.mimetype == NDJSON_MEDIA_TYPE
+    chunks = response.response
+    first = json.loads(next(iter(chunks)))
+    assert first == {'type': 'frame', 'frame_number': 0} and len(converted) == 1
+    response.close()
+
+    body = client.post('/video', json={'stream': True}).get_data().splitlines()
+    assert len(body) == 101 and json.loads(body[-1]) == {'type': 'summary', 'total_frames': 100}
+
+    with app.test_request_context('/video'):
+        assert not wants_ndjson(request, {'stream': False})
+    with app.test_request_context('/video?stream=1'):
+        assert wants_ndjson(request)
+    print("✓ Lazy streaming response")
+
+
+if __name__ == '__main__':
+    test_lines_and_summary()
+    test_error_ends_stream()
+    test_streaming_response_is_lazy()
+    print("All NDJSON stream tests passed")
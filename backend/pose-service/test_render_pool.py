@@ -0,0 +1,116 @@
+"""
+Test script for the pyrender context pool's threading - every GL job runs on
+the one render thread that owns the contexts, and release_renderers() frees
+them there even when called from another thread (e.g. the atexit hook).
+In auto mode only a failed context creation latches the CPU fallback.
+Runs without pyrender: fake contexts stand in for OffscreenRenderers.
+"""
+
+import threading
+
+import numpy as np
+
+import mesh_renderer
+
+
+class FakeContext:
+    def __init__(self, deleted_on):
+        self.renders = 0
+        self.deleted_on = deleted_on
+
+    def delete(self):
+        self.deleted_on.append(threading.current_thread().name)
+
+
+def test_jobs_run_on_render_thread():
+    """Jobs from several request threads all execute on the same render thread"""
+    seen = []
+
+    def job(i):
+        seen.append(threading.current_thread().name)
+        return i * 2
+
+    results = {}
+    threads = [threading.Thread(target=lambda i=i: results.__setitem__(i, mesh_renderer._on_render_thread(job, i)))
+               for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == {i: i * 2 for i in range(8)}
+    assert set(seen) == {'mesh-render'}, seen
+    print(f"✓ {len(seen)} jobs ran on the render thread")
+
+
+def test_errors_propagate_to_caller():
+    """An exception on the render thread re-raises in the submitting thread"""
+    def fail():
+        raise RuntimeError('boom')
+
+    try:
+        mesh_renderer._on_render_thread(fail)
+    except RuntimeError as e:
+        assert str(e) == 'boom'
+    else:
+        raise AssertionError('render thread error was swallowed')
+    assert mesh_renderer._on_render_thread(lambda: 'alive') == 'alive'
+    print("✓ Render thread errors re-raise in the caller")
+
+
+def test_release_from_other_thread():
+    """release_renderers() on a non-render thread deletes contexts on the render thread"""
+    deleted_on = []
+
+    def pool():
+        for size in ((64, 64), (128, 64)):
+            mesh_renderer._render_contexts[size] = FakeContext(deleted_on)
+
+    mesh_renderer._on_render_thread(pool)
+    released = mesh_renderer._pool_stats['contexts_released']
+    mesh_renderer.release_renderers()
+    assert deleted_on == ['mesh-render', 'mesh-render'], deleted_on
+    assert not mesh_renderer._render_contexts
+    assert mesh_renderer._pool_stats['contexts_released'] == released + 2
+    print("✓ Contexts released on the thread that owns them")
+
+
+def render_with_pyrender_error(error):
+    """render_rgba in auto mode with a pyrender path that raises error"""
+    def failing(*args, **kwargs):
+        raise error
+
+    saved = (mesh_renderer.HAS_PYRENDER, mesh_renderer._render_rgba_pyrender, mesh_renderer._pyrender_failed)
+    mesh_renderer.HAS_PYRENDER, mesh_renderer._render_rgba_pyrender = True, failing
+    mesh_renderer._pyrender_failed = False
+    try:
+        vertices = np.array([[-0.1, -0.1, 0.0], [0.1, -0.1, 0.0], [0.0, 0.1, 0.0]])
+        rgba = mesh_renderer.render_rgba(vertices, np.array([[0, 2, 1]]), np.array([0.0, 0.0, 5.0]), 32, 32,
+                                         100.0, backend='auto')
+        return rgba, mesh_renderer._pyrender_failed, mesh_renderer.resolve_backend('auto')
+    finally:
+        mesh_renderer.HAS_PYRENDER, mesh_renderer._render_rgba_pyrender, mesh_renderer._pyrender_failed = saved
+
+
+def test_frame_error_does_not_latch():
+    """A per-frame pyrender error renders that frame on the CPU and keeps pyrender for the next"""
+    rgba, latched, backend = render_with_pyrender_error(ValueError('degenerate mesh'))
+    assert rgba.shape == (32, 32, 4) and rgba[:, :, 3].any()
+    assert not latched and backend == 'pyrender'
+    print("✓ Per-frame error fell back once without disabling pyrender")
+
+
+def test_context_error_latches():
+    """Failing to create a GL context switches auto mode to the CPU rasterizer for good"""
+    rgba, latched, backend = render_with_pyrender_error(mesh_renderer.RenderContextError('no EGL display'))
+    assert rgba.shape == (32, 32, 4)
+    assert latched and backend == 'cpu'
+    print("✓ Context creation failure latched the CPU fallback")
+
+
+if __name__ == '__main__':
+    test_jobs_run_on_render_thread()
+    test_errors_propagate_to_caller()
+    test_release_from_other_thread()
+    test_frame_error_does_not_latch()
+    test_context_error_latches()
+    print("All render pool tests passed")
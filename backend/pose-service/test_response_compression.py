@@ -0,0 +1,121 @@
+"""
+Test script for Accept-Encoding response compression - negotiation, size
+threshold, streamed NDJSON compressed line by line, weak ETags on the
+compressed topology and per-endpoint stats
+"""
+
+import gzip
+import zlib
+
+import numpy as np
+from flask import Flask, jsonify, request
+
+import response_compression
+from json_response import install_json_provider, loads
+from mesh_topology import topology_response
+from ndjson_stream import ndjson_response
+from response_compression import compression_stats, install_compression, negotiate_encoding
+from test_mesh_wire import make_result
+
+
+def make_app():
+    response_compression._stats.clear()
+    app = install_compression(install_json_provider(Flask(__name__)))
+    result = make_result()
+
+    @app.route('/pose/hybrid')
+    def pose_hybrid():
+        return jsonify(result)
+
+    @app.route('/health')
+    def health():
+        return jsonify({'status': 'ready'})
+
+    @app.route('/pose/video')
+    def pose_video():
+        frames = ({'frame_number': i, 'mesh_vertices': result['mesh_vertices_data'][:500]} for i in range(5))
+        return ndjson_response(frames, lambda count: {'total_frames': count})
+
+    @app.route('/mesh/topology')
+    def mesh_topology():
+        return topology_response(request, result['mesh_faces_data'])
+
+    return app, result
+
+
+def test_negotiate_encoding():
+    """q-values, wildcards and q=0 are honoured; gzip is always available"""
+    assert negotiate_encoding(None) is None and negotiate_encoding('identity') is None
+    assert negotiate_encoding('gzip, deflate, br') == 'gzip'
+    assert negotiate_encoding('gzip;q=0') is None
+    assert negotiate_encoding('*') == response_compression.ENCODINGS[0]
+    assert negotiate_encoding('br;q=1.0, gzip;q=0.5') == 'gzip'
+    if response_compression.HAS_ZSTD:
+        assert negotiate_encoding('gzip, zstd') == 'zstd'
+        assert negotiate_encoding('gzip, zstd;q=0.5') == 'gzip'
+    print(f"✓ Negotiation ({', '.join(response_compression.ENCODINGS)})")
+
+
+def test_json_compression_and_threshold():
+    """Large JSON is gzipped and decodes to the same payload; small bodies and identity clients are untouched"""
+    app, result = make_app()
+    client = app.test_client()
+
+    response = client.get('/pose/hybrid', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip' and 'Accept-Encoding' in response.headers['Vary']
+    body = gzip.decompress(response.data)
+    assert loads(body)['frame_number'] == result['frame_number']
+    assert int(response.headers['Content-Length']) == len(response.data) < len(body) / 2
+
+    plain = client.get('/pose/hybrid')
+    assert 'Content-Encoding' not in plain.headers and plain.data == body
+    small = client.get('/health', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in small.headers
+
+    stats = compression_stats()['endpoints']
+    assert stats['pose_hybrid']['compressed'] == 1 and stats['pose_hybrid']['skipped'] == 1
+    assert stats['pose_hybrid']['ratio'] > 2 and stats['pose_hybrid']['cpu_ms'] >= 0
+    assert stats['health']['skipped'] == 1
+    print(f"✓ /pose/hybrid gzip: {len(body)} -> {len(response.data)} bytes ({stats['pose_hybrid']['ratio']}x)")
+
+
+def test_streamed_ndjson():
+    """Each streamed chunk is flushed, so every line decodes before the stream ends"""
+    app, _ = make_app()
+    client = app.test_client()
+    response = client.get('/pose/video', headers={'Accept-Encoding': 'gzip'}, buffered=False)
+    assert response.headers['Content-Encoding'] == 'gzip' and 'Content-Length' not in response.headers
+
+    inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    lines = []
+    for chunk in response.response:
+        text = inflater.decompress(chunk)
+        if text:
+            assert text.endswith(b'\n')  # whole lines per flushed chunk
+            lines.extend(text.splitlines())
+    response.close()
+    assert len(lines) == 6 and loads(lines[-1]) == {'type': 'summary', 'total_frames': 5}
+    assert compression_stats()['endpoints']['pose_video']['streamed'] == 1
+    print(f"✓ Streamed NDJSON gzip: {len(lines)} lines")
+
+
+def test_topology_etag():
+    """Compressed topology JSON gets a weak ETag that still revalidates to 304"""
+    app, _ = make_app()
+    client = app.test_client()
+    response = client.get('/mesh/topology?format=json', headers={'Accept-Encoding': 'gzip'})
+    etag = response.headers['ETag']
+    assert response.headers['Content-Encoding'] == 'gzip' and etag.startswith('W/')
+    revalidated = client.get('/mesh/topology?format=json', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+    assert revalidated.status_code == 304
+    binary = client.get('/mesh/topology', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in binary.headers and np.frombuffer(binary.data, dtype=np.uint16).size > 0
+    print(f"✓ Topology ETag {etag} revalidates")
+
+
+if __name__ == '__main__':
+    test_negotiate_encoding()
+    test_json_compression_and_threshold()
+    test_streamed_ndjson()
+    test_topology_etag()
+    print("All response compression tests passed")
@@ -0,0 +1,171 @@
+"""
+Test script for the compact SMPL parameter payloads - axis-angle conversion,
+payload size, decoding, batched reconstruction and the reference LBS
+(synthetic rotations and a tiny synthetic skinned model, no SMPL assets needed)
+"""
+
+import json
+
+import numpy as np
+from flask import Flask, request
+
+from smpl_params import (
+    axis_angle_to_rotmat, decode_smpl_params, encode_smpl_params, get_mesh_mode, linear_blend_skinning,
+    read_reconstruct_body, reconstruct_meshes, rotmat_to_axis_angle, strip_mesh,
+)
+
+
+def make_smpl_params(seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        'global_orient': axis_angle_to_rotmat(rng.normal(0, 1.0, (1, 3))).astype(np.float32),
+        'body_pose': axis_angle_to_rotmat(rng.normal(0, 0.4, (23, 3))).astype(np.float32),
+        'betas': rng.normal(0, 1, 10).astype(np.float32),
+    }
+
+
+def test_axis_angle_round_trip():
+    """rotmat -> axis-angle -> rotmat is lossless, including tiny and near-pi angles"""
+    rng = np.random.default_rng(1)
+    aa = np.concatenate([rng.normal(0, 1, (50, 3)), [[0, 0, 0], [1e-9, 0, 0], [0, 3.14, 0]]])
+    rotmats = axis_angle_to_rotmat(aa)
+    assert np.allclose(rotmats @ np.swapaxes(rotmats, -1, -2), np.eye(3), atol=1e-9)
+    assert np.allclose(axis_angle_to_rotmat(rotmat_to_axis_angle(rotmats)), rotmats, atol=1e-6)
+    print("✓ Axis-angle round trip")
+
+
+def test_payload_size_and_decode():
+    """85 numbers (plus focal length) carry the whole mesh; decoding restores the rotations"""
+    params = make_smpl_params()
+    payload = encode_smpl_params(params, cam_t=[0.1, 0.2, 25.0], focal_length=5000.0, img_size=[1920, 1080])
+
+    floats = len(payload['global_orient']) + len(payload['body_pose']) + len(payload['betas']) \
+        + len(payload['camera']['translation'])
+    assert floats == 85, floats
+    assert len(json.dumps(payload)) < 2000
+
+    decoded = decode_smpl_params(json.loads(json.dumps(payload)))
+    for key in ('global_orient', 'body_pose'):
+        assert np.allclose(decoded[key], params[key], atol=1e-5), key
+    assert np.allclose(decoded['betas'], params['betas'], atol=1e-6)
+
+    rotmat_payload = {'rotation_format': 'rotmat', 'global_orient': params['global_orient'].tolist(),
+                      'body_pose': params['body_pose'].tolist(), 'betas': params['betas'][:5].tolist()}
+    decoded = decode_smpl_params(rotmat_payload)
+    assert np.allclose(decoded['body_pose'], params['body_pose']) and decoded['betas'].shape == (10,)
+
+    for bad in ({'global_orient': [0, 0, 0]}, {'global_orient': [0, 0], 'body_pose': [0] * 69}):
+        try:
+            decode_smpl_params(bad)
+            raise AssertionError('expected ValueError')
+        except ValueError:
+            pass
+    assert encode_smpl_params(None) is None
+    print(f"✓ Payload {len(json.dumps(payload))} bytes JSON, decode round trip")
+
+
+def test_reconstruct_batches_once():
+    """reconstruct_meshes stacks every payload into one SMPL forward call"""
+    calls = []
+
+    def smpl_forward(global_orient, body_pose, betas):
+        calls.append((global_orient.shape, body_pose.shape, betas.shape))
+        return np.zeros((len(betas), 6890, 3)), np.zeros((len(betas), 45, 3))
+
+    payloads = [encode_smpl_params(make_smpl_params(seed)) for seed in range(4)]
+    vertices, joints = reconstruct_meshes(payloads, smpl_forward)
+    assert calls == [((4, 1, 3, 3), (4, 23, 3, 3), (4, 10))]
+    assert vertices.shape == (4, 6890, 3) and joints.shape == (4, 45, 3)
+    print("✓ Batched reconstruction")
+
+
+def test_reconstruct_body_validation():
+    """Malformed /mesh/reconstruct bodies are ValueErrors (400), not errors inside the handler"""
+    payloads = [encode_smpl_params(make_smpl_params(seed), cam_t=[0.0, 0.1, 20.0]) for seed in range(2)]
+    assert read_reconstruct_body({'params': payloads}) == (payloads, [0, 1])
+    assert read_reconstruct_body({'params': payloads, 'frame_numbers': [7, 9]}) == (payloads, [7, 9])
+
+    bad_bodies = [
+        [payloads[0]],
+        'params',
+        {'params': []},
+        {'params': payloads[0]},
+        {'params': payloads, 'frame_numbers': 5},
+        {'params': payloads, 'frame_numbers': [1]},
+        {'params': payloads, 'frame_numbers': []},
+    ]
+    for body in bad_bodies:
+        try:
+            read_reconstruct_body(body)
+        except ValueError:
+            continue
+        raise AssertionError(f'No ValueError for {body!r}')
+
+    for payload in ({**payloads[0], 'camera': [0.0, 0.1, 20.0]}, {**payloads[0], 'camera': 'front'}, [1, 2], 'x'):
+        try:
+            reconstruct_meshes([payload], lambda *args: None)
+        except ValueError:
+            continue
+        raise AssertionError(f'No ValueError for payload {payload!r}')
+    print("✓ Malformed reconstruct bodies rejected")
+
+
+def make_chain_model():
+    """Three joints in a line along +y, one vertex on each bone tip, rigidly weighted"""
+    v_template = np.array([[0.0, 0.5, 0.0], [0.0, 1.5, 0.0], [0.0, 2.5, 0.0]])
+    return {
+        'v_template': v_template,
+        'shapedirs': np.tile(np.array([0.0, 1.0, 0.0])[None, :, None], (3, 1, 1)),  # beta 0 raises everything
+        'posedirs': np.zeros((3, 3, 9 * 2)),
+        'J_regressor': np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0]]),
+        'weights': np.eye(3),
+        'parents': np.array([-1, 0, 1]),
+    }
+
+
+def test_linear_blend_skinning():
+    """Rest pose reproduces the shaped template; bending a joint swings its children"""
+    model = make_chain_model()
+    vertices, _ = linear_blend_skinning(model, np.zeros(3), np.zeros(6), [0.5])
+    assert np.allclose(vertices, model['v_template'] + [0.0, 0.5, 0.0])
+
+    # 90 degrees about z at joint 1 (at y=0.5): everything skinned below it swings to -x
+    vertices, joints = linear_blend_skinning(model, np.zeros(3), [0, 0, np.pi / 2, 0, 0, 0], [0.0])
+    assert np.allclose(vertices, [[0.0, 0.5, 0.0], [-1.0, 0.5, 0.0], [-2.0, 0.5, 0.0]]), vertices
+    assert np.allclose(joints, [[0.0, 0.0, 0.0], [0.0, 0.5, 0.0], [-1.0, 0.5, 0.0]]), joints
+
+    # The root rotation moves the whole body rigidly about joint 0
+    root = axis_angle_to_rotmat([np.pi, 0, 0])
+    vertices, _ = linear_blend_skinning(model, [np.pi, 0, 0], np.zeros(6), [0.0])
+    assert np.allclose(vertices, model['v_template'] @ root.T)
+    print("✓ Reference linear blend skinning")
+
+
+def test_mesh_mode_and_strip():
+    """?mesh=params selects params-only responses; strip_mesh drops the geometry"""
+    app = Flask(__name__)
+    with app.test_request_context('/pose/hybrid?mesh=params'):
+        assert get_mesh_mode(request) == 'params'
+    with app.test_request_context('/pose/hybrid'):
+        assert get_mesh_mode(request) == 'full' and get_mesh_mode(request, {'mesh': 'PARAMS'}) == 'params'
+    with app.test_request_context('/pose/hybrid?mesh=lod'):
+        try:
+            get_mesh_mode(request)
+            raise AssertionError('expected ValueError')
+        except ValueError:
+            pass
+
+    result = strip_mesh({'frame_number': 1, 'mesh_vertices_data': [[0, 0, 0]], 'mesh_faces_data': [[0, 1, 2]],
+                         'smpl_params': {}})
+    assert result == {'frame_number': 1, 'smpl_params': {}}
+    print("✓ Mesh mode negotiation")
+
+
+if __name__ == '__main__':
+    test_axis_angle_round_trip()
+    test_payload_size_and_decode()
+    test_reconstruct_batches_once()
+    test_reconstruct_body_validation()
+    test_linear_blend_skinning()
+    test_mesh_mode_and_strip()
+    print("All SMPL params tests passed")
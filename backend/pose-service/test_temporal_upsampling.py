@@ -0,0 +1,148 @@
+"""
+Test script for temporal upsampling - quaternion round trips, slerp and
+SMPL param interpolation with a stand-in SMPL forward (no models needed)
+"""
+
+import numpy as np
+
+from temporal_upsampling import (
+    interpolate_persons, interpolate_smpl_params, interpolate_tracks, is_keyframe, match_persons, quat_to_rotmat,
+    rotmat_to_quat, slerp
+)
+
+
+def axis_angle_rotmat(axis, angle):
+    axis = np.asarray(axis, dtype=np.float64) / np.linalg.norm(axis)
+    q = np.concatenate([[np.cos(angle / 2)], np.sin(angle / 2) * axis])
+    return quat_to_rotmat(q)
+
+
+def rotation_angle(R):
+    return float(np.arccos(np.clip((np.trace(R) - 1) / 2, -1.0, 1.0)))
+
+
+def test_quaternion_round_trip():
+    """rotmat -> quat -> rotmat is lossless, including 180 degree rotations"""
+    rng = np.random.default_rng(0)
+    rotmats = quat_to_rotmat(rng.normal(size=(100, 4)))
+    rotmats = np.concatenate([rotmats, axis_angle_rotmat([1, 0, 0], np.pi)[None]])
+    assert np.allclose(quat_to_rotmat(rotmat_to_quat(rotmats)), rotmats, atol=1e-9)
+    print("✓ Quaternion round trip")
+
+
+def test_slerp_constant_angular_speed():
+    """Slerp between 0 and 90 degrees about Y moves in equal angle steps"""
+    q0 = rotmat_to_quat(np.eye(3))
+    q1 = rotmat_to_quat(axis_angle_rotmat([0, 1, 0], np.pi / 2))
+    qs = slerp(q0, q1, np.array([0.0, 0.25, 0.5, 1.0]))
+    angles = [rotation_angle(R) for R in quat_to_rotmat(qs)]
+    assert np.allclose(angles, [0, np.pi / 8, np.pi / 4, np.pi / 2], atol=1e-9), angles
+
+    # Identical rotations do not divide by zero
+    assert np.allclose(slerp(q0, q0, 0.5), q0)
+    print("✓ Slerp")
+
+
+def test_interpolate_smpl_params():
+    """Rotations are slerped per joint and betas are held at the first keyframe"""
+    params0 = {
+        'global_orient': np.eye(3)[None],
+        'body_pose': np.repeat(np.eye(3)[None], 23, axis=0),
+        'betas': np.arange(10, dtype=np.float32),
+    }
+    params1 = {
+        'global_orient': axis_angle_rotmat([0, 0, 1], 1.0)[None],
+        'body_pose': np.repeat(axis_angle_rotmat([1, 0, 0], 0.5)[None], 23, axis=0),
+        'betas': np.zeros(10, dtype=np.float32),
+    }
+    out = interpolate_smpl_params(params0, params1, [0.5])
+
+    assert out['global_orient'].shape == (1, 1, 3, 3)
+    assert out['body_pose'].shape == (1, 23, 3, 3)
+    assert np.isclose(rotation_angle(out['global_orient'][0, 0]), 0.5, atol=1e-6)
+    assert np.isclose(rotation_angle(out['body_pose'][0, 5]), 0.25, atol=1e-6)
+    assert np.array_equal(out['betas'][0], params0['betas'])
+    print("✓ SMPL param interpolation")
+
+
+def make_person(tz, angle, box=None):
+    return {
+        'box': None if box is None else np.array(box, dtype=np.float32),
+        'cam_t_full': np.array([0.0, 0.0, tz]),
+        'img_size': np.array([640.0, 480.0]),
+        'scaled_focal_length': 800.0,
+        'faces': np.zeros((1, 3), dtype=np.int32),
+        'smpl_params': {
+            'global_orient': axis_angle_rotmat([0, 1, 0], angle)[None],
+            'body_pose': np.repeat(np.eye(3)[None], 23, axis=0),
+            'betas': np.zeros(10),
+        },
+    }
+
+
+def make_smpl_forward(calls):
+    def fake_smpl_forward(global_orient, body_pose, betas):
+        calls.append(len(global_orient))
+        # One vertex at the rotated +Z axis, joints = the same point
+        verts = global_orient[:, 0] @ np.array([0.0, 0.0, 1.0])
+        return verts[:, None, :], verts[:, None, :]
+    return fake_smpl_forward
+
+
+def test_interpolate_persons():
+    """Camera translation is lerped and geometry comes from the SMPL forward"""
+    calls = []
+    persons = interpolate_persons(make_person(10.0, 0.0), make_person(20.0, np.pi / 2), [0.25, 0.5, 0.75],
+                                  make_smpl_forward(calls))
+
+    assert calls == [3], "all in-between frames share one SMPL forward pass"
+    assert [round(float(p['cam_t_full'][2]), 3) for p in persons] == [12.5, 15.0, 17.5]
+    assert np.allclose(persons[1]['vertices'][0], [np.sin(np.pi / 4), 0, np.cos(np.pi / 4)], atol=1e-6)
+    assert all(p['interpolated'] for p in persons)
+    print("✓ Person interpolation")
+
+
+def test_match_persons():
+    """Primaries always pair; secondary riders pair by best box overlap and unmatched ones drop out"""
+    start = [make_person(10, 0, [0, 0, 10, 10]), make_person(10, 0, [100, 0, 120, 40]),
+             make_person(10, 0, [200, 0, 220, 40]), make_person(10, 0, [400, 0, 420, 40])]
+    end = [make_person(10, 0, [5, 0, 15, 10]), make_person(10, 0, [204, 0, 224, 40]),
+           make_person(10, 0, [102, 0, 122, 40]), make_person(10, 0, [0, 300, 20, 340])]
+    assert match_persons(start, end) == [(0, 0), (1, 2), (2, 1)]
+    assert match_persons(start[:1], []) == []
+    assert match_persons(start, end, min_iou=0.95) == [(0, 0)]
+    print("✓ Keyframe people matched by IoU")
+
+
+def test_interpolate_tracks():
+    """Every matched rider is interpolated in the same SMPL forward pass, primary first"""
+    calls = []
+    start = [make_person(10.0, 0.0, [0, 0, 10, 10]), make_person(30.0, 0.0, [100, 0, 120, 40])]
+    end = [make_person(20.0, np.pi / 2, [10, 0, 20, 10]), make_person(40.0, 0.0, [104, 0, 124, 40])]
+    frames = interpolate_tracks(start, end, [0.25, 0.5, 0.75], make_smpl_forward(calls))
+
+    assert calls == [6], "both riders share one SMPL forward pass"
+    assert [len(persons) for persons in frames] == [2, 2, 2]
+    assert [round(float(persons[1]['cam_t_full'][2]), 3) for persons in frames] == [32.5, 35.0, 37.5]
+    assert np.allclose(frames[1][0]['vertices'][0], [np.sin(np.pi / 4), 0, np.cos(np.pi / 4)], atol=1e-6)
+    assert np.allclose(frames[1][0]['box'], [5, 0, 15, 10]) and np.allclose(frames[1][1]['box'], [102, 0, 122, 40])
+    assert interpolate_tracks(start, end[:1], [0.5], make_smpl_forward(calls))[0][0]['box'] is not None
+    print("✓ Every tracked rider interpolated")
+
+
+def test_keyframe_schedule():
+    """Every stride-th frame and the last frame are keyframes"""
+    assert [i for i in range(10) if is_keyframe(i, 10, 4)] == [0, 4, 8, 9]
+    assert all(is_keyframe(i, 5, 1) for i in range(5))
+    print("✓ Keyframe schedule")
+
+
+if __name__ == '__main__':
+    test_quaternion_round_trip()
+    test_slerp_constant_angular_speed()
+    test_interpolate_smpl_params()
+    test_interpolate_persons()
+    test_match_persons()
+    test_interpolate_tracks()
+    test_keyframe_schedule()
+    print("All temporal upsampling tests passed")
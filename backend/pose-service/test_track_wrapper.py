@@ -0,0 +1,148 @@
+"""
+Test script for TrackWrapper output parsing with a synthetic PHALP pickle (no
+track.py run) - frames get a mesh_topology reference and smplParams, 'params'
+mode drops the mesh, the 'delta' codec moves vertices into vertex_sequence,
+and LOD maps come from the rest-pose template, never from a posed tracklet
+"""
+
+import os
+import pickle
+import tempfile
+
+import numpy as np
+
+import mesh_lod
+from mesh_lod import get_lod
+from mesh_sequence import decode_timeline
+from mesh_topology import EMBED_FACES, get_topology
+from track_wrapper import TrackWrapper
+
+FACES = [[0, 1, 2], [0, 2, 3], [0, 3, 1], [1, 3, 2]]
+REST = np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]])
+
+
+def make_tracklet(frame_idx, person_id=0):
+    return {
+        'vertices': REST + [0.01 * frame_idx, 0.5 * person_id, 0.0],
+        'faces': FACES,
+        'smpl': [{
+            'global_orient': np.eye(3)[None],
+            'body_pose': np.repeat(np.eye(3)[None], 23, axis=0),
+            'betas': np.full(10, 0.1 * person_id),
+        }],
+        'camera': np.array([0.0, 0.1, 20.0 + frame_idx]),
+        'person_id': person_id,
+    }
+
+
+def make_torus(rings=16, segments=10, radius=0.5, tube=0.15):
+    """Small closed mesh standing in for the SMPL template"""
+    u = np.arange(rings)[:, None] / rings * 2 * np.pi
+    v = np.arange(segments)[None, :] / segments * 2 * np.pi
+    vertices = np.stack([(radius + tube * np.cos(v)) * np.cos(u),
+                         (radius + tube * np.cos(v)) * np.sin(u),
+                         np.broadcast_to(tube * np.sin(v), (rings, segments))], axis=-1).reshape(-1, 3)
+    i, j = np.meshgrid(np.arange(rings), np.arange(segments), indexing='ij')
+    a = i * segments + j
+    b = (i + 1) % rings * segments + j
+    c = (i + 1) % rings * segments + (j + 1) % segments
+    d = i * segments + (j + 1) % segments
+    faces = np.concatenate([np.stack([a, b, c], -1).reshape(-1, 3), np.stack([a, c, d], -1).reshape(-1, 3)])
+    return vertices, faces
+
+
+def make_phalp_output(frames=4):
+    """PHALP-style dict: frame keys -> a list of person tracklets"""
+    return {f'frame_{i:04d}': [make_tracklet(i, 0), make_tracklet(i, 1)] for i in range(frames)}
+
+
+def parse(data, **wrapper_kwargs):
+    wrapper = TrackWrapper(**wrapper_kwargs)
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, 'results.pkl'), 'wb') as f:
+            pickle.dump(data, f)
+        return wrapper._parse_output(tmp, os.path.join(tmp, 'missing.mp4'))
+
+
+def test_frames_reference_topology():
+    """Each tracklet becomes a frame with mesh_topology and axis-angle smplParams"""
+    wrapper = TrackWrapper(mesh_mode='full', timeline_codec='none')
+    frame = wrapper._build_frame_from_tracklet(3, make_tracklet(3, person_id=1), 'frame_0003_person_1')
+    assert frame is not None
+    assert frame['mesh_topology'] == get_topology(FACES).reference()
+    assert ('faces' in frame) == EMBED_FACES
+    assert np.allclose(frame['vertices'], REST + [0.03, 0.5, 0.0])
+    assert frame['smplParams']['rotation_format'] == 'axis_angle'
+    assert len(frame['smplParams']['body_pose']) == 69
+    assert frame['smplParams']['camera']['translation'] == [0.0, 0.1, 23.0]
+    assert frame['personId'] == 1
+
+    result = parse(make_phalp_output(), mesh_mode='full', timeline_codec='none')
+    assert result['status'] == 'complete' and result['frame_count'] == 8
+    assert result['vertex_sequence'] is None
+    assert [frame['personId'] for frame in result['frames']] == [0, 1] * 4
+    assert all('mesh_topology' in frame and frame['vertices'] for frame in result['frames'])
+    print(f"✓ {result['frame_count']} frames with mesh_topology and smplParams")
+
+
+def test_params_mode():
+    """'params' keeps smplParams and the topology reference, no vertices, faces or vertex_sequence"""
+    result = parse(make_phalp_output(), mesh_mode='params', timeline_codec='delta')
+    assert result['frame_count'] == 8 and result['vertex_sequence'] is None
+    for frame in result['frames']:
+        assert 'vertices' not in frame and 'faces' not in frame
+        assert frame['smplParams']['betas'] == [0.1 * frame['personId']] * 10
+        assert 'mesh_topology' in frame
+    print("✓ params mode keeps only smplParams")
+
+
+def test_vertex_sequence():
+    """'delta' moves vertices into one sequence per person that decodes back to the tracklets"""
+    result = parse(make_phalp_output(), mesh_mode='full', timeline_codec='delta')
+    sequence = result['vertex_sequence']
+    assert [track['track'] for track in sequence['tracks']] == [0, 1]
+    assert all('vertices' not in frame for frame in result['frames'])
+
+    frames = decode_timeline(result['frames'], sequence)
+    for index, frame in enumerate(frames):
+        expected = REST + [0.01 * (index // 2), 0.5 * frame['personId'], 0.0]
+        assert np.abs(np.asarray(frame['vertices']) - expected).max() <= sequence['max_error'] + 1e-6
+    print(f"✓ vertex_sequence with {len(sequence['tracks'])} tracks round-trips")
+
+
+def test_lod_maps_from_template_only():
+    """Without a template the full mesh is kept; with one, the maps do not depend on the pose"""
+    template, faces = make_torus()
+    posed = template * [2.5, 0.3, 1.0]  # Decimating this would pick different edges
+    tracklet = {**make_tracklet(0), 'vertices': posed, 'faces': faces.tolist()}
+    saved_cache_dir = mesh_lod.LOD_CACHE_DIR
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            mesh_lod.LOD_CACHE_DIR = cache_dir
+            mesh_lod._lod_sets.clear()
+            frame = TrackWrapper(lod=1)._build_frame_from_tracklet(0, tracklet)
+            assert len(frame['vertices']) == len(template), 'posed vertices must not be decimated'
+            assert os.listdir(cache_dir) == [], 'no maps may be stored without the template'
+
+            frame = TrackWrapper(lod=1, rest_vertices=template)._build_frame_from_tracklet(0, tracklet)
+            assert len(os.listdir(cache_dir)) == 1
+
+        mesh_lod.LOD_CACHE_DIR = ''
+        mesh_lod._lod_sets.clear()
+        template_map = get_lod(1, faces, template).vertex_map
+        mesh_lod._lod_sets.clear()
+        posed_map = get_lod(1, faces, posed).vertex_map
+        assert not np.array_equal(template_map, posed_map)
+        np.testing.assert_allclose(frame['vertices'], posed[template_map])
+    finally:
+        mesh_lod.LOD_CACHE_DIR = saved_cache_dir
+        mesh_lod._lod_sets.clear()
+    print(f"✓ LOD 1 map from the template ({len(template)} -> {len(template_map)} vertices)")
+
+
+if __name__ == '__main__':
+    test_frames_reference_topology()
+    test_params_mode()
+    test_vertex_sequence()
+    test_lod_maps_from_template_only()
+    print("All track wrapper tests passed")
@@ -0,0 +1,137 @@
+"""
+Test script for the staged video pipeline - ordering, overlap and error
+handling with sleep-based stages (no models needed)
+"""
+
+import time
+
+from video_pipeline import StagedPipeline
+
+
+def _slow(seconds):
+    def stage(item):
+        time.sleep(seconds)
+        return item
+    return stage
+
+
+def test_order_is_preserved():
+    """Items reach the sink in source order, dropped items are skipped"""
+    written = []
+    pipeline = StagedPipeline(
+        source=range(20),
+        stages=[('inference', lambda x: x * 2), ('filter', lambda x: None if x == 10 else x)],
+        sink=('write', written.append),
+        queue_size=2,
+    )
+    report = pipeline.run()
+
+    assert written == [x * 2 for x in range(20) if x != 5], written
+    assert report['items'] == 19
+    print("✓ Order preserved through 2 stages")
+
+
+def test_stage_can_hold_and_release_items():
+    """A stage returning lists can buffer items and emit them later, in order"""
+    held = []
+
+    def pair_up(item):
+        held.append(item)
+        if len(held) < 2 and item != 'end':
+            return []
+        released, held[:] = list(held), []
+        return [x for x in released if x != 'end']
+
+    for threaded in (True, False):
+        written = []
+        StagedPipeline(
+            source=[0, 1, 2, 3, 4, 'end'],
+            stages=[('inference', pair_up)],
+            sink=('write', written.append),
+        ).run(threaded=threaded)
+        assert written == [0, 1, 2, 3, 4], (threaded, written)
+    print("✓ Held items released in order")
+
+
+def test_flush_releases_held_items():
+    """flush() runs once the input ends and its items reach the later stages and the sink"""
+    for threaded in (True, False):
+        held, written = [], []
+
+        def hold_odd(item):
+            if item % 2:
+                held.append(item)
+                return []
+            return item
+
+        def flush():
+            released, held[:] = list(held), []
+            return released
+
+        report = StagedPipeline(
+            source=range(6),
+            stages=[('inference', hold_odd, flush), ('render', lambda item: item * 10)],
+            sink=('write', written.append),
+        ).run(threaded=threaded)
+        assert written == [0, 20, 40, 10, 30, 50], (threaded, written)
+        assert report['items'] == 6
+    print("✓ flush() releases held items at end of input")
+
+
+def test_stages_overlap():
+    """Pipelined wall time approaches the slowest stage, not the sum of stages"""
+    def build():
+        return StagedPipeline(
+            source=range(10),
+            stages=[('inference', _slow(0.02)), ('render', _slow(0.02))],
+            sink=('write', _slow(0.02)),
+        )
+
+    sequential = build().run(threaded=False)
+    pipelined = build().run(threaded=True)
+
+    assert pipelined['wall_seconds'] < sequential['wall_seconds'] * 0.7, (pipelined, sequential)
+    assert pipelined['sum_of_stage_seconds'] > pipelined['wall_seconds']
+    print(f"✓ Sequential {sequential['wall_seconds']:.2f}s vs pipelined {pipelined['wall_seconds']:.2f}s")
+
+
+def test_report_names_bottleneck():
+    """The stage with the most busy time is reported as the bottleneck"""
+    report = StagedPipeline(
+        source=range(5),
+        stages=[('inference', _slow(0.03)), ('render', _slow(0.005))],
+        sink=('write', lambda item: None),
+    ).run()
+
+    assert report['bottleneck'] == 'inference', report
+    names = [stage['name'] for stage in report['stages']]
+    assert names == ['decode', 'inference', 'render', 'write'], names
+    assert all(0.0 <= stage['utilization'] <= 1.0 for stage in report['stages'])
+    print(f"✓ Bottleneck: {report['bottleneck']}")
+
+
+def test_stage_error_stops_pipeline():
+    """An exception in a stage is raised from run() without hanging the other threads"""
+    def explode(item):
+        if item == 3:
+            raise ValueError('bad frame')
+        return item
+
+    pipeline = StagedPipeline(source=range(100), stages=[('inference', explode)],
+                              sink=('write', _slow(0.001)), queue_size=1)
+    try:
+        pipeline.run()
+        raise AssertionError('expected ValueError')
+    except ValueError:
+        pass
+    print("✓ Stage error propagates")
+
+
+if __name__ == '__main__':
+    test_order_is_preserved()
+    test_stage_can_hold_and_release_items()
+    test_flush_releases_held_items()
+    test_stages_overlap()
+    test_report_names_bottleneck()
+    test_stage_error_stops_pipeline()
+    print("All video pipeline tests passed")
@@ -0,0 +1,118 @@
+"""
+Test script for VideoMeshProcessor with a stand-in detector (no models needed) -
+detector calls hold the shared lock and per-frame people come from return
+values, not from detector state another request may have overwritten
+"""
+
+import os
+import tempfile
+import threading
+
+import cv2
+import numpy as np
+
+from video_processor import VideoMeshProcessor
+
+
+def make_video(path, frames=6, width=64, height=48):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), 30, (width, height))
+    assert writer.isOpened()
+    for i in range(frames):
+        writer.write(np.full((height, width, 3), i * 20, dtype=np.uint8))
+    writer.release()
+
+
+def make_person(person_id, frame_number, x0=0.0):
+    box = np.array([x0 + frame_number, 0.0, x0 + frame_number + 20.0, 40.0], dtype=np.float32)
+    return {
+        'person_id': person_id,
+        'box': box,
+        'vertices': np.zeros((4, 3), dtype=np.float32),
+        'joints_3d': np.zeros((2, 3), dtype=np.float32),
+        'faces': np.array([[0, 1, 2], [1, 2, 3]], dtype=np.int32),
+        'cam_t_full': np.array([x0, 0.0, 20.0 + frame_number], dtype=np.float32),
+        'img_size': np.array([64.0, 48.0]),
+        'scaled_focal_length': 100.0,
+        'smpl_params': {
+            'global_orient': np.eye(3)[None],
+            'body_pose': np.repeat(np.eye(3)[None], 23, axis=0),
+            'betas': np.full(10, person_id, dtype=np.float32),
+        },
+    }
+
+
+class FakeDetector:
+    """Mimics HybridPoseDetector's surface; records what each frame was rendered with"""
+
+    def __init__(self, lock, riders=1):
+        self.lock = lock
+        self.riders = riders
+        self.rendered = {}
+        self._last_hmr2_result = None
+        self._last_hmr2_persons = []
+        self._last_detections = None
+
+    def detect_pose_people(self, image_np, frame_number=0, start_time=None, person_boxes=None, mesh_arrays=False):
+        assert self.lock.locked(), 'detector called without the shared lock'
+        persons = [make_person(i, frame_number, x0=40.0 * i) for i in range(self.riders)]
+        # What a concurrent /pose/hybrid request would leave behind
+        self._last_hmr2_result, self._last_hmr2_persons = None, []
+        return self._build_pose_result(persons[0], frame_number, 64, 48, 1.0), persons, None
+
+    def smpl_forward(self, global_orient, body_pose, betas):
+        assert self.lock.locked(), 'SMPL forward called without the shared lock'
+        n = len(global_orient)
+        return np.zeros((n, 4, 3), dtype=np.float32), np.zeros((n, 2, 3), dtype=np.float32)
+
+    def _build_pose_result(self, hmr2_result, frame_number, w, h, processing_time_ms, mesh_arrays=False):
+        return {'frame_number': frame_number, 'has_3d': hmr2_result is not None, 'keypoint_count': 0}
+
+    def render_visualization(self, image_bgr, result, hmr2_result, frame_number=0, persons=None):
+        self.rendered[frame_number] = [float(p['smpl_params']['betas'][0]) for p in persons or []]
+        return image_bgr
+
+
+def run_video(riders=1, infer_stride=1, frames=6):
+    lock = threading.Lock()
+    detector = FakeDetector(lock, riders=riders)
+    processor = VideoMeshProcessor(detector, mesh_renderer=None, detector_lock=lock)
+    with tempfile.TemporaryDirectory() as tmp:
+        video_path = os.path.join(tmp, 'in.mp4')
+        make_video(video_path, frames=frames)
+        result = processor.process_video(video_path, os.path.join(tmp, 'out.mp4'), max_frames=frames,
+                                         infer_stride=infer_stride)
+    return result, detector
+
+
+def test_detector_calls_hold_lock():
+    """Every frame is inferred under the shared lock and keeps its own people"""
+    result, detector = run_video(riders=2)
+    assert result['processed_frames'] == 6
+    assert all(entry['has_mesh'] for entry in result['frame_acceptance']), result['frame_acceptance']
+    assert detector.rendered == {i: [0.0, 1.0] for i in range(6)}
+    assert all(frame['has3D'] for frame in result['pose_timeline'])
+    print(f"✓ {result['processed_frames']} frames inferred under the detector lock")
+
+
+def test_interpolation_holds_lock():
+    """The SMPL forward used for interpolated frames also runs under the lock"""
+    result, _ = run_video(infer_stride=3)
+    assert result['processed_frames'] == 6
+    assert all(entry['has_mesh'] for entry in result['frame_acceptance']), result['frame_acceptance']
+    assert result['temporal_upsampling']['interpolated_frames'] == [1, 2, 4]
+    print("✓ Interpolated frames computed under the detector lock")
+
+
+def test_interpolated_frames_keep_every_rider():
+    """With a stride, frames between keyframes render the secondary rider too (no flicker)"""
+    result, detector = run_video(riders=2, infer_stride=3)
+    assert result['temporal_upsampling']['interpolated_frames'] == [1, 2, 4]
+    assert detector.rendered == {i: [0.0, 1.0] for i in range(6)}, detector.rendered
+    print("✓ Both riders rendered on every frame")
+
+
+if __name__ == '__main__':
+    test_detector_calls_hold_lock()
+    test_interpolation_holds_lock()
+    test_interpolated_frames_keep_every_rider()
+    print("All video processor tests passed")
@@ -17,6 +17,11 @@ import pickle
 import numpy as np
 import time
 
+from mesh_lod import apply_lod, get_lod
+from mesh_sequence import DEFAULT_TIMELINE_CODEC, encode_timeline
+from mesh_topology import attach_topology
+from smpl_params import DEFAULT_MESH_MODE, encode_smpl_params, strip_mesh
+
 logger = logging.getLogger(__name__)
 
 # Configure aggressive logging to both console and file
@@ -35,7 +40,8 @@ print(f"[TRACK_WRAPPER] Logging to: {log_file}")
 class TrackWrapper:
     """Wrapper around 4D-Humans track.py"""
     
-    def __init__(self, track_py_path: str = None, four_d_humans_root: str = None, job_log_file: str = None):
+    def __init__(self, track_py_path: str = None, four_d_humans_root: str = None, job_log_file: str = None,
+                 mesh_mode: str = None, timeline_codec: str = None, lod: int = None, rest_vertices=None):
         """
         Initialize the track wrapper.
         
@@ -43,6 +49,16 @@ class TrackWrapper:
             track_py_path: Path to track.py (default: ~/repos/4D-Humans/track.py)
             four_d_humans_root: Root directory of 4D-Humans repo
             job_log_file: Optional file to write logs to (for job tracking)
+            mesh_mode: 'full' keeps per-frame vertices, 'params' keeps only smplParams
+                       (default POSE_MESH_MODE, see smpl_params.py)
+            timeline_codec: 'delta' moves per-frame vertices into one encoded sequence per
+                            person (result['vertex_sequence'], see mesh_sequence.py);
+                            'none' keeps them in the frames (default VIDEO_TIMELINE_CODEC)
+            lod: Mesh level of detail for frame vertices - 0 full, 1 / 2 decimated previews
+                 (see mesh_lod.py)
+            rest_vertices: SMPL template (rest-pose) vertices to compute the LOD maps on if they
+                           are not cached yet; without them (and no cached maps) frames keep
+                           the full mesh - posed tracklet vertices are never decimated
         """
         if track_py_path is None:
             # Try ~/repos/4D-Humans/track.py first
@@ -55,6 +71,11 @@ class TrackWrapper:
         self.track_py_path = os.path.abspath(track_py_path)
         self.four_d_humans_root = os.path.abspath(four_d_humans_root)
         self.job_log_file = job_log_file
+        self.mesh_mode = mesh_mode or DEFAULT_MESH_MODE
+        self.timeline_codec = timeline_codec or DEFAULT_TIMELINE_CODEC
+        self.lod = int(lod or 0)
+        self.rest_vertices = rest_vertices
+        self._lod_warned = False
         
         logger.info(f"[TRACK_WRAPPER] Looking for track.py at {self.track_py_path}")
         logger.info(f"[TRACK_WRAPPER] 4D-Humans root at {self.four_d_humans_root}")
@@ -338,10 +359,18 @@ class TrackWrapper:
             total_frames = len(frames)
             video_duration = total_frames / fps if fps > 0 else 0
         
+        vertex_sequence = None
+        if self.timeline_codec == 'delta' and self.mesh_mode != 'params':
+            vertex_sequence = encode_timeline(frames, track_key='personId')
+            logger.info(f"[TRACK_WRAPPER] Encoded vertex timeline: {vertex_sequence['raw_bytes'] / (1024*1024):.2f} MB -> "
+                        f"{vertex_sequence['encoded_bytes'] / (1024*1024):.2f} MB ({vertex_sequence['ratio']}x, "
+                        f"max error {vertex_sequence['max_error'] * 1000:.3f} mm)")
+        
         logger.info("[TRACK_WRAPPER] ===== PARSE OUTPUT COMPLETE =====")
         
         return {
             'frames': frames,
+            'vertex_sequence': vertex_sequence,
             'video_path': video_path,
             'output_dir': output_dir,
             'fps': fps,
@@ -414,25 +443,35 @@ class TrackWrapper:
         logger.info(f"[TRACK_WRAPPER] Extracted {len(frames)} frames with mesh data")
         return frames
     
-    def _build_frame_from_tracklet(self, frame_idx: int, tracklet: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def _build_frame_from_tracklet(self, frame_idx: int, tracklet: Dict[str, Any],
+                                   key: str = None) -> Optional[Dict[str, Any]]:
         """
         Build frame data from PHALP tracklet with mesh information.
         
         Args:
             frame_idx: Frame index
             tracklet: PHALP tracklet data with vertices, faces, etc.
+            key: Where the tracklet came from in the PHALP output (for log messages)
         
         Returns:
-            Frame dictionary with mesh data or None
+            Frame dictionary with mesh data or None. Faces are replaced by a
+            'mesh_topology' reference to /mesh/topology (POSE_EMBED_FACES=1 keeps them);
+            in 'params' mesh mode vertices are dropped and only smplParams are kept.
         """
         try:
-            vertices = tracklet.get('vertices', [])
-            faces = tracklet.get('faces', [])
+            params_only = self.mesh_mode == 'params'
+            vertices = [] if params_only else tracklet.get('vertices', [])
             
             if isinstance(vertices, np.ndarray):
                 vertices = vertices.tolist()
-            if isinstance(faces, np.ndarray):
-                faces = faces.tolist()
+            
+            # PHALP keeps one rotation-matrix SMPL dict per person
+            smpl = tracklet.get('smpl')
+            if isinstance(smpl, list):
+                smpl = smpl[0] if smpl else None
+            camera = tracklet.get('camera')
+            camera = np.asarray(camera, dtype=np.float32).reshape(-1, 3)[0] if np.size(camera) >= 3 else None
+            smpl_params = encode_smpl_params(smpl, camera) if isinstance(smpl, dict) else None
             
             frame = {
                 'frameNumber': frame_idx,
@@ -444,19 +483,37 @@ class TrackWrapper:
                 'has3D': True,
                 'meshRendered': True,
                 'vertices': vertices,
-                'faces': faces,
+                'faces': tracklet.get('faces', []),
+                'smplParams': smpl_params,
                 'tracked': tracklet.get('tracked', True),
                 'personId': tracklet.get('person_id', 0),
             }
+            faces = frame.get('faces')
+            attach_topology(frame, faces_key='faces')
+            if self.lod and faces is not None and len(faces) > 0:
+                # Maps come from the cache or the SMPL template, never from this posed mesh
+                try:
+                    lod = get_lod(self.lod, faces, self.rest_vertices)
+                    apply_lod(frame, lod, vertices_key='vertices', faces_key='faces')
+                except ValueError as e:
+                    if not self._lod_warned:
+                        logger.warning(f"[TRACK_WRAPPER] Keeping the full mesh, LOD {self.lod} unavailable: {e}")
+                        self._lod_warned = True
+            if params_only:
+                strip_mesh(frame)
+            elif isinstance(frame.get('faces'), np.ndarray):
+                frame['faces'] = frame['faces'].tolist()
             
             return frame
         
         except Exception as e:
-            logger.warning(f"[TRACK_WRAPPER] Error building frame from tracklet: {e}")
+            logger.warning(f"[TRACK_WRAPPER] Error building frame from tracklet {key or frame_idx}: {e}")
             return None
 
 
-def process_video_with_track(video_path: str, output_dir: str = None, max_frames: int = None, job_log_file: str = None) -> Dict[str, Any]:
+def process_video_with_track(video_path: str, output_dir: str = None, max_frames: int = None, job_log_file: str = None,
+                             mesh_mode: str = None, timeline_codec: str = None, lod: int = None,
+                             rest_vertices=None) -> Dict[str, Any]:
     """
     Convenience function to process a video using track.py.
     
@@ -465,9 +522,14 @@ def process_video_with_track(video_path: str, output_dir: str = None, max_frames
         output_dir: Output directory (optional)
         max_frames: Maximum frames to process (optional)
         job_log_file: Optional file to write logs to
+        mesh_mode: 'full' or 'params' (see TrackWrapper)
+        timeline_codec: 'none' or 'delta' (see TrackWrapper)
+        lod: Mesh level of detail (see TrackWrapper)
+        rest_vertices: SMPL template vertices for the LOD maps (see TrackWrapper)
     
     Returns:
         Dictionary with results
     """
-    wrapper = TrackWrapper(job_log_file=job_log_file)
+    wrapper = TrackWrapper(job_log_file=job_log_file, mesh_mode=mesh_mode, timeline_codec=timeline_codec,
+                           lod=lod, rest_vertices=rest_vertices)
     return wrapper.process_video(video_path, output_dir, max_frames)
@@ -0,0 +1,263 @@
+"""
+Staged video processing pipeline
+
+Runs decode -> inference -> render -> encode/write as separate threads joined
+by bounded queues, so the GPU is busy with frame N while frame N+1 is being
+decoded and frame N-1 is being rendered and written. Long runs approach the
+throughput of the slowest stage instead of the sum of all stages.
+
+    pipeline = StagedPipeline(
+        source=read_frames(),                      # decoder thread
+        stages=[('inference', infer, flush_infer), ('render', render)],
+        sink=('write', write),                     # writer thread
+        queue_size=4,
+    )
+    report = pipeline.run()
+
+Each stage function takes one item and returns the item for the next stage,
+None to drop it, or a list to emit zero or more items (a stage may hold items
+back and release them later, e.g. frames waiting for the next keyframe).
+A stage that holds items back gives an optional third element, flush(), which
+is called once its input has ended and returns the remaining items in the
+same way. Items keep their order because every stage is a single thread
+reading a FIFO queue. run() returns a per-stage utilization report.
+"""
+
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of the stream on every queue
+_END = object()
+
+# How often blocked threads re-check whether another stage failed
+_POLL_SECONDS = 0.1
+
+
+class StageStats:
+    """Busy/wait accounting for one pipeline stage"""
+
+    def __init__(self, name):
+        self.name = name
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.wait_in_seconds = 0.0  # Starved: waiting for the upstream stage
+        self.wait_out_seconds = 0.0  # Back-pressured: waiting for room downstream
+
+    def to_dict(self, wall_seconds):
+        return {
+            'name': self.name,
+            'items': self.items,
+            'busy_seconds': round(self.busy_seconds, 3),
+            'wait_in_seconds': round(self.wait_in_seconds, 3),
+            'wait_out_seconds': round(self.wait_out_seconds, 3),
+            'avg_ms_per_item': round(self.busy_seconds / self.items * 1000, 2) if self.items else 0.0,
+            'utilization': round(self.busy_seconds / wall_seconds, 3) if wall_seconds > 0 else 0.0,
+        }
+
+
+class StagedPipeline:
+    """
+    Thread-per-stage pipeline with bounded queues between stages.
+
+    Args:
+        source: Iterable of items, consumed on the decoder thread (stage 'decode')
+        stages: list of (name, fn) or (name, fn, flush) - fn(item) -> item, None to drop it,
+                or a list of items; flush() -> the same, called once after the last item
+        sink: (name, fn) - fn(item) consumes the final items on the writer thread
+        queue_size: Maximum items buffered between two stages
+    """
+
+    def __init__(self, source, stages, sink, queue_size=4):
+        self.source = source
+        self.stages = [(stage[0], stage[1], stage[2] if len(stage) > 2 else None) for stage in stages]
+        self.sink = sink
+        self.queue_size = max(1, int(queue_size))
+
+        self._stop = threading.Event()
+        self._error = None
+        self._stats = [StageStats('decode')] + [StageStats(name) for name, _, _ in self.stages] + [StageStats(sink[0])]
+
+    def run(self, threaded=True):
+        """
+        Push every source item through the stages.
+
+        Args:
+            threaded: False runs all stages inline on the calling thread (same
+                      results and report, useful for debugging and comparison)
+
+        Returns:
+            Utilization report dict (see report())
+
+        Raises:
+            Whatever a stage raised - the pipeline stops at the first failure
+        """
+        start = time.time()
+        if threaded:
+            self._run_threaded()
+        else:
+            self._run_inline()
+        return self.report(time.time() - start)
+
+    def report(self, wall_seconds):
+        """Per-stage utilization; the bottleneck is the stage with the most busy time"""
+        stages = [stats.to_dict(wall_seconds) for stats in self._stats]
+        bottleneck = max(self._stats, key=lambda stats: stats.busy_seconds)
+        items = self._stats[-1].items
+        return {
+            'wall_seconds': round(wall_seconds, 3),
+            'items': items,
+            'throughput_fps': round(items / wall_seconds, 2) if wall_seconds > 0 else 0.0,
+            'sum_of_stage_seconds': round(sum(stats.busy_seconds for stats in self._stats), 3),
+            'bottleneck': bottleneck.name,
+            'queue_size': self.queue_size,
+            'stages': stages,
+        }
+
+    def _run_inline(self):
+        decode_stats = self._stats[0]
+        iterator = iter(self.source)
+        while True:
+            t0 = time.time()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                decode_stats.busy_seconds += time.time() - t0
+                break
+            decode_stats.busy_seconds += time.time() - t0
+            decode_stats.items += 1
+            self._push_inline(0, item)
+
+        for stage_index, (_, _, flush) in enumerate(self.stages):
+            if flush is None:
+                continue
+            stats = self._stats[stage_index + 1]
+            t0 = time.time()
+            result = flush()
+            stats.busy_seconds += time.time() - t0
+            for next_item in _as_items(result):
+                self._push_inline(stage_index + 1, next_item)
+
+    def _push_inline(self, stage_index, item):
+        """Run one item through stage stage_index and everything after it"""
+        if stage_index == len(self.stages):
+            t0 = time.time()
+            self.sink[1](item)
+            self._stats[-1].busy_seconds += time.time() - t0
+            self._stats[-1].items += 1
+            return
+
+        stats = self._stats[stage_index + 1]
+        t0 = time.time()
+        result = self.stages[stage_index][1](item)
+        stats.busy_seconds += time.time() - t0
+        stats.items += 1
+
+        for next_item in _as_items(result):
+            self._push_inline(stage_index + 1, next_item)
+
+    def _run_threaded(self):
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+
+        threads = [threading.Thread(target=self._source_worker, args=(queues[0],),
+                                    name='pipeline-decode', daemon=True)]
+        for i, (name, fn, flush) in enumerate(self.stages):
+            threads.append(threading.Thread(target=self._stage_worker,
+                                            args=(fn, self._stats[i + 1], queues[i], queues[i + 1], flush),
+                                            name=f'pipeline-{name}', daemon=True))
+        threads.append(threading.Thread(target=self._stage_worker,
+                                        args=(self.sink[1], self._stats[-1], queues[-1], None),
+                                        name=f'pipeline-{self.sink[0]}', daemon=True))
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if self._error is not None:
+            raise self._error
+
+    def _fail(self, stage_name, error):
+        logger.error("[PIPELINE] Stage '%s' failed: %s", stage_name, error, exc_info=True)
+        if self._error is None:
+            self._error = error
+        self._stop.set()
+
+    def _put(self, q, item, stats):
+        t0 = time.time()
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=_POLL_SECONDS)
+                break
+            except queue.Full:
+                continue
+        stats.wait_out_seconds += time.time() - t0
+
+    def _get(self, q, stats):
+        t0 = time.time()
+        while not self._stop.is_set():
+            try:
+                item = q.get(timeout=_POLL_SECONDS)
+                stats.wait_in_seconds += time.time() - t0
+                return item
+            except queue.Empty:
+                continue
+        stats.wait_in_seconds += time.time() - t0
+        return _END
+
+    def _source_worker(self, out_queue):
+        stats = self._stats[0]
+        try:
+            iterator = iter(self.source)
+            while not self._stop.is_set():
+                t0 = time.time()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    stats.busy_seconds += time.time() - t0
+                    break
+                stats.busy_seconds += time.time() - t0
+                stats.items += 1
+                self._put(out_queue, item, stats)
+        except Exception as e:
+            self._fail(stats.name, e)
+        finally:
+            self._put(out_queue, _END, stats)
+
+    def _stage_worker(self, fn, stats, in_queue, out_queue, flush=None):
+        try:
+            while True:
+                item = self._get(in_queue, stats)
+                if item is _END:
+                    break
+                t0 = time.time()
+                result = fn(item)
+                stats.busy_seconds += time.time() - t0
+                stats.items += 1
+                if out_queue is not None:
+                    for next_item in _as_items(result):
+                        self._put(out_queue, next_item, stats)
+
+            if flush is not None and not self._stop.is_set():
+                t0 = time.time()
+                result = flush()
+                stats.busy_seconds += time.time() - t0
+                for next_item in _as_items(result):
+                    self._put(out_queue, next_item, stats)
+        except Exception as e:
+            self._fail(stats.name, e)
+        finally:
+            if out_queue is not None:
+                self._put(out_queue, _END, stats)
+
+
+def _as_items(result):
+    """Normalise a stage's return value to a list of items to forward"""
+    if result is None:
+        return []
+    if isinstance(result, list):
+        return result
+    return [result]
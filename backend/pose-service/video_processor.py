@@ -11,24 +11,54 @@ import tempfile
 import os
 import logging
 import base64
+import threading
 from pathlib import Path
 
+from video_pipeline import StagedPipeline
+from box_propagation import BoxPropagator
+from keyframe_selection import MOTION_METHODS, select_motion_keyframes
+from temporal_upsampling import interpolate_tracks, is_keyframe
+from mesh_lod import get_lod
+from mesh_sequence import DEFAULT_TIMELINE_CODEC, encode_timeline
+from mesh_topology import EMBED_FACES, get_topology
+from smpl_params import DEFAULT_MESH_MODE, encode_smpl_params
+
 logger = logging.getLogger(__name__)
 
+# Quality of the per-frame JPEG thumbnails in pose_timeline[].imageBase64
+JPEG_QUALITY = int(os.environ.get('VIDEO_FRAME_JPEG_QUALITY', '90'))
+
+# Frames buffered between pipeline stages (bounds memory on long videos)
+PIPELINE_QUEUE_SIZE = int(os.environ.get('VIDEO_PIPELINE_QUEUE_SIZE', '4'))
+
+# Run ViTDet every N processed frames and propagate boxes in between (1 = every frame)
+DETECT_EVERY = int(os.environ.get('VIDEO_DETECT_EVERY', '1'))
+
+# How max_frames are picked from longer videos: 'even', 'motion-diff' or 'motion-flow'
+FRAME_SAMPLING = os.environ.get('VIDEO_FRAME_SAMPLING', 'even')
+
+# Run HMR2 on every Nth processed frame and interpolate SMPL params in between (1 = every frame)
+INFER_STRIDE = int(os.environ.get('VIDEO_INFER_STRIDE', '1'))
+
 
 class VideoMeshProcessor:
     """Process full videos with mesh overlay on every frame"""
     
-    def __init__(self, detector, mesh_renderer):
+    def __init__(self, detector, mesh_renderer, detector_lock=None):
         """
         Args:
             detector: HybridPoseDetector instance
             mesh_renderer: SMPLMeshRenderer instance
+            detector_lock: Lock held around every detector call, shared with whatever else
+                           uses the same detector (e.g. the app's request threads)
         """
         self.detector = detector
         self.mesh_renderer = mesh_renderer
+        self.detector_lock = detector_lock if detector_lock is not None else threading.Lock()
     
-    def process_video(self, video_path, output_path=None, progress_callback=None, max_frames=60):
+    def process_video(self, video_path, output_path=None, progress_callback=None, max_frames=60, pipelined=True,
+                      detect_every=None, sampling=None, infer_stride=None, mesh_mode=None,
+                      timeline_codec=None, lod=None):
         """
         Process video and apply mesh overlay to every frame
         
@@ -37,6 +67,23 @@ class VideoMeshProcessor:
             output_path: Path to save output video (if None, creates temp file)
             progress_callback: Function(frame_num, total_frames) for progress updates
             max_frames: Maximum frames to process (default 60 for testing, use 999999 for all)
+            pipelined: Run decode / inference / render / write on separate threads
+                       (False runs the same stages one after another)
+            detect_every: Run ViTDet every N processed frames and carry person boxes forward
+                          from the previous HMR2 mesh in between (default VIDEO_DETECT_EVERY)
+            sampling: How max_frames are picked when the video is longer - 'even' spacing, or
+                      'motion-diff' / 'motion-flow' to concentrate frames on high-motion
+                      segments (default VIDEO_FRAME_SAMPLING)
+            infer_stride: Run HMR2 on every Nth processed frame only; frames in between are
+                          rebuilt by slerping SMPL rotations and re-running the SMPL layer
+                          (default VIDEO_INFER_STRIDE)
+            mesh_mode: 'full' keeps per-frame vertices; 'params' leaves only the compact
+                       smplParams in the timeline (default POSE_MESH_MODE, see smpl_params.py)
+            timeline_codec: 'delta' moves the timeline's vertices into one quantized, delta-coded
+                            sequence (result['vertex_sequence'], see mesh_sequence.py); 'none'
+                            keeps a vertex list per frame (default VIDEO_TIMELINE_CODEC)
+            lod: Mesh level of detail for the timeline vertices - 0 full, 1 / 2 decimated
+                 previews (see mesh_lod.py); the rendered overlay always uses the full mesh
         
         Returns:
             {
@@ -45,7 +92,12 @@ class VideoMeshProcessor:
                 'fps': frames per second,
                 'resolution': (width, height),
                 'processing_time_seconds': total time taken,
-                'frame_acceptance': [{'frame_index': 0, 'has_mesh': True}, ...]
+                'frame_acceptance': [{'frame_index': 0, 'has_mesh': True}, ...],
+                'pipeline': per-stage utilization report (see StagedPipeline.report),
+                'detection': detector usage (see BoxPropagator.get_stats), when detect_every > 1,
+                'frame_selection': {'method', 'selected_frames', 'motion_scores' (motion sampling only)},
+                'temporal_upsampling': {'stride', 'inferred_frames', 'interpolated_frames'}, when infer_stride > 1,
+                'vertex_sequence': encode_timeline() output, when timeline_codec is 'delta'
             }
         """
         import time
@@ -79,9 +131,19 @@ class VideoMeshProcessor:
         log_with_time(f"[VIDEO_PROCESSOR] Video properties: {width}x{height} @ {fps}fps, {total_frames_in_video} frames")
         logger.info(f"[VIDEO] Processing: {width}x{height} @ {fps}fps, {total_frames_in_video} frames")
         
-        # Calculate which frames to process (evenly spaced)
+        # Calculate which frames to process (evenly spaced, or weighted by motion)
+        sampling = sampling or FRAME_SAMPLING
+        frame_selection = {'method': 'even'}
         frames_to_process = set()
-        if total_frames_in_video > max_frames:
+        if total_frames_in_video > max_frames and sampling.startswith('motion'):
+            motion_method = sampling.split('-', 1)[1] if '-' in sampling else 'diff'
+            if motion_method not in MOTION_METHODS:
+                raise ValueError(f"Unknown sampling '{sampling}'")
+            log_with_time(f"[VIDEO_PROCESSOR] Motion pre-pass ({motion_method}) to pick {max_frames} keyframes...")
+            frame_selection = select_motion_keyframes(video_path, max_frames, method=motion_method)
+            frames_to_process = set(frame_selection['selected_frames'])
+            log_with_time(f"[VIDEO_PROCESSOR] Motion pre-pass done: {len(frames_to_process)} keyframes")
+        elif total_frames_in_video > max_frames:
             frame_interval = total_frames_in_video / max_frames
             log_with_time(f"[VIDEO_PROCESSOR] Sampling {max_frames} frames evenly (interval: {frame_interval:.2f})")
             for i in range(max_frames):
@@ -93,6 +155,7 @@ class VideoMeshProcessor:
             frames_to_process = set(range(total_frames_in_video))
         
         log_with_time(f"[VIDEO_PROCESSOR] Frames to process: {sorted(frames_to_process)}")
+        frame_selection['selected_frames'] = sorted(frames_to_process)
         
         # Setup output video
         if output_path is None:
@@ -108,142 +171,291 @@ class VideoMeshProcessor:
         
         log_with_time(f"[VIDEO_PROCESSOR] Output video writer created: {output_path}")
         
-        frame_num = 0
         processed_frames = 0
         frame_acceptance = []  # Track which frames have successful mesh overlays
         pose_timeline = []  # Full pose data for each frame
         sorted_frames = sorted(frames_to_process)
-        next_frame_idx = 0
         
-        log_with_time(f"[VIDEO_PROCESSOR] Starting frame processing loop...")
+        detect_every = DETECT_EVERY if detect_every is None else int(detect_every)
+        box_propagator = BoxPropagator(detect_every=detect_every) if detect_every > 1 else None
+        if box_propagator:
+            log_with_time(f"[VIDEO_PROCESSOR] Running ViTDet every {detect_every} frames, propagating boxes in between")
         
-        try:
-            while next_frame_idx < len(sorted_frames):
-                target_frame = sorted_frames[next_frame_idx]
-                
-                # Skip to target frame
+        infer_stride = max(1, INFER_STRIDE if infer_stride is None else int(infer_stride))
+        upsampling = {'stride': infer_stride, 'inferred_frames': [], 'interpolated_frames': []}
+        rendering = {'frames': 0, 'frame_pixels': 0, 'rendered_pixels': 0, 'saved_pixels': 0}
+        mesh_topology = None  # /mesh/topology reference, set from the first mesh
+        mesh_lod = None  # MeshLOD for lod > 0, set from the first mesh
+        params_only = (mesh_mode or DEFAULT_MESH_MODE) == 'params'
+        pending_frames = []  # Frames waiting for the next keyframe (infer_stride > 1)
+        last_keyframe = None
+        if infer_stride > 1:
+            log_with_time(f"[VIDEO_PROCESSOR] Running HMR2 every {infer_stride} frames, interpolating SMPL params in between")
+        
+        def read_frames():
+            """Decode stage: yield the sampled frames straight from VideoCapture (BGR)"""
+            frame_num = 0
+            for position, target_frame in enumerate(sorted_frames):
+                # Skip to target frame (grab() skips without decoding)
                 if frame_num < target_frame:
                     frames_to_skip = target_frame - frame_num
                     log_with_time(f"[VIDEO_PROCESSOR] Skipping {frames_to_skip} frames (from {frame_num} to {target_frame})")
                     for _ in range(frames_to_skip):
-                        ret, _ = cap.read()
-                        if not ret:
+                        if not cap.grab():
                             log_with_time(f"[VIDEO_PROCESSOR] End of video reached while skipping to frame {target_frame}")
-                            break
+                            return
                         frame_num += 1
-                    if not ret:
-                        break
                 
                 # Read the target frame
                 ret, frame = cap.read()
                 if not ret:
                     log_with_time(f"[VIDEO_PROCESSOR] End of video reached at frame {frame_num}")
-                    break
-                
+                    return
                 frame_num += 1
-                should_process = True
                 
-                if should_process:
-                    log_with_time(f"[VIDEO_PROCESSOR] ▶ Processing frame {target_frame} (output frame {processed_frames + 1}/{max_frames})")
-                    
-                    try:
-                        # Encode frame to base64
-                        _, buffer = cv2.imencode('.jpg', frame)
-                        frame_base64 = base64.b64encode(buffer).decode('utf-8')
-                        
-                        log_with_time(f"[VIDEO_PROCESSOR]   → Calling detect_pose_with_visualization...")
-                        
-                        # Detect pose and render mesh
-                        result = self.detector.detect_pose_with_visualization(
-                            frame_base64, 
-                            frame_number=target_frame
-                        )
-                        
-                        log_with_time(f"[VIDEO_PROCESSOR]   ✓ Got result")
-                        
-                        # Check if visualization was successful
-                        has_mesh = 'visualization_base64' in result and result['visualization_base64'] is not None
-                        
-                        # Get visualization if available
-                        if has_mesh:
-                            log_with_time(f"[VIDEO_PROCESSOR]   ✓ Has mesh overlay")
-                            viz_data = base64.b64decode(result['visualization_base64'])
-                            viz_array = np.frombuffer(viz_data, dtype=np.uint8)
-                            frame_out = cv2.imdecode(viz_array, cv2.IMREAD_COLOR)
-                        else:
-                            # Skip frames without successful mesh overlay
-                            log_with_time(f"[VIDEO_PROCESSOR]   ✗ No mesh overlay, skipping")
-                            frame_out = None
-                        
-                        # Only write frame if it has mesh overlay
-                        if frame_out is not None:
-                            out.write(frame_out)
-                            
-                            # Extract pose data for this frame
-                            timestamp = target_frame / fps if fps > 0 else 0
-                            
-                            # Extract mesh geometry if available
-                            mesh_vertices = None
-                            mesh_faces = None
-                            if hasattr(self.detector, '_last_hmr2_result') and self.detector._last_hmr2_result:
-                                hmr2_result = self.detector._last_hmr2_result
-                                if 'vertices' in hmr2_result and 'faces' in hmr2_result:
-                                    mesh_vertices = hmr2_result['vertices'].tolist() if hasattr(hmr2_result['vertices'], 'tolist') else hmr2_result['vertices']
-                                    mesh_faces = hmr2_result['faces'].tolist() if hasattr(hmr2_result['faces'], 'tolist') else hmr2_result['faces']
-                                    log_with_time(f"[VIDEO_PROCESSOR]   ✓ Extracted mesh: {len(mesh_vertices)} vertices, {len(mesh_faces)} faces")
-                            
-                            pose_frame = {
-                                'frameNumber': processed_frames,
-                                'originalFrameNumber': target_frame,
-                                'timestamp': round(timestamp, 3),
-                                'confidence': 1.0 if result.get('keypoint_count', 0) > 0 else 0,
-                                'keypoints': result.get('keypoints', []),
-                                'joints3D': result.get('joints_3d_raw', []),
-                                'jointAngles': result.get('joint_angles_3d', {}),
-                                'has3D': result.get('has_3d', False),
-                                'meshRendered': result.get('mesh_rendered', False),
-                                'vertices': mesh_vertices,
-                                'faces': mesh_faces,
-                                'imageBase64': f"data:image/jpeg;base64,{result.get('visualization_base64', '')}",
-                            }
-                            pose_timeline.append(pose_frame)
-                            
-                            frame_acceptance.append({
-                                'frame_index': processed_frames,
-                                'has_mesh': True,
-                                'original_frame_number': target_frame,
-                                'timestamp': round(timestamp, 3)
-                            })
-                            processed_frames += 1
-                            log_with_time(f"[VIDEO_PROCESSOR]   ✓ Written to output ({processed_frames}/{max_frames})")
-                        
-                        if progress_callback:
-                            progress_callback(processed_frames, max_frames)
-                        
-                        if processed_frames % 5 == 0:
-                            log_with_time(f"[VIDEO_PROCESSOR] Progress: {processed_frames}/{max_frames} frames processed")
-                            logger.info(f"[VIDEO] Processed {processed_frames}/{max_frames} frames with mesh")
-                        
-                    except Exception as e:
-                        log_with_time(f"[VIDEO_PROCESSOR]   ✗ Error: {e}")
-                        import traceback
-                        traceback.print_exc()
-                        logger.error(f"[VIDEO] Error processing frame {target_frame}: {e}")
-                        frame_acceptance.append({
-                            'frame_index': processed_frames,
-                            'has_mesh': False,
-                            'original_frame_number': target_frame,
-                            'error': str(e)
-                        })
+                yield {
+                    'target_frame': target_frame,
+                    'frame': frame,
+                    'keyframe': is_keyframe(position, len(sorted_frames), infer_stride),
+                }
+        
+        def run_inference(item):
+            """Inference stage: HMR2 on keyframes, SMPL interpolation for the frames between them"""
+            if infer_stride == 1:
+                return infer_frame(item)
+            
+            if not item['keyframe']:
+                pending_frames.append(item)
+                return []
+            return infer_keyframe(item)
+        
+        def flush_inference():
+            """End of input: frames still waiting for a keyframe (video ended early)"""
+            if not pending_frames:
+                return None
+            # Promote the last waiting frame to a keyframe
+            return infer_keyframe(pending_frames.pop())
+        
+        def infer_keyframe(item):
+            nonlocal last_keyframe
+            infer_frame(item)
+            between = list(pending_frames)
+            pending_frames.clear()
+            if between:
+                interpolate_frames(last_keyframe, item, between)
+            last_keyframe = item
+            return between + [item]
+        
+        def interpolate_frames(start_item, end_item, between):
+            """Rebuild the frames between two inferred keyframes from slerped SMPL params"""
+            start_person = start_item.get('hmr2_result') if start_item else None
+            end_person = end_item.get('hmr2_result')
+            
+            if not (start_person and end_person and start_person.get('smpl_params') and end_person.get('smpl_params')):
+                # A keyframe failed - nothing to interpolate from, infer these frames directly
+                log_with_time(f"[VIDEO_PROCESSOR]   Keyframe missing SMPL params, inferring {len(between)} frames directly")
+                for frame_item in between:
+                    infer_frame(frame_item)
+                return
+            
+            f0, f1 = start_item['target_frame'], end_item['target_frame']
+            ts = [(frame_item['target_frame'] - f0) / float(f1 - f0) for frame_item in between]
+            try:
+                t0 = time.time()
+                with self.detector_lock:
+                    # Every rider matched between the keyframes, so secondary riders do not blink
+                    persons_per_frame = interpolate_tracks(start_item.get('hmr2_persons') or [start_person],
+                                                           end_item.get('hmr2_persons') or [end_person],
+                                                           ts, self.detector.smpl_forward)
+                elapsed_ms = (time.time() - t0) * 1000
+            except Exception as e:
+                for frame_item in between:
+                    frame_item['error'] = e
+                return
+            
+            for frame_item, persons in zip(between, persons_per_frame):
+                h, w = frame_item['frame'].shape[:2]
+                person = persons[0]
+                frame_item['hmr2_result'] = person
+                frame_item['hmr2_persons'] = persons
+                frame_item['result'] = self.detector._build_pose_result(
+                    person, frame_item['target_frame'], w, h, elapsed_ms / len(between)
+                )
+                frame_item['box_source'] = 'interpolated'
+                frame_item['interpolated'] = True
+                upsampling['interpolated_frames'].append(frame_item['target_frame'])
+            log_with_time(f"[VIDEO_PROCESSOR]   ✓ Interpolated {len(between)} frames between {f0} and {f1} ({elapsed_ms:.0f}ms)")
+        
+        def infer_frame(item):
+            """ViTDet + HMR2 on the RGB frame"""
+            target_frame = item['target_frame']
+            log_with_time(f"[VIDEO_PROCESSOR] ▶ Inference on frame {target_frame}")
+            try:
+                frame_rgb = cv2.cvtColor(item['frame'], cv2.COLOR_BGR2RGB)
+                person_boxes = box_propagator.boxes_for_frame(target_frame) if box_propagator else None
+                with self.detector_lock:
+                    result, persons, detections = self.detector.detect_pose_people(
+                        frame_rgb, frame_number=target_frame, person_boxes=person_boxes
+                    )
+                item['result'] = result
+                item['box_source'] = 'propagated' if person_boxes is not None else 'detector'
+                item['hmr2_result'] = persons[0] if persons else None
+                item['hmr2_persons'] = list(persons)
                 
-                next_frame_idx += 1
+                if box_propagator:
+                    box_propagator.update(
+                        target_frame,
+                        persons,
+                        detection=detections[0] if person_boxes is None and detections else None,
+                    )
+                upsampling['inferred_frames'].append(target_frame)
+            except Exception as e:
+                item['error'] = e
+            return item
         
+        def run_render(item):
+            """Render stage: mesh overlay, skeleton and info panels drawn on the BGR frame"""
+            if 'error' in item:
+                return item
+            try:
+                item['frame_out'] = self.detector.render_visualization(
+                    item['frame'], item['result'], item['hmr2_result'], item['target_frame'],
+                    persons=item.get('hmr2_persons'),
+                )
+            except Exception as e:
+                item['error'] = e
+            return item
+        
+        def write_frame(item):
+            """Encode/write stage: video writer, carousel JPEG and pose timeline entry"""
+            nonlocal processed_frames, mesh_topology, mesh_lod
+            target_frame = item['target_frame']
+            
+            if 'error' in item:
+                e = item['error']
+                log_with_time(f"[VIDEO_PROCESSOR]   ✗ Error on frame {target_frame}: {e}")
+                logger.error(f"[VIDEO] Error processing frame {target_frame}: {e}", exc_info=e)
+                frame_acceptance.append({
+                    'frame_index': processed_frames,
+                    'has_mesh': False,
+                    'original_frame_number': target_frame,
+                    'error': str(e)
+                })
+                return
+            
+            result = item['result']
+            hmr2_result = item['hmr2_result']
+            frame_out = item['frame_out']
+            
+            out.write(frame_out)
+            
+            render_stats = result.get('mesh_render_stats')
+            if render_stats:
+                for key in ('frame_pixels', 'rendered_pixels', 'saved_pixels'):
+                    rendering[key] += render_stats[key]
+                rendering['frames'] += 1
+            
+            # Extract pose data for this frame
+            timestamp = target_frame / fps if fps > 0 else 0
+            
+            # Extract mesh geometry if available
+            # Faces are the same for every frame: the timeline references /mesh/topology
+            # once (result['mesh_topology']) instead of copying them into each frame
+            mesh_vertices = None
+            smpl_params = None
+            if hmr2_result and hmr2_result.get('vertices') is not None and hmr2_result.get('faces') is not None:
+                if mesh_topology is None:
+                    mesh_topology = get_topology(hmr2_result['faces']).reference()
+                    if lod:
+                        with self.detector_lock:
+                            rest_vertices = self.detector.smpl_rest_vertices()
+                        mesh_lod = get_lod(int(lod), hmr2_result['faces'], rest_vertices)
+                        mesh_topology = mesh_lod.reference()
+                if not params_only:
+                    vertices = hmr2_result['vertices']
+                    if mesh_lod is not None:
+                        vertices = mesh_lod.subsample(vertices)
+                    mesh_vertices = vertices.tolist() if hasattr(vertices, 'tolist') else vertices
+                smpl_params = encode_smpl_params(hmr2_result.get('smpl_params'), hmr2_result.get('cam_t_full'),
+                                                 hmr2_result.get('scaled_focal_length'), hmr2_result.get('img_size'))
+                log_with_time(f"[VIDEO_PROCESSOR]   ✓ Extracted mesh: {len(hmr2_result['vertices'])} vertices, "
+                              f"{mesh_topology['face_count']} faces{' (params only)' if params_only else ''}")
+            
+            # Carousel thumbnail: the one JPEG encode of the rendered frame
+            _, jpeg_buffer = cv2.imencode('.jpg', frame_out, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+            frame_jpeg_base64 = base64.b64encode(jpeg_buffer).decode('utf-8')
+            
+            pose_frame = {
+                'frameNumber': processed_frames,
+                'originalFrameNumber': target_frame,
+                'timestamp': round(timestamp, 3),
+                'confidence': 1.0 if result.get('keypoint_count', 0) > 0 else 0,
+                'keypoints': result.get('keypoints', []),
+                'joints3D': result.get('joints_3d_raw', []),
+                'jointAngles': result.get('joint_angles_3d', {}),
+                'has3D': result.get('has_3d', False),
+                'meshRendered': result.get('mesh_rendered', False),
+                'renderSavedPixels': render_stats['saved_pixels'] if render_stats else 0,
+                'boxSource': item['box_source'],
+                'interpolated': item.get('interpolated', False),
+                'vertices': mesh_vertices,
+                'smplParams': smpl_params,
+                'imageBase64': f"data:image/jpeg;base64,{frame_jpeg_base64}",
+            }
+            if params_only:
+                del pose_frame['vertices']
+            elif EMBED_FACES and mesh_vertices is not None:
+                faces = mesh_lod.faces if mesh_lod is not None else hmr2_result['faces']
+                pose_frame['faces'] = np.asarray(faces).tolist()
+            pose_timeline.append(pose_frame)
+            
+            frame_acceptance.append({
+                'frame_index': processed_frames,
+                'has_mesh': True,
+                'original_frame_number': target_frame,
+                'timestamp': round(timestamp, 3)
+            })
+            processed_frames += 1
+            log_with_time(f"[VIDEO_PROCESSOR]   ✓ Frame {target_frame} written to output ({processed_frames}/{max_frames})")
+            
+            if progress_callback:
+                progress_callback(processed_frames, max_frames)
+            
+            if processed_frames % 5 == 0:
+                log_with_time(f"[VIDEO_PROCESSOR] Progress: {processed_frames}/{max_frames} frames processed")
+                logger.info(f"[VIDEO] Processed {processed_frames}/{max_frames} frames with mesh")
+        
+        pipeline = StagedPipeline(
+            source=read_frames(),
+            stages=[('inference', run_inference, flush_inference), ('render', run_render)],
+            sink=('write', write_frame),
+            queue_size=PIPELINE_QUEUE_SIZE,
+        )
+        
+        log_with_time(f"[VIDEO_PROCESSOR] Starting frame processing ({'pipelined' if pipelined else 'sequential'})...")
+        
+        try:
+            pipeline_report = pipeline.run(threaded=pipelined)
         finally:
             log_with_time(f"[VIDEO_PROCESSOR] Releasing video resources...")
             cap.release()
             out.release()
             log_with_time(f"[VIDEO_PROCESSOR] Resources released")
         
+        for stage in pipeline_report['stages']:
+            log_with_time(f"[VIDEO_PROCESSOR] Stage {stage['name']}: {stage['items']} items, "
+                          f"{stage['avg_ms_per_item']:.1f}ms/item, utilization {stage['utilization']:.0%}")
+        log_with_time(f"[VIDEO_PROCESSOR] Bottleneck: {pipeline_report['bottleneck']}, "
+                      f"{pipeline_report['throughput_fps']:.2f} fps")
+        if rendering['frame_pixels']:
+            rendering['saved_fraction'] = round(rendering['saved_pixels'] / rendering['frame_pixels'], 3)
+            log_with_time(f"[VIDEO_PROCESSOR] Mesh render: {rendering['rendered_pixels']}/{rendering['frame_pixels']} px "
+                          f"rendered ({rendering['saved_fraction']:.0%} saved by ROI)")
+        if box_propagator:
+            detection_stats = box_propagator.get_stats()
+            log_with_time(f"[VIDEO_PROCESSOR] ViTDet ran on {detection_stats['detector_runs']}/{detection_stats['frames']} frames "
+                          f"(redetect reasons: {detection_stats['redetect_reasons']})")
+        
         processing_time = time.time() - start_time
         
         log_with_time(f"[VIDEO_PROCESSOR] ✓ Complete: {processed_frames}/{max_frames} frames with mesh in {processing_time:.1f}s")
@@ -252,6 +464,13 @@ class VideoMeshProcessor:
         output_size_mb = round(os.path.getsize(output_path) / (1024 * 1024), 2)
         log_with_time(f"[VIDEO_PROCESSOR] Output file size: {output_size_mb} MB")
         
+        vertex_sequence = None
+        if (timeline_codec or DEFAULT_TIMELINE_CODEC) == 'delta' and not params_only:
+            vertex_sequence = encode_timeline(pose_timeline)
+            log_with_time(f"[VIDEO_PROCESSOR] Vertex timeline: {vertex_sequence['raw_bytes'] / (1024 * 1024):.2f} MB -> "
+                          f"{vertex_sequence['encoded_bytes'] / (1024 * 1024):.2f} MB ({vertex_sequence['ratio']}x, "
+                          f"max error {vertex_sequence['max_error'] * 1000:.3f} mm)")
+        
         result = {
             'output_path': output_path,
             'total_frames': processed_frames,
@@ -262,13 +481,23 @@ class VideoMeshProcessor:
             'output_size_mb': output_size_mb,
             'frame_acceptance': frame_acceptance,
             'pose_timeline': pose_timeline,
+            'pipeline': pipeline_report,
+            'detection': box_propagator.get_stats() if box_propagator else None,
+            'frame_selection': frame_selection,
+            'temporal_upsampling': upsampling if infer_stride > 1 else None,
+            'rendering': rendering,
+            'mesh_topology': mesh_topology,
+            'mesh_mode': 'params' if params_only else 'full',
+            'mesh_lod': mesh_lod.level if mesh_lod is not None else 0,
+            'vertex_sequence': vertex_sequence,
             'video_duration': round(total_frames_in_video / fps, 2) if fps > 0 else 0,
             'frames': [
                 {
                     'frameNumber': frame['frameNumber'],
                     'timestamp': frame['timestamp'],
-                    'vertices': frame.get('vertices', []),
-                    'faces': frame.get('faces', []),
+                    'smplParams': frame['smplParams'],
+                    **({'vertices': frame['vertices']} if 'vertices' in frame else {}),
+                    **({'faces': frame['faces']} if 'faces' in frame else {}),
                 }
                 for frame in pose_timeline
             ]
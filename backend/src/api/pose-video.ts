@@ -3,7 +3,7 @@ import path from 'path';
 import fs from 'fs';
 import logger from '../logger';
 import { processVideoWithTrackPy } from '../services/videoProcessingService';
-import { parsePickleToFrames } from '../services/pickleParserService';
+import { streamPickleFrames } from '../services/pickleParserService';
 import * as frameStorageService from '../services/frameStorageService';
 import * as frameQueryService from '../services/frameQueryService';
 
@@ -29,6 +29,8 @@ function addJobLog(jobId: string, message: string) {
 }
 
 async function processVideoInBackground(videoId: string, jobId: string, videoPath: string) {
+  let framesStored = false;
+
   try {
     addJobLog(jobId, `🚀 Starting background processing for ${videoId}`);
 
@@ -54,9 +56,13 @@ async function processVideoInBackground(videoId: string, jobId: string, videoPat
       addJobLog(jobId, `⚠ No overlay video found`);
     }
 
-    // Phase 2: Parse pickle file
-    addJobLog(jobId, `[PHASE 2] PICKLE PARSING`);
-    const parseResult = await parsePickleToFrames(processingResult.pklPath);
+    // Phase 2 + 3: Parse pickle file, storing frames in MongoDB as they are streamed
+    addJobLog(jobId, `[PHASE 2] PICKLE PARSING + MONGODB STORAGE`);
+    await frameStorageService.connectToMongoDB();
+    const parseResult = await streamPickleFrames(processingResult.pklPath, (frames) => {
+      framesStored = true;
+      return frameStorageService.storeFrames(videoId, frames);
+    });
 
     if (!parseResult.success) {
       throw new Error(`Pickle parsing failed: ${parseResult.error}`);
@@ -64,15 +70,10 @@ async function processVideoInBackground(videoId: string, jobId: string, videoPat
 
     addJobLog(jobId, `✓ Parsed ${parseResult.frameCount} frames`);
 
-    if (!parseResult.frames || parseResult.frames.length === 0) {
+    if (!parseResult.frameCount) {
       throw new Error('No frames extracted from pickle');
     }
 
-    // Phase 3: Store frames in MongoDB
-    addJobLog(jobId, `[PHASE 3] MONGODB STORAGE`);
-    await frameStorageService.connectToMongoDB();
-    await frameStorageService.storeFrames(videoId, parseResult.frames);
-
     addJobLog(jobId, `✓ Stored ${parseResult.frameCount} frames in MongoDB`);
 
     // Phase 4: Save video metadata
@@ -89,6 +90,7 @@ async function processVideoInBackground(videoId: string, jobId: string, videoPat
       createdAt: new Date(),
       originalVideoPath: videoPath,
       overlayVideoPath: processingResult.overlayVideoPath,
+      meshFaces: parseResult.meshFaces || undefined,
     };
 
     await frameQueryService.saveVideoMetadata(videoMetadata);
@@ -110,6 +112,17 @@ async function processVideoInBackground(videoId: string, jobId: string, videoPat
   } catch (err: any) {
     addJobLog(jobId, `✗ Error in background processing: ${err.message}`);
     logger.error(`Background processing error for ${videoId}: ${err.message}`);
+
+    // Batches are inserted as they stream in, so a failed job would leave a partial video behind
+    if (framesStored) {
+      try {
+        const deleted = await frameStorageService.deleteFrames(videoId);
+        addJobLog(jobId, `✓ Removed ${deleted} partially stored frames`);
+      } catch (cleanupErr: any) {
+        addJobLog(jobId, `✗ Failed to remove partially stored frames: ${cleanupErr.message}`);
+      }
+    }
+
     jobStatus[jobId] = {
       status: 'error',
       videoId,
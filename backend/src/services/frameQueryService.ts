@@ -44,6 +44,7 @@ export interface VideoMetadata {
   createdAt: Date;
   originalVideoPath?: string;
   overlayVideoPath?: string;
+  meshFaces?: number[][]; // SMPL topology, stored once per video instead of on every person
 }
 
 export async function getAllVideos(): Promise<VideoMetadata[]> {
@@ -55,7 +56,7 @@ export async function getAllVideos(): Promise<VideoMetadata[]> {
     console.log(`[VIDEO_QUERY] 🔍 Retrieving all videos`);
 
     const docs = await videosCollection
-      .find({})
+      .find({}, { projection: { meshFaces: 0 } })
       .sort({ createdAt: -1 })
       .toArray();
 
@@ -105,6 +106,7 @@ export async function getVideoMetadata(videoId: string): Promise<VideoMetadata |
       createdAt: doc.createdAt,
       originalVideoPath: doc.originalVideoPath,
       overlayVideoPath: doc.overlayVideoPath,
+      meshFaces: doc.meshFaces || undefined,
     };
   } catch (err: any) {
     console.error(`[VIDEO_QUERY] ✗ Failed to get video metadata: ${err.message}`);
@@ -130,6 +132,7 @@ export async function saveVideoMetadata(metadata: VideoMetadata): Promise<void>
       frameCount: metadata.frameCount,
       originalVideoPath: metadata.originalVideoPath,
       overlayVideoPath: metadata.overlayVideoPath,
+      meshFaces: metadata.meshFaces,
       createdAt: metadata.createdAt || now,
       updatedAt: now,
     };
@@ -102,7 +102,7 @@ function buildSyncedFrame(frame: FrameData, videoMetadata: any): SyncedFrame {
 
   const keypoints = transformPersonDataToKeypoints(personData);
   const vertices = personData.meshVertices || [];
-  const faces = personData.meshFaces || [];
+  const faces = personData.meshFaces || videoMetadata.meshFaces || [];
   const cameraParams = personData.camera
     ? transformCameraParams(personData.camera)
     : undefined;
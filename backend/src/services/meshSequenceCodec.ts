@@ -0,0 +1,197 @@
+/**
+ * Decoder for the pose service's delta-coded vertex timelines (codec 'smsq-delta')
+ *
+ * Video results processed with `timeline_codec=delta` leave the per-frame
+ * `vertices` out and carry `vertex_sequence` instead: one quantized,
+ * delta-coded and compressed sequence per person, base64 in JSON. Each
+ * sequence is ~10x+ smaller than float32 vertices (far more than JSON lists),
+ * with a per-track max_error in metres.
+ *
+ * Layout and decoding steps: see backend/pose-service/mesh_sequence.py
+ */
+
+import * as zlib from 'zlib';
+
+export const SEQUENCE_CODEC = 'smsq-delta';
+
+const MAGIC = 'SMSQ';
+const FORMAT_VERSION = 1;
+const HEADER_BYTES = 44;
+const COMPRESSION_NONE = 0;
+const COMPRESSION_ZLIB = 1;
+const COMPRESSION_ZSTD = 2;
+
+export interface VertexSequenceTrack {
+  track: number | string;
+  frames: number[]; // timeline indices
+  data: string; // base64
+  max_error: number;
+  ratio: number | null;
+}
+
+export interface VertexSequence {
+  codec: string;
+  vertices_key: string;
+  tracks: VertexSequenceTrack[];
+  raw_bytes: number;
+  encoded_bytes: number;
+  ratio: number | null;
+  max_error: number;
+}
+
+interface ParsedSequence {
+  bytes: Buffer;
+  compression: number;
+  frameCount: number;
+  vertexCount: number;
+  keyframeInterval: number;
+  origin: [number, number, number];
+  step: [number, number, number];
+  presence: Uint8Array;
+  gops: Array<{ offset: number; length: number }>;
+}
+
+function parse(bytes: Buffer): ParsedSequence {
+  if (bytes.length < HEADER_BYTES || bytes.toString('latin1', 0, 4) !== MAGIC) {
+    throw new Error('Bad mesh sequence magic');
+  }
+  const version = bytes.readUInt8(4);
+  if (version !== FORMAT_VERSION) {
+    throw new Error(`Unsupported mesh sequence version ${version}`);
+  }
+  const frameCount = bytes.readUInt32LE(8);
+  const origin = [0, 1, 2].map((i) => bytes.readFloatLE(20 + i * 4)) as [number, number, number];
+  const step = [0, 1, 2].map((i) => bytes.readFloatLE(32 + i * 4)) as [number, number, number];
+
+  let pos = HEADER_BYTES;
+  const presence = new Uint8Array(bytes.subarray(pos, pos + frameCount));
+  pos += frameCount + ((4 - (frameCount % 4)) % 4);
+  const gopCount = bytes.readUInt32LE(pos);
+  pos += 4;
+  const lengths: number[] = [];
+  for (let i = 0; i < gopCount; i++) lengths.push(bytes.readUInt32LE(pos + i * 4));
+  pos += 4 * gopCount;
+
+  const gops = lengths.map((length) => {
+    const gop = { offset: pos, length };
+    pos += length;
+    return gop;
+  });
+  if (pos > bytes.length) {
+    throw new Error('Truncated mesh sequence GOP data');
+  }
+
+  return {
+    bytes,
+    compression: bytes.readUInt8(5),
+    frameCount,
+    vertexCount: bytes.readUInt32LE(12),
+    keyframeInterval: bytes.readUInt32LE(16),
+    origin,
+    step,
+    presence,
+    gops,
+  };
+}
+
+function decompress(blob: Buffer, compression: number): Buffer {
+  if (compression === COMPRESSION_NONE) return blob;
+  if (compression === COMPRESSION_ZLIB) return zlib.inflateSync(blob);
+  if (compression === COMPRESSION_ZSTD) {
+    const zstd = (zlib as any).zstdDecompressSync;
+    if (!zstd) {
+      throw new Error('Sequence is zstd-compressed but this Node.js has no zlib.zstdDecompressSync');
+    }
+    return zstd(blob);
+  }
+  throw new Error(`Unknown compression code ${compression}`);
+}
+
+function unzigzag(z: number): number {
+  return ((z >>> 1) ^ -(z & 1)) & 0xffff;
+}
+
+/** Float32Array per frame (vertexCount * 3) for one GOP */
+function decodeGop(parsed: ParsedSequence, gopIndex: number): Float32Array[] {
+  const { offset, length } = parsed.gops[gopIndex];
+  const presentTotal = parsed.presence.reduce((sum, here) => sum + (here ? 1 : 0), 0);
+  const framesInGop = Math.min(parsed.keyframeInterval, presentTotal - gopIndex * parsed.keyframeInterval);
+  const perFrame = parsed.vertexCount * 3;
+  const count = framesInGop * perFrame;
+
+  const raw = decompress(parsed.bytes.subarray(offset, offset + length), parsed.compression);
+  if (raw.length !== count * 2) {
+    throw new Error(`GOP holds ${raw.length} bytes, expected ${count * 2}`);
+  }
+
+  // Low-byte plane, then high-byte plane
+  const q = new Uint16Array(perFrame);
+  const frames: Float32Array[] = [];
+  for (let t = 0; t < framesInGop; t++) {
+    const out = new Float32Array(perFrame);
+    for (let i = 0; i < perFrame; i++) {
+      const index = t * perFrame + i;
+      const value = raw[index] | (raw[count + index] << 8);
+      if (t === 0) {
+        // Keyframe: difference to the previous vertex, same axis
+        q[i] = i < 3 ? value : (q[i - 3] + unzigzag(value)) & 0xffff;
+      } else {
+        q[i] = (q[i] + unzigzag(value)) & 0xffff;
+      }
+      const axis = i % 3;
+      out[i] = parsed.origin[axis] + q[i] * parsed.step[axis];
+    }
+    frames.push(out);
+  }
+  return frames;
+}
+
+/** Decode a whole sequence; null for frames without a mesh */
+export function decodeSequence(data: Buffer | Uint8Array | string): Array<Float32Array | null> {
+  const bytes = typeof data === 'string' ? Buffer.from(data, 'base64') : Buffer.from(data);
+  const parsed = parse(bytes);
+  const present: Float32Array[] = [];
+  for (let gop = 0; gop < parsed.gops.length; gop++) present.push(...decodeGop(parsed, gop));
+
+  let cursor = 0;
+  return Array.from(parsed.presence, (here) => (here ? present[cursor++] : null));
+}
+
+/** Decode one frame, touching only its GOP */
+export function decodeSequenceFrame(data: Buffer | Uint8Array | string, index: number): Float32Array | null {
+  const bytes = typeof data === 'string' ? Buffer.from(data, 'base64') : Buffer.from(data);
+  const parsed = parse(bytes);
+  if (index < 0 || index >= parsed.frameCount) {
+    throw new Error(`Frame ${index} out of range (sequence has ${parsed.frameCount})`);
+  }
+  if (!parsed.presence[index]) return null;
+  let position = 0;
+  for (let i = 0; i < index; i++) position += parsed.presence[i] ? 1 : 0;
+  const gop = Math.floor(position / parsed.keyframeInterval);
+  return decodeGop(parsed, gop)[position % parsed.keyframeInterval];
+}
+
+/**
+ * Put decoded vertices back into timeline frames (in place), as [[x, y, z], ...]
+ * lists like the uncompressed timeline.
+ */
+export function decodeTimeline<T extends Record<string, any>>(frames: T[], sequence: VertexSequence): T[] {
+  if (sequence.codec !== SEQUENCE_CODEC) {
+    throw new Error(`Unknown vertex sequence codec '${sequence.codec}'`);
+  }
+  const key = sequence.vertices_key || 'vertices';
+  for (const track of sequence.tracks) {
+    const decoded = decodeSequence(track.data);
+    track.frames.forEach((frameIndex, i) => {
+      const vertices = decoded[i];
+      const list: number[][] | null = vertices ? [] : null;
+      if (vertices && list) {
+        for (let v = 0; v < vertices.length; v += 3) list.push([vertices[v], vertices[v + 1], vertices[v + 2]]);
+      }
+      (frames[frameIndex] as Record<string, any>)[key] = list;
+    });
+  }
+  console.log(`[MESH_SEQUENCE] Decoded ${sequence.tracks.length} vertex track(s), ` +
+              `${sequence.encoded_bytes} bytes (${sequence.ratio}x, max error ${sequence.max_error})`);
+  return frames;
+}
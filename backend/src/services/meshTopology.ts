@@ -0,0 +1,64 @@
+/**
+ * Client-side cache for the pose service's SMPL mesh topology
+ *
+ * Pose results no longer embed the 13776x3 face list on every frame; they carry
+ * a `mesh_topology` reference ({ version, url, face_count, dtype }) instead.
+ * The faces are fetched once per version from GET /mesh/topology (a packed
+ * little-endian uint16 buffer with an ETag) and reused for every later frame.
+ *
+ * Server side: backend/pose-service/mesh_topology.py
+ */
+
+import axios from 'axios';
+
+export interface MeshTopologyRef {
+  version: string;
+  url: string;
+  face_count: number;
+  dtype: 'uint16' | 'uint32';
+  lod?: number; // decimated preview level (?lod=1 / 2), url serves that level's faces
+  vertex_count?: number; // vertices per mesh at that level
+}
+
+export interface MeshTopology {
+  version: string;
+  indices: Uint16Array | Uint32Array; // faceCount * 3, ready for a BufferGeometry index
+  faces: number[][]; // [[a, b, c], ...] for callers that still expect mesh_faces_data
+}
+
+// version -> topology (or the in-flight fetch, so concurrent frames share one request)
+const topologyCache = new Map<string, Promise<MeshTopology>>();
+
+async function fetchTopology(baseUrl: string, ref: MeshTopologyRef): Promise<MeshTopology> {
+  const response = await axios.get(`${baseUrl}${ref.url}`, { responseType: 'arraybuffer', timeout: 30000 });
+  const buffer: ArrayBuffer = response.data instanceof ArrayBuffer
+    ? response.data
+    : new Uint8Array(response.data).slice().buffer;
+
+  const version = response.headers['x-mesh-topology-version'] || ref.version;
+  if (version !== ref.version) {
+    throw new Error(`Mesh topology version mismatch: expected ${ref.version}, server sent ${version}`);
+  }
+
+  const indices = ref.dtype === 'uint32' ? new Uint32Array(buffer) : new Uint16Array(buffer);
+  const faces: number[][] = [];
+  for (let i = 0; i + 2 < indices.length; i += 3) {
+    faces.push([indices[i], indices[i + 1], indices[i + 2]]);
+  }
+  console.log(`[MESH_TOPOLOGY] Cached topology ${ref.version}: ${faces.length} faces (${buffer.byteLength} bytes)`);
+  return { version: ref.version, indices, faces };
+}
+
+/**
+ * Resolve a mesh_topology reference to its faces, fetching each version only once.
+ */
+export function getMeshTopology(baseUrl: string, ref: MeshTopologyRef): Promise<MeshTopology> {
+  let cached = topologyCache.get(ref.version);
+  if (!cached) {
+    cached = fetchTopology(baseUrl, ref);
+    topologyCache.set(ref.version, cached);
+    // Drop failed fetches so the next frame retries
+    cached.catch(() => topologyCache.delete(ref.version));
+  }
+  return cached;
+}
@@ -0,0 +1,124 @@
+/**
+ * Decoder for the pose service's binary mesh wire format (application/x-smpl-mesh)
+ *
+ * Request it with `Accept: application/x-smpl-mesh` (float32) or
+ * `Accept: application/x-smpl-mesh; precision=16` (float16) on /pose/hybrid and
+ * /pose/hybrid/batch, with axios `responseType: 'arraybuffer'`. Vertex and joint
+ * buffers are viewed in place as Float32Array - no per-float JSON parsing.
+ *
+ * Layout: see backend/pose-service/mesh_wire.py
+ */
+
+export const MESH_MEDIA_TYPE = 'application/x-smpl-mesh';
+
+const FRAME_MAGIC = 'SMSH';
+const BATCH_MAGIC = 'SMBT';
+const FORMAT_VERSION = 1;
+const HEADER_BYTES = 40;
+const FLAG_FACES = 1;
+
+export interface MeshFrame {
+  metadata: Record<string, any>;
+  vertices: Float32Array; // vertexCount * 3
+  joints: Float32Array; // jointCount * 3
+  faces: Uint16Array | Uint32Array | null; // faceCount * 3
+  cameraTranslation: [number, number, number] | null;
+  focalLength: number | null;
+}
+
+function readMagic(view: DataView, offset: number): string {
+  return String.fromCharCode(
+    view.getUint8(offset), view.getUint8(offset + 1), view.getUint8(offset + 2), view.getUint8(offset + 3)
+  );
+}
+
+function pad8(n: number): number {
+  return n + ((8 - (n % 8)) % 8);
+}
+
+function halfToFloat(h: number): number {
+  const sign = h & 0x8000 ? -1 : 1;
+  const exponent = (h >> 10) & 0x1f;
+  const fraction = h & 0x3ff;
+  if (exponent === 0) return sign * Math.pow(2, -14) * (fraction / 1024);
+  if (exponent === 0x1f) return fraction ? NaN : sign * Infinity;
+  return sign * Math.pow(2, exponent - 15) * (1 + fraction / 1024);
+}
+
+function readFloats(buffer: ArrayBuffer, offset: number, count: number, dtype: number): Float32Array {
+  if (dtype === 1) {
+    return new Float32Array(buffer, offset, count);
+  }
+  const halves = new Uint16Array(buffer, offset, count);
+  const out = new Float32Array(count);
+  for (let i = 0; i < count; i++) out[i] = halfToFloat(halves[i]);
+  return out;
+}
+
+function decodeFrameAt(buffer: ArrayBuffer, offset: number): MeshFrame {
+  const view = new DataView(buffer);
+  if (readMagic(view, offset) !== FRAME_MAGIC) {
+    throw new Error(`Bad mesh frame magic at offset ${offset}`);
+  }
+  const version = view.getUint8(offset + 4);
+  if (version !== FORMAT_VERSION) {
+    throw new Error(`Unsupported mesh format version ${version}`);
+  }
+  const dtype = view.getUint8(offset + 5);
+  const flags = view.getUint16(offset + 6, true);
+  const metadataLength = view.getUint32(offset + 8, true);
+  const vertexCount = view.getUint32(offset + 12, true);
+  const jointCount = view.getUint32(offset + 16, true);
+  const faceCount = view.getUint32(offset + 20, true);
+  const camera = [0, 1, 2, 3].map((i) => view.getFloat32(offset + 24 + i * 4, true));
+
+  let pos = offset + HEADER_BYTES;
+  const metadata = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, pos, metadataLength)));
+  pos += metadataLength;
+
+  const floatBytes = dtype === 1 ? 4 : 2;
+  const vertices = readFloats(buffer, pos, vertexCount * 3, dtype);
+  pos += pad8(vertexCount * 3 * floatBytes);
+  const joints = readFloats(buffer, pos, jointCount * 3, dtype);
+  pos += pad8(jointCount * 3 * floatBytes);
+
+  let faces: Uint16Array | Uint32Array | null = null;
+  if (flags & FLAG_FACES) {
+    faces = vertexCount <= 65536
+      ? new Uint16Array(buffer, pos, faceCount * 3)
+      : new Uint32Array(buffer, pos, faceCount * 3);
+  }
+
+  return {
+    metadata,
+    vertices,
+    joints,
+    faces,
+    cameraTranslation: Number.isNaN(camera[0]) ? null : [camera[0], camera[1], camera[2]],
+    focalLength: Number.isNaN(camera[3]) ? null : camera[3],
+  };
+}
+
+/**
+ * Decode a single-frame or batch response body.
+ * Pass a fresh ArrayBuffer (e.g. axios arraybuffer response data).
+ */
+export function decodeMeshFrames(buffer: ArrayBuffer): MeshFrame[] {
+  const view = new DataView(buffer);
+  const magic = readMagic(view, 0);
+  if (magic === FRAME_MAGIC) {
+    return [decodeFrameAt(buffer, 0)];
+  }
+  if (magic !== BATCH_MAGIC) {
+    throw new Error(`Bad mesh payload magic '${magic}'`);
+  }
+
+  const count = view.getUint32(4, true);
+  let pos = pad8(8 + 4 * count);
+  const frames: MeshFrame[] = [];
+  for (let i = 0; i < count; i++) {
+    frames.push(decodeFrameAt(buffer, pos));
+    pos += view.getUint32(8 + 4 * i, true);
+  }
+  return frames;
+}
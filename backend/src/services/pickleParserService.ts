@@ -1,5 +1,26 @@
-import { spawn } from 'child_process';
+import { ChildProcess, spawn } from 'child_process';
+import * as crypto from 'crypto';
+import * as fs from 'fs';
+import * as os from 'os';
 import * as path from 'path';
+import axios from 'axios';
+import * as readline from 'readline';
+
+const PYTHON_SCRIPT_PATH = path.join(__dirname, '../../../src/services/pickle_parser.py');
+const PYTHON_PATH = path.join(__dirname, '../../../pose-service/venv/bin/python');
+
+// 'spawn' (default): one Python process per parse; 'daemon' (opt-in): parse through one resident
+// `pickle_parser.py --serve` process that keeps torch/smplx and the SMPL model loaded
+const PARSER_MODE = process.env.PICKLE_PARSER_MODE || 'spawn';
+// Use an already running parser instead of starting one (e.g. http://127.0.0.1:8765)
+const PARSER_URL = process.env.PICKLE_PARSER_URL;
+// Token the parser at PARSER_URL was started with (a started daemon gets a fresh random one)
+const PARSER_TOKEN = process.env.PICKLE_PARSER_TOKEN;
+// 0 (default): the started daemon binds a free port and reports it on stdout
+const PARSER_PORT = parseInt(process.env.PICKLE_PARSER_PORT || '0', 10);
+const PARSER_STARTUP_TIMEOUT_MS = parseInt(process.env.PICKLE_PARSER_STARTUP_TIMEOUT_MS || '120000', 10);
+// How streamPickleFrames() gets frames out of the parser: 'ndjson' (default) or 'npy' (binary sidecar)
+const PARSER_OUTPUT = process.env.PICKLE_PARSER_OUTPUT || 'ndjson';
 
 export interface FrameData {
   frameNumber: number;
@@ -38,9 +59,196 @@ export interface ParsedPickleResult {
   processingTimeMs?: number;
 }
 
+export interface ParserDaemonHealth {
+  status: string;
+  smplLoaded: boolean;
+  facesLoaded: boolean;
+  pid: number;
+  metrics: {
+    uptimeSeconds: number;
+    jobs: number;
+    failures: number;
+    inFlight: number;
+    framesParsed: number;
+    avgParseMs: number | null;
+    lastParseMs: number | null;
+  };
+}
+
+let daemonProcess: ChildProcess | null = null;
+let daemonUrl: Promise<string> | null = null;
+let daemonToken: string | undefined = PARSER_TOKEN;
+
+/**
+ * Headers for every request to the resident parser (it answers 401 without its token).
+ */
+function daemonHeaders(): Record<string, string> {
+  return daemonToken ? { 'X-Parser-Token': daemonToken } : {};
+}
+
+/**
+ * Port the started parser reports on its first stdout line ({"type": "listening", "port": N, ...}).
+ */
+function readListeningPort(child: ChildProcess): Promise<number> {
+  return new Promise((resolve, reject) => {
+    const lines = readline.createInterface({ input: child.stdout! });
+    const timer = setTimeout(() => {
+      lines.close();
+      reject(new Error('Resident parser did not report its port'));
+    }, PARSER_STARTUP_TIMEOUT_MS);
+    lines.once('line', (line) => {
+      clearTimeout(timer);
+      lines.close();
+      child.stdout!.resume(); // drain anything else so the child never blocks on a full pipe
+      try {
+        const record = JSON.parse(line);
+        if (record.type !== 'listening' || !record.port) throw new Error(`unexpected line ${line}`);
+        resolve(record.port);
+      } catch (err: any) {
+        reject(new Error(`Resident parser did not report its port: ${err.message}`));
+      }
+    });
+    child.once('exit', () => {
+      clearTimeout(timer);
+      reject(new Error('Resident parser exited during startup'));
+    });
+  });
+}
+
+async function startParserDaemon(): Promise<string> {
+  console.log(`[PICKLE_PARSER] 🚀 Starting resident parser`);
+
+  // The token proves a response came from this child, not whatever else answers on the port
+  const token = crypto.randomBytes(16).toString('hex');
+  const child = spawn(PYTHON_PATH, [PYTHON_SCRIPT_PATH, '--serve', '--port', String(PARSER_PORT)], {
+    stdio: ['ignore', 'pipe', 'pipe'],
+    env: { ...process.env, PICKLE_PARSER_TOKEN: token },
+  });
+  daemonProcess = child;
+  child.stderr?.on('data', (data) => {
+    console.log(`[PICKLE_PARSER] [daemon] ${data.toString().trim()}`);
+  });
+  child.on('exit', (code) => {
+    console.log(`[PICKLE_PARSER] Resident parser exited with code ${code}`);
+    if (daemonProcess === child) {
+      daemonProcess = null;
+      daemonUrl = null;
+    }
+  });
+
+  try {
+    // The SMPL model is loaded before the server binds, so the port line means it is warm
+    const port = await readListeningPort(child);
+    const url = `http://127.0.0.1:${port}`;
+    const response = await axios.get(`${url}/health`, {
+      timeout: 5000,
+      headers: { 'X-Parser-Token': token },
+    });
+    if (response.data?.pid !== child.pid) {
+      throw new Error(`${url} answered as PID ${response.data?.pid}, expected ${child.pid}`);
+    }
+    daemonToken = token;
+    console.log(`[PICKLE_PARSER] ✓ Resident parser ready on ${url} (PID=${child.pid})`);
+    return url;
+  } catch (err) {
+    child.kill('SIGTERM');
+    throw err;
+  }
+}
+
+/**
+ * True when err is a request timeout. The resident parser is still working on that request
+ * behind its parse lock, so our own daemon is restarted instead of queueing behind it, and
+ * callers report the timeout instead of starting a second parser next to it.
+ */
+function abandonTimedOutDaemon(err: any): boolean {
+  if (err.code !== 'ECONNABORTED') return false;
+  if (daemonProcess) {
+    console.log(`[PICKLE_PARSER] ⚠ Resident parser timed out, restarting it`);
+    stopParserDaemon();
+  }
+  return true;
+}
+
+/**
+ * URL of the resident parser, starting it on first use (shared by concurrent callers).
+ */
+export function getParserDaemonUrl(): Promise<string> {
+  if (PARSER_URL) return Promise.resolve(PARSER_URL);
+  if (!daemonUrl) {
+    daemonUrl = startParserDaemon().catch((err) => {
+      daemonUrl = null;
+      throw err;
+    });
+  }
+  return daemonUrl;
+}
+
+export async function getParserDaemonHealth(): Promise<ParserDaemonHealth> {
+  const url = await getParserDaemonUrl();
+  const response = await axios.get(`${url}/health`, { timeout: 5000, headers: daemonHeaders() });
+  return response.data;
+}
+
+export function stopParserDaemon(): void {
+  if (daemonProcess) {
+    daemonProcess.kill('SIGTERM');
+    daemonProcess = null;
+    daemonUrl = null;
+  }
+}
+
+// Don't leave the resident parser behind when the backend exits
+process.once('exit', stopParserDaemon);
+
+async function parseWithDaemon(pklPath: string, timeout: number): Promise<ParsedPickleResult> {
+  const startTime = Date.now();
+  const url = await getParserDaemonUrl();
+  try {
+    const response = await axios.post(`${url}/parse`, { pklPath }, {
+      timeout,
+      headers: daemonHeaders(),
+      maxContentLength: Infinity,
+      maxBodyLength: Infinity,
+    });
+    const processingTimeMs = Date.now() - startTime;
+    console.log(`[PICKLE_PARSER] ✓ Resident parser returned ${response.data.frameCount} frames in ${processingTimeMs}ms`);
+    return {
+      success: true,
+      frames: response.data.frames,
+      frameCount: response.data.frameCount,
+      processingTimeMs,
+    };
+  } catch (err: any) {
+    if (!err.response) throw err; // Daemon unreachable or timed out: let the caller decide
+    return {
+      success: false,
+      error: err.response.data?.error || `Resident parser returned ${err.response.status}`,
+      processingTimeMs: Date.now() - startTime,
+    };
+  }
+}
+
 export async function parsePickleToFrames(
   pklPath: string,
   timeout: number = 60000
+): Promise<ParsedPickleResult> {
+  if (PARSER_MODE === 'daemon') {
+    try {
+      return await parseWithDaemon(pklPath, timeout);
+    } catch (err: any) {
+      if (abandonTimedOutDaemon(err)) {
+        return { success: false, error: `Parsing timeout after ${timeout}ms` };
+      }
+      console.log(`[PICKLE_PARSER] ⚠ Resident parser unavailable (${err.message}), spawning a one-off parser`);
+    }
+  }
+  return parseWithSubprocess(pklPath, timeout);
+}
+
+async function parseWithSubprocess(
+  pklPath: string,
+  timeout: number
 ): Promise<ParsedPickleResult> {
   const startTime = Date.now();
   console.log(`[PICKLE_PARSER] 🚀 Starting pickle parser for pklPath=${pklPath}`);
@@ -52,8 +260,8 @@ export async function parsePickleToFrames(
     let timeoutHandle: NodeJS.Timeout | null = null;
 
     try {
-      const pythonScriptPath = path.join(__dirname, '../../../src/services/pickle_parser.py');
-      const pythonPath = path.join(__dirname, '../../../pose-service/venv/bin/python');
+      const pythonScriptPath = PYTHON_SCRIPT_PATH;
+      const pythonPath = PYTHON_PATH;
       console.log(`[PICKLE_PARSER] Python script: ${pythonScriptPath}`);
       console.log(`[PICKLE_PARSER] Python executable: ${pythonPath}`);
 
@@ -150,3 +358,485 @@ export async function parsePickleToFrames(
     }
   });
 }
+
+export interface StreamPickleOptions {
+  timeout?: number;
+  batchSize?: number; // frames per onFrames() call
+  attachFaces?: boolean; // put meshFaces on every person like parsePickleToFrames (default false: use result.meshFaces once)
+}
+
+export interface StreamedPickleResult {
+  success: boolean;
+  frameCount?: number;
+  meshFaces?: number[][] | null;
+  error?: string;
+  stderr?: string;
+  processingTimeMs?: number;
+}
+
+type FramesCallback = (frames: FrameData[]) => Promise<void> | void;
+
+interface NdjsonOutcome {
+  frameCount: number;
+  meshFaces: number[][] | null;
+  error?: string;
+}
+
+/**
+ * Read pickle_parser.py NDJSON (header, frame..., summary | error) and hand frames over in batches.
+ * The next batch is only read once onFrames() has finished with the previous one.
+ */
+async function consumeNdjson(
+  input: NodeJS.ReadableStream,
+  onFrames: FramesCallback,
+  batchSize: number,
+  attachFaces: boolean
+): Promise<NdjsonOutcome> {
+  const lines = readline.createInterface({ input, crlfDelay: Infinity });
+  const outcome: NdjsonOutcome = { frameCount: 0, meshFaces: null };
+  let batch: FrameData[] = [];
+  let finished = false;
+
+  for await (const line of lines) {
+    if (!line) continue;
+    const { type, ...record } = JSON.parse(line);
+    if (type === 'header') {
+      outcome.meshFaces = record.meshFaces || null;
+    } else if (type === 'frame') {
+      const frame = record as FrameData;
+      if (attachFaces && outcome.meshFaces) {
+        for (const person of frame.persons) person.meshFaces = outcome.meshFaces;
+      }
+      batch.push(frame);
+      outcome.frameCount++;
+      if (batch.length >= batchSize) {
+        await onFrames(batch);
+        batch = [];
+      }
+    } else if (type === 'summary') {
+      finished = true;
+    } else if (type === 'error') {
+      outcome.error = record.error;
+      finished = true;
+    }
+  }
+
+  if (batch.length > 0) await onFrames(batch);
+  if (!finished) outcome.error = 'Parser stream ended without a summary record';
+  return outcome;
+}
+
+async function streamWithDaemon(
+  pklPath: string,
+  onFrames: FramesCallback,
+  timeout: number,
+  batchSize: number,
+  attachFaces: boolean
+): Promise<NdjsonOutcome> {
+  const url = await getParserDaemonUrl();
+  const response = await axios.post(`${url}/parse`, { pklPath, format: 'ndjson' }, {
+    timeout,
+    headers: daemonHeaders(),
+    responseType: 'stream',
+  });
+  return consumeNdjson(response.data, onFrames, batchSize, attachFaces);
+}
+
+function streamWithSubprocess(
+  pklPath: string,
+  onFrames: FramesCallback,
+  timeout: number,
+  batchSize: number,
+  attachFaces: boolean
+): Promise<NdjsonOutcome & { stderr: string }> {
+  return new Promise((resolve, reject) => {
+    let stderr = '';
+    const subprocess = spawn(PYTHON_PATH, [PYTHON_SCRIPT_PATH, pklPath, '--format', 'ndjson'], {
+      stdio: ['ignore', 'pipe', 'pipe'],
+    });
+    const timeoutHandle = setTimeout(() => {
+      console.log(`[PICKLE_PARSER] ✗ Timeout after ${timeout}ms, killing subprocess`);
+      subprocess.kill('SIGTERM');
+    }, timeout);
+
+    subprocess.stderr?.on('data', (data) => {
+      stderr += data.toString();
+    });
+    subprocess.on('error', (err) => {
+      clearTimeout(timeoutHandle);
+      reject(err);
+    });
+
+    const exited = new Promise<number | null>((resolveExit) => subprocess.on('close', resolveExit));
+    consumeNdjson(subprocess.stdout!, onFrames, batchSize, attachFaces)
+      .then(async (outcome) => {
+        const exitCode = await exited;
+        clearTimeout(timeoutHandle);
+        if (!outcome.error && exitCode !== 0) {
+          outcome.error = `pickle_parser.py exited with code ${exitCode}`;
+        }
+        resolve({ ...outcome, stderr });
+      })
+      .catch((err) => {
+        clearTimeout(timeoutHandle);
+        subprocess.kill('SIGTERM');
+        reject(err);
+      });
+  });
+}
+
+/**
+ * Parse a pickle as an NDJSON stream: frames reach onFrames() in batches while the parser
+ * is still working, so neither side holds the whole video (faces come once, in the header).
+ *
+ * In daemon mode uses the resident parser like parsePickleToFrames(), falling back to a one-off
+ * `pickle_parser.py --format ndjson` process when it cannot be reached (not when it timed out).
+ */
+export async function streamPickleFrames(
+  pklPath: string,
+  onFrames: FramesCallback,
+  options: StreamPickleOptions = {}
+): Promise<StreamedPickleResult> {
+  const startTime = Date.now();
+  const timeout = options.timeout ?? 60000;
+  const batchSize = Math.max(1, options.batchSize ?? 100);
+  const attachFaces = options.attachFaces ?? false;
+
+  if (PARSER_OUTPUT === 'npy') {
+    return streamPickleSidecar(pklPath, onFrames, options);
+  }
+
+  // Only fall back before any frame was delivered, so callers never see a frame twice
+  let delivered = 0;
+  const counted: FramesCallback = async (frames) => {
+    delivered += frames.length;
+    await onFrames(frames);
+  };
+
+  try {
+    let outcome: NdjsonOutcome & { stderr?: string };
+    try {
+      if (PARSER_MODE !== 'daemon') throw new Error('resident parser disabled');
+      outcome = await streamWithDaemon(pklPath, counted, timeout, batchSize, attachFaces);
+    } catch (err: any) {
+      if (abandonTimedOutDaemon(err)) throw new Error(`Parsing timeout after ${timeout}ms`);
+      if (delivered > 0 || err.response) throw err;
+      if (PARSER_MODE === 'daemon') {
+        console.log(`[PICKLE_PARSER] ⚠ Resident parser unavailable (${err.message}), spawning a one-off parser`);
+      }
+      outcome = await streamWithSubprocess(pklPath, counted, timeout, batchSize, attachFaces);
+    }
+
+    const processingTimeMs = Date.now() - startTime;
+    console.log(`[PICKLE_PARSER] ${outcome.error ? '✗' : '✓'} Streamed ${outcome.frameCount} frames in ${processingTimeMs}ms`);
+    return {
+      success: !outcome.error,
+      frameCount: outcome.frameCount,
+      meshFaces: outcome.meshFaces,
+      error: outcome.error,
+      stderr: outcome.stderr,
+      processingTimeMs,
+    };
+  } catch (err: any) {
+    console.log(`[PICKLE_PARSER] ✗ Stream failed: ${err.message}`);
+    return {
+      success: false,
+      frameCount: delivered,
+      error: err.message,
+      processingTimeMs: Date.now() - startTime,
+    };
+  }
+}
+
+// Binary sidecar (`pickle_parser.py --format npy`): the parser writes contiguous .npy arrays
+// and a manifest.json into a directory, and frames are read back from the files at offsets
+// instead of going through JSON text.
+
+export interface SidecarArrayInfo {
+  file: string;
+  dtype: string; // NumPy descr, e.g. '<f4'
+  shape: number[];
+}
+
+export interface SidecarManifest {
+  format: string;
+  version: number;
+  frameCount: number;
+  maxPersons: number;
+  vertexCount: number;
+  fps: number;
+  arrays: Record<string, SidecarArrayInfo>;
+  metadata?: Record<string, any>;
+}
+
+export interface StreamSidecarOptions extends StreamPickleOptions {
+  outputDir?: string; // keep the arrays here; by default a temp dir that is removed afterwards
+}
+
+type NpyTypedArray = Float32Array | Int32Array | Uint8Array;
+
+const NPY_MAGIC = Buffer.from([0x93, 0x4e, 0x55, 0x4d, 0x50, 0x59]); // \x93NUMPY
+const NPY_TYPES: Record<string, { bytes: number; view: (buffer: ArrayBuffer, length: number) => NpyTypedArray }> = {
+  '<f4': { bytes: 4, view: (buffer, length) => new Float32Array(buffer, 0, length) },
+  '<i4': { bytes: 4, view: (buffer, length) => new Int32Array(buffer, 0, length) },
+  '|u1': { bytes: 1, view: (buffer, length) => new Uint8Array(buffer, 0, length) },
+};
+
+/**
+ * One C-ordered .npy file, read a range of rows (first axis) at a time.
+ */
+export class NpyArray {
+  private constructor(
+    private handle: fs.promises.FileHandle,
+    readonly dtype: string,
+    readonly shape: number[],
+    private dataOffset: number
+  ) {}
+
+  static async open(filePath: string): Promise<NpyArray> {
+    const handle = await fs.promises.open(filePath, 'r');
+    try {
+      const preamble = Buffer.alloc(12);
+      await handle.read(preamble, 0, 12, 0);
+      if (!preamble.subarray(0, 6).equals(NPY_MAGIC)) {
+        throw new Error(`${filePath} is not a .npy file`);
+      }
+      // Version 1 has a 2-byte header length, versions 2 and 3 a 4-byte one
+      const major = preamble[6];
+      const headerStart = major === 1 ? 10 : 12;
+      const headerLength = major === 1 ? preamble.readUInt16LE(8) : preamble.readUInt32LE(8);
+      const header = Buffer.alloc(headerLength);
+      await handle.read(header, 0, headerLength, headerStart);
+      const text = header.toString('latin1');
+
+      const descr = /'descr':\s*'([^']+)'/.exec(text)?.[1];
+      const shape = /'shape':\s*\(([^)]*)\)/.exec(text)?.[1];
+      if (!descr || !NPY_TYPES[descr] || shape === undefined || /'fortran_order':\s*True/.test(text)) {
+        throw new Error(`Unsupported .npy header in ${filePath}: ${text.trim()}`);
+      }
+      const dims = shape.split(',').map((dim) => dim.trim()).filter(Boolean).map(Number);
+      return new NpyArray(handle, descr, dims, headerStart + headerLength);
+    } catch (err) {
+      await handle.close();
+      throw err;
+    }
+  }
+
+  /** Elements per row (product of every axis but the first) */
+  get rowSize(): number {
+    return this.shape.slice(1).reduce((size, dim) => size * dim, 1);
+  }
+
+  async readRows(start: number, count: number): Promise<NpyTypedArray> {
+    const type = NPY_TYPES[this.dtype];
+    const length = count * this.rowSize;
+    const buffer = Buffer.alloc(length * type.bytes); // Not pooled: starts at offset 0 of its own ArrayBuffer
+    if (buffer.length > 0) {
+      await this.handle.read(buffer, 0, buffer.length, this.dataOffset + start * this.rowSize * type.bytes);
+    }
+    return type.view(buffer.buffer, length);
+  }
+
+  close(): Promise<void> {
+    return this.handle.close();
+  }
+}
+
+/**
+ * Open one array of a sidecar directory (e.g. 'vertices' for raw float32 upload to S3).
+ */
+export async function openSidecarArray(outputDir: string, manifest: SidecarManifest, name: string): Promise<NpyArray> {
+  const info = manifest.arrays[name];
+  if (!info) throw new Error(`Sidecar has no ${name} array`);
+  const array = await NpyArray.open(path.join(outputDir, info.file));
+  if (array.dtype !== info.dtype || array.shape.join(',') !== info.shape.join(',')) {
+    await array.close();
+    throw new Error(`${info.file} does not match the manifest`);
+  }
+  return array;
+}
+
+export async function loadSidecarManifest(outputDir: string): Promise<SidecarManifest> {
+  const manifest = JSON.parse(await fs.promises.readFile(path.join(outputDir, 'manifest.json'), 'utf8'));
+  if (manifest.format !== 'pickle-parser-npy' || manifest.version !== 1) {
+    throw new Error(`Unsupported sidecar ${manifest.format} v${manifest.version}`);
+  }
+  return manifest;
+}
+
+function toRows(values: NpyTypedArray, offset: number, rows: number, columns: number): number[][] {
+  const result: number[][] = new Array(rows);
+  for (let i = 0; i < rows; i++) {
+    const start = offset + i * columns;
+    result[i] = Array.from(values.subarray(start, start + columns));
+  }
+  return result;
+}
+
+/**
+ * Rebuild FrameData from a sidecar directory, batchSize frames per onFrames() call,
+ * with the same fields as the JSON output (plus SMPL joints as keypoints3d when present).
+ */
+async function readSidecarFrames(
+  outputDir: string,
+  manifest: SidecarManifest,
+  onFrames: FramesCallback,
+  batchSize: number,
+  meshFaces: number[][] | null
+): Promise<number> {
+  const names = ['vertices', 'trackIds', 'confidence', 'camera', 'personMask', 'vertexMask',
+    'smplMask', 'globalOrient', 'bodyPose', 'betas'];
+  if (manifest.arrays.joints) names.push('joints');
+  const arrays: Record<string, NpyArray> = {};
+  try {
+    for (const name of names) arrays[name] = await openSidecarArray(outputDir, manifest, name);
+
+    const { frameCount, maxPersons, vertexCount, fps } = manifest;
+    const jointCount = arrays.joints ? arrays.joints.shape[2] : 0;
+    for (let start = 0; start < frameCount; start += batchSize) {
+      const count = Math.min(batchSize, frameCount - start);
+      const rows: Record<string, NpyTypedArray> = {};
+      for (const name of names) rows[name] = await arrays[name].readRows(start, count);
+
+      const frames: FrameData[] = [];
+      for (let f = 0; f < count; f++) {
+        const persons: any[] = [];
+        for (let p = 0; p < maxPersons; p++) {
+          const slot = f * maxPersons + p;
+          if (!rows.personMask[slot]) continue;
+          const person: any = {
+            personId: rows.trackIds[slot],
+            confidence: rows.confidence[slot],
+            tracked: true,
+            camera: {
+              tx: rows.camera[slot * 3],
+              ty: rows.camera[slot * 3 + 1],
+              tz: rows.camera[slot * 3 + 2],
+              focalLength: 5000.0,
+            },
+          };
+          if (rows.smplMask[slot]) {
+            person.smpl = {
+              globalOrient: toRows(rows.globalOrient, slot * 9, 3, 3),
+              bodyPose: Array.from({ length: 23 }, (_, j) => toRows(rows.bodyPose, (slot * 23 + j) * 9, 3, 3)),
+              betas: Array.from(rows.betas.subarray(slot * 10, slot * 10 + 10)),
+            };
+          }
+          if (rows.vertexMask[slot]) {
+            person.meshVertices = toRows(rows.vertices, slot * vertexCount * 3, vertexCount, 3);
+          }
+          if (rows.joints) {
+            person.keypoints3d = toRows(rows.joints, slot * jointCount * 3, jointCount, 3);
+          }
+          if (meshFaces) person.meshFaces = meshFaces;
+          persons.push(person);
+        }
+        frames.push({ frameNumber: start + f, timestamp: (start + f) / fps, persons });
+      }
+      await onFrames(frames);
+    }
+    return frameCount;
+  } finally {
+    await Promise.all(Object.values(arrays).map((array) => array.close()));
+  }
+}
+
+async function writeSidecarWithDaemon(pklPath: string, outputDir: string, timeout: number): Promise<SidecarManifest> {
+  const url = await getParserDaemonUrl();
+  const response = await axios.post(`${url}/parse`, { pklPath, format: 'npy', outputDir }, {
+    timeout,
+    headers: daemonHeaders(),
+  });
+  return response.data;
+}
+
+function writeSidecarWithSubprocess(
+  pklPath: string,
+  outputDir: string,
+  timeout: number
+): Promise<{ manifest?: SidecarManifest; error?: string; stderr: string }> {
+  return new Promise((resolve) => {
+    let stdout = '';
+    let stderr = '';
+    const subprocess = spawn(PYTHON_PATH, [PYTHON_SCRIPT_PATH, pklPath, '--format', 'npy', '--output-dir', outputDir], {
+      stdio: ['ignore', 'pipe', 'pipe'],
+      timeout,
+    });
+    subprocess.stdout?.on('data', (data) => {
+      stdout += data.toString();
+    });
+    subprocess.stderr?.on('data', (data) => {
+      stderr += data.toString();
+    });
+    subprocess.on('error', (err) => resolve({ error: `Subprocess error: ${err.message}`, stderr }));
+    subprocess.on('close', (exitCode) => {
+      if (exitCode !== 0) {
+        resolve({ error: `pickle_parser.py exited with code ${exitCode}`, stderr });
+        return;
+      }
+      try {
+        resolve({ manifest: JSON.parse(stdout), stderr });
+      } catch (err: any) {
+        resolve({ error: `Failed to parse manifest: ${err.message}`, stderr });
+      }
+    });
+  });
+}
+
+/**
+ * Parse a pickle into a binary sidecar directory and hand the frames to onFrames() in batches.
+ * Same contract as streamPickleFrames(), which uses this when PICKLE_PARSER_OUTPUT=npy.
+ */
+export async function streamPickleSidecar(
+  pklPath: string,
+  onFrames: FramesCallback,
+  options: StreamSidecarOptions = {}
+): Promise<StreamedPickleResult> {
+  const startTime = Date.now();
+  const timeout = options.timeout ?? 60000;
+  const batchSize = Math.max(1, options.batchSize ?? 100);
+  const attachFaces = options.attachFaces ?? false;
+  const outputDir = options.outputDir ?? await fs.promises.mkdtemp(path.join(os.tmpdir(), 'pickle-sidecar-'));
+  let stderr: string | undefined;
+
+  try {
+    try {
+      if (PARSER_MODE !== 'daemon') throw new Error('resident parser disabled');
+      await writeSidecarWithDaemon(pklPath, outputDir, timeout);
+    } catch (err: any) {
+      if (abandonTimedOutDaemon(err)) throw new Error(`Parsing timeout after ${timeout}ms`);
+      if (err.response) throw new Error(err.response.data?.error || `Resident parser returned ${err.response.status}`);
+      if (PARSER_MODE === 'daemon') {
+        console.log(`[PICKLE_PARSER] ⚠ Resident parser unavailable (${err.message}), spawning a one-off parser`);
+      }
+      const result = await writeSidecarWithSubprocess(pklPath, outputDir, timeout);
+      stderr = result.stderr;
+      if (result.error) throw new Error(result.error);
+    }
+
+    const manifest = await loadSidecarManifest(outputDir);
+    const parsedAt = Date.now();
+    let meshFaces: number[][] | null = null;
+    if (manifest.arrays.faces.shape[0] > 0) {
+      const faces = await openSidecarArray(outputDir, manifest, 'faces');
+      try {
+        meshFaces = toRows(await faces.readRows(0, faces.shape[0]), 0, faces.shape[0], 3);
+      } finally {
+        await faces.close();
+      }
+    }
+    const frameCount = await readSidecarFrames(outputDir, manifest, onFrames, batchSize, attachFaces ? meshFaces : null);
+
+    const processingTimeMs = Date.now() - startTime;
+    console.log(`[PICKLE_PARSER] ✓ Read ${frameCount} frames from sidecar in ${processingTimeMs}ms ` +
+      `(parse ${parsedAt - startTime}ms)`);
+    return { success: true, frameCount, meshFaces, stderr, processingTimeMs };
+  } catch (err: any) {
+    console.log(`[PICKLE_PARSER] ✗ Sidecar failed: ${err.message}`);
+    return { success: false, error: err.message, stderr, processingTimeMs: Date.now() - startTime };
+  } finally {
+    if (!options.outputDir) {
+      await fs.promises.rm(outputDir, { recursive: true, force: true });
+    }
+  }
+}
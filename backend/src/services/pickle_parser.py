@@ -3,23 +3,36 @@
 Pickle Parser - Extract PHALP output to JSON format
 
 This script loads a PHALP pickle file and extracts frame data.
-Computes mesh vertices from SMPL parameters using the SMPL model.
+Computes mesh vertices from SMPL parameters using the SMPL model, batched
+across the whole pickle (PICKLE_PARSER_SMPL_BATCH persons per forward pass).
 
 Usage:
-    python pickle_parser.py /path/to/results.pkl
+    python pickle_parser.py /path/to/results.pkl [--format ndjson]
+    python pickle_parser.py /path/to/results.pkl --format npy --output-dir /tmp/sidecar
+    python pickle_parser.py --serve [--port 8765 | --socket /tmp/pickle_parser.sock] [--token T]
 
 Output:
-    JSON to stdout with frame data
+    JSON to stdout with frame data (--serve: same JSON from POST /parse);
+    --format ndjson streams one compact record per frame (see iter_ndjson_records);
+    --format npy writes .npy arrays + manifest.json (see write_sidecar) and prints the manifest
 """
 
+import os
 import sys
 import json
+import time
+import argparse
+import hmac
+import threading
+import socketserver
 import pickle
 import logging
 import gzip
 import bz2
+import lzma
 import zlib
 import io
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import numpy as np
 import torch
 
@@ -46,6 +59,9 @@ except ImportError:
 
 SMPL_MODEL = None
 
+# Persons per batched SMPL forward pass (see SMPLBatch)
+SMPL_BATCH_SIZE = int(os.environ.get('PICKLE_PARSER_SMPL_BATCH', '128'))
+
 def get_smpl_model():
     """Lazy load SMPL model"""
     global SMPL_MODEL
@@ -57,7 +73,6 @@ def get_smpl_model():
         return None
     
     try:
-        import os
         model_path = os.path.expanduser('~/pose-service/basicmodel_m_lbs_10_207_0_v1.1.0_p3.pkl')
         if not os.path.exists(model_path):
             model_path = os.path.expanduser('~/pose-service/basicmodel_m_lbs_10_207_0_v1.1.0.pkl')
@@ -138,85 +153,217 @@ def compute_smpl_vertices(smpl_params):
         return None
 
 
-def parse_pickle_file(pkl_path):
+class SMPLBatch:
     """
-    Parse PHALP pickle file and extract frame data.
-    Handles joblib, gzip, bz2, zlib, and uncompressed pickle files.
-    
-    Args:
-        pkl_path: Path to pickle file
+    Collects SMPL parameters for every person in the pickle, then computes all
+    vertices in a few chunked SMPL forward passes instead of one pass per person.
+
+    parse_frame() calls add() with the person dict the vertices belong to;
+    run() fills in 'meshVertices' for every person that has none yet (PHALP
+    'verts' take precedence, exactly like the per-person path). Other callers
+    can queue any target and read the raw outputs from iter_chunks().
+    """
+
+    def __init__(self, chunk_size=None):
+        self.chunk_size = max(1, int(chunk_size or SMPL_BATCH_SIZE))
+        self.global_orient = []
+        self.body_pose = []
+        self.betas = []
+        self.targets = []
+
+    def __len__(self):
+        return len(self.targets)
+
+    def add(self, person_obj, smpl_params):
+        """Queue a target's rotation-matrix SMPL params; False if they are missing or malformed"""
+        global_orient = smpl_params.get('global_orient')
+        body_pose = smpl_params.get('body_pose')
+        betas = smpl_params.get('betas')
+        if global_orient is None or body_pose is None or betas is None:
+            logger.debug("[PARSE] Missing SMPL parameters for vertex computation")
+            return False
+        try:
+            global_orient = np.asarray(global_orient, dtype=np.float32).reshape(3, 3)
+            body_pose = np.asarray(body_pose, dtype=np.float32).reshape(23, 3, 3)
+            betas = np.asarray(betas, dtype=np.float32).reshape(10)
+        except ValueError as e:
+            logger.debug(f"[PARSE] Malformed SMPL parameters: {e}")
+            return False
+        self.global_orient.append(global_orient)
+        self.body_pose.append(body_pose)
+        self.betas.append(betas)
+        self.targets.append(person_obj)
+        return True
+
+    def _forward(self, smpl_model, indices):
+        with torch.no_grad():
+            output = smpl_model(
+                global_orient=torch.from_numpy(np.stack([self.global_orient[i] for i in indices])),
+                body_pose=torch.from_numpy(np.stack([self.body_pose[i] for i in indices])),
+                betas=torch.from_numpy(np.stack([self.betas[i] for i in indices]))
+            )
+        return output.vertices.cpu().numpy(), output.joints.cpu().numpy()
+
+    def iter_chunks(self, indices=None):
+        """
+        Run the SMPL layer over queued persons, chunk_size at a time.
+
+        Yields:
+            (indices, vertices (n, V, 3), joints (n, J, 3)) per forward pass
+        """
+        smpl_model = get_smpl_model()
+        if smpl_model is None:
+            return
+        indices = list(range(len(self.targets))) if indices is None else list(indices)
+
+        for start in range(0, len(indices), self.chunk_size):
+            chunk = indices[start:start + self.chunk_size]
+            try:
+                outputs = self._forward(smpl_model, chunk)
+            except Exception as e:
+                # One bad parameter set should not cost the whole chunk its vertices
+                logger.warning(f"[PARSE] SMPL batch {start}-{start + len(chunk)} failed, "
+                               f"falling back to per-person passes: {e}")
+                outputs = None
+            if outputs is not None:
+                yield (chunk,) + outputs
+                continue
+            for index in chunk:
+                try:
+                    outputs = self._forward(smpl_model, [index])
+                except Exception as e:
+                    logger.debug(f"[PARSE] Failed to compute SMPL vertices: {e}")
+                    continue
+                yield ([index],) + outputs
+
+    def run(self):
+        """Compute and scatter the vertices; returns the number of forward passes"""
+        pending = [i for i, person_obj in enumerate(self.targets) if 'meshVertices' not in person_obj]
+        if not pending:
+            return 0
+
+        passes = 0
+        for chunk, vertices, _ in self.iter_chunks(pending):
+            passes += 1
+            for index, person_vertices in zip(chunk, vertices):
+                self.targets[index]['meshVertices'] = person_vertices.tolist()
+
+        if passes:
+            logger.info(f"[PARSE] Computed vertices for {len(pending)} persons in {passes} SMPL forward passes")
+        return passes
+
+
+# Leading bytes of each container format (zlib is checked separately: 0x78 + header checksum)
+MAGIC_BYTES = (
+    (b'\x1f\x8b', 'gzip'),
+    (b'BZh', 'bz2'),
+    (b'\xfd7zXZ\x00', 'xz'),
+    (b'\x04\x22\x4d\x18', 'lz4'),
+    (b'\x80', 'pickle'),  # pickle protocol 2+ (PROTO opcode)
+)
+
+# Everything joblib.load() opens by itself (it also handles plain pickles)
+JOBLIB_FORMATS = ('zlib', 'gzip', 'bz2', 'xz', 'lz4', 'pickle', 'unknown')
+
+# Read size for the streaming zlib reader
+_STREAM_CHUNK_BYTES = 1 << 20
+
+
+def sniff_format(f):
+    """
+    Detect a pickle file's container format from its first bytes, without consuming them.
     
     Returns:
-        dict with frames array and metadata
+        'zlib', 'gzip', 'bz2', 'xz', 'lz4', 'pickle' or 'unknown'
     """
-    logger.info(f"[PARSING] Loading pickle file: {pkl_path}")
+    position = f.tell()
+    header = f.read(8)
+    f.seek(position)
     
-    data = None
+    for magic, name in MAGIC_BYTES:
+        if header.startswith(magic):
+            return name
+    # zlib: CMF 0x78 (deflate, 32K window) and (CMF * 256 + FLG) divisible by 31
+    if len(header) >= 2 and header[0] == 0x78 and (header[0] * 256 + header[1]) % 31 == 0:
+        return 'zlib'
+    return 'unknown'
+
+
+class ZlibReader(io.RawIOBase):
+    """Read-only file object that inflates a zlib stream as it is read (no full-file copy)"""
     
-    if HAS_JOBLIB:
-        try:
-            data = joblib.load(pkl_path)
-            logger.info(f"[PARSING] ✓ Successfully loaded with joblib")
-        except Exception as e:
-            logger.debug(f"[PARSING] ⚠ joblib failed: {e}")
-            data = None
+    def __init__(self, f):
+        self._f = f
+        self._inflater = zlib.decompressobj()
+        self._buffer = b''
     
-    if data is None:
-        try:
-            with open(pkl_path, 'rb') as f:
-                compressed_data = f.read()
-            decompressed = zlib.decompress(compressed_data)
-            data = pickle.loads(decompressed, encoding='latin1')
-            logger.info(f"[PARSING] ✓ Successfully loaded as zlib compressed")
-        except Exception as e:
-            logger.debug(f"[PARSING] ⚠ Not zlib format: {e}")
-            data = None
+    def readable(self):
+        return True
     
-    if data is None:
-        try:
-            with gzip.open(pkl_path, 'rb') as f:
-                data = pickle.load(f, encoding='latin1')
-            logger.info(f"[PARSING] ✓ Successfully loaded as gzip")
-        except Exception as e:
-            logger.debug(f"[PARSING] ⚠ Not gzip format: {e}")
-            data = None
+    def readinto(self, b):
+        while not self._buffer and not self._inflater.eof:
+            chunk = self._f.read(_STREAM_CHUNK_BYTES)
+            if not chunk:
+                raise EOFError("Compressed stream ended before the end-of-stream marker")
+            self._buffer = self._inflater.decompress(chunk)
+        count = min(len(b), len(self._buffer))
+        b[:count] = self._buffer[:count]
+        self._buffer = self._buffer[count:]
+        return count
+
+
+def open_stream(f, file_format):
+    """Wrap an open binary file in a streaming decompressor for its sniffed format"""
+    if file_format == 'zlib':
+        return io.BufferedReader(ZlibReader(f), buffer_size=_STREAM_CHUNK_BYTES)
+    if file_format == 'gzip':
+        return gzip.GzipFile(fileobj=f, mode='rb')
+    if file_format == 'bz2':
+        return bz2.BZ2File(f, mode='rb')
+    if file_format == 'xz':
+        return lzma.LZMAFile(f, mode='rb')
+    if file_format == 'lz4':
+        raise ValueError("lz4-compressed pickle needs joblib (with lz4) installed")
+    return f
+
+
+def load_pickle_data(pkl_path):
+    """
+    Load a PHALP pickle in one pass: sniff the container format from the magic
+    bytes, then stream it through the matching loader.
     
-    if data is None:
-        try:
-            with bz2.open(pkl_path, 'rb') as f:
-                data = pickle.load(f, encoding='latin1')
-            logger.info(f"[PARSING] ✓ Successfully loaded as bz2")
-        except Exception as e:
-            logger.debug(f"[PARSING] ⚠ Not bz2 format: {e}")
-            data = None
+    joblib.load (when installed) reads every format from the open handle and
+    understands joblib's numpy array records; plain pickle with latin1 is used
+    without joblib, and for Python 2 pickles joblib cannot decode.
     
-    if data is None:
-        try:
-            with open(pkl_path, 'rb') as f:
-                data = pickle.load(f, encoding='latin1')
-            logger.info(f"[PARSING] ✓ Successfully loaded as regular pickle (latin1)")
-        except Exception as e:
-            logger.error(f"[PARSING] ✗ Failed to load pickle with latin1: {e}")
-            try:
-                with open(pkl_path, 'rb') as f:
-                    data = pickle.load(f, encoding='utf-8')
-                logger.info(f"[PARSING] ✓ Successfully loaded as regular pickle (utf-8)")
-            except Exception as e2:
-                logger.error(f"[PARSING] ✗ Failed to load pickle with utf-8: {e2}")
+    Returns:
+        Unpickled object, or None if the file cannot be loaded
+    """
+    try:
+        with open(pkl_path, 'rb') as f:
+            file_format = sniff_format(f)
+            logger.info(f"[PARSING] Detected {file_format} format")
+            
+            if HAS_JOBLIB and file_format in JOBLIB_FORMATS:
                 try:
-                    with open(pkl_path, 'rb') as f:
-                        data = pickle.load(f)
-                    logger.info(f"[PARSING] ✓ Successfully loaded as regular pickle (default)")
-                except Exception as e3:
-                    logger.error(f"[PARSING] ✗ Failed to load pickle with default encoding: {e3}")
-                    return None
-    
-    logger.info(f"[PARSING] ✓ Pickle loaded, type: {type(data)}")
-    
-    smpl_faces = get_smpl_faces()
-    
-    frames_data = []
+                    data = joblib.load(f)
+                    logger.info(f"[PARSING] ✓ Loaded {file_format} with joblib")
+                    return data
+                except UnicodeDecodeError as e:
+                    logger.info(f"[PARSING] joblib could not decode (Python 2 pickle?), using latin1: {e}")
+                    f.seek(0)
+            
+            data = pickle.load(open_stream(f, file_format), encoding='latin1')
+            logger.info(f"[PARSING] ✓ Loaded {file_format} pickle")
+            return data
     
+    except Exception as e:
+        logger.error(f"[PARSING] ✗ Failed to load pickle: {e}")
+        return None
+
+
+def get_frames_list(data):
+    """The per-frame list inside a loaded PHALP pickle (dict or list layout), or None"""
     if isinstance(data, dict):
         if 'frames' in data:
             frames_list = data['frames']
@@ -228,32 +375,85 @@ def parse_pickle_file(pkl_path):
             frames_list = list(data.values())
         
         logger.info(f"[PARSING] Found {len(frames_list)} frames in dict")
-        
-        for frame_idx, frame_data in enumerate(frames_list):
-            try:
-                frame_obj = parse_frame(frame_data, frame_idx, smpl_faces)
-                if frame_obj:
-                    frames_data.append(frame_obj)
-            except Exception as e:
-                logger.warning(f"[PARSING] ⚠ Failed to parse frame {frame_idx}: {e}")
-                continue
+        return frames_list
     
-    elif isinstance(data, list):
+    if isinstance(data, list):
         logger.info(f"[PARSING] Found {len(data)} frames in list")
+        return data
+    
+    logger.error(f"[PARSING] ✗ Unexpected pickle structure: {type(data)}")
+    return None
+
+
+def iter_parsed_frames(frames_list, smpl_faces=None, include_faces=True):
+    """
+    Parse frames and yield them in order.
+    
+    SMPL vertices are computed in batches: frames are held back until their
+    persons fill one SMPLBatch chunk (or as many frames are pending), then the
+    batch runs and those frames are yielded. Memory stays bounded by one chunk.
+    
+    Args:
+        frames_list: Per-frame PHALP dicts (see get_frames_list)
+        smpl_faces: SMPL face indices to attach to every person
+        include_faces: False leaves meshFaces out of the persons (NDJSON sends them once)
+    """
+    smpl_batch = SMPLBatch()
+    pending = []
+    
+    for frame_idx, frame_data in enumerate(frames_list):
+        try:
+            frame_obj = parse_frame(frame_data, frame_idx, smpl_faces, smpl_batch, include_faces)
+            if frame_obj:
+                pending.append(frame_obj)
+        except Exception as e:
+            logger.warning(f"[PARSING] ⚠ Failed to parse frame {frame_idx}: {e}")
+            continue
         
-        for frame_idx, frame_data in enumerate(data):
-            try:
-                frame_obj = parse_frame(frame_data, frame_idx, smpl_faces)
-                if frame_obj:
-                    frames_data.append(frame_obj)
-            except Exception as e:
-                logger.warning(f"[PARSING] ⚠ Failed to parse frame {frame_idx}: {e}")
-                continue
+        if len(smpl_batch) >= smpl_batch.chunk_size or len(pending) >= smpl_batch.chunk_size:
+            smpl_batch.run()
+            yield from pending
+            smpl_batch = SMPLBatch()
+            pending = []
     
-    else:
-        logger.error(f"[PARSING] ✗ Unexpected pickle structure: {type(data)}")
+    smpl_batch.run()
+    yield from pending
+
+
+def first_phalp_faces(frames_list):
+    """Faces stored in the pickle itself (first frame that has any), for when SMPL is unavailable"""
+    for frame_data in frames_list:
+        faces_list = frame_data.get('faces') if isinstance(frame_data, dict) else None
+        if faces_list is not None and len(faces_list) > 0:
+            return faces_list[0] if isinstance(faces_list, list) else faces_list
+    return None
+
+
+def parse_pickle_file(pkl_path):
+    """
+    Parse PHALP pickle file and extract frame data.
+    Handles joblib, gzip, bz2, xz, zlib, and uncompressed pickle files (see load_pickle_data).
+    
+    Args:
+        pkl_path: Path to pickle file
+    
+    Returns:
+        dict with frames array and metadata
+    """
+    logger.info(f"[PARSING] Loading pickle file: {pkl_path}")
+    
+    data = load_pickle_data(pkl_path)
+    if data is None:
+        return None
+    
+    logger.info(f"[PARSING] ✓ Pickle loaded, type: {type(data)}")
+    
+    frames_list = get_frames_list(data)
+    if frames_list is None:
         return None
     
+    frames_data = list(iter_parsed_frames(frames_list, get_smpl_faces()))
+    
     logger.info(f"[PARSING] ✓ Successfully parsed {len(frames_data)} frames")
     
     return {
@@ -265,6 +465,217 @@ def parse_pickle_file(pkl_path):
     }
 
 
+def iter_ndjson_records(pkl_path):
+    """
+    Parse a pickle as a stream of NDJSON records (dicts), one per line:
+    
+        {"type": "header", "frameCount": N, "meshFaces": [[a, b, c], ...], ...}
+        {"type": "frame", "frameNumber": 0, "timestamp": 0.0, "persons": [...]}
+        ...
+        {"type": "summary", "frameCount": parsed}
+    
+    Faces are sent once in the header instead of on every person. If loading or
+    parsing fails, the last record is {"type": "error", "error": ..., "framesSent": n}.
+    """
+    frames_sent = 0
+    try:
+        data = load_pickle_data(pkl_path)
+        frames_list = get_frames_list(data) if data is not None else None
+        if frames_list is None:
+            yield {'type': 'error', 'error': f'Failed to load pickle file {pkl_path}', 'framesSent': 0}
+            return
+        
+        smpl_faces = get_smpl_faces()
+        faces = smpl_faces if smpl_faces is not None else first_phalp_faces(frames_list)
+        yield {
+            'type': 'header',
+            'frameCount': len(frames_list),
+            'meshFaces': faces.tolist() if hasattr(faces, 'tolist') else faces,
+            'metadata': {'parserVersion': '1.1'},
+        }
+        
+        for frame_obj in iter_parsed_frames(frames_list, smpl_faces, include_faces=False):
+            yield {'type': 'frame', **frame_obj}
+            frames_sent += 1
+    except Exception as e:
+        logger.error(f"[PARSING] ✗ Stream failed after {frames_sent} frames: {e}")
+        yield {'type': 'error', 'error': str(e), 'framesSent': frames_sent}
+        return
+    
+    logger.info(f"[PARSING] ✓ Streamed {frames_sent} frames")
+    yield {'type': 'summary', 'frameCount': frames_sent}
+
+
+def ndjson_line(record):
+    """One compact JSON line (bytes, newline-terminated)"""
+    return (json.dumps(record, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+SIDECAR_FORMAT = 'pickle-parser-npy'
+SIDECAR_VERSION = 1
+SIDECAR_MANIFEST = 'manifest.json'
+SMPL_VERTEX_COUNT = 6890
+
+
+def _open_npy(path, dtype, shape):
+    """Writable .npy array, memory-mapped so large arrays are filled in place on disk"""
+    if int(np.prod(shape)) == 0:
+        # Empty files cannot be mapped
+        empty = np.zeros(shape, dtype=dtype)
+        np.save(path, empty)
+        return empty
+    return np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+
+
+def write_sidecar(pkl_path, output_dir):
+    """
+    Parse a pickle into contiguous .npy arrays plus a small JSON manifest.
+    
+    F frames x P person slots (P = most people in any frame); empty slots have
+    trackIds -1 and personMask 0. Written to output_dir:
+    
+        vertices.npy     float32 [F, P, V, 3]  PHALP 'verts', else SMPL output (vertexMask)
+        joints.npy       float32 [F, P, J, 3]  SMPL joints (only when the SMPL model is available)
+        globalOrient.npy float32 [F, P, 3, 3]  rotation matrices (smplMask)
+        bodyPose.npy     float32 [F, P, 23, 3, 3]
+        betas.npy        float32 [F, P, 10]
+        camera.npy       float32 [F, P, 3]     tx, ty, tz
+        trackIds.npy     int32   [F, P]
+        confidence.npy   float32 [F, P]
+        faces.npy        int32   [T, 3]
+        manifest.json    {"format", "version", "frameCount", "maxPersons", "fps", "arrays": {name: {file, dtype, shape}}}
+    
+    The manifest is written last, so its presence means the arrays are complete.
+    
+    Args:
+        pkl_path: Path to pickle file
+        output_dir: Directory for the arrays (created if needed)
+    
+    Returns:
+        manifest dict or None if the pickle cannot be loaded
+    """
+    logger.info(f"[SIDECAR] Loading pickle file: {pkl_path}")
+    data = load_pickle_data(pkl_path)
+    frames_list = get_frames_list(data) if data is not None else None
+    if frames_list is None:
+        return None
+    
+    os.makedirs(output_dir, exist_ok=True)
+    frames = [frame_data if isinstance(frame_data, dict) else {} for frame_data in frames_list]
+    frame_count = len(frames)
+    max_persons = max((len(frame_data.get('smpl', [])) for frame_data in frames), default=0)
+    shape = (frame_count, max_persons)
+    
+    arrays = {
+        'trackIds': np.full(shape, -1, dtype=np.int32),
+        'confidence': np.zeros(shape, dtype=np.float32),
+        'camera': np.zeros(shape + (3,), dtype=np.float32),
+        'personMask': np.zeros(shape, dtype=np.uint8),
+        'globalOrient': np.zeros(shape + (3, 3), dtype=np.float32),
+        'bodyPose': np.zeros(shape + (23, 3, 3), dtype=np.float32),
+        'betas': np.zeros(shape + (10,), dtype=np.float32),
+        'smplMask': np.zeros(shape, dtype=np.uint8),
+        'vertexMask': np.zeros(shape, dtype=np.uint8),
+    }
+    smpl_batch = SMPLBatch()
+    phalp_verts = {}
+    
+    for frame_idx, frame_data in enumerate(frames):
+        smpl_list = frame_data.get('smpl', [])
+        camera_list = frame_data.get('camera', [])
+        conf_list = frame_data.get('conf', [])
+        tid_list = frame_data.get('tid', [])
+        verts_list = frame_data.get('verts', [])
+        
+        for person_idx in range(len(smpl_list)):
+            slot = (frame_idx, person_idx)
+            arrays['personMask'][slot] = 1
+            try:
+                arrays['trackIds'][slot] = int(tid_list[person_idx]) if person_idx < len(tid_list) else person_idx
+                arrays['confidence'][slot] = float(conf_list[person_idx]) if person_idx < len(conf_list) else 1.0
+                if person_idx < len(camera_list):
+                    cam = np.asarray(camera_list[person_idx], dtype=np.float32).reshape(-1)
+                    if cam.size >= 3:
+                        arrays['camera'][slot] = cam[:3]
+            except (TypeError, ValueError) as e:
+                logger.debug(f"[SIDECAR] Frame {frame_idx} person {person_idx}: track/camera parse failed: {e}")
+            
+            smpl = smpl_list[person_idx]
+            if isinstance(smpl, dict) and smpl_batch.add(slot, smpl):
+                arrays['globalOrient'][slot] = smpl_batch.global_orient[-1]
+                arrays['bodyPose'][slot] = smpl_batch.body_pose[-1]
+                arrays['betas'][slot] = smpl_batch.betas[-1]
+                arrays['smplMask'][slot] = 1
+            
+            if person_idx < len(verts_list) and verts_list[person_idx] is not None:
+                phalp_verts[slot] = verts_list[person_idx]
+    
+    vertex_count = SMPL_VERTEX_COUNT
+    if phalp_verts:
+        vertex_count = len(next(iter(phalp_verts.values())))
+    vertices = _open_npy(os.path.join(output_dir, 'vertices.npy'), np.float32, shape + (vertex_count, 3))
+    
+    # PHALP vertices take precedence over the SMPL output, as in parse_frame()
+    for slot, verts in phalp_verts.items():
+        try:
+            vertices[slot] = np.asarray(verts, dtype=np.float32).reshape(vertex_count, 3)
+            arrays['vertexMask'][slot] = 1
+        except ValueError as e:
+            logger.debug(f"[SIDECAR] Frame {slot[0]} person {slot[1]}: vertices parse failed: {e}")
+    
+    joints = None
+    for chunk, chunk_vertices, chunk_joints in smpl_batch.iter_chunks():
+        if joints is None:
+            joints = _open_npy(os.path.join(output_dir, 'joints.npy'), np.float32,
+                               shape + chunk_joints.shape[1:])
+        frame_idx, person_idx = np.array([smpl_batch.targets[i] for i in chunk]).T
+        joints[frame_idx, person_idx] = chunk_joints
+        missing = arrays['vertexMask'][frame_idx, person_idx] == 0
+        if chunk_vertices.shape[1] == vertex_count and missing.any():
+            vertices[frame_idx[missing], person_idx[missing]] = chunk_vertices[missing]
+            arrays['vertexMask'][frame_idx[missing], person_idx[missing]] = 1
+    
+    smpl_faces = get_smpl_faces()
+    faces = smpl_faces if smpl_faces is not None else first_phalp_faces(frames)
+    arrays['faces'] = np.asarray(faces if faces is not None else np.zeros((0, 3)), dtype=np.int32).reshape(-1, 3)
+    
+    entries = {'vertices': vertices}
+    if joints is not None:
+        entries['joints'] = joints
+    entries.update(arrays)
+    manifest_arrays = {}
+    for name, array in entries.items():
+        file_name = f"{name}.npy"
+        if isinstance(array, np.memmap):
+            array.flush()
+        else:
+            np.save(os.path.join(output_dir, file_name), array)
+        manifest_arrays[name] = {
+            'file': file_name,
+            'dtype': np.lib.format.dtype_to_descr(array.dtype),
+            'shape': list(array.shape),
+        }
+    del vertices, joints, entries
+    
+    manifest = {
+        'format': SIDECAR_FORMAT,
+        'version': SIDECAR_VERSION,
+        'frameCount': frame_count,
+        'maxPersons': max_persons,
+        'vertexCount': vertex_count,
+        'fps': 30.0,
+        'arrays': manifest_arrays,
+        'metadata': {'parserVersion': '1.2'},
+    }
+    manifest_path = os.path.join(output_dir, SIDECAR_MANIFEST)
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    
+    logger.info(f"[SIDECAR] ✓ Wrote {frame_count} frames x {max_persons} persons to {output_dir}")
+    return manifest
+
+
 def get_smpl_faces():
     """Get SMPL face indices (triangles) - these are static"""
     smpl_model = get_smpl_model()
@@ -324,7 +735,7 @@ def get_smpl_faces():
         return None
 
 
-def parse_frame(frame_data, frame_idx, smpl_faces=None):
+def parse_frame(frame_data, frame_idx, smpl_faces=None, smpl_batch=None, include_faces=True):
     """
     Parse a single frame from PHALP output.
     PHALP format: dict with lists of data (multiple people per frame)
@@ -333,6 +744,9 @@ def parse_frame(frame_data, frame_idx, smpl_faces=None):
         frame_data: Frame data (dict)
         frame_idx: Frame index
         smpl_faces: SMPL face indices (optional, cached from model)
+        smpl_batch: SMPLBatch to queue vertex computation on (filled in by smpl_batch.run());
+                    without one, vertices are computed per person right away
+        include_faces: False leaves meshFaces out (sent once per stream instead)
     
     Returns:
         dict with frame information or None if parsing fails
@@ -396,10 +810,13 @@ def parse_frame(frame_data, frame_idx, smpl_faces=None):
                 if smpl_obj:
                     person_obj['smpl'] = smpl_obj
                     
-                    vertices = compute_smpl_vertices(smpl)
-                    if vertices is not None:
-                        person_obj['meshVertices'] = vertices.tolist()
-                        logger.debug(f"[PARSE] Frame {frame_idx} person {person_idx}: computed {len(vertices)} vertices")
+                    if smpl_batch is not None:
+                        smpl_batch.add(person_obj, smpl)
+                    else:
+                        vertices = compute_smpl_vertices(smpl)
+                        if vertices is not None:
+                            person_obj['meshVertices'] = vertices.tolist()
+                            logger.debug(f"[PARSE] Frame {frame_idx} person {person_idx}: computed {len(vertices)} vertices")
             
             except Exception as e:
                 logger.debug(f"[PARSE] Frame {frame_idx} person {person_idx}: SMPL parse failed: {e}")
@@ -413,7 +830,10 @@ def parse_frame(frame_data, frame_idx, smpl_faces=None):
             except Exception as e:
                 logger.debug(f"[PARSE] Frame {frame_idx} person {person_idx}: vertices parse failed: {e}")
         
-        if smpl_faces is not None:
+        if not include_faces:
+            pass
+        
+        elif smpl_faces is not None:
             try:
                 faces_data = smpl_faces.tolist() if hasattr(smpl_faces, 'tolist') else smpl_faces
                 person_obj['meshFaces'] = faces_data
@@ -435,19 +855,284 @@ def parse_frame(frame_data, frame_idx, smpl_faces=None):
     return frame_obj
 
 
+# Resident mode (--serve): one process keeps torch, smplx and the SMPL model loaded
+# and parses many pickles over HTTP, instead of paying interpreter + import + model
+# load time on every spawn.
+#
+#   POST /parse    {"pklPath": "/abs/path/results.pkl"} -> same JSON as the CLI
+#                  (+ "format": "ndjson" -> chunked NDJSON, see iter_ndjson_records)
+#                  (+ "format": "npy", "outputDir": dir -> .npy sidecar, manifest returned)
+#   GET  /health   SMPL model / faces loaded, pid, uptime
+#   GET  /metrics  jobs, failures, frames and parse times since startup
+#
+# Once bound, one {"type": "listening", "port": N, "pid": P} line goes to stdout (so
+# --port 0 can be used), and with a token every request needs an X-Parser-Token header.
+PARSER_HOST = os.environ.get('PICKLE_PARSER_HOST', '127.0.0.1')
+PARSER_PORT = int(os.environ.get('PICKLE_PARSER_PORT', '8765'))
+PARSER_TOKEN = os.environ.get('PICKLE_PARSER_TOKEN')
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+
+
+class ParserMetrics:
+    """Parse job accounting for the resident parser"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self.jobs = 0
+        self.failures = 0
+        self.frames = 0
+        self.in_flight = 0
+        self.total_ms = 0.0
+        self.last_ms = None
+    
+    def start(self):
+        with self._lock:
+            self.in_flight += 1
+    
+    def finish(self, elapsed_ms, frames=None):
+        with self._lock:
+            self.in_flight -= 1
+            self.jobs += 1
+            self.total_ms += elapsed_ms
+            self.last_ms = elapsed_ms
+            if frames is None:
+                self.failures += 1
+            else:
+                self.frames += frames
+    
+    def to_dict(self):
+        with self._lock:
+            return {
+                'uptimeSeconds': round(time.time() - self.started_at, 1),
+                'jobs': self.jobs,
+                'failures': self.failures,
+                'inFlight': self.in_flight,
+                'framesParsed': self.frames,
+                'avgParseMs': round(self.total_ms / self.jobs, 1) if self.jobs else None,
+                'lastParseMs': round(self.last_ms, 1) if self.last_ms is not None else None,
+            }
+
+
+class ParserRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end for parse_pickle_file()"""
+    
+    server_version = 'PickleParser/1.1'
+    protocol_version = 'HTTP/1.1'
+    
+    def log_message(self, format, *args):
+        logger.debug(f"[SERVE] {self.address_string()} {format % args}")
+    
+    def address_string(self):
+        # Unix-socket clients have no (host, port) address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'local'
+    
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _authorized(self):
+        """Check X-Parser-Token against the server's token (401 and False on a mismatch)"""
+        token = getattr(self.server, 'token', None)
+        if not token or hmac.compare_digest(self.headers.get('X-Parser-Token', ''), token):
+            return True
+        self._send_json(401, {'error': 'Missing or wrong X-Parser-Token'})
+        return False
+    
+    def do_GET(self):
+        if not self._authorized():
+            return
+        path = self.path.split('?')[0]
+        if path == '/health':
+            self._send_json(200, {
+                'status': 'ready',
+                'smplLoaded': SMPL_MODEL is not None,
+                'facesLoaded': get_smpl_faces() is not None,
+                'pid': os.getpid(),
+                'metrics': self.server.metrics.to_dict(),
+            })
+        elif path == '/metrics':
+            self._send_json(200, self.server.metrics.to_dict())
+        else:
+            self._send_json(404, {'error': f'Unknown path {self.path}'})
+    
+    def do_POST(self):
+        if not self._authorized():
+            return
+        if self.path.split('?')[0] != '/parse':
+            self._send_json(404, {'error': f'Unknown path {self.path}'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            request = json.loads(self.rfile.read(length) or b'{}')
+            pkl_path = request['pklPath']
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(400, {'error': f'Expected a JSON body with pklPath: {e}'})
+            return
+        if not os.path.isfile(pkl_path):
+            self._send_json(404, {'error': f'Pickle file not found: {pkl_path}'})
+            return
+        if request.get('format') == 'ndjson':
+            self._stream_ndjson(pkl_path)
+            return
+        output_dir = request.get('outputDir')
+        if request.get('format') == 'npy' and not isinstance(output_dir, str):
+            self._send_json(400, {'error': 'format npy needs an outputDir'})
+            return
+        
+        metrics = self.server.metrics
+        metrics.start()
+        start_time = time.time()
+        result = None
+        try:
+            # One parse at a time: the SMPL model and the CPU are shared
+            with self.server.parse_lock:
+                if request.get('format') == 'npy':
+                    result = write_sidecar(pkl_path, output_dir)
+                else:
+                    result = parse_pickle_file(pkl_path)
+        except Exception as e:
+            logger.error(f"[SERVE] ✗ Parse of {pkl_path} raised: {e}")
+        finally:
+            elapsed_ms = (time.time() - start_time) * 1000
+            metrics.finish(elapsed_ms, result['frameCount'] if result is not None else None)
+        
+        if result is None:
+            self._send_json(422, {'error': f'Failed to parse pickle file {pkl_path}'})
+            return
+        logger.info(f"[SERVE] ✓ Parsed {pkl_path}: {result['frameCount']} frames in {elapsed_ms:.0f}ms")
+        self._send_json(200, result)
+
+
+    def _stream_ndjson(self, pkl_path):
+        """iter_ndjson_records() as a chunked application/x-ndjson response"""
+        metrics = self.server.metrics
+        metrics.start()
+        start_time = time.time()
+        frames = None
+        self.send_response(200)
+        self.send_header('Content-Type', NDJSON_MEDIA_TYPE)
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        try:
+            with self.server.parse_lock:
+                for record in iter_ndjson_records(pkl_path):
+                    line = ndjson_line(record)
+                    self.wfile.write(b'%x\r\n%s\r\n' % (len(line), line))
+                    if record['type'] == 'summary':
+                        frames = record['frameCount']
+            self.wfile.write(b'0\r\n\r\n')
+        except (BrokenPipeError, ConnectionResetError) as e:
+            logger.warning(f"[SERVE] Client went away while streaming {pkl_path}: {e}")
+            self.close_connection = True
+        finally:
+            elapsed_ms = (time.time() - start_time) * 1000
+            metrics.finish(elapsed_ms, frames)
+        logger.info(f"[SERVE] ✓ Streamed {pkl_path}: {frames} frames in {elapsed_ms:.0f}ms")
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(host=PARSER_HOST, port=PARSER_PORT, socket_path=None, token=PARSER_TOKEN):
+    """Run the resident parser until interrupted (SMPL model loaded before the first request)"""
+    logger.info("[SERVE] Warming up SMPL model")
+    warmup_start = time.time()
+    faces = get_smpl_faces()
+    logger.info(f"[SERVE] ✓ Warm in {time.time() - warmup_start:.1f}s "
+                f"(SMPL model: {SMPL_MODEL is not None}, faces: {faces is not None})")
+    
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = ThreadingUnixHTTPServer(socket_path, ParserRequestHandler)
+        address = f"unix:{socket_path}"
+    else:
+        server = ThreadingHTTPServer((host, port), ParserRequestHandler)
+        address = f"http://{host}:{server.server_address[1]}"
+    server.metrics = ParserMetrics()
+    server.parse_lock = threading.Lock()
+    server.token = token
+    
+    logger.info(f"[SERVE] ✓ Pickle parser listening on {address}")
+    listening = {'type': 'listening', 'pid': os.getpid()}
+    if socket_path:
+        listening['socket'] = socket_path
+    else:
+        listening['port'] = server.server_address[1]
+    sys.stdout.write(json.dumps(listening) + '\n')
+    sys.stdout.flush()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if socket_path and os.path.exists(socket_path):
+            os.unlink(socket_path)
+        logger.info("[SERVE] Stopped")
+
+
 def main():
     """Main entry point"""
-    if len(sys.argv) < 2:
-        logger.error("[MAIN] Usage: python pickle_parser.py <pkl_path>")
+    parser = argparse.ArgumentParser(description='Extract PHALP pickle output to JSON')
+    parser.add_argument('pkl_path', nargs='?', help='PHALP results pickle')
+    parser.add_argument('--serve', action='store_true', help='Run as a resident HTTP parser (see serve())')
+    parser.add_argument('--host', default=PARSER_HOST, help='--serve bind address')
+    parser.add_argument('--port', type=int, default=PARSER_PORT, help='--serve port (0 picks a free one)')
+    parser.add_argument('--socket', help='--serve on this Unix socket path instead of TCP')
+    parser.add_argument('--token', default=PARSER_TOKEN,
+                        help='--serve requires this X-Parser-Token header (default: $PICKLE_PARSER_TOKEN)')
+    parser.add_argument('--format', choices=('json', 'ndjson', 'npy'), default='json',
+                        help='json: one document; ndjson: header, one line per frame, summary (streamed); '
+                             'npy: .npy arrays + manifest.json in --output-dir')
+    parser.add_argument('--output-dir', help='--format npy destination directory')
+    args = parser.parse_args()
+    
+    if args.serve:
+        serve(args.host, args.port, args.socket, args.token)
+        return
+    if not args.pkl_path:
+        logger.error("[MAIN] Usage: python pickle_parser.py <pkl_path> | --serve [--port N | --socket PATH]")
         sys.exit(1)
     
-    pkl_path = sys.argv[1]
+    pkl_path = args.pkl_path
     
     logger.info(f"[MAIN] ========================================")
     logger.info(f"[MAIN] Pickle Parser v1.0")
     logger.info(f"[MAIN] Input: {pkl_path}")
     logger.info(f"[MAIN] ========================================")
     
+    if args.format == 'ndjson':
+        # Each record is written as soon as it is parsed; the last one says whether it worked
+        last_type = None
+        for record in iter_ndjson_records(pkl_path):
+            sys.stdout.buffer.write(ndjson_line(record))
+            sys.stdout.buffer.flush()
+            last_type = record['type']
+        if last_type != 'summary':
+            logger.error("[MAIN] ✗ Failed to parse pickle file")
+            sys.exit(1)
+        logger.info(f"[MAIN] ✓ Pickle streaming complete")
+        return
+    
+    if args.format == 'npy':
+        if not args.output_dir:
+            logger.error("[MAIN] ✗ --format npy needs --output-dir")
+            sys.exit(1)
+        manifest = write_sidecar(pkl_path, args.output_dir)
+        if manifest is None:
+            logger.error("[MAIN] ✗ Failed to parse pickle file")
+            sys.exit(1)
+        print(json.dumps(manifest))
+        logger.info(f"[MAIN] ✓ Sidecar written to {args.output_dir}")
+        return
+    
     result = parse_pickle_file(pkl_path)
     
     if result is None:
@@ -6,6 +6,7 @@
 import axios from 'axios';
 import logger from '../logger';
 import { CameraParams } from '../types';
+import { getMeshTopology, MeshTopologyRef } from './meshTopology';
 
 const POSE_SERVICE_URL = process.env.POSE_SERVICE_URL || 'http://localhost:5000';
 const POSE_SERVICE_TIMEOUT = parseInt(process.env.POSE_SERVICE_TIMEOUT || '10000');
@@ -280,6 +281,23 @@ export function getAverageConfidence(frame: PoseFrame): number {
 }
 
 // 4D-Humans (HMR2) specific types
+
+/**
+ * Compact SMPL parameters (axis-angle) - ~85 floats that rebuild the whole mesh.
+ * Skin client side per backend/pose-service/SMPL_LBS_SPEC.md, or POST to /mesh/reconstruct.
+ */
+export interface SmplParams {
+  rotation_format: 'axis_angle';
+  global_orient: number[]; // 3
+  body_pose: number[]; // 69 (joints 1..23)
+  betas: number[]; // 10
+  camera?: {
+    translation?: number[];
+    focal_length?: number;
+    img_size?: number[];
+  };
+}
+
 export interface HybridPoseFrame extends PoseFrame {
   has3d: boolean;
   joints3dRaw?: number[][] | null;
@@ -289,6 +307,8 @@ export interface HybridPoseFrame extends PoseFrame {
   meshVertices?: number;
   mesh_vertices_data?: number[][] | null;
   mesh_faces_data?: number[][] | null;
+  meshTopology?: MeshTopologyRef | null;  // Faces served once from /mesh/topology
+  smplParams?: SmplParams | null;
   trackingConfidence?: number;
   visualization?: string; // Base64 image with skeleton overlay from Python
 }
@@ -359,6 +379,12 @@ export async function detectPoseHybrid(
       console.log(`\x1b[36m[4D-HUMANS]   ✅ First keypoint: ${JSON.stringify(data.keypoints[0])}\x1b[0m`);
     }
     
+    // Faces come from the cached /mesh/topology unless the service embedded them
+    let meshFaces: number[][] | null = data.mesh_faces_data || null;
+    if (!meshFaces && data.mesh_topology) {
+      meshFaces = (await getMeshTopology(POSE_SERVICE_URL, data.mesh_topology)).faces;
+    }
+    
     const result: HybridPoseFrame = {
       frameNumber: data.frame_number,
       frameWidth: data.frame_width,
@@ -374,7 +400,9 @@ export async function detectPoseHybrid(
       cameraParams: data.camera_params,  // New: weak perspective camera parameters
       meshVertices: data.mesh_vertices,
       mesh_vertices_data: data.mesh_vertices_data,
-      mesh_faces_data: data.mesh_faces_data,
+      mesh_faces_data: meshFaces,
+      meshTopology: data.mesh_topology || null,
+      smplParams: data.smpl_params || null,
       trackingConfidence: data.tracking_confidence,
       visualization: data.visualization // Python-generated skeleton overlay
     };
@@ -0,0 +1,391 @@
+"""
+Test script for pickle_parser.py with a stand-in SMPL layer (no model file needed) -
+container sniffing, NDJSON records, the .npy sidecar, chunked SMPL scatter order
+and the resident parser's HTTP routes
+
+torch is only needed by the parser for no_grad/from_numpy around the SMPL layer;
+when it is not installed a minimal stand-in module is registered before import.
+"""
+
+import bz2
+import contextlib
+import gzip
+import json
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import types
+import urllib.error
+import urllib.request
+import zlib
+from http.server import ThreadingHTTPServer
+
+import numpy as np
+
+try:
+    import torch  # noqa: F401
+except ImportError:
+    torch_stub = types.ModuleType('torch')
+    torch_stub.no_grad = contextlib.nullcontext
+    torch_stub.from_numpy = lambda array: array
+    torch_stub.Tensor = type('Tensor', (), {})
+    sys.modules['torch'] = torch_stub
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import pickle_parser as pp  # noqa: E402
+
+FACES = np.array([[0, 1, 2], [1, 2, 3]], dtype=np.int64)
+JOINT_COUNT = 24
+
+
+class _Output:
+    def __init__(self, array):
+        self.array = array
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self.array
+
+
+class FakeSMPL:
+    """
+    SMPL layer stand-in: every vertex/joint of a person carries its betas[0], so
+    scattered outputs can be traced back to the person they were computed for
+    """
+
+    faces = FACES
+
+    def __init__(self):
+        self.batch_sizes = []
+        self.fail_on = set()  # betas[0] values that make a forward pass raise
+
+    def __call__(self, global_orient, body_pose, betas):
+        betas = np.asarray(betas)
+        assert np.asarray(global_orient).shape == (len(betas), 3, 3)
+        assert np.asarray(body_pose).shape == (len(betas), 23, 3, 3)
+        if self.fail_on & set(betas[:, 0].tolist()):
+            raise RuntimeError('bad SMPL parameters')
+        self.batch_sizes.append(len(betas))
+        ids = betas[:, 0].astype(np.float32)
+        vertices = np.broadcast_to(ids[:, None, None], (len(betas), pp.SMPL_VERTEX_COUNT, 3)).copy()
+        joints = np.broadcast_to(ids[:, None, None], (len(betas), JOINT_COUNT, 3)).copy()
+        return types.SimpleNamespace(vertices=_Output(vertices), joints=_Output(joints))
+
+
+def install_smpl(chunk_size=128):
+    model = FakeSMPL()
+    pp.SMPL_MODEL = model
+    pp.get_smpl_model = lambda: pp.SMPL_MODEL
+    pp.SMPL_BATCH_SIZE = chunk_size
+    return model
+
+
+def person_id(frame_idx, person_idx):
+    return frame_idx * 10 + person_idx + 1
+
+
+def make_frames(people_per_frame=(2, 0, 1)):
+    """PHALP-style frames; betas[0] identifies (frame, person)"""
+    frames = []
+    for frame_idx, count in enumerate(people_per_frame):
+        frames.append({
+            'smpl': [{
+                'global_orient': np.eye(3, dtype=np.float32)[None],
+                'body_pose': np.repeat(np.eye(3, dtype=np.float32)[None], 23, axis=0),
+                'betas': np.full(10, person_id(frame_idx, p), dtype=np.float32),
+            } for p in range(count)],
+            'camera': [np.array([0.1 * p, 0.2, 30.0 + frame_idx], dtype=np.float32) for p in range(count)],
+            'conf': [0.9 - 0.1 * p for p in range(count)],
+            'tid': [100 + p for p in range(count)],
+        })
+    return frames
+
+
+def write_pickle(path, data, container='pickle'):
+    raw = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+    encode = {
+        'pickle': lambda b: b,
+        'gzip': gzip.compress,
+        'bz2': bz2.compress,
+        'zlib': zlib.compress,
+    }[container]
+    with open(path, 'wb') as f:
+        f.write(encode(raw))
+    return path
+
+
+def test_sniff_and_load_containers():
+    """Plain, gzip, bz2 and zlib pickles are sniffed by magic bytes and load to the same data"""
+    install_smpl()
+    data = {'frames': make_frames()}
+    with tempfile.TemporaryDirectory() as tmp:
+        for container in ('pickle', 'gzip', 'bz2', 'zlib'):
+            path = write_pickle(os.path.join(tmp, f'{container}.pkl'), data, container)
+            with open(path, 'rb') as f:
+                assert pp.sniff_format(f) == container
+                assert f.tell() == 0, 'sniffing must not consume the header'
+            loaded = pp.load_pickle_data(path)
+            assert len(pp.get_frames_list(loaded)) == 3, container
+            np.testing.assert_array_equal(loaded['frames'][0]['smpl'][1]['betas'], data['frames'][0]['smpl'][1]['betas'])
+
+        path = os.path.join(tmp, 'text.pkl')
+        with open(path, 'wb') as f:
+            f.write(b'not a pickle')
+        with open(path, 'rb') as f:
+            assert pp.sniff_format(f) == 'unknown'
+    print("✓ Sniffed and loaded pickle, gzip, bz2 and zlib containers")
+
+
+def test_joblib_dispatch():
+    """With joblib, every joblib format goes through joblib.load on the open handle; latin1 is the fallback"""
+    install_smpl()
+    data = {'frames': make_frames()}
+    calls = []
+
+    class RecordingJoblib:
+        @staticmethod
+        def load(f):
+            calls.append(f.tell())
+            return pickle.load(pp.open_stream(f, pp.sniff_format(f)))
+
+    class Python2Joblib:
+        @staticmethod
+        def load(f):
+            f.read(4)  # joblib consumed part of the stream before failing
+            raise UnicodeDecodeError('ascii', b'\xff', 0, 1, 'ordinal not in range(128)')
+
+    saved = (pp.HAS_JOBLIB, getattr(pp, 'joblib', None))
+    try:
+        pp.HAS_JOBLIB = True
+        with tempfile.TemporaryDirectory() as tmp:
+            for container in ('pickle', 'gzip', 'bz2', 'zlib'):
+                path = write_pickle(os.path.join(tmp, f'{container}.pkl'), data, container)
+                pp.joblib = RecordingJoblib
+                assert len(pp.load_pickle_data(path)['frames']) == 3
+                pp.joblib = Python2Joblib
+                assert len(pp.load_pickle_data(path)['frames']) == 3, 'latin1 fallback must rewind'
+        assert calls == [0, 0, 0, 0]
+
+        if saved[1] is not None:
+            # Real joblib: its own compressed containers round-trip too
+            with tempfile.TemporaryDirectory() as tmp:
+                pp.joblib = saved[1]
+                for compress in (('zlib', 3), ('gzip', 3), 0):
+                    path = os.path.join(tmp, f'{compress}.joblib')
+                    saved[1].dump(data, path, compress=compress)
+                    assert len(pp.load_pickle_data(path)['frames']) == 3, compress
+    finally:
+        pp.HAS_JOBLIB, pp.joblib = saved
+    print("✓ joblib formats dispatched to joblib.load with a latin1 fallback")
+
+
+def test_ndjson_records():
+    """header (faces once), one frame record per frame without faces, then a summary"""
+    install_smpl()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_pickle(os.path.join(tmp, 'video.pkl'), {'frames': make_frames()}, 'gzip')
+        records = [json.loads(pp.ndjson_line(record)) for record in pp.iter_ndjson_records(path)]
+
+    assert [record['type'] for record in records] == ['header', 'frame', 'frame', 'frame', 'summary']
+    header, frames, summary = records[0], records[1:-1], records[-1]
+    assert header['frameCount'] == 3 and header['meshFaces'] == FACES.tolist()
+    assert [frame['frameNumber'] for frame in frames] == [0, 1, 2]
+    assert [len(frame['persons']) for frame in frames] == [2, 0, 1]
+    for frame in frames:
+        for p, person in enumerate(frame['persons']):
+            assert 'meshFaces' not in person
+            assert person['personId'] == 100 + p
+            assert person['meshVertices'][0][0] == person_id(frame['frameNumber'], p)
+    assert summary == {'type': 'summary', 'frameCount': 3}
+    print(f"✓ {len(records)} NDJSON records: header, frames, summary")
+
+
+def test_ndjson_error_record():
+    """A corrupt or truncated pickle ends the stream with an error record"""
+    install_smpl()
+    with tempfile.TemporaryDirectory() as tmp:
+        corrupt = os.path.join(tmp, 'corrupt.pkl')
+        with open(corrupt, 'wb') as f:
+            f.write(b'\x80\x05garbage')
+        records = list(pp.iter_ndjson_records(corrupt))
+        assert records == [{'type': 'error', 'error': f'Failed to load pickle file {corrupt}', 'framesSent': 0}]
+
+        truncated = write_pickle(os.path.join(tmp, 'truncated.pkl'), {'frames': make_frames()}, 'zlib')
+        with open(truncated, 'r+b') as f:
+            f.truncate(os.path.getsize(truncated) // 2)
+        records = list(pp.iter_ndjson_records(truncated))
+        assert len(records) == 1 and records[0]['type'] == 'error'
+    print("✓ Corrupt and truncated pickles end with an error record")
+
+
+def test_sidecar_arrays():
+    """write_sidecar: [F, P] arrays, person/SMPL/vertex masks and a manifest matching the files"""
+    install_smpl()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_pickle(os.path.join(tmp, 'video.pkl'), {'frames': make_frames((2, 0, 1))})
+        output_dir = os.path.join(tmp, 'sidecar')
+        manifest = pp.write_sidecar(path, output_dir)
+
+        with open(os.path.join(output_dir, pp.SIDECAR_MANIFEST)) as f:
+            assert json.load(f) == manifest
+        assert manifest['format'] == pp.SIDECAR_FORMAT and manifest['version'] == pp.SIDECAR_VERSION
+        assert manifest['frameCount'] == 3 and manifest['maxPersons'] == 2
+
+        arrays = {}
+        for name, info in manifest['arrays'].items():
+            arrays[name] = np.load(os.path.join(output_dir, info['file']))
+            assert list(arrays[name].shape) == info['shape'], name
+            assert np.lib.format.dtype_to_descr(arrays[name].dtype) == info['dtype'], name
+
+    V = pp.SMPL_VERTEX_COUNT
+    expected_shapes = {
+        'vertices': (3, 2, V, 3), 'joints': (3, 2, JOINT_COUNT, 3), 'globalOrient': (3, 2, 3, 3),
+        'bodyPose': (3, 2, 23, 3, 3), 'betas': (3, 2, 10), 'camera': (3, 2, 3), 'trackIds': (3, 2),
+        'confidence': (3, 2), 'personMask': (3, 2), 'smplMask': (3, 2), 'vertexMask': (3, 2),
+        'faces': (len(FACES), 3),
+    }
+    assert {name: array.shape for name, array in arrays.items()} == expected_shapes
+
+    present = [[1, 1], [0, 0], [1, 0]]
+    for mask in ('personMask', 'smplMask', 'vertexMask'):
+        assert arrays[mask].tolist() == present, mask
+    assert arrays['trackIds'].tolist() == [[100, 101], [-1, -1], [100, -1]]
+    np.testing.assert_array_equal(arrays['faces'], FACES)
+    for f, p in ((0, 0), (0, 1), (2, 0)):
+        assert (arrays['vertices'][f, p] == person_id(f, p)).all()
+        assert (arrays['joints'][f, p] == person_id(f, p)).all()
+        assert arrays['betas'][f, p, 0] == person_id(f, p)
+        np.testing.assert_allclose(arrays['camera'][f, p], [0.1 * p, 0.2, 30.0 + f])
+    assert not arrays['vertices'][1].any() and not arrays['vertices'][2, 1].any()
+    print(f"✓ Sidecar with {len(arrays)} arrays, masks and manifest")
+
+
+def test_chunked_scatter_order():
+    """Outputs of several small SMPL chunks land on the person and frame they were computed for"""
+    people = (3, 1, 0, 2, 3)
+    model = install_smpl(chunk_size=2)
+    frames = list(pp.iter_parsed_frames(make_frames(people), FACES))
+    assert [frame['frameNumber'] for frame in frames] == list(range(len(people)))
+    assert all(size <= 2 for size in model.batch_sizes) and sum(model.batch_sizes) == sum(people)
+    for frame in frames:
+        for p, person in enumerate(frame['persons']):
+            assert person['meshVertices'][0][0] == person_id(frame['frameNumber'], p)
+            assert person['meshFaces'] == FACES.tolist()
+
+    # A failing chunk falls back to per-person passes; only the bad person loses its vertices
+    model = install_smpl(chunk_size=2)
+    model.fail_on = {person_id(3, 1)}
+    frames = list(pp.iter_parsed_frames(make_frames(people), FACES))
+    missing = [(frame['frameNumber'], p) for frame in frames for p, person in enumerate(frame['persons'])
+               if 'meshVertices' not in person]
+    assert missing == [(3, 1)], missing
+
+    # The sidecar scatters the same chunks into its [F, P] arrays
+    install_smpl(chunk_size=2)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_pickle(os.path.join(tmp, 'video.pkl'), make_frames(people))
+        output_dir = os.path.join(tmp, 'sidecar')
+        pp.write_sidecar(path, output_dir)
+        vertices = np.load(os.path.join(output_dir, 'vertices.npy'))
+    for f, count in enumerate(people):
+        for p in range(count):
+            assert (vertices[f, p] == person_id(f, p)).all(), (f, p)
+    print(f"✓ Chunked SMPL outputs scattered in order ({len(model.batch_sizes)} passes)")
+
+
+@contextlib.contextmanager
+def running_parser(token=None):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), pp.ParserRequestHandler)
+    server.metrics = pp.ParserMetrics()
+    server.parse_lock = threading.Lock()
+    server.token = token
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def http(url, body=None, token=None):
+    """(status, body bytes) for a GET, or a POST when body is given"""
+    headers = {'Content-Type': 'application/json'}
+    if token:
+        headers['X-Parser-Token'] = token
+    data = body if isinstance(body, bytes) or body is None else json.dumps(body).encode('utf-8')
+    request = urllib.request.Request(url, data=data, headers=headers, method='POST' if data is not None else 'GET')
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+def test_daemon_routes():
+    """/health and /parse (json, ndjson, npy) plus the error statuses"""
+    install_smpl()
+    with tempfile.TemporaryDirectory() as tmp, running_parser() as url:
+        path = write_pickle(os.path.join(tmp, 'video.pkl'), {'frames': make_frames()}, 'bz2')
+
+        status, body = http(f'{url}/health')
+        health = json.loads(body)
+        assert status == 200 and health['status'] == 'ready' and health['pid'] == os.getpid()
+        assert health['smplLoaded'] and health['facesLoaded']
+
+        status, body = http(f'{url}/parse', {'pklPath': path})
+        result = json.loads(body)
+        assert status == 200 and result['frameCount'] == 3
+        assert result['frames'][0]['persons'][1]['meshVertices'][0][0] == person_id(0, 1)
+
+        status, body = http(f'{url}/parse', {'pklPath': path, 'format': 'ndjson'})
+        records = [json.loads(line) for line in body.splitlines()]
+        assert status == 200 and [r['type'] for r in records] == ['header', 'frame', 'frame', 'frame', 'summary']
+
+        output_dir = os.path.join(tmp, 'sidecar')
+        status, body = http(f'{url}/parse', {'pklPath': path, 'format': 'npy', 'outputDir': output_dir})
+        assert status == 200 and json.loads(body)['frameCount'] == 3
+        assert os.path.exists(os.path.join(output_dir, pp.SIDECAR_MANIFEST))
+
+        assert http(f'{url}/parse', {'pklPath': path, 'format': 'npy'})[0] == 400
+        assert http(f'{url}/parse', b'[not json')[0] == 400
+        assert http(f'{url}/parse', {'pklPath': os.path.join(tmp, 'missing.pkl')})[0] == 404
+        assert http(f'{url}/nope')[0] == 404
+
+        corrupt = os.path.join(tmp, 'corrupt.pkl')
+        with open(corrupt, 'wb') as f:
+            f.write(b'\x80\x05garbage')
+        assert http(f'{url}/parse', {'pklPath': corrupt})[0] == 422
+
+        status, body = http(f'{url}/metrics')
+        metrics = json.loads(body)
+        assert metrics['jobs'] == 4 and metrics['failures'] == 1 and metrics['framesParsed'] == 9
+    print("✓ Resident parser /health and /parse routes")
+
+
+def test_daemon_token():
+    """With a token every route answers 401 unless X-Parser-Token matches"""
+    install_smpl()
+    with running_parser(token='secret') as url:
+        assert http(f'{url}/health')[0] == 401
+        assert http(f'{url}/health', token='wrong')[0] == 401
+        assert http(f'{url}/parse', {'pklPath': __file__})[0] == 401
+        status, body = http(f'{url}/health', token='secret')
+        assert status == 200 and json.loads(body)['pid'] == os.getpid()
+    print("✓ Resident parser rejects requests without its token")
+
+
+if __name__ == '__main__':
+    test_sniff_and_load_containers()
+    test_joblib_dispatch()
+    test_ndjson_records()
+    test_ndjson_error_record()
+    test_sidecar_arrays()
+    test_chunked_scatter_order()
+    test_daemon_routes()
+    test_daemon_token()
+    print("All pickle parser tests passed")